@@ -1,11 +1,14 @@
 """### Command Line Interface that interacts with the test runner."""
+
 from __future__ import annotations
 
 import argparse
 import multiprocessing
 import os
 
-from scipion_testrunner.domain import test_service
+from scipion_testrunner.configuration import test_data_keys
+from scipion_testrunner.domain import run_options, static_discovery, test_service
+from scipion_testrunner.domain.handlers import cache_handler, socket_handler
 
 
 def __generate_parser() -> argparse.ArgumentParser:
@@ -17,6 +20,10 @@ def __generate_parser() -> argparse.ArgumentParser:
     """
     epilog = "Example 1: python -m scipion-testrunner /path/to/scipion myModule -j 2"
     epilog += f"\nExample 2: python -m scipion-testrunner /path/to/scipion myModule --{test_service.NO_GPU_PARAM_NAME}"
+    epilog += f"\nExample 3: python -m scipion-testrunner /path/to/scipion myModule --{test_service.SHARD_PARAM_NAME} 1/4"
+    epilog += f"\nExample 4: python -m scipion-testrunner /path/to/scipion myModule --{test_service.COORDINATOR_PARAM_NAME} 0.0.0.0:5000"
+    epilog += f"\nExample 5: python -m scipion-testrunner /path/to/scipion myModule --{test_service.WORKER_PARAM_NAME} coordinator-host:5000"
+    epilog += f"\nExample 6: python -m scipion-testrunner /path/to/scipion myModule --{test_service.TEST_DATA_PARAM_NAME} testData.json --{test_service.PROFILE_PARAM_NAME} nightly"
     return argparse.ArgumentParser(
         prog="scipion_testrunner",
         epilog=epilog,
@@ -53,14 +60,215 @@ def __add_params(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
         action="store_true",
         help="If set, no tests that need a GPU will run. Use it in enviroments where a GPU cannot be accessed.",
     )
+    parser.add_argument(
+        f"--{test_service.FORK_SERVER_PARAM_NAME}",
+        action="store_true",
+        help="If set, tests are forked from Scipion processes that already imported pyworkflow, pwem and the plugin, instead of starting Scipion for every test. Only available on POSIX systems.",
+    )
+    parser.add_argument(
+        f"--{test_service.ENGINE_PARAM_NAME}",
+        choices=run_options.ENGINES,
+        default=run_options.POOL_ENGINE,
+        help=f"Engine running the tests. '{run_options.POOL_ENGINE}' waits for each Scipion process from a pool of worker processes, while '{run_options.ASYNCIO_ENGINE}' manages every Scipion process from a single event loop. Defaults to {run_options.POOL_ENGINE}",
+    )
+    parser.add_argument(
+        f"--{test_service.TIMEOUT_PARAM_NAME}",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=f"If set, tests running for longer than SECONDS are stopped and reported as timed out. Specific tests can have their own timeout under the '{test_data_keys.TIMEOUTS_KEY}' key of the test data JSON file.",
+    )
+    parser.add_argument(
+        f"--{test_service.CPUS_PARAM_NAME}",
+        type=__parse_capacity,
+        default=None,
+        metavar="N",
+        help=f"Number of CPU cores the running tests can use at the same time, as needed by each test under the '{test_data_keys.RESOURCES_KEY}' key of the test data JSON file. Tests without resource hints need one core. Defaults to the available cores",
+    )
+    parser.add_argument(
+        f"--{test_service.MEMORY_PARAM_NAME}",
+        type=__parse_capacity,
+        default=None,
+        metavar="GB",
+        help=f"Memory in GB the running tests can use at the same time, as needed by each test under the '{test_data_keys.RESOURCES_KEY}' key of the test data JSON file. Defaults to the available memory",
+    )
+    parser.add_argument(
+        f"--{test_service.GPUS_PARAM_NAME}",
+        type=__parse_capacity,
+        default=None,
+        metavar="N",
+        help=f"Number of GPUs the running tests can use at the same time, as needed by each test under the '{test_data_keys.RESOURCES_KEY}' key of the test data JSON file. Defaults to the available GPUs",
+    )
+    parser.add_argument(
+        f"--{test_service.FAIL_FAST_PARAM_NAME}",
+        action="store_true",
+        help="If set, the run stops at the first failed test, cancelling the pending tests and terminating the running ones.",
+    )
     parser.add_argument(
         f"--{test_service.TEST_DATA_PARAM_NAME}",
         default="",
         help="Location of the test data JSON file.",
     )
+    parser.add_argument(
+        f"--{test_service.PROFILE_PARAM_NAME}",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help=f"Profile of the test data JSON file applied on top of it, as defined under its '{test_data_keys.PROFILES_KEY}' key. Can be given several times, and profiles are applied in order.",
+    )
+    parser.add_argument(
+        f"--{test_service.CACHE_DIR_PARAM_NAME}",
+        default=cache_handler.DEFAULT_CACHE_DIR,
+        help=f"Directory where data such as the duration of each test is kept between runs. Defaults to {cache_handler.DEFAULT_CACHE_DIR}",
+    )
+    parser.add_argument(
+        f"--{test_service.LOG_DIR_PARAM_NAME}",
+        default=None,
+        help=f"Directory where the full output of each test is written while it runs. Defaults to a logs directory inside --{test_service.CACHE_DIR_PARAM_NAME}",
+    )
+    parser.add_argument(
+        f"--{test_service.OUTPUT_TAIL_PARAM_NAME}",
+        type=int,
+        default=20,
+        metavar="KB",
+        help="Maximum size in KB of the last part of the output of a failed test shown in the logs. Defaults to 20",
+    )
+    parser.add_argument(
+        f"--{test_service.REFRESH_DISCOVERY_PARAM_NAME}",
+        action="store_true",
+        help=f"If set, tests are discovered again with Scipion instead of being read from the cache in --{test_service.CACHE_DIR_PARAM_NAME}, even if the plugin files did not change.",
+    )
+    parser.add_argument(
+        f"--{test_service.DISCOVERY_PARAM_NAME}",
+        choices=static_discovery.DISCOVERY_MODES,
+        default=static_discovery.SCIPION_DISCOVERY,
+        help=f"How tests are discovered. '{static_discovery.SCIPION_DISCOVERY}' lists them with Scipion, '{static_discovery.STATIC_DISCOVERY}' parses the plugin sources without launching Scipion, falling back to Scipion if they are ambiguous, and '{static_discovery.CHECK_DISCOVERY}' uses both and shows their differences. Defaults to {static_discovery.SCIPION_DISCOVERY}",
+    )
+    parser.add_argument(
+        f"--{test_service.DEFAULT_DURATION_PARAM_NAME}",
+        type=float,
+        default=60.0,
+        help="Estimated duration in seconds of the tests that have never run before. Defaults to 60",
+    )
+    parser.add_argument(
+        f"--{test_service.PACK_THRESHOLD_PARAM_NAME}",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="If set, tests without dependencies whose estimated duration is at most SECONDS are run together in a single Scipion process. Not used when acting as a coordinator.",
+    )
+    parser.add_argument(
+        f"--{test_service.PACK_SIZE_PARAM_NAME}",
+        type=int,
+        default=10,
+        help="Maximum number of short tests run in a single Scipion process. Defaults to 10",
+    )
+    parser.add_argument(
+        f"--{test_service.SPLIT_THRESHOLD_PARAM_NAME}",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="If set, test classes whose estimated duration is at least SECONDS run each of their test methods as a separate job, as long as the duration history shows it saves more time than the repeated class setup costs.",
+    )
+    parser.add_argument(
+        f"--{test_service.SPLIT_TESTS_PARAM_NAME}",
+        nargs="+",
+        default=[],
+        metavar="TEST",
+        help="Test classes, such as test_file.TestClass, whose test methods run as separate jobs under the same conditions as --splitThreshold, regardless of their duration.",
+    )
+    parser.add_argument(
+        f"--{test_service.SHARD_PARAM_NAME}",
+        type=__parse_shard,
+        default=None,
+        metavar="INDEX/COUNT",
+        help=f"If set, only the tests of the given shard will run, e.g. 2/4. Shards are balanced by the durations in --{test_service.SHARD_DURATIONS_PARAM_NAME} if given, or by their number of tests otherwise, and dependent tests always share the same shard.",
+    )
+    parser.add_argument(
+        f"--{test_service.SHARD_DURATIONS_PARAM_NAME}",
+        default="",
+        metavar="FILE",
+        help=f"Duration history file, in the same format as the one kept in --{test_service.CACHE_DIR_PARAM_NAME}, used to balance the shards by the recorded duration of the tests. Every node must use the same file, e.g. one committed to the repository, so that all of them compute the same shards.",
+    )
+    distribution_group = parser.add_mutually_exclusive_group()
+    distribution_group.add_argument(
+        f"--{test_service.COORDINATOR_PARAM_NAME}",
+        type=__parse_address,
+        default=None,
+        metavar="ADDRESS",
+        help="If set, tests are not run locally but handed out to workers connecting to ADDRESS (HOST:PORT, or unix:PATH for a Unix socket).",
+    )
+    distribution_group.add_argument(
+        f"--{test_service.WORKER_PARAM_NAME}",
+        type=__parse_address,
+        default=None,
+        metavar="ADDRESS",
+        help="If set, runs the tests handed out by the coordinator listening on ADDRESS with the given Scipion, running up to -j tests at the same time.",
+    )
     return parser
 
 
+def __parse_address(value: str) -> str:
+    """
+    ### Validates a socket address param.
+
+    #### Params:
+    - value (str): Address param.
+
+    #### Returns:
+    - (str): Address with format HOST:PORT, or unix:PATH for a Unix socket.
+    """
+    if not socket_handler.is_valid_address(value):
+        raise argparse.ArgumentTypeError(
+            f"Invalid address '{value}'. Expected format HOST:PORT or unix:PATH."
+        )
+    return value
+
+
+def __parse_capacity(value: str) -> float:
+    """
+    ### Parses a resource capacity param.
+
+    #### Params:
+    - value (str): Capacity param.
+
+    #### Returns:
+    - (float): Amount of the resource.
+    """
+    try:
+        capacity = float(value)
+    except ValueError:
+        capacity = -1.0
+    if not capacity >= 0:
+        raise argparse.ArgumentTypeError(
+            f"Invalid capacity '{value}'. Expected a non-negative number."
+        )
+    return capacity
+
+
+def __parse_shard(value: str) -> tuple[int, int]:
+    """
+    ### Parses a shard param with format INDEX/COUNT.
+
+    #### Params:
+    - value (str): Shard param.
+
+    #### Returns:
+    - (tuple[int, int]): Index of the shard, starting at 1, and total number of shards.
+    """
+    try:
+        shard_index, shard_count = (int(number) for number in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid shard '{value}'. Expected format INDEX/COUNT, e.g. 1/4."
+        ) from None
+    if not 1 <= shard_index <= shard_count:
+        raise argparse.ArgumentTypeError(
+            f"Invalid shard '{value}'. INDEX must be between 1 and COUNT."
+        )
+    return shard_index, shard_count
+
+
 def __get_args_from_parser(parser: argparse.ArgumentParser) -> dict:
     """
     ### Extracts the appropiate values from the given parser.
@@ -72,10 +280,43 @@ def __get_args_from_parser(parser: argparse.ArgumentParser) -> dict:
     - (Namespace): Argument's object.
     """
     args = vars(parser.parse_args())
+    if (
+        args[test_service.FORK_SERVER_PARAM_NAME]
+        and args[test_service.ENGINE_PARAM_NAME] == run_options.ASYNCIO_ENGINE
+    ):
+        parser.error(
+            f"--{test_service.FORK_SERVER_PARAM_NAME} is only available with the '{run_options.POOL_ENGINE}' engine."
+        )
+    if (
+        args[test_service.PROFILE_PARAM_NAME]
+        and not args[test_service.TEST_DATA_PARAM_NAME]
+    ):
+        parser.error(
+            f"--{test_service.PROFILE_PARAM_NAME} can only be used along with --{test_service.TEST_DATA_PARAM_NAME}."
+        )
+    if args[test_service.SHARD_DURATIONS_PARAM_NAME]:
+        if not args[test_service.SHARD_PARAM_NAME]:
+            parser.error(
+                f"--{test_service.SHARD_DURATIONS_PARAM_NAME} can only be used along with --{test_service.SHARD_PARAM_NAME}."
+            )
+        if not os.path.isfile(args[test_service.SHARD_DURATIONS_PARAM_NAME]):
+            parser.error(
+                f"Shard durations file {args[test_service.SHARD_DURATIONS_PARAM_NAME]} does not exist."
+            )
+        args[test_service.SHARD_DURATIONS_PARAM_NAME] = os.path.abspath(
+            args[test_service.SHARD_DURATIONS_PARAM_NAME]
+        )
     if args[test_service.TEST_DATA_PARAM_NAME]:
         args[test_service.TEST_DATA_PARAM_NAME] = os.path.abspath(
             args[test_service.TEST_DATA_PARAM_NAME]
         )
+    args[test_service.CACHE_DIR_PARAM_NAME] = os.path.abspath(
+        args[test_service.CACHE_DIR_PARAM_NAME]
+    )
+    if args[test_service.LOG_DIR_PARAM_NAME]:
+        args[test_service.LOG_DIR_PARAM_NAME] = os.path.abspath(
+            args[test_service.LOG_DIR_PARAM_NAME]
+        )
     return args
 
 
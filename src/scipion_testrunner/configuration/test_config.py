@@ -2,41 +2,774 @@
 
 from __future__ import annotations
 
+import contextlib
+import difflib
+import hashlib
 import json
+import os
 
 from scipion_testrunner.application.logger import logger
 from scipion_testrunner.configuration import test_data_keys
+from scipion_testrunner.domain import test_matcher
 
+__CONFIG_CACHE_FILE_NAME = "test-configs.json"
+__FILES_KEY = "files"
+__CONFIG_KEY = "config"
+__STAMP_SIZE = 3
+__JSON_TYPE_NAMES = {
+    dict: "an object",
+    list: "a list",
+    str: "a string",
+    bool: "a boolean",
+    int: "a number",
+    float: "a number",
+    type(None): "null",
+}
+__PROFILE_KEYS = (
+    test_data_keys.DATASETS_KEY,
+    test_data_keys.SKIPPABLE_TESTS_KEY,
+    test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY,
+    test_data_keys.TIMEOUTS_KEY,
+    test_data_keys.RESOURCES_KEY,
+)
+__TOP_LEVEL_KEYS = (
+    *__PROFILE_KEYS,
+    test_data_keys.INCLUDE_KEY,
+    test_data_keys.PROFILES_KEY,
+)
+__SKIPPABLE_KEYS = (
+    test_data_keys.SKIPPABLE_GPU_KEY,
+    test_data_keys.SKIPPABLE_DEPENDENCIES_KEY,
+    test_data_keys.SKIPPABLE_OTHERS_KEY,
+)
+__DEPENDENCY_KEYS = (
+    test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY,
+    test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY,
+    test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY,
+    test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY,
+)
+__OTHER_TEST_KEYS = (
+    test_data_keys.SKIPPABLE_OTHERS_TEST_KEY,
+    test_data_keys.SKIPPABLE_OTHERS_REASON_KEY,
+)
+__RESOURCE_DEFAULTS = {
+    test_data_keys.RESOURCES_CPUS_KEY: 1.0,
+    test_data_keys.RESOURCES_MEMORY_KEY: 0.0,
+    test_data_keys.RESOURCES_GPUS_KEY: 0.0,
+}
 
-def get_test_config(file_path: str) -> tuple[list[str], dict, dict]:
+
+class TestConfig:
+    """
+    ### Validated test configuration, with every optional field filled in.
+
+    #### Attributes:
+    - data_sets (list[str]): Datasets to download.
+    - skippable_tests (dict): Skippable tests. Every section is present, and every dependency
+    and other test has all of its keys, with the default value when missing from the file.
+    - tests_with_deps (dict[str, list[str]]): Dependencies between tests.
+    - test_timeouts (dict[str, float]): Timeouts in seconds of specific tests.
+    - test_resources (dict[str, dict[str, float]]): CPU cores, memory in GB and GPUs needed by specific tests,
+    with the default value of every resource missing from the file.
+    """
+
+    __test__ = False
+    __slots__ = (
+        "data_sets",
+        "skippable_tests",
+        "test_resources",
+        "test_timeouts",
+        "tests_with_deps",
+    )
+
+    def __init__(
+        self,
+        data_sets: list[str] | None = None,
+        skippable_tests: dict | None = None,
+        tests_with_deps: dict[str, list[str]] | None = None,
+        test_timeouts: dict[str, float] | None = None,
+        test_resources: dict[str, dict[str, float]] | None = None,
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - data_sets (list[str] | None): Optional. Datasets to download.
+        - skippable_tests (dict | None): Optional. Skippable tests.
+        - tests_with_deps (dict[str, list[str]] | None): Optional. Dependencies between tests.
+        - test_timeouts (dict[str, float] | None): Optional. Timeouts in seconds of specific tests.
+        - test_resources (dict[str, dict[str, float]] | None): Optional. Resources needed by specific tests.
+        """
+        self.data_sets = data_sets or []
+        self.skippable_tests = skippable_tests or {}
+        self.tests_with_deps = tests_with_deps or {}
+        self.test_timeouts = test_timeouts or {}
+        self.test_resources = test_resources or {}
+
+    def __eq__(self, other: object) -> bool:
+        """
+        ### Checks if two configurations have the same content.
+
+        #### Params:
+        - other (object): Object to compare with.
+
+        #### Returns:
+        - (bool): True if both are configurations with the same content, False otherwise.
+        """
+        return isinstance(other, TestConfig) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None
+
+
+def get_test_config(
+    file_path: str, cache_dir: str | None = None, profiles: list[str] | None = None
+) -> TestConfig:
     """
-    ### Returns a list with the necessary datasets for the tests, as well as an object with the different tests, the situations where to skip them, and the dependencies between tests.
+    ### Returns the validated test configuration: the necessary datasets for the tests, the different tests, the situations where to skip them, the dependencies between tests, their timeouts, and the resources they need.
+
+    The files listed under the include key are merged first, followed by the file itself and the selected profiles,
+    in order. Lists are appended without repeating elements, objects are merged key by key, and other values
+    are replaced. When a cache directory is given, the resulting configuration is kept there along with the
+    modification time, size, and content hash of every file it was composed from. If the modification times
+    and sizes match, no file is read. Any mistake in a file stops the execution, listing where it is.
 
     #### Params:
     - file_path (str): Path to the test data json file.
+    - cache_dir (str | None): Optional. Path to the cache directory.
+    - profiles (list[str] | None): Optional. Names of the profiles applied on top of the file.
 
     #### Returns:
-    - (tuple[list[str], dict, dict]): Tuple containing the list of
-    datasets to download, skippable tests, and dependencies between tests.
+    - (TestConfig): Validated test configuration.
     """
     if not file_path:
         logger(logger.yellow("No skippable tests file provided, running all."))
-        return [], {}, {}
+        return TestConfig()
     try:
-        with open(file_path, encoding="utf-8") as file:
-            data_file = json.load(file)
-            return (
-                data_file.get(test_data_keys.DATASETS_KEY, []),
-                data_file.get(test_data_keys.SKIPPABLE_TESTS_KEY, {}),
-                data_file.get(test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY, {}),
+        return __load_test_config(file_path, cache_dir, profiles or [])
+    except FileNotFoundError as e:
+        logger.log_error(f"ERROR: File '{e.filename or file_path}' does not exist.")
+    except IsADirectoryError as e:
+        logger.log_error(
+            f"ERROR: Path '{e.filename or file_path}' provided is a directory."
+        )
+    except PermissionError as e:
+        logger.log_error(
+            f"ERROR: Permission denied to open file '{e.filename or file_path}'."
+        )
+    except Exception as e:  # noqa: BLE001
+        logger.log_error(f"An unexpected error occurred:\n{e}")
+
+
+def __load_test_config(
+    file_path: str, cache_dir: str | None, profiles: list[str]
+) -> TestConfig:
+    """
+    ### Returns the validated test configuration, from the cache if none of its files changed.
+
+    #### Params:
+    - file_path (str): Path to the test data json file.
+    - cache_dir (str | None): Path to the cache directory.
+    - profiles (list[str]): Names of the profiles applied on top of the file.
+
+    #### Returns:
+    - (TestConfig): Validated test configuration.
+    """
+    cache_file = (
+        os.path.join(cache_dir, __CONFIG_CACHE_FILE_NAME) if cache_dir else None
+    )
+    cache = __get_config_cache(cache_file)
+    cache_key = json.dumps([os.path.realpath(file_path), *profiles])
+    entry = cache.get(cache_key, {})
+    cached_files = entry.get(__FILES_KEY, {})
+    if cached_files and all(
+        __get_file_stat(path) == stamp[:2] for path, stamp in cached_files.items()
+    ):
+        return TestConfig(*entry[__CONFIG_KEY])
+    file_stamps = __get_file_stamps(list(cached_files))
+    if not file_stamps or any(
+        file_stamps[path][2] != stamp[2] for path, stamp in cached_files.items()
+    ):
+        file_stamps = {}
+        data = __read_config_file(file_path, file_stamps, ())
+        entry = {
+            __CONFIG_KEY: __get_normalized_config(
+                __apply_profiles(data, profiles, file_path)
             )
-    except FileNotFoundError:
-        logger.log_error(f"ERROR: File '{file_path}' does not exist.")
-    except IsADirectoryError:
-        logger.log_error(f"ERROR: Path '{file_path}' provided is a directory.")
-    except PermissionError:
-        logger.log_error(f"ERROR: Permission denied to open file '{file_path}'.")
+        }
+    if cache_file:
+        cache[cache_key] = {**entry, __FILES_KEY: file_stamps}
+        __record_config_cache(cache_file, cache)
+    return TestConfig(*entry[__CONFIG_KEY])
+
+
+def __read_config_file(
+    file_path: str, file_stamps: dict[str, list], include_chain: tuple[str, ...]
+) -> dict:
+    """
+    ### Reads and validates a test data json file, merged with the files it includes.
+
+    #### Params:
+    - file_path (str): Path to the test data json file.
+    - file_stamps (dict[str, list]): Dictionary where the modification time, size and content hash of each read file are added.
+    - include_chain (tuple[str, ...]): Real paths of the files including this one.
+
+    #### Returns:
+    - (dict): Content of the file merged with the files it includes, without the include key.
+    """
+    real_path = os.path.realpath(file_path)
+    if real_path in include_chain:
+        logger.log_error(
+            f"ERROR: Circular include in file '{file_path}': "
+            + " -> ".join([*include_chain, real_path])
+        )
+    stat = os.stat(file_path)
+    with open(file_path, "rb") as file:
+        content = file.read()
+    file_stamps[real_path] = [
+        stat.st_mtime_ns,
+        stat.st_size,
+        hashlib.sha256(content).hexdigest(),
+    ]
+    try:
+        data = json.loads(content)
     except json.JSONDecodeError as e:
         logger.log_error(f"ERROR: Invalid JSON format in file '{file_path}':\n{e}")
-    except Exception as e:  # noqa: BLE001
-        logger.log_error(f"An unexpected error occurred:\n{e}")
+    errors = __get_config_errors(data)
+    if errors:
+        logger.log_error(
+            f"ERROR: Invalid test configuration in file '{file_path}':\n"
+            + "\n".join(f"  - {error}" for error in errors)
+        )
+    merged_data = {}
+    for include in data.get(test_data_keys.INCLUDE_KEY, []):
+        merged_data = __merge_config_data(
+            merged_data,
+            __read_config_file(
+                os.path.join(os.path.dirname(file_path), include),
+                file_stamps,
+                (*include_chain, real_path),
+            ),
+        )
+    return __merge_config_data(
+        merged_data,
+        {
+            key: value
+            for key, value in data.items()
+            if key != test_data_keys.INCLUDE_KEY
+        },
+    )
+
+
+def __apply_profiles(data: dict, profiles: list[str], file_path: str) -> dict:
+    """
+    ### Merges the given profiles, in order, on top of the configuration.
+
+    #### Params:
+    - data (dict): Validated configuration, with the profiles of every file.
+    - profiles (list[str]): Names of the profiles to apply.
+    - file_path (str): Path to the test data json file.
+
+    #### Returns:
+    - (dict): Configuration with the profiles applied, without the profiles key.
+    """
+    defined_profiles = data.get(test_data_keys.PROFILES_KEY, {})
+    data = {
+        key: value for key, value in data.items() if key != test_data_keys.PROFILES_KEY
+    }
+    for profile in profiles:
+        if profile not in defined_profiles:
+            available = ", ".join(defined_profiles) or "none"
+            logger.log_error(
+                f"ERROR: Profile '{profile}' is not defined in file '{file_path}' or the files it includes. Available profiles: {available}."
+            )
+        data = __merge_config_data(data, defined_profiles[profile])
+    return data
+
+
+def __merge_config_data(base: dict, overlay: dict) -> dict:
+    """
+    ### Merges a configuration on top of another one.
+
+    Lists are appended without repeating elements, objects are merged key by key, and other values are replaced.
+
+    #### Params:
+    - base (dict): Configuration merged first.
+    - overlay (dict): Configuration merged on top.
+
+    #### Returns:
+    - (dict): Merged configuration.
+    """
+    merged_data = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged_data.get(key), dict):
+            merged_data[key] = __merge_config_data(merged_data[key], value)
+        elif isinstance(value, list) and isinstance(merged_data.get(key), list):
+            merged_data[key] = list(
+                {
+                    json.dumps(item, sort_keys=True): item
+                    for item in [*merged_data[key], *value]
+                }.values()
+            )
+        else:
+            merged_data[key] = value
+    return merged_data
+
+
+def __get_file_stat(file_path: str) -> list[int] | None:
+    """
+    ### Returns the modification time and size of a file.
+
+    #### Params:
+    - file_path (str): Path to the file.
+
+    #### Returns:
+    - (list[int] | None): Modification time in nanoseconds and size in bytes, or None if the file cannot be accessed.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def __get_file_stamps(file_paths: list[str]) -> dict[str, list] | None:
+    """
+    ### Returns the modification time, size and content hash of the given files.
+
+    #### Params:
+    - file_paths (list[str]): Paths to the files.
+
+    #### Returns:
+    - (dict[str, list] | None): Stamp of each file, or None if any of them cannot be read.
+    """
+    file_stamps = {}
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+            with open(file_path, "rb") as file:
+                content_hash = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            return None
+        file_stamps[file_path] = [stat.st_mtime_ns, stat.st_size, content_hash]
+    return file_stamps
+
+
+def __get_config_cache(cache_file: str | None) -> dict:
+    """
+    ### Returns the cached configurations, keyed by the real path of their file and their profiles.
+
+    #### Params:
+    - cache_file (str | None): Path to the JSON configuration cache file.
+
+    #### Returns:
+    - (dict): Cached configurations. Empty if there is no valid cache.
+    """
+    if not cache_file:
+        return {}
+    try:
+        with open(cache_file, encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return {
+        key: entry
+        for key, entry in cache.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get(__CONFIG_KEY), list)
+        and isinstance(entry.get(__FILES_KEY), dict)
+        and all(
+            isinstance(stamp, list) and len(stamp) == __STAMP_SIZE
+            for stamp in entry[__FILES_KEY].values()
+        )
+    }
+
+
+def __record_config_cache(cache_file: str, cache: dict):
+    """
+    ### Overwrites the configuration cache. A cache that cannot be written is left as it is.
+
+    #### Params:
+    - cache_file (str): Path to the JSON configuration cache file.
+    - cache (dict): Cached configurations, keyed by the real path of their file and their profiles.
+    """
+    tmp_file = f"{cache_file}.tmp"
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+        os.replace(tmp_file, cache_file)
+
+
+def __get_normalized_config(data: dict) -> list:
+    """
+    ### Returns the fields of a validated configuration, with the default values of the missing keys.
+
+    #### Params:
+    - data (dict): Validated content of the test data json file.
+
+    #### Returns:
+    - (list): Datasets, skippable tests, dependencies between tests, timeouts, and resources, as expected by TestConfig.
+    """
+    skippable_tests = data.get(test_data_keys.SKIPPABLE_TESTS_KEY, {})
+    return [
+        data.get(test_data_keys.DATASETS_KEY, []),
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: skippable_tests.get(
+                test_data_keys.SKIPPABLE_GPU_KEY, []
+            ),
+            test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+                {
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: dependency[
+                        test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY
+                    ],
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY: dependency.get(
+                        test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY
+                    ),
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY: dependency.get(
+                        test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY, True
+                    ),
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: dependency.get(
+                        test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, []
+                    ),
+                }
+                for dependency in skippable_tests.get(
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, []
+                )
+            ],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [
+                {
+                    test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: other_test[
+                        test_data_keys.SKIPPABLE_OTHERS_TEST_KEY
+                    ],
+                    test_data_keys.SKIPPABLE_OTHERS_REASON_KEY: other_test.get(
+                        test_data_keys.SKIPPABLE_OTHERS_REASON_KEY
+                    ),
+                }
+                for other_test in skippable_tests.get(
+                    test_data_keys.SKIPPABLE_OTHERS_KEY, []
+                )
+            ],
+        },
+        data.get(test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY, {}),
+        {
+            test: float(timeout)
+            for test, timeout in data.get(test_data_keys.TIMEOUTS_KEY, {}).items()
+        },
+        {
+            test: {
+                key: float(resources.get(key, default))
+                for key, default in __RESOURCE_DEFAULTS.items()
+            }
+            for test, resources in data.get(test_data_keys.RESOURCES_KEY, {}).items()
+        },
+    ]
+
+
+def __get_config_errors(data: object, prefix: str = "") -> list[str]:
+    """
+    ### Returns every mistake found in the content of a test data json file.
+
+    #### Params:
+    - data (object): Content of the test data json file.
+    - prefix (str): Optional. Location of the content in the file, if it is a profile.
+
+    #### Returns:
+    - (list[str]): Description of each mistake, starting with the location where it was found.
+    """
+    errors = []
+    if not __check_keys(
+        data,
+        __PROFILE_KEYS if prefix else __TOP_LEVEL_KEYS,
+        prefix.rstrip(".") or "configuration",
+        errors,
+    ):
+        return errors
+    __check_string_list(
+        data.get(test_data_keys.DATASETS_KEY, []),
+        f"{prefix}{test_data_keys.DATASETS_KEY}",
+        errors,
+    )
+    skippable_tests = data.get(test_data_keys.SKIPPABLE_TESTS_KEY, {})
+    skippable_path = f"{prefix}{test_data_keys.SKIPPABLE_TESTS_KEY}"
+    if __check_keys(skippable_tests, __SKIPPABLE_KEYS, skippable_path, errors):
+        __check_string_list(
+            skippable_tests.get(test_data_keys.SKIPPABLE_GPU_KEY, []),
+            f"{skippable_path}.{test_data_keys.SKIPPABLE_GPU_KEY}",
+            errors,
+            are_tests=True,
+        )
+        __check_dependencies(
+            skippable_tests.get(test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, []),
+            f"{skippable_path}.{test_data_keys.SKIPPABLE_DEPENDENCIES_KEY}",
+            errors,
+        )
+        __check_other_tests(
+            skippable_tests.get(test_data_keys.SKIPPABLE_OTHERS_KEY, []),
+            f"{skippable_path}.{test_data_keys.SKIPPABLE_OTHERS_KEY}",
+            errors,
+        )
+    tests_with_deps = data.get(test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY, {})
+    deps_path = f"{prefix}{test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY}"
+    if __check_type(tests_with_deps, dict, deps_path, errors):
+        for test, deps in tests_with_deps.items():
+            __check_string_list(deps, f"{deps_path}.{test}", errors)
+    test_timeouts = data.get(test_data_keys.TIMEOUTS_KEY, {})
+    timeouts_path = f"{prefix}{test_data_keys.TIMEOUTS_KEY}"
+    if __check_type(test_timeouts, dict, timeouts_path, errors):
+        for test, timeout in test_timeouts.items():
+            if (
+                isinstance(timeout, bool)
+                or not isinstance(timeout, (int, float))
+                or timeout <= 0
+            ):
+                errors.append(
+                    f"{timeouts_path}.{test}: expected a positive number of seconds, got {json.dumps(timeout)}."
+                )
+    __check_resources(
+        data.get(test_data_keys.RESOURCES_KEY, {}),
+        f"{prefix}{test_data_keys.RESOURCES_KEY}",
+        errors,
+    )
+    if prefix:
+        return errors
+    __check_string_list(
+        data.get(test_data_keys.INCLUDE_KEY, []), test_data_keys.INCLUDE_KEY, errors
+    )
+    profiles = data.get(test_data_keys.PROFILES_KEY, {})
+    if __check_type(profiles, dict, test_data_keys.PROFILES_KEY, errors):
+        for profile, profile_data in profiles.items():
+            errors.extend(
+                __get_config_errors(
+                    profile_data, f"{test_data_keys.PROFILES_KEY}.{profile}."
+                )
+            )
+    return errors
+
+
+def __check_dependencies(dependencies: object, path: str, errors: list[str]):
+    """
+    ### Adds the mistakes found in the dependency-based skippable tests.
+
+    #### Params:
+    - dependencies (object): Dependency-based tests of the file.
+    - path (str): Location of the dependency-based tests in the file.
+    - errors (list[str]): List where mistakes are added.
+    """
+    if not __check_type(dependencies, list, path, errors):
+        return
+    for index, dependency in enumerate(dependencies):
+        dependency_path = f"{path}[{index}]"
+        if not __check_keys(dependency, __DEPENDENCY_KEYS, dependency_path, errors):
+            continue
+        __check_string(
+            dependency,
+            test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY,
+            dependency_path,
+            errors,
+        )
+        __check_string(
+            dependency,
+            test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY,
+            dependency_path,
+            errors,
+            required=False,
+        )
+        if test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY in dependency:
+            __check_type(
+                dependency[test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY],
+                bool,
+                f"{dependency_path}.{test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY}",
+                errors,
+            )
+        __check_string_list(
+            dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, []),
+            f"{dependency_path}.{test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY}",
+            errors,
+            are_tests=True,
+        )
+
+
+def __check_other_tests(other_tests: object, path: str, errors: list[str]):
+    """
+    ### Adds the mistakes found in the other skippable tests.
+
+    #### Params:
+    - other_tests (object): Other tests of the file.
+    - path (str): Location of the other tests in the file.
+    - errors (list[str]): List where mistakes are added.
+    """
+    if not __check_type(other_tests, list, path, errors):
+        return
+    for index, other_test in enumerate(other_tests):
+        other_test_path = f"{path}[{index}]"
+        if not __check_keys(other_test, __OTHER_TEST_KEYS, other_test_path, errors):
+            continue
+        if __check_string(
+            other_test,
+            test_data_keys.SKIPPABLE_OTHERS_TEST_KEY,
+            other_test_path,
+            errors,
+        ):
+            __check_pattern(
+                other_test[test_data_keys.SKIPPABLE_OTHERS_TEST_KEY],
+                f"{other_test_path}.{test_data_keys.SKIPPABLE_OTHERS_TEST_KEY}",
+                errors,
+            )
+        __check_string(
+            other_test,
+            test_data_keys.SKIPPABLE_OTHERS_REASON_KEY,
+            other_test_path,
+            errors,
+            required=False,
+        )
+
+
+def __check_resources(test_resources: object, path: str, errors: list[str]):
+    """
+    ### Adds the mistakes found in the resources needed by specific tests.
+
+    #### Params:
+    - test_resources (object): Resources needed by specific tests of the file.
+    - path (str): Location of the resources in the file.
+    - errors (list[str]): List where mistakes are added.
+    """
+    if not __check_type(test_resources, dict, path, errors):
+        return
+    for test, resources in test_resources.items():
+        resources_path = f"{path}.{test}"
+        if not __check_keys(
+            resources, tuple(__RESOURCE_DEFAULTS), resources_path, errors
+        ):
+            continue
+        for key, default in __RESOURCE_DEFAULTS.items():
+            amount = resources.get(key, default)
+            if (
+                isinstance(amount, bool)
+                or not isinstance(amount, (int, float))
+                or amount < 0
+                or (key == test_data_keys.RESOURCES_CPUS_KEY and amount == 0)
+            ):
+                errors.append(
+                    f"{resources_path}.{key}: expected a {'positive' if key == test_data_keys.RESOURCES_CPUS_KEY else 'non-negative'} number, got {json.dumps(amount)}."
+                )
+
+
+def __check_keys(
+    value: object, allowed_keys: tuple[str, ...], path: str, errors: list[str]
+) -> bool:
+    """
+    ### Checks that the given value is an object without unknown keys.
+
+    #### Params:
+    - value (object): Value to check.
+    - allowed_keys (tuple[str, ...]): Keys the object can have.
+    - path (str): Location of the value in the file.
+    - errors (list[str]): List where mistakes are added.
+
+    #### Returns:
+    - (bool): True if the value is an object, even with unknown keys, False otherwise.
+    """
+    if not __check_type(value, dict, path, errors):
+        return False
+    for key in value:
+        if key not in allowed_keys:
+            suggestions = difflib.get_close_matches(key, allowed_keys, n=1)
+            suggestion = f" Did you mean '{suggestions[0]}'?" if suggestions else ""
+            errors.append(f"{path}: unknown key '{key}'.{suggestion}")
+    return True
+
+
+def __check_string(
+    value: dict, key: str, path: str, errors: list[str], required: bool = True
+) -> bool:
+    """
+    ### Checks that the given key of an object holds a string.
+
+    #### Params:
+    - value (dict): Object holding the key.
+    - key (str): Key to check.
+    - path (str): Location of the object in the file.
+    - errors (list[str]): List where mistakes are added.
+    - required (bool): Optional. If True, the key must be present.
+
+    #### Returns:
+    - (bool): True if the key holds a string, False otherwise.
+    """
+    if key not in value:
+        if required:
+            errors.append(f"{path}: missing required key '{key}'.")
+        return False
+    return __check_type(value[key], str, f"{path}.{key}", errors)
+
+
+def __check_string_list(
+    value: object, path: str, errors: list[str], are_tests: bool = False
+):
+    """
+    ### Checks that the given value is a list of strings.
+
+    #### Params:
+    - value (object): Value to check.
+    - path (str): Location of the value in the file.
+    - errors (list[str]): List where mistakes are added.
+    - are_tests (bool): Optional. If True, the strings are test entries that can be patterns.
+    """
+    if not __check_type(value, list, path, errors):
+        return
+    for index, item in enumerate(value):
+        if __check_type(item, str, f"{path}[{index}]", errors) and are_tests:
+            __check_pattern(item, f"{path}[{index}]", errors)
+
+
+def __check_pattern(entry: str, path: str, errors: list[str]):
+    """
+    ### Checks that a test entry is a usable regular expression, if it is one.
+
+    #### Params:
+    - entry (str): Test entry.
+    - path (str): Location of the entry in the file.
+    - errors (list[str]): List where mistakes are added.
+    """
+    error = test_matcher.get_pattern_error(entry)
+    if error:
+        errors.append(f"{path}: {error}.")
+
+
+def __check_type(
+    value: object, expected_type: type, path: str, errors: list[str]
+) -> bool:
+    """
+    ### Checks that the given value has the expected JSON type.
+
+    #### Params:
+    - value (object): Value to check.
+    - expected_type (type): Python type the JSON value must be loaded as.
+    - path (str): Location of the value in the file.
+    - errors (list[str]): List where mistakes are added.
+
+    #### Returns:
+    - (bool): True if the value has the expected type, False otherwise.
+    """
+    if isinstance(value, expected_type):
+        return True
+    errors.append(
+        f"{path}: expected {__JSON_TYPE_NAMES[expected_type]}, got {__get_json_type_name(value)}."
+    )
+    return False
+
+
+def __get_json_type_name(value: object) -> str:
+    """
+    ### Returns the name of the JSON type of the given value.
+
+    #### Params:
+    - value (object): Value loaded from JSON.
+
+    #### Returns:
+    - (str): Name of its JSON type.
+    """
+    return __JSON_TYPE_NAMES.get(type(value), type(value).__name__)
@@ -3,6 +3,10 @@
 DATASETS_KEY = "datasets"
 SKIPPABLE_TESTS_KEY = "skippable"
 TEST_INTERNAL_DEPENDENCIES_KEY = "test-dependencies"
+TIMEOUTS_KEY = "timeouts"
+RESOURCES_KEY = "resources"
+INCLUDE_KEY = "include"
+PROFILES_KEY = "profiles"
 
 SKIPPABLE_GPU_KEY = "gpu"
 SKIPPABLE_DEPENDENCIES_KEY = "dependencies"
@@ -15,3 +19,7 @@ SKIPPABLE_DEPENDENCIES_TESTS_KEY = "tests"
 
 SKIPPABLE_OTHERS_TEST_KEY = "test"
 SKIPPABLE_OTHERS_REASON_KEY = "reason"
+
+RESOURCES_CPUS_KEY = "cpus"
+RESOURCES_MEMORY_KEY = "memory"
+RESOURCES_GPUS_KEY = "gpus"
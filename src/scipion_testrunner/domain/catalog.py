@@ -0,0 +1,194 @@
+"""### Ordered catalog holding the state of every test of a run."""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+PENDING_STATUS = "pending"
+PASSED_STATUS = "passed"
+FAILED_STATUS = "failed"
+SKIPPED_STATUS = "skipped"
+REMOVED_STATUS = "removed"
+
+
+class TestRecord:
+    """
+    ### State of a single test along the run.
+
+    #### Attributes:
+    - name (str): Full name of the test, such as file.Class.
+    - module (str): Module the test belongs to.
+    - class_name (str): Name of the test class.
+    - status (str): One of the status constants of this module.
+    - skip_reason (str | None): Reason why the test was removed or skipped, if it was.
+    - deps (tuple[str, ...]): Tests that have to finish before this one starts.
+    - duration (float | None): Measured duration in seconds, if it is known.
+    """
+
+    __test__ = False
+    __slots__ = (
+        "class_name",
+        "deps",
+        "duration",
+        "module",
+        "name",
+        "skip_reason",
+        "status",
+    )
+
+    def __init__(self, name: str, deps: tuple[str, ...] = ()):
+        """
+        ### Constructor.
+
+        #### Params:
+        - name (str): Full name of the test, such as file.Class.
+        - deps (tuple[str, ...]): Optional. Tests that have to finish before this one starts.
+        """
+        self.name = name
+        self.module, _, self.class_name = name.rpartition(".")
+        self.status = PENDING_STATUS
+        self.skip_reason = None
+        self.deps = deps
+        self.duration = None
+
+
+class TestCatalog:
+    """
+    ### Keeps the tests of a run in discovery order with constant-time membership and removal.
+
+    Removed tests keep their record, so the reason they were removed is not lost,
+    but they are no longer part of the catalog when iterating or checking membership.
+    """
+
+    __test__ = False
+    __slots__ = ("__n_removed", "__records")
+
+    def __init__(
+        self, tests: list[str], tests_with_deps: dict[str, list[str]] | None = None
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - tests (list[str]): Tests of the run, in order. Repeated tests are only kept once.
+        - tests_with_deps (dict[str, list[str]]): Optional. Dictionary containing tests with their dependencies.
+        """
+        tests_with_deps = tests_with_deps or {}
+        self.__records = {
+            test: TestRecord(test, tuple(tests_with_deps.get(test, ())))
+            for test in tests
+        }
+        self.__n_removed = 0
+
+    def __contains__(self, test: str) -> bool:
+        """
+        ### Checks if the given test is in the catalog and was not removed.
+
+        #### Params:
+        - test (str): Name of the test.
+
+        #### Returns:
+        - (bool): True if the test is part of the run, False otherwise.
+        """
+        record = self.__records.get(test)
+        return record is not None and record.status != REMOVED_STATUS
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        ### Iterates over the tests that were not removed, in order.
+
+        #### Returns:
+        - (Iterator[str]): Names of the tests.
+        """
+        return (
+            test
+            for test, record in self.__records.items()
+            if record.status != REMOVED_STATUS
+        )
+
+    def __len__(self) -> int:
+        """
+        ### Returns the number of tests that were not removed.
+
+        #### Returns:
+        - (int): Number of tests.
+        """
+        return len(self.__records) - self.__n_removed
+
+    def get_tests(self) -> list[str]:
+        """
+        ### Returns the tests that were not removed, in order.
+
+        #### Returns:
+        - (list[str]): Names of the tests.
+        """
+        return list(self)
+
+    def get_record(self, test: str) -> TestRecord | None:
+        """
+        ### Returns the record of the given test, even if it was removed.
+
+        #### Params:
+        - test (str): Name of the test.
+
+        #### Returns:
+        - (TestRecord | None): Record of the test, or None if it was never in the catalog.
+        """
+        return self.__records.get(test)
+
+    def remove(self, test: str, reason: str | None = None) -> bool:
+        """
+        ### Removes the given test from the run before it starts.
+
+        #### Params:
+        - test (str): Name of the test.
+        - reason (str | None): Optional. Reason why the test is removed.
+
+        #### Returns:
+        - (bool): True if the test was part of the run, False otherwise.
+        """
+        if test not in self:
+            return False
+        record = self.__records[test]
+        record.status = REMOVED_STATUS
+        record.skip_reason = reason
+        self.__n_removed += 1
+        return True
+
+    def set_results(
+        self,
+        failed_tests: list[str],
+        skipped_tests: list[str],
+        durations: dict[str, float] | None = None,
+    ):
+        """
+        ### Records the outcome of every test that was not removed.
+
+        Tests neither failed nor skipped are considered passed.
+
+        #### Params:
+        - failed_tests (list[str]): Names of the tests that failed.
+        - skipped_tests (list[str]): Names of the tests that were skipped during the run.
+        - durations (dict[str, float] | None): Optional. Measured duration in seconds of each test.
+        """
+        failed_tests = set(failed_tests)
+        skipped_tests = set(skipped_tests)
+        durations = durations or {}
+        for test in self:
+            record = self.__records[test]
+            if test in failed_tests:
+                record.status = FAILED_STATUS
+            elif test in skipped_tests:
+                record.status = SKIPPED_STATUS
+            else:
+                record.status = PASSED_STATUS
+            record.duration = durations.get(test, record.duration)
+
+    def get_records(self) -> list[TestRecord]:
+        """
+        ### Returns the records of the tests that were not removed, in order.
+
+        #### Returns:
+        - (list[TestRecord]): Records of the tests.
+        """
+        return [self.__records[test] for test in self]
@@ -0,0 +1,263 @@
+"""### Hands out the tests of a plugin to remote workers and gathers their results."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from typing import TYPE_CHECKING, BinaryIO
+
+from scipion_testrunner.application.logger import logger
+from scipion_testrunner.domain.handlers import socket_handler
+
+if TYPE_CHECKING:
+    from scipion_testrunner.domain.run_options import RunOptions
+    from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+TYPE_KEY = "type"
+PLUGIN_KEY = "plugin"
+DATASETS_KEY = "datasets"
+TEST_KEY = "test"
+FAILED_KEY = "failed"
+OUTPUT_KEY = "output"
+WORKER_KEY = "worker"
+MESSAGE_KEY = "message"
+TIMEOUT_KEY = "timeout"
+
+HELLO_TYPE = "hello"
+WELCOME_TYPE = "welcome"
+ERROR_TYPE = "error"
+NEXT_TYPE = "next"
+TEST_TYPE = "test"
+RESULT_TYPE = "result"
+DONE_TYPE = "done"
+CANCEL_TYPE = "cancel"
+
+
+class Coordinator:
+    """
+    ### Serves the tests of a scheduler to the workers that ask for them.
+
+    Workers pull one test at a time per slot, so faster workers naturally take more tests.
+    If a worker disconnects while running a test, the test goes back to the ready queue.
+    When failing fast, the run ends at the first failure without waiting for the tests still running on workers,
+    which are told to stop them.
+    """
+
+    def __init__(
+        self,
+        scheduler: DependencyScheduler,
+        plugin_module: str,
+        datasets: list[str],
+        options: RunOptions | None = None,
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - scheduler (DependencyScheduler): Scheduler containing the tests to run.
+        - plugin_module (str): Module name of the plugin to run tests for.
+        - datasets (list[str]): Datasets every worker needs to download before running tests.
+        - options (RunOptions | None): Optional. Options sent to the workers along with each test, such as its timeout.
+        """
+        self.__scheduler = scheduler
+        self.__plugin_module = plugin_module
+        self.__datasets = datasets
+        self.__options = options
+        self.__condition = threading.Condition()
+        self.__failed_tests = []
+        self.__running_streams = {}
+
+    def serve(self, address: str) -> list[str]:
+        """
+        ### Serves all the tests on the given address until every one of them has finished.
+
+        #### Params:
+        - address (str): Address with format HOST:PORT, or unix:PATH for a Unix socket.
+
+        #### Returns:
+        - (list[str]): Names of the tests that failed.
+        """
+        server = socket_handler.create_server(address)
+        n_tests = self.__scheduler.get_test_count()
+        logger(
+            logger.blue(
+                f"Serving a total of {n_tests} test{'s' if n_tests > 1 else ''} for {self.__plugin_module} on {address}. Waiting for workers..."
+            )
+        )
+        threading.Thread(
+            target=self.__accept_workers, args=(server,), daemon=True
+        ).start()
+        with self.__condition:
+            self.__condition.wait_for(self.__scheduler.is_finished)
+        server.close()
+        return self.__failed_tests
+
+    def __accept_workers(self, server: socket.socket):
+        """
+        ### Accepts incoming worker connections until the server is closed.
+
+        #### Params:
+        - server (socket): Listening socket.
+        """
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self.__serve_worker, args=(connection,), daemon=True
+            ).start()
+
+    def __serve_worker(self, connection: socket.socket):
+        """
+        ### Answers the messages of a worker slot until there are no more tests or it disconnects.
+
+        #### Params:
+        - connection (socket): Connection with the worker slot.
+        """
+        running_test = None
+        worker_name = "unknown"
+        with connection, connection.makefile("rwb") as stream:
+            message = socket_handler.receive_message(stream)
+            if not self.__welcome_worker(stream, message):
+                return
+            worker_name = message.get(WORKER_KEY, worker_name)
+            while True:
+                message = socket_handler.receive_message(stream)
+                if message is None:
+                    break
+                if (
+                    message.get(TYPE_KEY) == RESULT_TYPE
+                    and message.get(TEST_KEY) == running_test
+                ):
+                    self.__register_result(stream, message, worker_name)
+                    running_test = None
+                elif message.get(TYPE_KEY) == NEXT_TYPE:
+                    running_test = self.__hand_out_test(stream)
+                    if running_test is None:
+                        socket_handler.send_message(stream, {TYPE_KEY: DONE_TYPE})
+                        return
+            if running_test is not None:
+                self.__requeue_test(stream, running_test, worker_name)
+
+    def __welcome_worker(self, stream: BinaryIO, message: dict | None) -> bool:
+        """
+        ### Checks the greeting of a worker and answers it.
+
+        #### Params:
+        - stream (BinaryIO): Stream of the worker connection.
+        - message (dict | None): Greeting received from the worker.
+
+        #### Returns:
+        - (bool): True if the worker can receive tests, False otherwise.
+        """
+        if not message or message.get(TYPE_KEY) != HELLO_TYPE:
+            return False
+        if message.get(PLUGIN_KEY) != self.__plugin_module:
+            socket_handler.send_message(
+                stream,
+                {
+                    TYPE_KEY: ERROR_TYPE,
+                    MESSAGE_KEY: f"Coordinator is serving tests for {self.__plugin_module}, not for {message.get(PLUGIN_KEY)}.",
+                },
+            )
+            return False
+        socket_handler.send_message(
+            stream,
+            {
+                TYPE_KEY: WELCOME_TYPE,
+                PLUGIN_KEY: self.__plugin_module,
+                DATASETS_KEY: self.__datasets,
+            },
+        )
+        return True
+
+    def __hand_out_test(self, stream: BinaryIO) -> str | None:
+        """
+        ### Waits until a test is ready to run or there is no more work, and sends the test to the worker slot.
+
+        #### Params:
+        - stream (BinaryIO): Stream of the worker connection.
+
+        #### Returns:
+        - (str | None): Name of the test sent, or None if every test has finished.
+        """
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: self.__scheduler.has_ready_tests()
+                or self.__scheduler.is_finished()
+            )
+            if self.__scheduler.is_finished():
+                return None
+            test = self.__scheduler.pop_ready_test()
+            socket_handler.send_message(
+                stream,
+                {
+                    TYPE_KEY: TEST_TYPE,
+                    TEST_KEY: test,
+                    TIMEOUT_KEY: (
+                        self.__options.get_timeout(test) if self.__options else None
+                    ),
+                },
+            )
+            self.__running_streams[stream] = test
+            return test
+
+    def __requeue_test(self, stream: BinaryIO, test: str, worker_name: str):
+        """
+        ### Puts back into the ready queue a test whose worker slot disconnected while running it.
+
+        #### Params:
+        - stream (BinaryIO): Stream of the worker connection.
+        - test (str): Name of the test.
+        - worker_name (str): Name of the worker that was running the test.
+        """
+        with self.__condition:
+            self.__running_streams.pop(stream, None)
+            if self.__scheduler.is_finished():
+                return
+            self.__scheduler.requeue_test(test)
+            self.__condition.notify_all()
+        logger.log_warning(
+            f"Worker {worker_name} disconnected while running test {test}. Queuing it again."
+        )
+
+    def __cancel_running_tests(self):
+        """
+        ### Tells every worker slot still running a test to stop it.
+
+        Must be called while holding the condition, so no other message is sent to those slots at the same time.
+        """
+        for stream in self.__running_streams:
+            socket_handler.send_message(stream, {TYPE_KEY: CANCEL_TYPE})
+        self.__running_streams.clear()
+
+    def __register_result(self, stream: BinaryIO, message: dict, worker_name: str):
+        """
+        ### Logs and stores the result of a test sent by a worker.
+
+        #### Params:
+        - stream (BinaryIO): Stream of the worker connection.
+        - message (dict): Result message.
+        - worker_name (str): Name of the worker that ran the test.
+        """
+        test = message.get(TEST_KEY)
+        if message.get(FAILED_KEY):
+            logger(
+                logger.red(
+                    f"{message.get(OUTPUT_KEY, '')}\nTest {test} failed on worker {worker_name} with above message."
+                )
+            )
+        else:
+            logger(logger.green(f"Test {test} OK on worker {worker_name}"))
+        with self.__condition:
+            self.__running_streams.pop(stream, None)
+            if self.__scheduler.is_finished():
+                return
+            if message.get(FAILED_KEY):
+                self.__failed_tests.append(test)
+            self.__scheduler.mark_finished(test, failed=bool(message.get(FAILED_KEY)))
+            if message.get(FAILED_KEY) and self.__options and self.__options.fail_fast:
+                self.__scheduler.cancel()
+                self.__cancel_running_tests()
+            self.__condition.notify_all()
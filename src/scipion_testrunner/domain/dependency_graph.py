@@ -0,0 +1,162 @@
+"""### Linear-time algorithms over the dependency graph of the tests."""
+
+from __future__ import annotations
+
+import collections
+
+
+def get_circular_dependencies(
+    tests_with_deps: dict[str, list[str]],
+) -> list[tuple[list[str], list[str]]]:
+    """
+    ### Returns the groups of tests that depend on each other, each one along with a circular path among them.
+
+    Each group is a strongly connected component of the dependency graph, so every test in it
+    is part of a circular dependency. The graph is only walked iteratively, in time linear to its size.
+
+    #### Params:
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+
+    #### Returns:
+    - (list[tuple[list[str], list[str]]]): Tests of each group, in the order of the given dictionary,
+    and a circular path starting and ending with the first of them.
+    """
+    order = {test: index for index, test in enumerate(tests_with_deps)}
+    circular_dependencies = []
+    for component in __get_strongly_connected_components(tests_with_deps):
+        if len(component) == 1 and component[0] not in tests_with_deps.get(
+            component[0], []
+        ):
+            continue
+        component.sort(key=order.__getitem__)
+        circular_dependencies.append(
+            (
+                component,
+                __get_circular_path(tests_with_deps, set(component), component[0]),
+            )
+        )
+    circular_dependencies.sort(
+        key=lambda circular_dependency: order[circular_dependency[0][0]]
+    )
+    return circular_dependencies
+
+
+def get_unmet_dependencies(
+    tests: list[str], tests_with_deps: dict[str, list[str]]
+) -> dict[str, list[str]]:
+    """
+    ### Returns the tests whose dependencies cannot be met, directly or because a test they depend on is removed.
+
+    Each removed test makes its dependents be checked once more, in time linear to the size of the graph.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+
+    #### Returns:
+    - (dict[str, list[str]]): Missing dependencies of each test that has to be removed.
+    """
+    available = set(tests)
+    dependents = collections.defaultdict(list)
+    for test, deps in tests_with_deps.items():
+        for dep in deps:
+            dependents[dep].append(test)
+    unmet_deps = {}
+    for test, deps in tests_with_deps.items():
+        missing_deps = [dep for dep in deps if dep not in available]
+        if test in unmet_deps or not missing_deps:
+            continue
+        unmet_deps[test] = missing_deps
+        removed = collections.deque([test] if test in available else [])
+        available.discard(test)
+        while removed:
+            for dependent in dependents.get(removed.popleft(), []):
+                if dependent in unmet_deps:
+                    continue
+                unmet_deps[dependent] = [
+                    dep for dep in tests_with_deps[dependent] if dep not in available
+                ]
+                if dependent in available:
+                    available.discard(dependent)
+                    removed.append(dependent)
+    return unmet_deps
+
+
+def __get_strongly_connected_components(
+    tests_with_deps: dict[str, list[str]],
+) -> list[list[str]]:
+    """
+    ### Splits the dependency graph into strongly connected components with an iterative version of Tarjan's algorithm.
+
+    #### Params:
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+
+    #### Returns:
+    - (list[list[str]]): Tests of each component. Dependencies are listed before their dependents.
+    """
+    indexes = {}
+    low_links = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root, root_deps in tests_with_deps.items():
+        if root in indexes:
+            continue
+        indexes[root] = low_links[root] = len(indexes)
+        stack.append(root)
+        on_stack.add(root)
+        to_visit = [(root, iter(root_deps))]
+        while to_visit:
+            test, deps = to_visit[-1]
+            for dep in deps:
+                if dep not in indexes:
+                    indexes[dep] = low_links[dep] = len(indexes)
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    to_visit.append((dep, iter(tests_with_deps.get(dep, []))))
+                    break
+                if dep in on_stack:
+                    low_links[test] = min(low_links[test], indexes[dep])
+            else:
+                to_visit.pop()
+                if to_visit:
+                    parent = to_visit[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[test])
+                if low_links[test] == indexes[test]:
+                    component = []
+                    while not component or component[-1] != test:
+                        component.append(stack.pop())
+                        on_stack.discard(component[-1])
+                    components.append(component)
+    return components
+
+
+def __get_circular_path(
+    tests_with_deps: dict[str, list[str]], component: set[str], root: str
+) -> list[str]:
+    """
+    ### Returns the shortest circular path from the given test back to itself with a breadth-first search.
+
+    #### Params:
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - component (set[str]): Tests of the strongly connected component the root belongs to.
+    - root (str): Test the path starts and ends with.
+
+    #### Returns:
+    - (list[str]): Circular path, with the root as first and last element.
+    """
+    parents = {root: None}
+    to_visit = collections.deque([root])
+    while root not in tests_with_deps[to_visit[0]]:
+        test = to_visit.popleft()
+        for dep in tests_with_deps[test]:
+            if dep in component and dep not in parents:
+                parents[dep] = test
+                to_visit.append(dep)
+    circular_path = [root]
+    test = to_visit[0]
+    while test is not None:
+        circular_path.append(test)
+        test = parents[test]
+    circular_path.reverse()
+    return circular_path
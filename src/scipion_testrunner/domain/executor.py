@@ -0,0 +1,265 @@
+"""### Long-lived worker pools shared by every parallel step of a run."""
+
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.pool
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from scipion_testrunner.domain.handlers import shell_handler
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    ### Counters describing how worker pools were used.
+
+    #### Attributes:
+    - pools_created (int): Number of pools started.
+    - queue_wait (float): Seconds tasks spent waiting for a free worker, added up.
+    - idle_time (float): Seconds workers spent without a task while their pool was alive, added up.
+    """
+
+    pools_created: int = 0
+    queue_wait: float = 0.0
+    idle_time: float = 0.0
+
+
+class WorkerPool:
+    """
+    ### Pool of workers reused for every task submitted to it until it is closed.
+
+    The workers are started along with the first task, so a pool that is never used costs nothing.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        use_threads: bool = False,
+        initializer: Callable | None = None,
+    ):
+        """
+        ### Constructor. The workers are not started until the first task is submitted.
+
+        #### Params:
+        - processes (int): Number of workers.
+        - use_threads (bool): Optional. If True, workers are threads instead of processes.
+        - initializer (callable): Optional. Callable each worker process runs when starting.
+        """
+        self.processes = processes
+        self.__use_threads = use_threads
+        self.__initializer = initializer
+        self.__pool = None
+        self.__lock = threading.Lock()
+        self.__pools_created = 0
+        self.__queue_wait = 0.0
+        self.__busy_time = 0.0
+        self.__alive_time = 0.0
+        self.__start_time = 0.0
+
+    def apply_async(
+        self,
+        func: Callable,
+        args: tuple,
+        callback: Callable[[Any], None],
+        error_callback: Callable[[BaseException], None],
+    ):
+        """
+        ### Runs the given function in a worker, starting the pool if needed.
+
+        #### Params:
+        - func (callable): Function to run.
+        - args (tuple): Params of the function.
+        - callback (callable): Called with the result of the function.
+        - error_callback (callable): Called with the exception raised by the function.
+        """
+        if self.__pool is None:
+            self.__pool = self.__create_pool()
+        submit_time = time.monotonic()
+        self.__pool.apply_async(
+            run_timed,
+            args=(func, *args),
+            callback=lambda result: callback(self.__record_timing(submit_time, result)),
+            error_callback=error_callback,
+        )
+
+    def close(self):
+        """### Waits for the submitted tasks to finish and stops the workers."""
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__stop_pool()
+
+    def terminate(self):
+        """### Stops the workers right away, without waiting for the submitted tasks."""
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__stop_pool()
+
+    def get_stats(self) -> PoolStats:
+        """
+        ### Returns the counters of this pool.
+
+        #### Returns:
+        - (PoolStats): Pool creation, queue wait and idle time counters.
+        """
+        alive_time = self.__alive_time
+        if self.__pool is not None:
+            alive_time += time.monotonic() - self.__start_time
+        return PoolStats(
+            pools_created=self.__pools_created,
+            queue_wait=self.__queue_wait,
+            idle_time=max(self.processes * alive_time - self.__busy_time, 0.0),
+        )
+
+    def __create_pool(self) -> multiprocessing.pool.Pool:
+        """
+        ### Starts the workers.
+
+        #### Returns:
+        - (Pool): Started pool.
+        """
+        self.__pools_created += 1
+        self.__start_time = time.monotonic()
+        if self.__use_threads:
+            return multiprocessing.pool.ThreadPool(processes=self.processes)
+        return multiprocessing.Pool(
+            processes=self.processes, initializer=self.__initializer
+        )
+
+    def __stop_pool(self):
+        """### Forgets the stopped pool, adding up how long it was alive."""
+        self.__alive_time += time.monotonic() - self.__start_time
+        self.__pool = None
+
+    def __record_timing(self, submit_time: float, timed_result: tuple) -> Any:
+        """
+        ### Adds the timing of a finished task to the counters.
+
+        #### Params:
+        - submit_time (float): Moment the task was submitted.
+        - timed_result (tuple): Moment the task started, moment it finished, and its result.
+
+        #### Returns:
+        - (Any): Result of the task.
+        """
+        start_time, end_time, result = timed_result
+        with self.__lock:
+            self.__queue_wait += max(start_time - submit_time, 0.0)
+            self.__busy_time += end_time - start_time
+        return result
+
+
+class Executor:
+    """
+    ### Keeps a pool for dataset downloads and another one for tests alive during the whole run.
+
+    Downloads wait on the network, so their pool is larger than the one running tests.
+    """
+
+    def __init__(
+        self,
+        test_jobs: int = multiprocessing.cpu_count(),
+        download_jobs: int = multiprocessing.cpu_count() * 2,
+    ):
+        """
+        ### Constructor. No worker is started until it is needed.
+
+        #### Params:
+        - test_jobs (int): Optional. Number of workers running tests.
+        - download_jobs (int): Optional. Number of workers downloading datasets.
+        """
+        self.test_jobs = test_jobs
+        self.__download_pool = WorkerPool(download_jobs)
+        self.__test_pools = {}
+
+    def get_download_pool(self) -> WorkerPool:
+        """
+        ### Returns the pool downloading datasets.
+
+        #### Returns:
+        - (WorkerPool): Download pool.
+        """
+        return self.__download_pool
+
+    def get_test_pool(self, use_threads: bool = False) -> WorkerPool:
+        """
+        ### Returns the pool running tests.
+
+        Worker processes stop the commands they are running when they are terminated.
+
+        #### Params:
+        - use_threads (bool): Optional. If True, the pool uses threads instead of processes.
+
+        #### Returns:
+        - (WorkerPool): Test pool.
+        """
+        if use_threads not in self.__test_pools:
+            self.__test_pools[use_threads] = WorkerPool(
+                self.test_jobs,
+                use_threads=use_threads,
+                initializer=(
+                    None if use_threads else shell_handler.stop_commands_on_termination
+                ),
+            )
+        return self.__test_pools[use_threads]
+
+    def close(self):
+        """### Waits for every submitted task and stops every pool."""
+        for pool in self.__get_pools():
+            pool.close()
+
+    def terminate(self):
+        """
+        ### Stops every pool right away, without waiting for the submitted tasks.
+
+        Commands run by thread workers are stopped first, since threads cannot be terminated
+        and terminating their pool would otherwise wait for them.
+        """
+        shell_handler.stop_running_commands()
+        for pool in self.__get_pools():
+            pool.terminate()
+
+    def get_stats(self) -> PoolStats:
+        """
+        ### Returns the counters of every pool added up.
+
+        #### Returns:
+        - (PoolStats): Pool creation, queue wait and idle time counters.
+        """
+        stats = [pool.get_stats() for pool in self.__get_pools()]
+        return PoolStats(
+            pools_created=sum(stat.pools_created for stat in stats),
+            queue_wait=sum(stat.queue_wait for stat in stats),
+            idle_time=sum(stat.idle_time for stat in stats),
+        )
+
+    def __get_pools(self) -> list[WorkerPool]:
+        """
+        ### Returns every pool of the executor.
+
+        #### Returns:
+        - (list[WorkerPool]): Download and test pools.
+        """
+        return [self.__download_pool, *self.__test_pools.values()]
+
+
+def run_timed(func: Callable, *args) -> tuple[float, float, Any]:
+    """
+    ### Runs the given function, also returning when it started and finished.
+
+    #### Params:
+    - func (callable): Function to run.
+    - *args (tuple): Params of the function.
+
+    #### Returns:
+    - (float): Moment the function started.
+    - (float): Moment the function finished.
+    - (Any): Result of the function.
+    """
+    start_time = time.monotonic()
+    result = func(*args)
+    return start_time, time.monotonic(), result
@@ -0,0 +1,226 @@
+"""### Runs tests by forking preloaded Scipion processes instead of starting Scipion for each one."""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+from scipion_testrunner.domain import zygote
+from scipion_testrunner.domain.handlers import shell_handler
+
+TEST_RUNNER_MODULE = "pyworkflow.apps.pw_run_tests"
+PRELOADED_MODULES = ["pyworkflow", "pwem"]
+
+
+class ForkServer:
+    """
+    ### Preloaded Scipion process that runs every requested test in a forked child.
+
+    A test crashing only takes its own child down, so tests stay as isolated as when
+    each of them starts its own Scipion process.
+    """
+
+    def __init__(self, scipion: str, plugin_module: str):
+        """
+        ### Constructor. Starts the preloaded process and waits until it is ready.
+
+        #### Params:
+        - scipion (str): Path to Scipion's executable.
+        - plugin_module (str): Module name of the plugin, preloaded along with Scipion's core modules.
+        """
+        start_time = time.monotonic()
+        self.__stderr = tempfile.TemporaryFile()  # noqa: SIM115
+        self.__process = subprocess.Popen(
+            f"{scipion} python {zygote.__file__} {TEST_RUNNER_MODULE} {' '.join([*PRELOADED_MODULES, plugin_module])}",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.__stderr,
+            shell=True,
+            env=os.environ,
+            start_new_session=True,
+        )
+        self.__is_alive = self.__wait_until_ready()
+        self.__startup_time = time.monotonic() - start_time
+        self.__n_tests = 0
+
+    def is_alive(self) -> bool:
+        """
+        ### Checks if the preloaded process can still run tests.
+
+        #### Returns:
+        - (bool): True if the process is running, False otherwise.
+        """
+        return self.__is_alive
+
+    def run_test(
+        self,
+        test: str,
+        timeout: float | None = None,
+        log_file: str | None = None,
+        tail_size: int = shell_handler.DEFAULT_TAIL_SIZE,
+    ) -> tuple[int, str]:
+        """
+        ### Runs the given test in a forked child of the preloaded process.
+
+        #### Params:
+        - test (str): Full name of the test.
+        - timeout (float | None): Optional. Maximum number of seconds the test can run for.
+        - log_file (str | None): Optional. File receiving the full output of the test.
+        - tail_size (int): Optional. Maximum number of bytes of output to return.
+
+        #### Returns:
+        - (int): Return code of the test, or shell_handler.TIMEOUT_RET_CODE if it timed out.
+        - (str): Tail of the output of the test.
+        """
+        if self.__is_alive:
+            request = {
+                zygote.TEST_KEY: test,
+                zygote.TIMEOUT_KEY: timeout,
+                zygote.LOG_FILE_KEY: log_file,
+                zygote.TAIL_SIZE_KEY: tail_size,
+            }
+            try:
+                self.__process.stdin.write((json.dumps(request) + "\n").encode())
+                self.__process.stdin.flush()
+            except OSError:
+                self.__is_alive = False
+        message = self.__receive_message() if self.__is_alive else None
+        if message is None:
+            self.__is_alive = False
+            return 1, f"{self.__get_stderr()}\nFork server exited unexpectedly."
+        self.__n_tests += 1
+        if message.get(zygote.TIMED_OUT_KEY):
+            return shell_handler.TIMEOUT_RET_CODE, message[zygote.OUTPUT_KEY]
+        return message[zygote.RET_CODE_KEY], message[zygote.OUTPUT_KEY]
+
+    def get_saved_time(self) -> float:
+        """
+        ### Returns the startup time saved by not starting a new process for each test.
+
+        #### Returns:
+        - (float): Saved time in seconds.
+        """
+        return self.__startup_time * max(self.__n_tests - 1, 0)
+
+    def close(self):
+        """### Stops the preloaded process."""
+        if self.__process.stdin:
+            self.__process.stdin.close()
+        self.__process.wait()
+        self.__stderr.close()
+
+    def terminate(self):
+        """### Terminates the preloaded process along with the test it is running, without waiting for it."""
+        try:
+            os.killpg(self.__process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def __wait_until_ready(self) -> bool:
+        """
+        ### Waits until the preloaded process has imported every module.
+
+        #### Returns:
+        - (bool): True if the process is ready, False if it exited before.
+        """
+        message = self.__receive_message()
+        return bool(message) and message.get(zygote.TYPE_KEY) == zygote.READY_TYPE
+
+    def __receive_message(self) -> dict | None:
+        """
+        ### Waits for the next JSON line message, skipping any other line printed by Scipion.
+
+        #### Returns:
+        - (dict | None): Received message, or None if the process exited.
+        """
+        for line in self.__process.stdout:
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    def __get_stderr(self) -> str:
+        """
+        ### Returns the error output of the preloaded process.
+
+        #### Returns:
+        - (str): Error output.
+        """
+        self.__stderr.seek(0)
+        return self.__stderr.read().decode(errors="replace").rstrip("\n")
+
+
+class ForkServerPool:
+    """### Keeps one fork server per thread, starting a new one whenever the previous one died."""
+
+    def __init__(self, scipion: str, plugin_module: str):
+        """
+        ### Constructor.
+
+        #### Params:
+        - scipion (str): Path to Scipion's executable.
+        - plugin_module (str): Module name of the plugin to run tests for.
+        """
+        self.__scipion = scipion
+        self.__plugin_module = plugin_module
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__servers = []
+
+    def run_test(
+        self,
+        test: str,
+        timeout: float | None = None,
+        log_file: str | None = None,
+        tail_size: int = shell_handler.DEFAULT_TAIL_SIZE,
+    ) -> tuple[int, str]:
+        """
+        ### Runs the given test in the fork server of the calling thread.
+
+        #### Params:
+        - test (str): Full name of the test.
+        - timeout (float | None): Optional. Maximum number of seconds the test can run for.
+        - log_file (str | None): Optional. File receiving the full output of the test.
+        - tail_size (int): Optional. Maximum number of bytes of output to return.
+
+        #### Returns:
+        - (int): Return code of the test, or shell_handler.TIMEOUT_RET_CODE if it timed out.
+        - (str): Tail of the output of the test.
+        """
+        server = getattr(self.__local, "server", None)
+        if server is None or not server.is_alive():
+            server = ForkServer(self.__scipion, self.__plugin_module)
+            self.__local.server = server
+            with self.__lock:
+                self.__servers.append(server)
+        return server.run_test(
+            test, timeout=timeout, log_file=log_file, tail_size=tail_size
+        )
+
+    def get_saved_time(self) -> float:
+        """
+        ### Returns the startup time saved by every fork server.
+
+        #### Returns:
+        - (float): Saved time in seconds.
+        """
+        with self.__lock:
+            return sum(server.get_saved_time() for server in self.__servers)
+
+    def terminate(self):
+        """### Terminates every fork server along with the tests they are running."""
+        with self.__lock:
+            for server in self.__servers:
+                server.terminate()
+
+    def close(self):
+        """### Stops every fork server."""
+        with self.__lock:
+            for server in self.__servers:
+                server.close()
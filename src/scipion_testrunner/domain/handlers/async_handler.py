@@ -0,0 +1,95 @@
+"""### Functions that run coroutines concurrently in a single event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+
+def run_coroutine_in_dependency_order(
+    coroutine_func: Callable[..., Awaitable],
+    *args,
+    scheduler: DependencyScheduler,
+    jobs: int = multiprocessing.cpu_count(),
+    fail_fast: bool = False,
+) -> list:
+    """
+    ### Runs the given coroutine function concurrently, starting each param as soon as the scheduler releases it.
+
+    Every coroutine runs in the same event loop, so no worker processes nor threads are needed to wait for them.
+    The coroutine can return a list to report several failures for a single param, and raising an exception
+    counts as a failure of that param. The params depending on a failed one are skipped by the scheduler.
+
+    #### Params:
+    - coroutine_func (callable): Coroutine function to run concurrently.
+    - *args (tuple): Contains the params needed by the coroutine function.
+    - scheduler (DependencyScheduler): Scheduler providing the params in a valid order.
+    - jobs (int): Maximum number of coroutines running at the same time.
+    - fail_fast (bool): Optional. If True, the remaining params are cancelled and the running coroutines too after the first failure.
+
+    #### Returns:
+    - (list): Failed commands.
+    """
+    return asyncio.run(
+        __run_in_dependency_order(
+            coroutine_func, args, scheduler=scheduler, jobs=jobs, fail_fast=fail_fast
+        )
+    )
+
+
+async def __run_in_dependency_order(
+    coroutine_func: Callable[..., Awaitable],
+    args: tuple,
+    scheduler: DependencyScheduler,
+    jobs: int,
+    fail_fast: bool,
+) -> list:
+    """
+    ### Runs the given coroutine function concurrently inside the running event loop.
+
+    #### Params:
+    - coroutine_func (callable): Coroutine function to run concurrently.
+    - args (tuple): Contains the params needed by the coroutine function.
+    - scheduler (DependencyScheduler): Scheduler providing the params in a valid order.
+    - jobs (int): Maximum number of coroutines running at the same time.
+    - fail_fast (bool): If True, the remaining params are cancelled and the running coroutines too after the first failure.
+
+    #### Returns:
+    - (list): Failed commands.
+    """
+    running = {}
+    failed_commands = []
+    while not scheduler.is_finished():
+        while len(running) < jobs and scheduler.has_ready_tests():
+            param = scheduler.pop_ready_test()
+            running[asyncio.ensure_future(coroutine_func(param, *args))] = param
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            param = running.pop(task)
+            result = param if task.exception() else task.result()
+            if isinstance(result, list):
+                failed_commands.extend(result)
+            elif result:
+                failed_commands.append(result)
+            scheduler.mark_finished(param, failed=bool(result))
+            if result and fail_fast:
+                scheduler.cancel()
+                await __cancel_tasks(list(running))
+                return failed_commands
+    return failed_commands
+
+
+async def __cancel_tasks(tasks: list[asyncio.Future]):
+    """
+    ### Cancels the given tasks and waits for them to finish their cleanup.
+
+    #### Params:
+    - tasks (list[Future]): Tasks to cancel.
+    """
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
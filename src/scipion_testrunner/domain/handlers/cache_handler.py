@@ -0,0 +1,25 @@
+"""### Functions that locate the files where data is kept between runs."""
+
+from __future__ import annotations
+
+import os
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "scipion-testrunner",
+)
+
+
+def get_cache_file_path(cache_dir: str, file_name: str) -> str:
+    """
+    ### Returns the path of the given file inside the cache directory, creating the directory if needed.
+
+    #### Params:
+    - cache_dir (str): Path to the cache directory.
+    - file_name (str): Name of the file inside the cache directory.
+
+    #### Returns:
+    - (str): Path to the cache file.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, file_name)
@@ -0,0 +1,145 @@
+"""### Functions that keep the discovered tests of a plugin between runs."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import sys
+
+from scipion_testrunner.domain.handlers import cache_handler
+
+__FINGERPRINT_KEY = "fingerprint"
+__TESTS_KEY = "tests"
+__IGNORED_DIRS = {"__pycache__", ".git"}
+
+
+def get_discovery_file_path(cache_dir: str, plugin_module: str) -> str:
+    """
+    ### Returns the path of the discovery cache file of the given plugin.
+
+    #### Params:
+    - cache_dir (str): Path to the cache directory.
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (str): Path to the JSON discovery file.
+    """
+    return cache_handler.get_cache_file_path(
+        cache_dir, f"{plugin_module}-discovery.json"
+    )
+
+
+def get_package_dir(plugin_module: str) -> str | None:
+    """
+    ### Locates the directory of the given package without importing it.
+
+    #### Params:
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (str | None): Path to the package directory, or None if it cannot be located.
+    """
+    try:
+        spec = importlib.util.find_spec(plugin_module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return next(iter(spec.submodule_search_locations), None)
+
+
+def get_fingerprint(scipion: str, plugin_module: str) -> str | None:
+    """
+    ### Returns a fingerprint that changes whenever the discovered tests could change.
+
+    It covers the path, size and modification time of every file of the plugin package,
+    the Scipion executable, and the Python version. Finding the package does not import it.
+
+    #### Params:
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (str | None): Fingerprint, or None if the sources of the plugin cannot be located.
+    """
+    package_dir = get_package_dir(plugin_module)
+    if not package_dir:
+        return None
+    fingerprint = hashlib.sha256()
+    fingerprint.update(f"{sys.version}\n".encode())
+    scipion_path = shutil.which(scipion) or scipion
+    fingerprint.update(__get_file_record(scipion_path, scipion_path).encode())
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(name for name in dirs if name not in __IGNORED_DIRS)
+        for name in sorted(files):
+            if not name.endswith(".pyc"):
+                fingerprint.update(
+                    __get_file_record(
+                        os.path.join(root, name),
+                        os.path.relpath(os.path.join(root, name), package_dir),
+                    ).encode()
+                )
+    return fingerprint.hexdigest()
+
+
+def get_cached_tests(discovery_file: str, fingerprint: str) -> list[str] | None:
+    """
+    ### Returns the tests recorded in the discovery cache, if they were discovered with the same fingerprint.
+
+    #### Params:
+    - discovery_file (str): Path to the JSON discovery file.
+    - fingerprint (str): Current fingerprint of the plugin.
+
+    #### Returns:
+    - (list[str] | None): Cached tests, or None if there is no valid cache for the fingerprint.
+    """
+    try:
+        with open(discovery_file, encoding="utf-8") as file:
+            discovery = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(discovery, dict)
+        or discovery.get(__FINGERPRINT_KEY) != fingerprint
+    ):
+        return None
+    tests = discovery.get(__TESTS_KEY)
+    if not isinstance(tests, list) or not all(isinstance(test, str) for test in tests):
+        return None
+    return tests
+
+
+def record_tests(discovery_file: str, fingerprint: str, tests: list[str]):
+    """
+    ### Overwrites the discovery cache with the given tests.
+
+    #### Params:
+    - discovery_file (str): Path to the JSON discovery file.
+    - fingerprint (str): Fingerprint of the plugin the tests were discovered with.
+    - tests (list[str]): Discovered tests.
+    """
+    tmp_file = f"{discovery_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump({__FINGERPRINT_KEY: fingerprint, __TESTS_KEY: tests}, file)
+    os.replace(tmp_file, discovery_file)
+
+
+def __get_file_record(path: str, name: str) -> str:
+    """
+    ### Returns the line that identifies the current state of a file in the fingerprint.
+
+    #### Params:
+    - path (str): Path to the file.
+    - name (str): Name of the file in the record.
+
+    #### Returns:
+    - (str): Name, size and modification time of the file.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{name}\n"
+    return f"{name}\t{stat.st_size}\t{stat.st_mtime_ns}\n"
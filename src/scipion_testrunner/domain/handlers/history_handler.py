@@ -0,0 +1,137 @@
+"""### Functions that read and write the duration history of the tests."""
+
+from __future__ import annotations
+
+import json
+import os
+
+from scipion_testrunner.domain.handlers import cache_handler
+
+__HISTORY_SIZE = 5
+__TEST_KEY = "test"
+__DURATION_KEY = "duration"
+
+
+def get_history_file_path(cache_dir: str, plugin_module: str) -> str:
+    """
+    ### Returns the path of the duration history file of the given plugin.
+
+    #### Params:
+    - cache_dir (str): Path to the cache directory.
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (str): Path to the JSON-lines history file.
+    """
+    return cache_handler.get_cache_file_path(
+        cache_dir, f"{plugin_module}-durations.jsonl"
+    )
+
+
+def get_test_durations(history_file: str, compact: bool = True) -> dict[str, float]:
+    """
+    ### Returns the expected duration of every test present in the history.
+
+    The expected duration is the mean of the most recent recorded runs.
+
+    #### Params:
+    - history_file (str): Path to the JSON-lines history file.
+    - compact (bool): Optional. If True, the file is rewritten without the old runs once it grows too big.
+
+    #### Returns:
+    - (dict[str, float]): Expected duration in seconds of each test.
+    """
+    records, n_lines = __read_records(history_file)
+    if compact and n_lines > 2 * __HISTORY_SIZE * len(records):
+        __write_records(history_file, records)
+    return {
+        test: sum(durations) / len(durations) for test, durations in records.items()
+    }
+
+
+def record_test_durations(history_file: str, durations: dict[str, float]):
+    """
+    ### Appends the given durations to the history.
+
+    #### Params:
+    - history_file (str): Path to the JSON-lines history file.
+    - durations (dict[str, float]): Measured duration in seconds of each test.
+    """
+    if not durations:
+        return
+    with open(history_file, "a", encoding="utf-8") as file:
+        file.writelines(
+            __get_record_line(test, duration) for test, duration in durations.items()
+        )
+
+
+def __read_records(history_file: str) -> tuple[dict[str, list[float]], int]:
+    """
+    ### Reads the most recent durations of every test in the history.
+
+    #### Params:
+    - history_file (str): Path to the JSON-lines history file.
+
+    #### Returns:
+    - (dict[str, list[float]]): Most recent durations of each test, oldest first.
+    - (int): Number of lines present in the history file.
+    """
+    try:
+        with open(history_file, encoding="utf-8") as file:
+            lines = file.readlines()
+    except OSError:
+        return {}, 0
+    records = {}
+    for line in lines:
+        record = __parse_record_line(line)
+        if record:
+            records.setdefault(record[0], []).append(record[1])
+    return {
+        test: durations[-__HISTORY_SIZE:] for test, durations in records.items()
+    }, len(lines)
+
+
+def __parse_record_line(line: str) -> tuple[str, float] | None:
+    """
+    ### Parses a line of the history.
+
+    #### Params:
+    - line (str): JSON line.
+
+    #### Returns:
+    - (tuple[str, float] | None): Name of the test and its duration, or None if the line is not valid.
+    """
+    try:
+        record = json.loads(line)
+        return record[__TEST_KEY], float(record[__DURATION_KEY])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def __write_records(history_file: str, records: dict[str, list[float]]):
+    """
+    ### Overwrites the history with the given records, keeping it compact.
+
+    #### Params:
+    - history_file (str): Path to the JSON-lines history file.
+    - records (dict[str, list[float]]): Durations of each test, oldest first.
+    """
+    tmp_file = f"{history_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        for test, durations in records.items():
+            file.writelines(__get_record_line(test, duration) for duration in durations)
+    os.replace(tmp_file, history_file)
+
+
+def __get_record_line(test: str, duration: float) -> str:
+    """
+    ### Returns the JSON line that records the given duration.
+
+    #### Params:
+    - test (str): Name of the test.
+    - duration (float): Duration in seconds.
+
+    #### Returns:
+    - (str): JSON line.
+    """
+    return json.dumps({__TEST_KEY: test, __DURATION_KEY: round(duration, 3)}) + "\n"
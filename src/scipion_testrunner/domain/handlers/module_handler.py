@@ -0,0 +1,189 @@
+"""### Functions that keep the results of Python module existence checks between runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+
+from scipion_testrunner.domain.handlers import cache_handler
+
+__MODULE_FILE_NAME = "python-modules.json"
+__FINGERPRINT_KEY = "fingerprint"
+__MODULES_KEY = "modules"
+__SEARCH_PATH_KEY = "searchPath"
+__PTH_EXTENSION = ".pth"
+__PATH_VARIABLE = "PYTHONPATH"
+
+
+def get_module_file_path(cache_dir: str) -> str:
+    """
+    ### Returns the path of the module existence cache file.
+
+    #### Params:
+    - cache_dir (str): Path to the cache directory.
+
+    #### Returns:
+    - (str): Path to the JSON module existence file.
+    """
+    return cache_handler.get_cache_file_path(cache_dir, __MODULE_FILE_NAME)
+
+
+def get_fingerprint(search_path: list[str]) -> str:
+    """
+    ### Returns a fingerprint that changes whenever the importable modules could change.
+
+    It covers the Python executable found in the PATH, the PYTHONPATH variable,
+    the modification time of every directory in the module search path,
+    which changes when a package is installed into or removed from it,
+    and the modification time of the .pth files in them, which extend the search path.
+
+    #### Params:
+    - search_path (list[str]): Module search path of the Python executable found in the PATH.
+
+    #### Returns:
+    - (str): Fingerprint of the Python environment.
+    """
+    fingerprint = hashlib.sha256()
+    python_path = os.path.realpath(shutil.which("python") or "python")
+    fingerprint.update(__get_path_record(python_path).encode())
+    fingerprint.update(f"{os.environ.get(__PATH_VARIABLE, '')}\n".encode())
+    for path in search_path:
+        if path and os.path.isdir(path):
+            fingerprint.update(__get_path_record(path).encode())
+            for pth_file in __get_pth_files(path):
+                fingerprint.update(__get_path_record(pth_file).encode())
+    return fingerprint.hexdigest()
+
+
+def get_cached_search_path(module_file: str) -> list[str] | None:
+    """
+    ### Returns the recorded module search path if the Python environment did not change since it was recorded.
+
+    The fingerprint of the recorded search path is compared with the recorded one,
+    so the search path can be reused without starting the Python executable.
+
+    #### Params:
+    - module_file (str): Path to the JSON module existence file.
+
+    #### Returns:
+    - (list[str] | None): Module search path of the Python executable found in the PATH, or None if there is no valid one.
+    """
+    cache = __read_cache(module_file)
+    search_path = cache.get(__SEARCH_PATH_KEY)
+    if not isinstance(search_path, list) or not all(
+        isinstance(path, str) for path in search_path
+    ):
+        return None
+    return (
+        search_path
+        if cache.get(__FINGERPRINT_KEY) == get_fingerprint(search_path)
+        else None
+    )
+
+
+def get_cached_modules(module_file: str, fingerprint: str) -> dict[str, bool]:
+    """
+    ### Returns the module existence checks recorded with the given fingerprint.
+
+    #### Params:
+    - module_file (str): Path to the JSON module existence file.
+    - fingerprint (str): Current fingerprint of the Python environment.
+
+    #### Returns:
+    - (dict[str, bool]): Whether each cached module exists. Empty if there is no valid cache for the fingerprint.
+    """
+    cache = __read_cache(module_file)
+    if cache.get(__FINGERPRINT_KEY) != fingerprint:
+        return {}
+    modules = cache.get(__MODULES_KEY)
+    if not isinstance(modules, dict) or not all(
+        isinstance(exists, bool) for exists in modules.values()
+    ):
+        return {}
+    return modules
+
+
+def record_modules(
+    module_file: str,
+    fingerprint: str,
+    modules: dict[str, bool],
+    search_path: list[str] | None = None,
+):
+    """
+    ### Overwrites the module existence cache with the given checks.
+
+    #### Params:
+    - module_file (str): Path to the JSON module existence file.
+    - fingerprint (str): Fingerprint of the Python environment the modules were checked in.
+    - modules (dict[str, bool]): Whether each module exists.
+    - search_path (list[str] | None): Optional. Module search path the fingerprint was obtained from.
+    """
+    tmp_file = f"{module_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                __FINGERPRINT_KEY: fingerprint,
+                __MODULES_KEY: modules,
+                __SEARCH_PATH_KEY: search_path,
+            },
+            file,
+        )
+    os.replace(tmp_file, module_file)
+
+
+def __read_cache(module_file: str) -> dict:
+    """
+    ### Reads the module existence cache file.
+
+    #### Params:
+    - module_file (str): Path to the JSON module existence file.
+
+    #### Returns:
+    - (dict): Content of the cache. Empty if it cannot be read.
+    """
+    try:
+        with open(module_file, encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def __get_pth_files(path: str) -> list[str]:
+    """
+    ### Returns the .pth files of a directory in the module search path.
+
+    #### Params:
+    - path (str): Path to the directory.
+
+    #### Returns:
+    - (list[str]): Sorted paths of the .pth files in the directory.
+    """
+    try:
+        file_names = os.listdir(path)
+    except OSError:
+        return []
+    return sorted(
+        os.path.join(path, file_name)
+        for file_name in file_names
+        if file_name.endswith(__PTH_EXTENSION)
+    )
+
+
+def __get_path_record(path: str) -> str:
+    """
+    ### Returns the line that identifies the current state of a path in the fingerprint.
+
+    #### Params:
+    - path (str): Path to a file or directory.
+
+    #### Returns:
+    - (str): Path and modification time of the file or directory.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{path}\n"
+    return f"{path}\t{stat.st_mtime_ns}\n"
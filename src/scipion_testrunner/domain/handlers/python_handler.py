@@ -2,11 +2,32 @@
 
 from __future__ import annotations
 
-import multiprocessing
-from typing import Callable
+import json
+import queue
+import shlex
+from typing import TYPE_CHECKING, Any, Callable
 
+from scipion_testrunner.domain.executor import run_timed
 from scipion_testrunner.domain.handlers import shell_handler
 
+__MODULE_CHECK_MARKER = "MODULE_CHECK:"
+__MODULE_CHECK_SCRIPT = f"""
+import importlib, json, sys
+modules = {{}}
+for module_name in sys.argv[1:]:
+    try:
+        importlib.import_module(module_name)
+        modules[module_name] = True
+    except BaseException:
+        modules[module_name] = False
+print("\\n{__MODULE_CHECK_MARKER}" + json.dumps(modules))
+"""
+__SEARCH_PATH_SCRIPT = "import json, sys; print(json.dumps(sys.path))"
+
+if TYPE_CHECKING:
+    from scipion_testrunner.domain.executor import WorkerPool
+    from scipion_testrunner.domain.scheduler import DependencyScheduler
+
 
 def exists_python_module(module_name: str) -> bool:
     """
@@ -21,6 +42,57 @@ def exists_python_module(module_name: str) -> bool:
     return python_command_succeeded(f"import {module_name}")
 
 
+def get_existing_python_modules(module_names: list[str]) -> dict[str, bool]:
+    """
+    ### Checks if the given Python modules exist, importing all of them in a single Python process.
+
+    If that process cannot report its results, for example because an import crashed the interpreter,
+    each module is checked in its own process instead.
+
+    #### Params:
+    - module_names (list[str]): Names of the Python modules.
+
+    #### Returns:
+    - (dict[str, bool]): True for each module that exists, False otherwise.
+    """
+    if not module_names:
+        return {}
+    ret_code, output = shell_handler.run_shell_command(
+        " ".join(
+            [
+                "python",
+                "-c",
+                shlex.quote(__MODULE_CHECK_SCRIPT),
+                *(shlex.quote(module_name) for module_name in module_names),
+            ]
+        )
+    )
+    existing_modules = __get_module_check_result(output) if not ret_code else None
+    if existing_modules is None or set(existing_modules) != set(module_names):
+        return {
+            module_name: exists_python_module(module_name)
+            for module_name in module_names
+        }
+    return existing_modules
+
+
+def get_python_search_path() -> list[str] | None:
+    """
+    ### Returns the module search path of the Python executable that checks if modules exist.
+
+    #### Returns:
+    - (list[str] | None): Entries of its sys.path, or None if they could not be obtained.
+    """
+    ret_code, output = shell_handler.run_shell_command(
+        f"python -c {shlex.quote(__SEARCH_PATH_SCRIPT)}"
+    )
+    try:
+        search_path = json.loads(output.splitlines()[-1]) if not ret_code else None
+    except (IndexError, ValueError):
+        return None
+    return search_path if isinstance(search_path, list) else None
+
+
 def python_command_succeeded(command: str) -> bool:
     """
     ### This function executes the given Python command and the status of it.
@@ -38,28 +110,119 @@ def run_function_in_parallel(
     func: Callable,
     *args,
     parallelizable_params: list[str],
-    jobs: int = multiprocessing.cpu_count(),
+    pool: WorkerPool,
+    on_result: Callable[[str, Any], None] | None = None,
 ) -> list:
     """
     ### Runs the given Python function in parallel.
 
+    Results are collected in the order the params finish, not in the order they were submitted.
+
     #### Params:
     - func (callable): Function to run in parallel.
     - *args (tuple): Contains the params needed by the function.
     - parallelizable_params (list[str]): List of main params to parallelize from.
-    - max_jobs (int): Maximum number of jobs.
+    - pool (WorkerPool): Pool running the function. It is kept alive for later work.
+    - on_result (callable): Optional. Called with each param and its result as soon as it finishes.
 
     #### Returns:
     - (list): Failed commands.
     """
-    pool = multiprocessing.Pool(processes=jobs)
-    results = [
-        pool.apply_async(func, args=(param, *args)) for param in parallelizable_params
-    ]
+    finished = queue.Queue()
+    for param in parallelizable_params:
+        pool.apply_async(
+            func,
+            args=(param, *args),
+            callback=lambda result, param=param: finished.put((param, result)),
+            error_callback=lambda _, param=param: finished.put((param, param)),
+        )
     failed_commands = []
-    for result in results:
-        if result.get():
-            failed_commands.append(result.get())
-    pool.close()
-    pool.join()
+    for _ in parallelizable_params:
+        param, result = finished.get()
+        if result:
+            failed_commands.append(result)
+        if on_result:
+            on_result(param, result)
     return failed_commands
+
+
+def run_function_in_dependency_order(
+    func: Callable,
+    *args,
+    scheduler: DependencyScheduler,
+    pool: WorkerPool,
+    jobs: int | None = None,
+    fail_fast: bool = False,
+) -> list:
+    """
+    ### Runs the given Python function in parallel, starting each param as soon as the scheduler releases it.
+
+    The function can return a list to report several failures for a single param.
+    The params depending on a failed one are skipped by the scheduler, which records how long each param
+    ran for since a worker started it, without the time it spent waiting for a free worker.
+
+    #### Params:
+    - func (callable): Function to run in parallel.
+    - *args (tuple): Contains the params needed by the function.
+    - scheduler (DependencyScheduler): Scheduler providing the params in a valid order.
+    - pool (WorkerPool): Pool running the function. It is kept alive for later work.
+    - jobs (int | None): Optional. Maximum number of params running at the same time. Defaults to the size of the pool.
+    - fail_fast (bool): Optional. If True, the remaining params are cancelled and the pool terminated after the first failure.
+
+    #### Returns:
+    - (list): Failed commands.
+    """
+    jobs = jobs or pool.processes
+    finished = queue.Queue()
+    failed_commands = []
+    n_running = 0
+    while not scheduler.is_finished():
+        while n_running < jobs and scheduler.has_ready_tests():
+            param = scheduler.pop_ready_test()
+            pool.apply_async(
+                run_timed,
+                args=(func, param, *args),
+                callback=lambda timed_result, param=param: finished.put(
+                    (param, timed_result)
+                ),
+                error_callback=lambda _, param=param: finished.put(
+                    (param, (None, None, param))
+                ),
+            )
+            n_running += 1
+        param, (start_time, end_time, result) = finished.get()
+        n_running -= 1
+        if isinstance(result, list):
+            failed_commands.extend(result)
+        elif result:
+            failed_commands.append(result)
+        scheduler.mark_finished(
+            param,
+            failed=bool(result),
+            duration=end_time - start_time if start_time is not None else None,
+        )
+        if result and fail_fast:
+            scheduler.cancel()
+            pool.terminate()
+            return failed_commands
+    return failed_commands
+
+
+def __get_module_check_result(output: str) -> dict[str, bool] | None:
+    """
+    ### Extracts the module existence checks from the output of the check script.
+
+    #### Params:
+    - output (str): Output of the check script, which can include lines printed by the imported modules.
+
+    #### Returns:
+    - (dict[str, bool] | None): Whether each module exists, or None if the output has no valid result.
+    """
+    for line in reversed(output.splitlines()):
+        if line.startswith(__MODULE_CHECK_MARKER):
+            try:
+                result = json.loads(line[len(__MODULE_CHECK_MARKER) :])
+            except ValueError:
+                return None
+            return result if isinstance(result, dict) else None
+    return None
@@ -2,25 +2,56 @@
 
 from __future__ import annotations
 
-import multiprocessing
+import functools
+import json
+import os
+import re
+import shlex
+from typing import Callable
 
 from scipion_testrunner.application.logger import logger
-from scipion_testrunner.domain.handlers import python_handler, shell_handler
-
-
-def get_all_tests(scipion: str, plugin_module: str):
+from scipion_testrunner.domain import packing
+from scipion_testrunner.domain.executor import Executor
+from scipion_testrunner.domain.fork_server import ForkServerPool
+from scipion_testrunner.domain.handlers import (
+    async_handler,
+    python_handler,
+    shell_handler,
+)
+from scipion_testrunner.domain.run_options import ASYNCIO_ENGINE, RunOptions
+from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+__LIST_METHODS_CODE = (
+    "import importlib, json, sys, unittest; "
+    "print(json.dumps({name: list(unittest.TestLoader().getTestCaseNames("
+    'getattr(importlib.import_module(name.rsplit(".", 1)[0]), name.rsplit(".", 1)[1])'
+    ")) for name in sys.argv[1:]}))"
+)
+__TEST_NAME_PATTERN = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
+
+
+def get_all_tests(
+    scipion: str,
+    plugin_module: str,
+    on_test: Callable[[str], None] | None = None,
+):
     """
     ### Finds the full list of tests from a given module.
 
+    The output of Scipion's test search is parsed line by line as it is printed,
+    so each test can be handed over before the search finishes.
+
     #### Params:
     - scipion (str): Path to Scipion's executable.
     - plugin_module (str): Module name of the plugin to obtain tests from.
+    - on_test (callable): Optional. Called with each test as soon as it is found.
 
     #### Returns:
     - (list[str]): List of available tests.
     """
-    ret_code, output = shell_handler.run_shell_command(
-        __get_scipion_test_search_param(scipion, plugin_module)
+    ret_code, output = shell_handler.run_streamed_shell_command(
+        __get_scipion_test_search_param(scipion, plugin_module),
+        functools.partial(__handle_test_search_line, plugin_module, on_test),
     )
     if ret_code:
         logger.log_error(
@@ -37,20 +68,69 @@ def get_all_tests(scipion: str, plugin_module: str):
     return test_list
 
 
-def download_datasets(scipion: str, datasets: list[str]):
+def get_test_methods(
+    scipion: str, plugin_module: str, tests: list[str]
+) -> dict[str, list[str]]:
+    """
+    ### Finds the test methods of the given test classes.
+
+    #### Params:
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to obtain tests from.
+    - tests (list[str]): Names of the test classes.
+
+    #### Returns:
+    - (dict[str, list[str]]): Test methods of each class, or an empty dictionary if they could not be listed.
+    """
+    full_names = shlex.join(f"{plugin_module}.tests.{test}" for test in tests)
+    ret_code, output = shell_handler.run_shell_command(
+        f"{scipion} python -c '{__LIST_METHODS_CODE}' {full_names}"
+    )
+    try:
+        methods = json.loads(output.splitlines()[-1]) if not ret_code else None
+    except (IndexError, json.JSONDecodeError):
+        methods = None
+    if methods is None:
+        logger.log_warning(
+            f"{output}\nCould not list the test methods of {', '.join(tests)}. They will not be split."
+        )
+        return {}
+    prefix_length = len(f"{plugin_module}.tests.")
+    return {
+        name[prefix_length:]: test_methods for name, test_methods in methods.items()
+    }
+
+
+def is_valid_test_name(test: str) -> bool:
+    """
+    ### Checks if the given test, or every test of the given pack, is named like module.Class or module.Class.method.
+
+    #### Params:
+    - test (str): Scheduled name of the test or pack.
+
+    #### Returns:
+    - (bool): True if every name is made of dot-separated Python identifiers, False otherwise.
+    """
+    return all(
+        __TEST_NAME_PATTERN.fullmatch(name) for name in packing.get_pack_tests(test)
+    )
+
+
+def download_datasets(scipion: str, datasets: list[str], executor: Executor):
     """
     ### Downloads the given list of datasets.
 
     #### Params:
     - scipion (str): Path to Scipion's executable.
     - datasets (list[str]): List of datasets to download.
+    - executor (Executor): Executor whose download pool runs the downloads.
     """
     logger(logger.blue(f"Downloading {len(datasets)} datasets..."))
     failed_downloads = python_handler.run_function_in_parallel(
         __download_dataset,
         scipion,
         parallelizable_params=datasets,
-        jobs=multiprocessing.cpu_count() * 2,
+        pool=executor.get_download_pool(),
     )
     if failed_downloads:
         logger.log_error(
@@ -60,39 +140,132 @@ def download_datasets(scipion: str, datasets: list[str]):
 
 def run_tests(
     scipion: str,
-    tests: list[str],
-    test_batches: list[list[str]],
-    max_jobs: int,
+    scheduler: DependencyScheduler,
+    executor: Executor,
     plugin_module: str,
+    options: RunOptions | None = None,
 ) -> list[str]:
     """
-    ### Runs the given tests and returns the name of the failed ones.
+    ### Runs the tests of the given scheduler and returns the name of the failed ones.
+
+    Every test is started as soon as all of its dependencies have finished,
+    so there are no barriers between groups of dependent tests.
 
     #### Params:
     - scipion (str): Path to Scipion's executable.
-    - tests (list[str]): List of tests to run.
-    - test_batches (list[list[str]]): Test batches to run in order.
-    - max_jobs (int): Maximum number of concurrent jobs.
+    - scheduler (DependencyScheduler): Scheduler containing the tests to run.
+    - executor (Executor): Executor whose test pool runs the tests. Its size is the maximum number of concurrent jobs.
     - plugin_module (str): Module name of the plugin to run tests for.
+    - options (RunOptions | None): Optional. Options that change how each test is run.
 
     #### Returns:
     - (list[str]): Names of the tests that failed.
     """
-    if test_batches:
-        logger(logger.blue("Initial run of non-dependent tests."))
-    failed_tests = __run_test_batch(tests, max_jobs, scipion, plugin_module)
-
-    n_batches = len(test_batches)
-    for batch_number in range(n_batches):
-        logger(logger.blue(f"Batch of dependent tests {batch_number + 1}/{n_batches}."))
-        failed_in_batch = __run_test_batch(
-            test_batches[batch_number], max_jobs, scipion, plugin_module
+    options = options or RunOptions()
+    n_tests = scheduler.get_test_count()
+    jobs = min(executor.test_jobs, n_tests)
+    test_number_text = f"test{'s' if n_tests > 1 else ''}"
+    jobs_text = f"process{'es' if jobs > 1 else ''}"
+    parallel_text = f" in up to {jobs} parallel {jobs_text}" if n_tests > 1 else ""
+    logger(
+        logger.blue(
+            f"Running a total of {n_tests} {test_number_text} for {plugin_module}{parallel_text}..."
         )
-        failed_tests.extend(failed_in_batch)
-
+    )
+    if options.log_dir:
+        os.makedirs(options.log_dir, exist_ok=True)
+        logger(logger.blue(f"Full output of each test goes to {options.log_dir}"))
+    if options.engine == ASYNCIO_ENGINE:
+        return async_handler.run_coroutine_in_dependency_order(
+            __run_test_async,
+            scipion,
+            plugin_module,
+            options,
+            scheduler=scheduler,
+            jobs=jobs,
+            fail_fast=options.fail_fast,
+        )
+    if not options.fork_server:
+        return python_handler.run_function_in_dependency_order(
+            __run_test,
+            scipion,
+            plugin_module,
+            options,
+            scheduler=scheduler,
+            pool=executor.get_test_pool(),
+            jobs=jobs,
+            fail_fast=options.fail_fast,
+        )
+    fork_servers = ForkServerPool(scipion, plugin_module)
+    try:
+        failed_tests = python_handler.run_function_in_dependency_order(
+            __run_test,
+            scipion,
+            plugin_module,
+            options,
+            fork_servers,
+            scheduler=scheduler,
+            pool=executor.get_test_pool(use_threads=True),
+            jobs=jobs,
+            fail_fast=options.fail_fast,
+        )
+    finally:
+        if options.fail_fast:
+            fork_servers.terminate()
+        fork_servers.close()
+    logger(
+        logger.blue(
+            f"Fork servers saved about {fork_servers.get_saved_time():.1f}s of Scipion startup time."
+        )
+    )
     return failed_tests
 
 
+def run_logged_test(
+    test: str, scipion: str, plugin_module: str, options: RunOptions | None = None
+) -> str | list[str] | None:
+    """
+    ### Runs a given test, or pack of tests, logging its result.
+
+    #### Params:
+    - test (str): Test name.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run test for.
+    - options (RunOptions | None): Optional. Options that change how the test is run.
+
+    #### Returns:
+    - (None | str | list[str]): Test name if there were any errors, or names of the failed tests for packs.
+    """
+    return __run_test(test, scipion, plugin_module, options or RunOptions())
+
+
+def run_test(
+    test: str, scipion: str, plugin_module: str, options: RunOptions | None = None
+) -> tuple[int, str]:
+    """
+    ### Runs a given test, or pack of tests, without logging anything.
+
+    The full output of the test is written to its log file, if any, as it is produced.
+
+    #### Params:
+    - test (str): Test name.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run test for.
+    - options (RunOptions | None): Optional. Options that change how the test is run, such as its timeout.
+
+    #### Returns:
+    - (int): Return code of the test, or shell_handler.TIMEOUT_RET_CODE if it timed out.
+    - (str): Tail of the output of the test.
+    """
+    options = options or RunOptions()
+    return shell_handler.run_logged_shell_command(
+        __get_test_command(test, scipion, plugin_module),
+        log_file=options.get_log_file(test),
+        timeout=options.get_timeout(test),
+        tail_size=options.output_tail_size,
+    )
+
+
 def __get_test_list_from_str(command_text: str, plugin_module: str) -> list[str]:
     """
     ### Return the list of tests given a command text.
@@ -104,16 +277,47 @@ def __get_test_list_from_str(command_text: str, plugin_module: str) -> list[str]
     #### Returns:
     - (list[str]): List of tests present in the command text.
     """
-    lines = command_text.split("\n")
     tests = []
-    leading_chars = __get_full_test_leading_chars(plugin_module)
-    for line in lines:
-        stripped_line = line.lstrip()
-        if __is_test_line(stripped_line, plugin_module):
-            tests.append(stripped_line.replace(leading_chars, ""))
+    for line in command_text.split("\n"):
+        test = __get_test_from_line(line, plugin_module)
+        if test:
+            tests.append(test)
     return tests
 
 
+def __handle_test_search_line(
+    plugin_module: str, on_test: Callable[[str], None] | None, line: str
+):
+    """
+    ### Hands over the test of a line printed by Scipion's test search, if any.
+
+    #### Params:
+    - plugin_module (str): Module name of the plugin to obtain tests from.
+    - on_test (callable | None): Called with the test of the line.
+    - line (str): Line printed by the test search.
+    """
+    test = __get_test_from_line(line, plugin_module)
+    if test and on_test:
+        on_test(test)
+
+
+def __get_test_from_line(line: str, plugin_module: str) -> str | None:
+    """
+    ### Returns the test of a line printed by Scipion's test search.
+
+    #### Params:
+    - line (str): Line printed by the test search.
+    - plugin_module (str): Module name of the plugin to obtain tests from.
+
+    #### Returns:
+    - (str | None): Test name, or None if the line does not correspond to a test.
+    """
+    stripped_line = line.lstrip()
+    if not __is_test_line(stripped_line, plugin_module):
+        return None
+    return stripped_line.replace(__get_full_test_leading_chars(plugin_module), "")
+
+
 def __get_scipion_test_search_param(scipion: str, plugin_module: str) -> str:
     """
     ### Returns the Scipion test search param for a given plugin module.
@@ -191,59 +395,250 @@ def __download_dataset(dataset: str, scipion: str) -> str | None:
     return None
 
 
-def __run_test_batch(
-    tests: list[str], max_jobs: int, scipion: str, plugin_module: str
+def __run_test(
+    test: str,
+    scipion: str,
+    plugin_module: str,
+    options: RunOptions,
+    fork_servers: ForkServerPool | None = None,
+) -> str | list[str] | None:
+    """
+    ### Runs a given test.
+
+    #### Params:
+    - test (str): Test name.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run test for.
+    - options (RunOptions): Options that change how the test is run.
+    - fork_servers (ForkServerPool | None): Optional. Fork servers to run the test in.
+
+    #### Return:
+    - (None | str | list[str]): Test name if there were any errors, or names of the failed tests for packs.
+    """
+    if packing.is_pack(test):
+        return __run_pack(test, scipion, plugin_module, options, fork_servers)
+    logger.log_warning(f"Running test {test}...")
+    ret_code, output = __run_test_command(
+        test, scipion, plugin_module, options, fork_servers
+    )
+    return __log_test_result(test, ret_code, output, options)
+
+
+def __run_pack(
+    pack: str,
+    scipion: str,
+    plugin_module: str,
+    options: RunOptions,
+    fork_servers: ForkServerPool | None = None,
 ) -> list[str]:
     """
-    ### Runs the given test batch.
+    ### Runs a pack of tests in a single Scipion process.
+
+    If the pack fails or times out and its output does not tell which tests caused it, they are run again one by one.
 
     #### Params:
-    - tests (list[str]): Tests in the batch.
-    - max_jobs (int): Maximum number of concurrent jobs.
+    - pack (str): Scheduled name of the pack.
     - scipion (str): Path to Scipion's executable.
     - plugin_module (str): Module name of the plugin to run tests for.
+    - options (RunOptions): Options that change how the tests are run.
+    - fork_servers (ForkServerPool | None): Optional. Fork servers to run the pack in.
 
-    #### Returns:
-    - (list[str]): Tests that failed.
+    #### Return:
+    - (list[str]): Names of the failed tests.
     """
-    batch_size = len(tests)
-    jobs = min(max_jobs, batch_size)
-    test_number_text = f"test{'s' if batch_size > 1 else ''}"
-    jobs_text = f"process{'es' if jobs > 1 else ''}"
-    batch_text = f" in batches of {jobs} {jobs_text}" if batch_size > 1 else ""
-    logger(
-        logger.blue(
-            f"Running a total of {batch_size} {test_number_text} for {plugin_module}{batch_text}..."
-        )
+    logger.log_warning(
+        f"Running packed tests {', '.join(packing.get_pack_tests(pack))}..."
     )
-    return python_handler.run_function_in_parallel(
-        __run_test, scipion, plugin_module, parallelizable_params=tests, jobs=jobs
+    ret_code, output = __run_test_command(
+        pack, scipion, plugin_module, options, fork_servers
     )
-
-
-def __run_test(test: str, scipion: str, plugin_module: str) -> str | None:
+    failed_tests = __log_pack_result(pack, ret_code, output, options)
+    if failed_tests is not None:
+        return failed_tests
+    return [
+        test
+        for test in packing.get_pack_tests(pack)
+        if __run_test(test, scipion, plugin_module, options, fork_servers)
+    ]
+
+
+async def __run_test_async(
+    test: str, scipion: str, plugin_module: str, options: RunOptions
+) -> str | list[str] | None:
     """
-    ### Runs a given test.
+    ### Runs a given test as a subprocess of the running event loop.
 
     #### Params:
     - test (str): Test name.
     - scipion (str): Path to Scipion's executable.
     - plugin_module (str): Module name of the plugin to run test for.
+    - options (RunOptions): Options that change how the test is run.
 
     #### Return:
-    - (None | str): Test name if there were any errors.
+    - (None | str | list[str]): Test name if there were any errors, or names of the failed tests for packs.
     """
-    logger.log_warning(f"Running test {test}...")
-    ret_code, output = shell_handler.run_shell_command(
-        f"{scipion} {__get_test_prefix(plugin_module)}{test}"
+    if packing.is_pack(test):
+        logger.log_warning(
+            f"Running packed tests {', '.join(packing.get_pack_tests(test))}..."
+        )
+    else:
+        logger.log_warning(f"Running test {test}...")
+    ret_code, output = await shell_handler.run_logged_shell_command_async(
+        __get_test_command(test, scipion, plugin_module),
+        log_file=options.get_log_file(test),
+        timeout=options.get_timeout(test),
+        tail_size=options.output_tail_size,
     )
+    if not packing.is_pack(test):
+        return __log_test_result(test, ret_code, output, options)
+    failed_tests = __log_pack_result(test, ret_code, output, options)
+    if failed_tests is not None:
+        return failed_tests
+    return [
+        packed_test
+        for packed_test in packing.get_pack_tests(test)
+        if await __run_test_async(packed_test, scipion, plugin_module, options)
+    ]
+
+
+def __log_test_result(
+    test: str, ret_code: int, output: str, options: RunOptions
+) -> str | None:
+    """
+    ### Logs the result of a test.
+
+    #### Params:
+    - test (str): Test name.
+    - ret_code (int): Return code of the test.
+    - output (str): Tail of the output of the test.
+    - options (RunOptions): Options the test was run with.
+
+    #### Return:
+    - (str | None): Test name if there were any errors.
+    """
+    timeout = options.get_timeout(test)
+    log_file = options.get_log_file(test)
+    log_text = f" Full output in {log_file}." if log_file else ""
+    if timeout is not None and ret_code == shell_handler.TIMEOUT_RET_CODE:
+        logger(
+            logger.red(
+                f"{output}\nTest {test} timed out after {timeout:g} seconds.{log_text}"
+            )
+        )
+        return test
     if ret_code:
-        logger(logger.red(f"{output}\nTest {test} failed with above message."))
+        logger(
+            logger.red(f"{output}\nTest {test} failed with above message.{log_text}")
+        )
         return test
     logger(logger.green(f"Test {test} OK"))
     return None
 
 
+def __log_pack_result(
+    pack: str, ret_code: int, output: str, options: RunOptions
+) -> list[str] | None:
+    """
+    ### Logs the result of each test of a pack, if the output tells which of them failed.
+
+    #### Params:
+    - pack (str): Scheduled name of the pack.
+    - ret_code (int): Return code of the pack.
+    - output (str): Tail of the output of the pack.
+    - options (RunOptions): Options the pack was run with.
+
+    #### Return:
+    - (list[str] | None): Names of the failed tests, or None if they must be run again one by one.
+    """
+    tests = packing.get_pack_tests(pack)
+    failed_tests = []
+    if (
+        options.get_timeout(pack) is not None
+        and ret_code == shell_handler.TIMEOUT_RET_CODE
+    ):
+        failed_tests = None
+    elif ret_code:
+        failed_tests = packing.get_failed_pack_tests(tests, output)
+    if failed_tests is None:
+        logger.log_warning(
+            f"Could not find which packed tests failed among {', '.join(tests)}. Running them one by one..."
+        )
+        return None
+    if failed_tests:
+        logger(
+            logger.red(
+                f"{output}\nTests {', '.join(failed_tests)} failed with above message."
+            )
+        )
+    for test in tests:
+        if test not in failed_tests:
+            logger(logger.green(f"Test {test} OK"))
+    return failed_tests
+
+
+def __run_test_command(
+    test: str,
+    scipion: str,
+    plugin_module: str,
+    options: RunOptions,
+    fork_servers: ForkServerPool | None = None,
+) -> tuple[int, str]:
+    """
+    ### Runs a given test, or pack of tests, in a fork server if available or in a new Scipion process otherwise.
+
+    #### Params:
+    - test (str): Scheduled name of the test or pack.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    - options (RunOptions): Options that change how the test is run.
+    - fork_servers (ForkServerPool | None): Optional. Fork servers to run the test in.
+
+    #### Returns:
+    - (int): Return code of the test, or shell_handler.TIMEOUT_RET_CODE if it timed out.
+    - (str): Output of the test.
+    """
+    if fork_servers:
+        return fork_servers.run_test(
+            f"{plugin_module}.tests.{__get_test_names(test, plugin_module)}",
+            timeout=options.get_timeout(test),
+            log_file=options.get_log_file(test),
+            tail_size=options.output_tail_size,
+        )
+    return run_test(test, scipion, plugin_module, options)
+
+
+def __get_test_command(test: str, scipion: str, plugin_module: str) -> str:
+    """
+    ### Returns the command that runs a given test, or pack of tests, in a new Scipion process.
+
+    #### Params:
+    - test (str): Scheduled name of the test or pack.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (str): Command to run.
+    """
+    return f"{scipion} {__get_test_prefix(plugin_module)}{__get_test_names(test, plugin_module, quote=True)}"
+
+
+def __get_test_names(test: str, plugin_module: str, quote: bool = False) -> str:
+    """
+    ### Returns the names of the tests to pass to Scipion after the prefix of the first one.
+
+    #### Params:
+    - test (str): Scheduled name of the test or pack.
+    - plugin_module (str): Module name of the plugin.
+    - quote (bool): Optional. If True, each test name is quoted to be used in a shell command.
+
+    #### Returns:
+    - (str): Test names, each one after the first preceded by its full module path.
+    """
+    return f" {plugin_module}.tests.".join(
+        shlex.quote(name) if quote else name for name in packing.get_pack_tests(test)
+    )
+
+
 def __get_test_prefix(plugin_module: str):
     """
     ### Returns Scipion's prefix for test names.
@@ -2,29 +2,357 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import signal
 import subprocess
+import tempfile
+import time
+from typing import BinaryIO, Callable
 
+TIMEOUT_RET_CODE = 124
+DEFAULT_TAIL_SIZE = 20 * 1024
+__KILL_GRACE_PERIOD = 10
+__EXIT_POLL_INTERVAL = 0.1
+__running_processes = set()
 
-def run_shell_command(cmd: str) -> tuple[int, str]:
+
+def run_shell_command(cmd: str, timeout: float | None = None) -> tuple[int, str]:
     """
     ### Runs the given command in a shell.
 
+    The command runs in its own process group so that, if it times out,
+    every process it started is terminated along with it.
+
     #### Params:
     - cmd (str): Command to run.
+    - timeout (float | None): Optional. Maximum number of seconds the command can run for.
 
     #### Returns:
-    - (int): Return code.
+    - (int): Return code, or TIMEOUT_RET_CODE if the command timed out.
     - (str): Output of the command, regardless of if it is an error or regular output.
     """
     process = subprocess.Popen(
-        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, env=os.environ
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        shell=True,
+        env=os.environ,
+        start_new_session=True,
     )
-    process.wait()
+    __running_processes.add(process)
+    try:
+        output, err = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        output, err = __stop_process_group(process)
+        return TIMEOUT_RET_CODE, __decode_output((output or b"") + (err or b""))
+    finally:
+        __running_processes.discard(process)
 
     ret_code = process.returncode
-    output, err = process.communicate()
-    output_str = output.decode() if not ret_code and output else err.decode()
-    output_str = output_str[:-1] if output_str.endswith("\n") else output_str
+    return ret_code, __decode_output(output if not ret_code and output else err)
+
+
+def run_streamed_shell_command(
+    cmd: str, on_line: Callable[[str], None]
+) -> tuple[int, str]:
+    """
+    ### Runs the given command in a shell, handing over each line of its regular output as soon as it is printed.
+
+    The error output goes to a temporary file so that it cannot block the command while its regular output is read.
+
+    #### Params:
+    - cmd (str): Command to run.
+    - on_line (callable): Called with each line of regular output, without its line break.
+
+    #### Returns:
+    - (int): Return code.
+    - (str): Output of the command, regardless of if it is an error or regular output.
+    """
+    with tempfile.TemporaryFile() as err_file:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=err_file,
+            shell=True,
+            env=os.environ,
+            start_new_session=True,
+        )
+        __running_processes.add(process)
+        output = []
+        try:
+            for line in process.stdout:
+                output.append(line)
+                on_line(line.decode(errors="replace").rstrip("\r\n"))
+            ret_code = process.wait()
+        finally:
+            if process.poll() is None:
+                __stop_process_group(process)
+            process.stdout.close()
+            __running_processes.discard(process)
+        if not ret_code and output:
+            return ret_code, __decode_output(b"".join(output))
+        err_file.seek(0)
+        return ret_code, __decode_output(err_file.read())
+
+
+def run_logged_shell_command(
+    cmd: str,
+    log_file: str | None = None,
+    timeout: float | None = None,
+    tail_size: int = DEFAULT_TAIL_SIZE,
+) -> tuple[int, str]:
+    """
+    ### Runs the given command in a shell, writing its output to a file as it is produced.
+
+    Both output streams go straight from the command to the file, so memory use does not depend on how much
+    the command prints, and only the tail of the output is read back.
+    The command runs in its own process group so that, if it times out,
+    every process it started is terminated along with it.
+
+    #### Params:
+    - cmd (str): Command to run.
+    - log_file (str | None): Optional. File receiving the full output. If not provided, a temporary file is used.
+    - timeout (float | None): Optional. Maximum number of seconds the command can run for.
+    - tail_size (int): Optional. Maximum number of bytes of output to return.
+
+    #### Returns:
+    - (int): Return code, or TIMEOUT_RET_CODE if the command timed out.
+    - (str): Tail of the combined regular and error output of the command.
+    """
+    with __open_output_file(log_file) as output_file:
+        process = subprocess.Popen(
+            cmd,
+            stdout=output_file,
+            stderr=subprocess.STDOUT,
+            shell=True,
+            env=os.environ,
+            start_new_session=True,
+        )
+        __running_processes.add(process)
+        try:
+            ret_code = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            __stop_process_group(process)
+            ret_code = TIMEOUT_RET_CODE
+        finally:
+            __running_processes.discard(process)
+        return ret_code, __decode_output(read_tail(output_file, tail_size))
+
+
+async def run_logged_shell_command_async(
+    cmd: str,
+    log_file: str | None = None,
+    timeout: float | None = None,
+    tail_size: int = DEFAULT_TAIL_SIZE,
+) -> tuple[int, str]:
+    """
+    ### Runs the given command in a shell as a subprocess of the running event loop, writing its output to a file.
+
+    Behaves like run_logged_shell_command, but waits for the command without blocking the event loop.
+    If the waiting task is cancelled, the process group of the command is stopped before the cancellation propagates.
+
+    #### Params:
+    - cmd (str): Command to run.
+    - log_file (str | None): Optional. File receiving the full output. If not provided, a temporary file is used.
+    - timeout (float | None): Optional. Maximum number of seconds the command can run for.
+    - tail_size (int): Optional. Maximum number of bytes of output to return.
+
+    #### Returns:
+    - (int): Return code, or TIMEOUT_RET_CODE if the command timed out.
+    - (str): Tail of the combined regular and error output of the command.
+    """
+    with __open_output_file(log_file) as output_file:
+        process = await asyncio.create_subprocess_shell(
+            cmd,
+            stdout=output_file,
+            stderr=subprocess.STDOUT,
+            env=os.environ,
+            start_new_session=True,
+        )
+        __running_processes.add(process)
+        try:
+            ret_code = await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            await __stop_process_group_async(process)
+            ret_code = TIMEOUT_RET_CODE
+        except asyncio.CancelledError:
+            await asyncio.shield(__stop_process_group_async(process))
+            raise
+        finally:
+            __running_processes.discard(process)
+        return ret_code, __decode_output(read_tail(output_file, tail_size))
+
+
+def read_tail(file: BinaryIO, tail_size: int) -> bytes:
+    """
+    ### Reads the last bytes of the given file.
+
+    #### Params:
+    - file (BinaryIO): File opened for reading in binary mode.
+    - tail_size (int): Maximum number of bytes to read.
+
+    #### Returns:
+    - (bytes): Last bytes of the file.
+    """
+    file.seek(0, os.SEEK_END)
+    file.seek(max(file.tell() - tail_size, 0))
+    return file.read()
+
+
+def stop_commands_on_termination():
+    """
+    ### Makes the current process stop the commands it is running before exiting when it is terminated.
+
+    Commands run in their own process group, so they would otherwise keep running after
+    the process that started them is terminated.
+    """
+    signal.signal(signal.SIGTERM, __terminate)
+
+
+def stop_running_commands():
+    """### Terminates the process group of every running command, killing the ones that do not stop in time."""
+    processes = list(__running_processes)
+    for process in processes:
+        __send_signal_to_group(process, signal.SIGTERM)
+    deadline = time.monotonic() + __KILL_GRACE_PERIOD
+    for process in processes:
+        if not __wait_for_exit(process, deadline):
+            __send_signal_to_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+def __terminate(*_):
+    """### Stops the process group of every running command and exits."""
+    stop_running_commands()
+    os._exit(1)
+
 
-    return ret_code, output_str
+def __wait_for_exit(
+    process: subprocess.Popen | asyncio.subprocess.Process, deadline: float
+) -> bool:
+    """
+    ### Waits until the given process exits or the deadline passes.
+
+    Asyncio processes can only be awaited from their own event loop, so they are polled instead.
+
+    #### Params:
+    - process (Popen | Process): Process to wait for.
+    - deadline (float): Monotonic time after which to stop waiting.
+
+    #### Returns:
+    - (bool): True if the process exited, False otherwise.
+    """
+    if isinstance(process, subprocess.Popen):
+        try:
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+    while __is_running(process):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(__EXIT_POLL_INTERVAL)
+    return True
+
+
+def __is_running(process: asyncio.subprocess.Process) -> bool:
+    """
+    ### Checks if the given asyncio process is still running.
+
+    Its return code is only updated by its event loop, which may be busy, so the process itself is checked too.
+
+    #### Params:
+    - process (Process): Process to check.
+
+    #### Returns:
+    - (bool): True if the process is still running, False otherwise.
+    """
+    if process.returncode is not None:
+        return False
+    if not hasattr(os, "killpg"):
+        return True
+    try:
+        os.kill(process.pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def __open_output_file(log_file: str | None) -> BinaryIO:
+    """
+    ### Opens the file receiving the output of a command.
+
+    #### Params:
+    - log_file (str | None): File to open. If not provided, a temporary file is used.
+
+    #### Returns:
+    - (BinaryIO): File opened for writing and reading in binary mode.
+    """
+    return open(log_file, "w+b") if log_file else tempfile.TemporaryFile()
+
+
+def __stop_process_group(process: subprocess.Popen) -> tuple[bytes, bytes]:
+    """
+    ### Terminates the process group of the given process, killing it if it does not stop in time.
+
+    #### Params:
+    - process (Popen): Process leading the group.
+
+    #### Returns:
+    - (bytes): Regular output produced by the process.
+    - (bytes): Error output produced by the process.
+    """
+    __send_signal_to_group(process, signal.SIGTERM)
+    try:
+        return process.communicate(timeout=__KILL_GRACE_PERIOD)
+    except subprocess.TimeoutExpired:
+        __send_signal_to_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        return process.communicate()
+
+
+async def __stop_process_group_async(process: asyncio.subprocess.Process):
+    """
+    ### Terminates the process group of the given asyncio process, killing it if it does not stop in time.
+
+    #### Params:
+    - process (Process): Process leading the group.
+    """
+    __send_signal_to_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), __KILL_GRACE_PERIOD)
+    except asyncio.TimeoutError:
+        __send_signal_to_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
+
+
+def __send_signal_to_group(
+    process: subprocess.Popen | asyncio.subprocess.Process, sig: int
+):
+    """
+    ### Sends the given signal to every process in the group of the given process.
+
+    #### Params:
+    - process (Popen | Process): Process leading the group.
+    - sig (int): Signal to send.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except ProcessLookupError:
+        pass
+
+
+def __decode_output(output: bytes | None) -> str:
+    """
+    ### Decodes the output of a command, removing the trailing line break.
+
+    #### Params:
+    - output (bytes | None): Raw output.
+
+    #### Returns:
+    - (str): Decoded output.
+    """
+    output_str = output.decode(errors="replace") if output else ""
+    return output_str[:-1] if output_str.endswith("\n") else output_str
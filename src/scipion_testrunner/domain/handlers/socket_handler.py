@@ -0,0 +1,122 @@
+"""### Functions that exchange JSON messages through TCP or Unix sockets."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from typing import BinaryIO
+
+UNIX_ADDRESS_PREFIX = "unix:"
+
+
+def is_valid_address(address: str) -> bool:
+    """
+    ### Checks if the given address has a valid format.
+
+    #### Params:
+    - address (str): Address with format HOST:PORT, or unix:PATH for a Unix socket.
+
+    #### Returns:
+    - (bool): True if the address is valid, False otherwise.
+    """
+    if address.startswith(UNIX_ADDRESS_PREFIX):
+        return len(address) > len(UNIX_ADDRESS_PREFIX)
+    try:
+        __get_host_and_port(address)
+    except ValueError:
+        return False
+    return True
+
+
+def create_server(address: str) -> socket.socket:
+    """
+    ### Creates a socket listening on the given address.
+
+    #### Params:
+    - address (str): Address with format HOST:PORT, or unix:PATH for a Unix socket.
+
+    #### Returns:
+    - (socket): Listening socket.
+    """
+    if address.startswith(UNIX_ADDRESS_PREFIX):
+        path = address[len(UNIX_ADDRESS_PREFIX) :]
+        if os.path.exists(path):
+            os.remove(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+        return server
+    return socket.create_server(__get_host_and_port(address))
+
+
+def create_connection(address: str) -> socket.socket:
+    """
+    ### Connects to a socket listening on the given address.
+
+    #### Params:
+    - address (str): Address with format HOST:PORT, or unix:PATH for a Unix socket.
+
+    #### Returns:
+    - (socket): Connected socket.
+    """
+    if address.startswith(UNIX_ADDRESS_PREFIX):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address[len(UNIX_ADDRESS_PREFIX) :])
+        return connection
+    return socket.create_connection(__get_host_and_port(address))
+
+
+def send_message(stream: BinaryIO, message: dict) -> bool:
+    """
+    ### Sends the given message as a JSON line.
+
+    #### Params:
+    - stream (BinaryIO): Stream of the socket.
+    - message (dict): Message to send.
+
+    #### Returns:
+    - (bool): True if the message was sent, False if the connection was closed.
+    """
+    try:
+        stream.write(json.dumps(message).encode() + b"\n")
+        stream.flush()
+    except OSError:
+        return False
+    return True
+
+
+def receive_message(stream: BinaryIO) -> dict | None:
+    """
+    ### Waits for the next JSON line message.
+
+    #### Params:
+    - stream (BinaryIO): Stream of the socket.
+
+    #### Returns:
+    - (dict | None): Received message, or None if the connection was closed.
+    """
+    try:
+        line = stream.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def __get_host_and_port(address: str) -> tuple[str, int]:
+    """
+    ### Splits a TCP address into its host and port.
+
+    #### Params:
+    - address (str): Address with format HOST:PORT.
+
+    #### Returns:
+    - (tuple[str, int]): Host and port.
+    """
+    host, port = address.rsplit(":", maxsplit=1)
+    return host, int(port)
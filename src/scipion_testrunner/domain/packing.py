@@ -0,0 +1,189 @@
+"""### Functions to run several short tests in a single Scipion process."""
+
+from __future__ import annotations
+
+import math
+import re
+
+PACK_SEPARATOR = " "
+
+__SUMMARY_PATTERNS = [
+    re.compile(r"^Ran \d+ tests? in ", re.MULTILINE),
+    re.compile(r"^\[=+\] (?:run|ran) \d+ tests?", re.MULTILINE | re.IGNORECASE),
+]
+__FAILURE_PATTERNS = [
+    re.compile(r"^(?:FAIL|ERROR): \w+ \(([\w.]+)\)", re.MULTILINE),
+    re.compile(r"^\[\s*FAILED\s*\] ([\w.]+)", re.MULTILINE),
+]
+__FAILURE_COUNTS_PATTERN = re.compile(r"^FAILED \(([^)]*)\)", re.MULTILINE)
+__FAILURE_COUNT_PATTERN = re.compile(r"\b(?:failures|errors)=(\d+)")
+
+
+def get_short_tests(
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    estimates: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """
+    ### Returns the tests that are short enough to be packed with others.
+
+    Tests involved in a dependency are never packed, so the scheduler can still release them one by one.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test.
+    - threshold (float): Maximum estimated duration in seconds of a short test.
+
+    #### Returns:
+    - (list[str]): Short tests, in their original order.
+    """
+    dependency_tests = set()
+    for test, deps in tests_with_deps.items():
+        if deps:
+            dependency_tests.update([test, *deps])
+    return [
+        test
+        for test in tests
+        if test not in dependency_tests and estimates.get(test, 0) <= threshold
+    ]
+
+
+def get_test_packs(
+    tests: list[str], estimates: dict[str, float], max_pack_size: int, jobs: int
+) -> list[list[str]]:
+    """
+    ### Splits the given tests into packs with a similar estimated duration.
+
+    There are never fewer packs than jobs available, so packing does not reduce parallelism.
+
+    #### Params:
+    - tests (list[str]): Tests to pack.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test.
+    - max_pack_size (int): Maximum number of tests in a pack.
+    - jobs (int): Number of tests that can run at the same time.
+
+    #### Returns:
+    - (list[list[str]]): Packs of tests, each of them in the original order of the tests.
+    """
+    if not tests:
+        return []
+    n_packs = min(max(math.ceil(len(tests) / max_pack_size), jobs), len(tests))
+    loads = [0.0] * n_packs
+    packs = [[] for _ in range(n_packs)]
+    for test in sorted(tests, key=lambda test: -estimates.get(test, 0)):
+        pack_index = min(
+            (index for index in range(n_packs) if len(packs[index]) < max_pack_size),
+            key=lambda index: (loads[index], len(packs[index]), index),
+        )
+        loads[pack_index] += estimates.get(test, 0)
+        packs[pack_index].append(test)
+    order = {test: index for index, test in enumerate(tests)}
+    return [sorted(pack, key=order.get) for pack in packs]
+
+
+def get_pack_name(pack: list[str]) -> str:
+    """
+    ### Returns the name the scheduler uses for the given pack.
+
+    #### Params:
+    - pack (list[str]): Tests of the pack.
+
+    #### Returns:
+    - (str): Name of the pack.
+    """
+    return PACK_SEPARATOR.join(pack)
+
+
+def is_pack(name: str) -> bool:
+    """
+    ### Checks if the given scheduled name corresponds to a pack of tests.
+
+    #### Params:
+    - name (str): Scheduled name.
+
+    #### Returns:
+    - (bool): True if the name contains more than one test, False otherwise.
+    """
+    return PACK_SEPARATOR in name
+
+
+def get_pack_tests(name: str) -> list[str]:
+    """
+    ### Returns the tests contained in the given scheduled name.
+
+    #### Params:
+    - name (str): Scheduled name of a single test or a pack.
+
+    #### Returns:
+    - (list[str]): Tests it contains.
+    """
+    return name.split(PACK_SEPARATOR)
+
+
+def get_failed_pack_tests(tests: list[str], output: str) -> list[str] | None:
+    """
+    ### Finds which tests of a failed pack caused the failure, using the unittest output.
+
+    The output can be just its last part, so the failures found are checked against the number
+    of failures and errors in the unittest summary, as some of them may have been cut off.
+
+    #### Params:
+    - tests (list[str]): Tests of the pack.
+    - output (str): Output of the pack.
+
+    #### Returns:
+    - (list[str] | None): Failed tests, or None if the failure cannot be attributed.
+    """
+    if not any(pattern.search(output) for pattern in __SUMMARY_PATTERNS):
+        return None
+    n_reported_failures = __get_reported_failure_count(output)
+    if n_reported_failures is not None and n_reported_failures != len(
+        __FAILURE_PATTERNS[0].findall(output)
+    ):
+        return None
+    failed_tests = []
+    for pattern in __FAILURE_PATTERNS:
+        for failure_id in pattern.findall(output):
+            matches = [test for test in tests if __is_failure_of(failure_id, test)]
+            if len(matches) != 1:
+                return None
+            if matches[0] not in failed_tests:
+                failed_tests.append(matches[0])
+    return [test for test in tests if test in failed_tests] or None
+
+
+def __get_reported_failure_count(output: str) -> int | None:
+    """
+    ### Returns the number of failures and errors reported in the unittest summary.
+
+    #### Params:
+    - output (str): Output of the pack.
+
+    #### Returns:
+    - (int | None): Number of failed tests, or None if the output has no unittest failure summary.
+    """
+    summaries = __FAILURE_COUNTS_PATTERN.findall(output)
+    if not summaries:
+        return None
+    return sum(int(count) for count in __FAILURE_COUNT_PATTERN.findall(summaries[-1]))
+
+
+def __is_failure_of(failure_id: str, test: str) -> bool:
+    """
+    ### Checks if the dotted id reported for a failure belongs to the given test class.
+
+    #### Params:
+    - failure_id (str): Dotted id of the failure, such as module.Class or module.Class.method.
+    - test (str): Test name with format file.Class.
+
+    #### Returns:
+    - (bool): True if the failure belongs to the test, False otherwise.
+    """
+    failure_parts = failure_id.split(".")
+    test_parts = test.split(".")
+    for start in range(len(failure_parts) - len(test_parts) + 1):
+        if failure_parts[start : start + len(test_parts)] == test_parts:
+            return True
+    return failure_parts[0] == test_parts[-1]
@@ -0,0 +1,117 @@
+"""### Starts tests while the rest of them are still being discovered."""
+
+from __future__ import annotations
+
+import os
+import queue
+from typing import Callable
+
+from scipion_testrunner.application.logger import logger
+from scipion_testrunner.domain.executor import Executor, run_timed
+from scipion_testrunner.domain.handlers import scipion_handler
+from scipion_testrunner.domain.run_options import RunOptions
+
+
+class DiscoveryPipeline:
+    """
+    ### Runs the tests handed over by the discovery that do not need the full test list to be scheduled.
+
+    Each accepted test is submitted to the test pool of the executor as soon as it is found,
+    so the discovery of the remaining tests overlaps with useful work. Tests are only started while
+    a worker of the pool is free, so the ones found meanwhile are left to the scheduler and never wait
+    in the pool ahead of the tests it releases with a higher priority.
+    """
+
+    def __init__(
+        self,
+        scipion: str,
+        plugin_module: str,
+        executor: Executor,
+        options: RunOptions,
+        can_start: Callable[[str], bool],
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - scipion (str): Path to Scipion's executable.
+        - plugin_module (str): Module name of the plugin to run tests for.
+        - executor (Executor): Executor whose test pool runs the tests.
+        - options (RunOptions): Options that change how each test is run.
+        - can_start (callable): Called with each discovered test. Returns True if it can start before discovery ends.
+        """
+        self.__scipion = scipion
+        self.__plugin_module = plugin_module
+        self.__executor = executor
+        self.__options = options
+        self.__can_start = can_start
+        self.__started = {}
+        self.__finished = queue.Queue()
+
+    def add_test(self, test: str):
+        """
+        ### Starts the given discovered test if it can run before discovery ends, it was not started yet, and a worker is free.
+
+        #### Params:
+        - test (str): Name of the discovered test.
+        """
+        pool = self.__executor.get_test_pool()
+        n_running = len(self.__started) - self.__finished.qsize()
+        if (
+            test in self.__started
+            or n_running >= pool.processes
+            or not self.__can_start(test)
+        ):
+            return
+        if not self.__started:
+            logger(logger.blue("Starting independent tests while discovery goes on..."))
+            if self.__options.log_dir:
+                os.makedirs(self.__options.log_dir, exist_ok=True)
+        self.__started[test] = None
+        pool.apply_async(
+            run_timed,
+            args=(
+                scipion_handler.run_logged_test,
+                test,
+                self.__scipion,
+                self.__plugin_module,
+                self.__options,
+            ),
+            callback=lambda result, test=test: self.__finished.put((test, result)),
+            error_callback=lambda _, test=test: self.__finished.put(
+                (test, (0.0, 0.0, test))
+            ),
+        )
+
+    def get_pending_tests(self, tests: list[str]) -> list[str]:
+        """
+        ### Returns the given tests that were not started during discovery.
+
+        #### Params:
+        - tests (list[str]): Tests to filter.
+
+        #### Returns:
+        - (list[str]): Tests that still have to be scheduled, in their original order.
+        """
+        return [test for test in tests if test not in self.__started]
+
+    def wait(
+        self, on_finished: Callable[[str, float, bool], None] | None = None
+    ) -> list[str]:
+        """
+        ### Waits for every started test to finish.
+
+        #### Params:
+        - on_finished (callable): Optional. Called with the name, duration and failure status of each test as it is collected.
+
+        #### Returns:
+        - (list[str]): Names of the tests that failed.
+        """
+        failed_tests = []
+        for _ in self.__started:
+            test, (start_time, end_time, result) = self.__finished.get()
+            if result:
+                failed_tests.append(test)
+            if on_finished:
+                on_finished(test, end_time - start_time, bool(result))
+        return failed_tests
@@ -0,0 +1,183 @@
+"""### Resources needed by each test and resources available to run them."""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+
+from scipion_testrunner.configuration import test_data_keys
+from scipion_testrunner.domain import packing
+
+__MEMINFO_FILE = "/proc/meminfo"
+__NVIDIA_GPUS_DIR = "/proc/driver/nvidia/gpus"
+__MEMINFO_KEYS = ("MemAvailable", "MemTotal")
+__KB_PER_GB = 1024**2
+
+
+@dataclass(frozen=True)
+class Resources:
+    """
+    ### Amount of each resource a test needs, or a machine offers.
+
+    #### Attributes:
+    - cpus (float): Number of CPU cores.
+    - memory (float): Memory in GB.
+    - gpus (float): Number of GPUs.
+    """
+
+    cpus: float = 1.0
+    memory: float = 0.0
+    gpus: float = 0.0
+
+    def __add__(self, other: Resources) -> Resources:
+        """
+        ### Adds up the given resources to these ones.
+
+        #### Params:
+        - other (Resources): Resources to add.
+
+        #### Returns:
+        - (Resources): Sum of both resources.
+        """
+        return Resources(
+            cpus=self.cpus + other.cpus,
+            memory=self.memory + other.memory,
+            gpus=self.gpus + other.gpus,
+        )
+
+    def fits_in(self, capacity: Resources) -> bool:
+        """
+        ### Checks if these resources are available within the given capacity.
+
+        #### Params:
+        - capacity (Resources): Available resources.
+
+        #### Returns:
+        - (bool): True if no resource exceeds the capacity, False otherwise.
+        """
+        return (
+            self.cpus <= capacity.cpus
+            and self.memory <= capacity.memory
+            and self.gpus <= capacity.gpus
+        )
+
+
+NO_RESOURCES = Resources(cpus=0.0)
+DEFAULT_DEMAND = Resources()
+
+
+def get_system_capacity(
+    cpus: float | None = None, memory: float | None = None, gpus: float | None = None
+) -> Resources:
+    """
+    ### Returns the resources available to run tests on this machine.
+
+    CPU cores come from os.cpu_count(), memory from the available memory in /proc/meminfo,
+    and GPUs from CUDA_VISIBLE_DEVICES or the NVIDIA driver. Resources that cannot be detected are not limited.
+
+    #### Params:
+    - cpus (float | None): Optional. Number of CPU cores, instead of the detected ones.
+    - memory (float | None): Optional. Memory in GB, instead of the detected one.
+    - gpus (float | None): Optional. Number of GPUs, instead of the detected ones.
+
+    #### Returns:
+    - (Resources): Available resources.
+    """
+    return Resources(
+        cpus=cpus if cpus is not None else float(os.cpu_count() or math.inf),
+        memory=memory if memory is not None else __get_system_memory(),
+        gpus=gpus if gpus is not None else __get_system_gpus(),
+    )
+
+
+def get_test_demand(
+    test: str, test_resources: dict[str, dict[str, float]]
+) -> Resources:
+    """
+    ### Returns the resources needed by the given test, or pack of tests.
+
+    The tests of a pack run one after another, so a pack needs the most of each resource among its tests.
+
+    #### Params:
+    - test (str): Scheduled name of the test or pack.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
+
+    #### Returns:
+    - (Resources): Resources needed by the test.
+    """
+    demands = [
+        __get_single_test_demand(name, test_resources)
+        for name in packing.get_pack_tests(test)
+    ]
+    return Resources(
+        cpus=max(demand.cpus for demand in demands),
+        memory=max(demand.memory for demand in demands),
+        gpus=max(demand.gpus for demand in demands),
+    )
+
+
+def __get_single_test_demand(
+    test: str, test_resources: dict[str, dict[str, float]]
+) -> Resources:
+    """
+    ### Returns the resources needed by a single test, falling back to the ones of its class or file.
+
+    #### Params:
+    - test (str): Name of the test, such as file.Class or file.Class.method.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
+
+    #### Returns:
+    - (Resources): Resources needed by the test, or the default ones if none are configured.
+    """
+    name = test
+    while name:
+        if name in test_resources:
+            resources = test_resources[name]
+            return Resources(
+                cpus=resources.get(test_data_keys.RESOURCES_CPUS_KEY, 1.0),
+                memory=resources.get(test_data_keys.RESOURCES_MEMORY_KEY, 0.0),
+                gpus=resources.get(test_data_keys.RESOURCES_GPUS_KEY, 0.0),
+            )
+        name = name.rpartition(".")[0]
+    return DEFAULT_DEMAND
+
+
+def __get_system_memory() -> float:
+    """
+    ### Returns the memory available on this machine, according to /proc/meminfo.
+
+    #### Returns:
+    - (float): Memory in GB, or infinity if it cannot be read.
+    """
+    try:
+        with open(__MEMINFO_FILE, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return math.inf
+    values = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        fields = value.split()
+        if fields and fields[0].isdigit():
+            values[key] = int(fields[0])
+    for key in __MEMINFO_KEYS:
+        if key in values:
+            return values[key] / __KB_PER_GB
+    return math.inf
+
+
+def __get_system_gpus() -> float:
+    """
+    ### Returns the number of GPUs tests can use on this machine.
+
+    #### Returns:
+    - (float): Number of GPUs listed in CUDA_VISIBLE_DEVICES or by the NVIDIA driver, or infinity if unknown.
+    """
+    visible_devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible_devices is not None:
+        return float(len([device for device in visible_devices.split(",") if device]))
+    try:
+        return float(len(os.listdir(__NVIDIA_GPUS_DIR))) or math.inf
+    except OSError:
+        return math.inf
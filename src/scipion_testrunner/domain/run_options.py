@@ -0,0 +1,89 @@
+"""### Options that change how each test is run."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+from scipion_testrunner.domain import packing
+from scipion_testrunner.domain.handlers import shell_handler
+
+POOL_ENGINE = "pool"
+ASYNCIO_ENGINE = "asyncio"
+ENGINES = [POOL_ENGINE, ASYNCIO_ENGINE]
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """
+    ### Groups the options that apply to every test run, so they can be passed along together.
+
+    #### Attributes:
+    - fork_server (bool): If True, tests are forked from preloaded Scipion processes.
+    - timeout (float | None): Maximum number of seconds any test can run for.
+    - test_timeouts (dict[str, float]): Maximum number of seconds of specific tests, files or methods.
+    - fail_fast (bool): If True, the run stops at the first failed test.
+    - log_dir (str | None): Directory receiving the full output of each test. If not provided, it is discarded.
+    - output_tail_size (int): Maximum number of bytes of the output of each test kept in memory to report failures.
+    - engine (str): Engine waiting for the test processes, either POOL_ENGINE or ASYNCIO_ENGINE.
+    """
+
+    fork_server: bool = False
+    timeout: float | None = None
+    test_timeouts: dict[str, float] = field(default_factory=dict)
+    fail_fast: bool = False
+    log_dir: str | None = None
+    output_tail_size: int = shell_handler.DEFAULT_TAIL_SIZE
+    engine: str = POOL_ENGINE
+
+    def get_timeout(self, test: str) -> float | None:
+        """
+        ### Returns the maximum number of seconds the given test, or pack of tests, can run for.
+
+        The timeout of a pack is the sum of the timeouts of its tests.
+
+        #### Params:
+        - test (str): Scheduled name of the test or pack.
+
+        #### Returns:
+        - (float | None): Timeout in seconds, or None if it can run indefinitely.
+        """
+        timeouts = [
+            self.__get_test_timeout(name) for name in packing.get_pack_tests(test)
+        ]
+        return None if None in timeouts else sum(timeouts)
+
+    def get_log_file(self, test: str) -> str | None:
+        """
+        ### Returns the file receiving the full output of the given test, or pack of tests.
+
+        A pack is named after its first test and the number of tests packed with it.
+
+        #### Params:
+        - test (str): Scheduled name of the test or pack.
+
+        #### Returns:
+        - (str | None): Path to the log file, or None if the output is not kept.
+        """
+        if not self.log_dir:
+            return None
+        tests = packing.get_pack_tests(test)
+        name = f"{tests[0]}+{len(tests) - 1}" if len(tests) > 1 else test
+        return os.path.join(self.log_dir, f"{name}.log")
+
+    def __get_test_timeout(self, test: str) -> float | None:
+        """
+        ### Returns the timeout of a single test, falling back to the one of its class or file, and then to the global one.
+
+        #### Params:
+        - test (str): Name of the test, such as file.Class or file.Class.method.
+
+        #### Returns:
+        - (float | None): Timeout in seconds, or None if it can run indefinitely.
+        """
+        name = test
+        while name:
+            if name in self.test_timeouts:
+                return self.test_timeouts[name]
+            name = name.rpartition(".")[0]
+        return self.timeout
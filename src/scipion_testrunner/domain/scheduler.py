@@ -0,0 +1,284 @@
+"""### Dependency-aware scheduler that decides which tests are ready to run."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Callable
+
+from scipion_testrunner.domain import resources
+from scipion_testrunner.domain.resources import Resources
+
+
+class DependencyScheduler:
+    """
+    ### Releases each test as soon as all of its own dependencies have finished.
+
+    Among the tests that are ready, the ones heading the longest chain of remaining work
+    (their own estimated duration plus the one of their slowest path of dependents) are released first.
+    When a capacity is given, a ready test is only released while the resources it needs, added to the ones
+    of the running tests, fit in it. Tests further down the ready queue that fit are released meanwhile,
+    and a test needing more than the whole capacity is released once nothing else is running.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        tests: list[str],
+        tests_with_deps: dict[str, list[str]],
+        estimates: dict[str, float] | None = None,
+        on_finished: Callable[[str, float, bool], None] | None = None,
+        demands: dict[str, Resources] | None = None,
+        capacity: Resources | None = None,
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - tests (list[str]): Tests to schedule.
+        - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+        - estimates (dict[str, float]): Optional. Estimated duration in seconds of each test.
+        - on_finished (callable): Optional. Called with the name, duration and failure status of each test as soon as it finishes.
+        - demands (dict[str, Resources]): Optional. Resources needed by each test. Tests not present need the default ones.
+        - capacity (Resources | None): Optional. Resources available to the running tests. If not provided, they are not limited.
+        """
+        estimates = estimates or {}
+        self.__on_finished = on_finished
+        self.__demands = demands or {}
+        self.__capacity = capacity
+        self.__pending_deps = {test: 0 for test in tests}
+        self.__dependents = {test: [] for test in tests}
+        for test, deps in tests_with_deps.items():
+            if test not in self.__pending_deps:
+                continue
+            for dep in dict.fromkeys(deps):
+                if dep in self.__pending_deps and dep != test:
+                    self.__pending_deps[test] += 1
+                    self.__dependents[dep].append(test)
+        critical_paths = self.__get_critical_path_lengths(estimates)
+        self.__sort_keys = {
+            test: (-critical_paths[test], -estimates.get(test, 0), index)
+            for index, test in enumerate(tests)
+        }
+        self.__ready = []
+        for test, n_deps in self.__pending_deps.items():
+            if not n_deps:
+                self.__push_ready(test)
+        self.__start_times = {}
+        self.__durations = {}
+        self.__skipped = {}
+
+    def get_test_count(self) -> int:
+        """
+        ### Returns the number of scheduled tests.
+
+        #### Returns:
+        - (int): Number of tests.
+        """
+        return len(self.__pending_deps)
+
+    def has_ready_tests(self) -> bool:
+        """
+        ### Checks if there is any test whose dependencies have all finished and whose resources are available.
+
+        #### Returns:
+        - (bool): True if at least one test can be started, False otherwise.
+        """
+        return self.__pop_admissible_entry(keep=True) is not None
+
+    def pop_ready_test(self) -> str:
+        """
+        ### Returns the next test to run and marks it as running.
+
+        #### Returns:
+        - (str): Name of the test.
+        """
+        test = self.__pop_admissible_entry()[-1]
+        self.__start_times[test] = time.monotonic()
+        return test
+
+    def mark_finished(
+        self, test: str, failed: bool = False, duration: float | None = None
+    ) -> list[str]:
+        """
+        ### Marks the given test as finished and releases its dependents if possible.
+
+        If the test failed, every test depending on it, directly or not, is skipped instead.
+        Tests that are no longer running, because they were cancelled, are ignored.
+
+        #### Params:
+        - test (str): Name of the finished test.
+        - failed (bool): Optional. If True, the test failed.
+        - duration (float | None): Optional. Seconds the test actually ran for. If not provided,
+        it is measured from the moment the test was handed out, including any time it waited for a worker.
+
+        #### Returns:
+        - (list[str]): Tests that became ready to run.
+        """
+        if test not in self.__start_times:
+            return []
+        start_time = self.__start_times.pop(test)
+        self.__durations[test] = (
+            duration if duration is not None else time.monotonic() - start_time
+        )
+        if self.__on_finished:
+            self.__on_finished(test, self.__durations[test], failed)
+        if failed:
+            self.__skip_dependents(test)
+            return []
+        released = []
+        for dependent in self.__dependents.get(test, []):
+            self.__pending_deps[dependent] -= 1
+            if not self.__pending_deps[dependent] and dependent not in self.__skipped:
+                released.append(dependent)
+                self.__push_ready(dependent)
+        return released
+
+    def cancel(self) -> list[str]:
+        """
+        ### Cancels every test that has not finished yet, including the running ones.
+
+        #### Returns:
+        - (list[str]): Tests that were cancelled.
+        """
+        cancelled = [
+            test
+            for test in self.__pending_deps
+            if test not in self.__durations and test not in self.__skipped
+        ]
+        for test in cancelled:
+            self.__skipped[test] = "Cancelled after a test failed"
+        self.__ready = []
+        self.__start_times = {}
+        return cancelled
+
+    def get_skipped_tests(self) -> dict[str, str]:
+        """
+        ### Returns the tests that were skipped because a dependency failed or because they were cancelled.
+
+        #### Returns:
+        - (dict[str, str]): Reason why each test was skipped.
+        """
+        return self.__skipped.copy()
+
+    def requeue_test(self, test: str):
+        """
+        ### Puts a running test back into the ready queue, for example when the process running it is lost.
+
+        #### Params:
+        - test (str): Name of the running test.
+        """
+        del self.__start_times[test]
+        self.__push_ready(test)
+
+    def is_finished(self) -> bool:
+        """
+        ### Checks if there is no more work to do.
+
+        #### Returns:
+        - (bool): True if no test is running nor ready to run, False otherwise.
+        """
+        return not self.__ready and not self.__start_times
+
+    def get_durations(self) -> dict[str, float]:
+        """
+        ### Returns the measured duration of every finished test.
+
+        #### Returns:
+        - (dict[str, float]): Duration in seconds of each finished test.
+        """
+        return self.__durations.copy()
+
+    def __get_critical_path_lengths(
+        self, estimates: dict[str, float]
+    ) -> dict[str, float]:
+        """
+        ### Computes the critical path length of every test, visiting dependents before their dependencies.
+
+        #### Params:
+        - estimates (dict[str, float]): Estimated duration in seconds of each test.
+
+        #### Returns:
+        - (dict[str, float]): Critical path length in seconds of each test.
+        """
+        deps = {test: [] for test in self.__dependents}
+        for test, dependents in self.__dependents.items():
+            for dependent in dependents:
+                deps[dependent].append(test)
+        n_unvisited_dependents = {
+            test: len(dependents) for test, dependents in self.__dependents.items()
+        }
+        to_visit = [
+            test for test, n_left in n_unvisited_dependents.items() if not n_left
+        ]
+        lengths = {}
+        while to_visit:
+            test = to_visit.pop()
+            lengths[test] = estimates.get(test, 0) + max(
+                (lengths[dependent] for dependent in self.__dependents[test]),
+                default=0,
+            )
+            for dep in deps[test]:
+                n_unvisited_dependents[dep] -= 1
+                if not n_unvisited_dependents[dep]:
+                    to_visit.append(dep)
+        return {test: lengths.get(test, estimates.get(test, 0)) for test in deps}
+
+    def __skip_dependents(self, test: str):
+        """
+        ### Skips every test depending, directly or not, on the given failed test.
+
+        #### Params:
+        - test (str): Name of the failed test.
+        """
+        to_visit = [test]
+        while to_visit:
+            dep = to_visit.pop()
+            for dependent in self.__dependents.get(dep, []):
+                if dependent not in self.__skipped:
+                    self.__skipped[dependent] = f"Dependency failed: '{test}'"
+                    to_visit.append(dependent)
+
+    def __pop_admissible_entry(self, keep: bool = False) -> tuple | None:
+        """
+        ### Removes from the ready queue the first test whose resources are available.
+
+        #### Params:
+        - keep (bool): Optional. If True, the test is left in the ready queue.
+
+        #### Returns:
+        - (tuple | None): Entry of the ready queue of the test, or None if no ready test can start.
+        """
+        if not self.__ready:
+            return None
+        if self.__capacity is None or not self.__start_times:
+            return self.__ready[0] if keep else heapq.heappop(self.__ready)
+        used = sum(
+            (
+                self.__demands.get(test, resources.DEFAULT_DEMAND)
+                for test in self.__start_times
+            ),
+            resources.NO_RESOURCES,
+        )
+        postponed = []
+        admissible = None
+        while self.__ready:
+            entry = heapq.heappop(self.__ready)
+            demand = self.__demands.get(entry[-1], resources.DEFAULT_DEMAND)
+            if (used + demand).fits_in(self.__capacity):
+                admissible = entry
+                break
+            postponed.append(entry)
+        if admissible is not None and keep:
+            postponed.append(admissible)
+        for entry in postponed:
+            heapq.heappush(self.__ready, entry)
+        return admissible
+
+    def __push_ready(self, test: str):
+        """
+        ### Adds the given test to the ready queue.
+
+        #### Params:
+        - test (str): Name of the test.
+        """
+        heapq.heappush(self.__ready, (*self.__sort_keys[test], test))
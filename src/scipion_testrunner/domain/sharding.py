@@ -0,0 +1,93 @@
+"""### Functions to split the tests of a plugin into balanced shards."""
+
+from __future__ import annotations
+
+
+def get_shard_tests(
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    estimates: dict[str, float],
+    shard_index: int,
+    shard_count: int,
+) -> list[str]:
+    """
+    ### Returns the tests that belong to the given shard.
+
+    Tests connected through their dependencies always land on the same shard, and the groups
+    of tests are spread so that every shard gets a similar estimated duration,
+    or a similar number of tests if there are no estimates.
+    The assignment only depends on the given params, so every node computes the same one
+    as long as all of them receive the same estimates.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test, shared by every node. Can be empty.
+    - shard_index (int): Index of the shard, starting at 1.
+    - shard_count (int): Total number of shards.
+
+    #### Returns:
+    - (list[str]): Tests of the shard, in their original order.
+    """
+    weights = estimates or dict.fromkeys(tests, 1.0)
+    groups = __get_dependency_groups(tests, tests_with_deps)
+    sorted_groups = sorted(
+        groups,
+        key=lambda group: (-sum(weights.get(test, 0) for test in group), min(group)),
+    )
+    loads = [0.0] * shard_count
+    shard_tests = set()
+    for group in sorted_groups:
+        lightest_shard = min(
+            range(shard_count), key=lambda shard: (loads[shard], shard)
+        )
+        loads[lightest_shard] += sum(weights.get(test, 0) for test in group)
+        if lightest_shard == shard_index - 1:
+            shard_tests.update(group)
+    return [test for test in tests if test in shard_tests]
+
+
+def __get_dependency_groups(
+    tests: list[str], tests_with_deps: dict[str, list[str]]
+) -> list[list[str]]:
+    """
+    ### Groups the tests that are connected through their dependencies.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+
+    #### Returns:
+    - (list[list[str]]): Groups of connected tests.
+    """
+    parents = {test: test for test in tests}
+    for test, deps in tests_with_deps.items():
+        if test not in parents:
+            continue
+        for dep in deps:
+            if dep in parents:
+                parents[__find_root(parents, dep)] = __find_root(parents, test)
+
+    groups = {}
+    for test in tests:
+        groups.setdefault(__find_root(parents, test), []).append(test)
+    return list(groups.values())
+
+
+def __find_root(parents: dict[str, str], test: str) -> str:
+    """
+    ### Returns the representative test of the group the given test belongs to, compressing the path to it.
+
+    #### Params:
+    - parents (dict[str, str]): Parent of each test in the group forest.
+    - test (str): Name of the test.
+
+    #### Returns:
+    - (str): Representative test of the group.
+    """
+    root = test
+    while parents[root] != root:
+        root = parents[root]
+    while parents[test] != root:
+        parents[test], test = root, parents[test]
+    return root
@@ -0,0 +1,157 @@
+"""### Functions to split long test classes into their individual test methods."""
+
+from __future__ import annotations
+
+__MIN_METHODS_TO_SPLIT = 2
+
+
+def get_split_candidates(
+    tests: list[str],
+    estimates: dict[str, float],
+    threshold: float,
+    selected_tests: list[str],
+) -> list[str]:
+    """
+    ### Returns the test classes that could be split into their methods.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test.
+    - threshold (float): Minimum estimated duration in seconds of a class to split it. Ignored if 0.
+    - selected_tests (list[str]): Test classes to split regardless of their duration.
+
+    #### Returns:
+    - (list[str]): Candidate test classes, in their original order.
+    """
+    return [
+        test
+        for test in tests
+        if test in selected_tests or (threshold and estimates.get(test, 0) >= threshold)
+    ]
+
+
+def is_split_worth_it(
+    test: str, methods: list[str], durations: dict[str, float], selected: bool = False
+) -> bool:
+    """
+    ### Checks if running the methods of a test class separately is expected to finish earlier.
+
+    Each method run separately repeats the class setup. That setup time is estimated by comparing the
+    recorded duration of the whole class with the sum of the recorded durations of its methods.
+    Splitting is worth it when the time saved by running the methods in parallel is bigger than the repeated setup.
+    Until the duration of the whole class is recorded, the class runs whole so it can be recorded.
+    After that, while any method duration is missing, the class is split so they can be recorded.
+    Explicitly selected classes are always split, with or without history.
+
+    #### Params:
+    - test (str): Name of the test class.
+    - methods (list[str]): Names of the test methods of the class.
+    - durations (dict[str, float]): Expected duration in seconds of the tests present in the history.
+    - selected (bool): Optional. If True, the class was explicitly selected to be split.
+
+    #### Returns:
+    - (bool): True if the class should be split, False otherwise.
+    """
+    if len(methods) < __MIN_METHODS_TO_SPLIT:
+        return False
+    if selected:
+        return True
+    method_durations = [
+        durations.get(get_method_name(test, method)) for method in methods
+    ]
+    if test not in durations:
+        return False
+    if None in method_durations:
+        return True
+    class_duration = durations[test]
+    setup_duration = max(
+        (sum(method_durations) - class_duration) / (len(methods) - 1), 0
+    )
+    saved_time = class_duration - max(method_durations)
+    return saved_time > setup_duration * (len(methods) - 1)
+
+
+def get_class_duration(
+    test: str, method_durations: dict[str, float], durations: dict[str, float]
+) -> float:
+    """
+    ### Derives the duration of a whole test class from the durations of its methods run separately.
+
+    The methods repeat the class setup, so the class is expected to take as long as its methods
+    minus the setup they repeated according to the history. Methods not present in the history
+    are assumed to take as long as they just did, and a class not present in the history is assumed
+    to have no repeated setup. The class never takes less than its longest method.
+
+    #### Params:
+    - test (str): Name of the test class.
+    - method_durations (dict[str, float]): Measured duration in seconds of each method of the class.
+    - durations (dict[str, float]): Expected duration in seconds of the tests present in the history.
+
+    #### Returns:
+    - (float): Estimated duration in seconds of the whole class.
+    """
+    repeated_setup = (
+        max(
+            sum(
+                durations.get(method, duration)
+                for method, duration in method_durations.items()
+            )
+            - durations[test],
+            0,
+        )
+        if test in durations
+        else 0
+    )
+    return max(
+        sum(method_durations.values()) - repeated_setup, *method_durations.values()
+    )
+
+
+def split_tests(
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    methods_by_test: dict[str, list[str]],
+) -> tuple[list[str], dict[str, list[str]], dict[str, str]]:
+    """
+    ### Replaces the given test classes with their methods.
+
+    A method depends on the dependencies of its class, and the dependents of a class depend on all of its methods.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - methods_by_test (dict[str, list[str]]): Methods of each test class to split.
+
+    #### Returns:
+    - (list[str]): Tests with the split classes replaced by their methods.
+    - (dict[str, list[str]]): Dependencies between the resulting tests.
+    - (dict[str, str]): Test class of each method.
+    """
+    units_by_test = {
+        test: [get_method_name(test, method) for method in methods]
+        for test, methods in methods_by_test.items()
+    }
+    units = [unit for test in tests for unit in units_by_test.get(test, [test])]
+    units_with_deps = {}
+    for test, deps in tests_with_deps.items():
+        unit_deps = [unit for dep in deps for unit in units_by_test.get(dep, [dep])]
+        for unit in units_by_test.get(test, [test]):
+            units_with_deps[unit] = unit_deps
+    test_classes = {
+        unit: test for test, test_units in units_by_test.items() for unit in test_units
+    }
+    return units, units_with_deps, test_classes
+
+
+def get_method_name(test: str, method: str) -> str:
+    """
+    ### Returns the name of a test method as expected by Scipion.
+
+    #### Params:
+    - test (str): Name of the test class.
+    - method (str): Name of the method.
+
+    #### Returns:
+    - (str): Name of the test method.
+    """
+    return f"{test}.{method}"
@@ -0,0 +1,446 @@
+"""### Finds the tests of a plugin by parsing its sources, without launching Scipion nor importing the plugin."""
+
+from __future__ import annotations
+
+import ast
+import fnmatch
+import functools
+import os
+import re
+from typing import Callable
+
+from scipion_testrunner.domain.handlers import discovery_handler
+
+SCIPION_DISCOVERY = "scipion"
+STATIC_DISCOVERY = "static"
+CHECK_DISCOVERY = "check"
+DISCOVERY_MODES = [SCIPION_DISCOVERY, STATIC_DISCOVERY, CHECK_DISCOVERY]
+TEST_MODULE_PATTERN = "test*.py"
+TEST_CASE_BASES = {"TestCase", "IsolatedAsyncioTestCase", "BaseTest"}
+VALID_MODULE_NAME = re.compile(r"[_a-z]\w*\.py$", re.IGNORECASE)
+
+
+class AmbiguousSourcesError(Exception):
+    """### Raised when the tests of a plugin cannot be told for sure without importing it."""
+
+
+def find_tests(plugin_module: str) -> list[str] | None:
+    """
+    ### Returns the same tests Scipion's test search would find for the given plugin, by parsing its sources.
+
+    Test modules are visited following the rules of unittest's discovery, including the classes
+    re-exported by the packages, and every test is named after the module defining its class.
+
+    #### Params:
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (list[str] | None): Sorted tests, or None if the sources are ambiguous and Scipion must be used instead.
+    """
+    package_dir = discovery_handler.get_package_dir(plugin_module)
+    if not package_dir:
+        return None
+    try:
+        return StaticTestFinder(plugin_module, package_dir).find_tests()
+    except AmbiguousSourcesError:
+        return None
+
+
+def get_test_name_resolver(plugin_module: str) -> Callable[[str], str]:
+    """
+    ### Returns a function giving the canonical name of each test of the given plugin.
+
+    A test class re-exported by other modules can be listed under several names. The canonical one
+    is the name after the module defining the class, so every alias of a class resolves to it.
+
+    #### Params:
+    - plugin_module (str): Module name of the plugin.
+
+    #### Returns:
+    - (callable): Function receiving a test name and returning its canonical name, or the same name if it cannot be resolved.
+    """
+    package_dir = discovery_handler.get_package_dir(plugin_module)
+    if not package_dir:
+        return str
+    return functools.lru_cache(maxsize=None)(
+        StaticTestFinder(plugin_module, package_dir).get_canonical_name
+    )
+
+
+class StaticTestFinder:
+    """
+    ### Parses the modules of a plugin on demand to find its test classes.
+
+    Anything that could only be known by running the code, such as conditionally defined test classes,
+    star imports, load_tests functions or base classes coming from outside the plugin, raises AmbiguousSourcesError.
+    """
+
+    def __init__(self, plugin_module: str, package_dir: str):
+        """
+        ### Constructor.
+
+        #### Params:
+        - plugin_module (str): Module name of the plugin.
+        - package_dir (str): Directory of the plugin package.
+        """
+        self.__plugin_module = plugin_module
+        self.__package_dir = package_dir
+        self.__modules = {}
+        self.__test_case_status = {}
+
+    def find_tests(self) -> list[str]:
+        """
+        ### Finds the tests of the plugin.
+
+        #### Returns:
+        - (list[str]): Sorted tests, named as in Scipion's test search.
+        """
+        tests_module = f"{self.__plugin_module}.tests"
+        if not self.__get_module_file(tests_module).endswith("__init__.py"):
+            raise AmbiguousSourcesError
+        tests = set()
+        for module_name in self.__get_loaded_modules(tests_module):
+            module = self.__get_module(module_name)
+            if "load_tests" in {*module.classes, *module.functions, *module.imports}:
+                raise AmbiguousSourcesError
+            for name in [*module.classes, *module.imports]:
+                test = self.__get_test_name(module_name, name)
+                if test:
+                    tests.add(test)
+        return sorted(tests)
+
+    def __get_loaded_modules(self, package_name: str) -> list[str]:
+        """
+        ### Returns the modules unittest's discovery would load from the given package, itself included.
+
+        #### Params:
+        - package_name (str): Name of the package.
+
+        #### Returns:
+        - (list[str]): Names of the loaded modules.
+        """
+        modules = [package_name]
+        package_dir = os.path.dirname(self.__get_module_file(package_name))
+        for entry in sorted(os.listdir(package_dir)):
+            path = os.path.join(package_dir, entry)
+            if os.path.isfile(path):
+                if self.__is_test_module(entry):
+                    modules.append(f"{package_name}.{entry[:-3]}")
+            elif os.path.isfile(os.path.join(path, "__init__.py")):
+                modules.extend(self.__get_loaded_modules(f"{package_name}.{entry}"))
+        return modules
+
+    def __get_test_name(self, module_name: str, name: str) -> str | None:
+        """
+        ### Returns the test name of the class bound to the given name in a module, if it is a test with test methods.
+
+        #### Params:
+        - module_name (str): Name of the module.
+        - name (str): Name bound in the module.
+
+        #### Returns:
+        - (str | None): Test name, or None if the name is not a test class of the plugin.
+        """
+        module = self.__get_module(module_name)
+        if name in module.imports and not module.imports[name][1].startswith("Test"):
+            return None
+        defining_module, class_name = self.__resolve_class(module_name, name)
+        if not defining_module or not class_name.startswith("Test"):
+            return None
+        is_test_case, has_tests = self.__get_test_case_status(
+            defining_module, class_name
+        )
+        if not is_test_case or not has_tests:
+            return None
+        return self.__get_relative_test_name(defining_module, class_name)
+
+    def get_canonical_name(self, test: str) -> str:
+        """
+        ### Returns the name of the given test after the module defining its class, so that every alias of a class gets the same name.
+
+        #### Params:
+        - test (str): Test name, relative to the tests package of the plugin.
+
+        #### Returns:
+        - (str): Canonical test name, or the given one if it cannot be resolved from the sources.
+        """
+        module_name, _, name = f"{self.__plugin_module}.tests.{test}".rpartition(".")
+        try:
+            defining_module, class_name = self.__resolve_class(module_name, name)
+        except AmbiguousSourcesError:
+            return test
+        if not defining_module:
+            return test
+        return self.__get_relative_test_name(defining_module, class_name) or test
+
+    def __get_relative_test_name(self, module_name: str, class_name: str) -> str | None:
+        """
+        ### Returns the test name of a class, relative to the tests package of the plugin as in Scipion's test search.
+
+        #### Params:
+        - module_name (str): Name of the module defining the class.
+        - class_name (str): Name of the class.
+
+        #### Returns:
+        - (str | None): Test name, or None if the module is outside the tests package.
+        """
+        tests_prefix = f"{self.__plugin_module}.tests"
+        if module_name == tests_prefix:
+            return class_name
+        if module_name.startswith(f"{tests_prefix}."):
+            return f"{module_name[len(tests_prefix) + 1:]}.{class_name}"
+        return None
+
+    def __resolve_class(self, module_name: str, name: str) -> tuple[str | None, str]:
+        """
+        ### Follows the imports of the plugin until the module defining the given class.
+
+        #### Params:
+        - module_name (str): Name of the module where the name is bound.
+        - name (str): Name bound in the module.
+
+        #### Returns:
+        - (str | None): Name of the defining module, or None if the name comes from outside the plugin.
+        - (str): Name of the class in its defining module.
+        """
+        visited = set()
+        while (module_name, name) not in visited:
+            visited.add((module_name, name))
+            module = self.__get_module(module_name)
+            if name in module.classes:
+                return module_name, name
+            if name not in module.imports:
+                raise AmbiguousSourcesError
+            source_module, source_name = module.imports[name]
+            if not self.__is_plugin_module(source_module):
+                return None, source_name
+            module_name, name = source_module, source_name
+        raise AmbiguousSourcesError
+
+    def __get_test_case_status(
+        self, module_name: str, class_name: str
+    ) -> tuple[bool, bool]:
+        """
+        ### Checks if the given class is a TestCase and if it has test methods, counting the inherited ones.
+
+        #### Params:
+        - module_name (str): Name of the module defining the class.
+        - class_name (str): Name of the class.
+
+        #### Returns:
+        - (bool): True if the class is a TestCase, False otherwise.
+        - (bool): True if the class has test methods, False otherwise.
+        """
+        key = (module_name, class_name)
+        if key in self.__test_case_status:
+            if self.__test_case_status[key] is None:
+                raise AmbiguousSourcesError
+            return self.__test_case_status[key]
+        self.__test_case_status[key] = None
+        bases, has_tests = self.__get_module(module_name).classes[class_name]
+        is_test_case = False
+        for base in bases:
+            base_is_test_case, base_has_tests = self.__get_base_status(
+                module_name, base
+            )
+            is_test_case = is_test_case or base_is_test_case
+            has_tests = has_tests or base_has_tests
+        self.__test_case_status[key] = (is_test_case, has_tests)
+        return is_test_case, has_tests
+
+    def __get_base_status(self, module_name: str, base: str) -> tuple[bool, bool]:
+        """
+        ### Checks if the given base class is a TestCase and if it has test methods.
+
+        #### Params:
+        - module_name (str): Name of the module where the base class is used.
+        - base (str): Dotted name of the base class, as written in the module.
+
+        #### Returns:
+        - (bool): True if the base class is a TestCase, False otherwise.
+        - (bool): True if the base class has test methods, False otherwise.
+        """
+        if base == "object":
+            return False, False
+        if "." not in base:
+            defining_module, class_name = self.__resolve_class(module_name, base)
+            if defining_module:
+                return self.__get_test_case_status(defining_module, class_name)
+            base = class_name
+        if base.rsplit(".", maxsplit=1)[-1] in TEST_CASE_BASES:
+            return True, False
+        raise AmbiguousSourcesError
+
+    def __get_module(self, module_name: str) -> ParsedModule:
+        """
+        ### Returns the given module of the plugin, parsing it the first time.
+
+        #### Params:
+        - module_name (str): Name of the module.
+
+        #### Returns:
+        - (ParsedModule): Parsed module.
+        """
+        if module_name not in self.__modules:
+            module_file = self.__get_module_file(module_name)
+            try:
+                with open(module_file, encoding="utf-8") as file:
+                    tree = ast.parse(file.read(), filename=module_file)
+            except (OSError, SyntaxError, ValueError):
+                raise AmbiguousSourcesError from None
+            self.__modules[module_name] = ParsedModule(
+                tree, module_name, module_file.endswith("__init__.py")
+            )
+        return self.__modules[module_name]
+
+    def __get_module_file(self, module_name: str) -> str:
+        """
+        ### Returns the source file of the given module of the plugin.
+
+        #### Params:
+        - module_name (str): Name of the module.
+
+        #### Returns:
+        - (str): Path to the module file, or to the __init__.py file of the package.
+        """
+        path = os.path.join(self.__package_dir, *module_name.split(".")[1:])
+        if os.path.isfile(os.path.join(path, "__init__.py")):
+            return os.path.join(path, "__init__.py")
+        if os.path.isfile(f"{path}.py"):
+            return f"{path}.py"
+        raise AmbiguousSourcesError
+
+    def __is_plugin_module(self, module_name: str) -> bool:
+        """
+        ### Checks if the given module belongs to the plugin.
+
+        #### Params:
+        - module_name (str): Name of the module.
+
+        #### Returns:
+        - (bool): True if the module is part of the plugin package, False otherwise.
+        """
+        return module_name == self.__plugin_module or module_name.startswith(
+            f"{self.__plugin_module}."
+        )
+
+    @staticmethod
+    def __is_test_module(file_name: str) -> bool:
+        """
+        ### Checks if unittest's discovery would load the given file as a test module.
+
+        #### Params:
+        - file_name (str): Name of the file.
+
+        #### Returns:
+        - (bool): True if the file is a test module, False otherwise.
+        """
+        return bool(VALID_MODULE_NAME.match(file_name)) and fnmatch.fnmatch(
+            file_name, TEST_MODULE_PATTERN
+        )
+
+
+class ParsedModule:
+    """
+    ### Names a module binds at its top level, as far as test discovery is concerned.
+
+    #### Attributes:
+    - classes (dict[str, tuple[list[str], bool]]): Dotted base names of each class, and whether it defines test methods.
+    - functions (set[str]): Names of the functions.
+    - imports (dict[str, tuple[str, str]]): Source module and original name of each name imported with from-imports.
+    """
+
+    def __init__(self, tree: ast.Module, module_name: str, is_package: bool):
+        """
+        ### Constructor.
+
+        #### Params:
+        - tree (Module): Syntax tree of the module.
+        - module_name (str): Name of the module.
+        - is_package (bool): If True, the module is the __init__.py file of a package.
+        """
+        self.classes = {}
+        self.functions = set()
+        self.imports = {}
+        package = module_name if is_package else module_name.rpartition(".")[0]
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                self.classes[node.name] = (
+                    [self.__get_dotted_name(base) for base in node.bases],
+                    any(
+                        isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                        and item.name.startswith("test")
+                        for item in node.body
+                    ),
+                )
+                self.imports.pop(node.name, None)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions.add(node.name)
+            elif isinstance(node, ast.ImportFrom):
+                self.__add_imports(node, package)
+            elif self.__binds_test_name(node):
+                raise AmbiguousSourcesError
+
+    def __add_imports(self, node: ast.ImportFrom, package: str):
+        """
+        ### Records the names bound by a from-import.
+
+        #### Params:
+        - node (ImportFrom): Import statement.
+        - package (str): Package the module belongs to, used to resolve relative imports.
+        """
+        source = node.module or ""
+        if node.level:
+            parts = package.split(".")
+            if node.level - 1 >= len(parts):
+                raise AmbiguousSourcesError
+            base = ".".join(parts[: len(parts) - node.level + 1])
+            source = f"{base}.{source}" if source else base
+        for alias in node.names:
+            if alias.name == "*":
+                raise AmbiguousSourcesError
+            name = alias.asname or alias.name
+            self.imports[name] = (source, alias.name)
+            self.classes.pop(name, None)
+
+    def __get_dotted_name(self, node: ast.expr) -> str:
+        """
+        ### Returns the dotted name of a base class expression.
+
+        #### Params:
+        - node (expr): Base class expression.
+
+        #### Returns:
+        - (str): Dotted name, such as unittest.TestCase.
+        """
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return f"{self.__get_dotted_name(node.value)}.{node.attr}"
+        raise AmbiguousSourcesError
+
+    @staticmethod
+    def __binds_test_name(node: ast.stmt) -> bool:
+        """
+        ### Checks if a top-level statement could bind a test class in a way that cannot be followed statically.
+
+        #### Params:
+        - node (stmt): Top-level statement.
+
+        #### Returns:
+        - (bool): True if the statement binds a name starting with Test, or if it is a compound statement that does.
+        """
+        for child in ast.walk(node):
+            if isinstance(child, ast.ClassDef) and child.name.startswith("Test"):
+                return True
+            if (
+                isinstance(child, ast.Name)
+                and isinstance(child.ctx, ast.Store)
+                and child.id.startswith("Test")
+            ):
+                return True
+            if isinstance(child, ast.alias) and (
+                (child.asname or child.name).startswith("Test") or child.name == "*"
+            ):
+                return True
+        return False
@@ -0,0 +1,222 @@
+"""### Matching of test names against the exact names, glob and regex patterns of the test configuration."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+
+REGEX_PREFIX = "re:"
+__GLOB_CHARACTERS = frozenset("*?[")
+__DEFAULT_FLAGS = re.compile("").flags
+
+
+def is_pattern(entry: str) -> bool:
+    """
+    ### Checks if a test entry of the configuration is a pattern rather than an exact test name.
+
+    Entries starting with "re:" are regular expressions, and entries containing "*", "?" or "[" are glob patterns.
+
+    #### Params:
+    - entry (str): Test entry of the configuration.
+
+    #### Returns:
+    - (bool): True if the entry is a pattern, False otherwise.
+    """
+    return entry.startswith(REGEX_PREFIX) or not __GLOB_CHARACTERS.isdisjoint(entry)
+
+
+def get_pattern_error(entry: str) -> str | None:
+    """
+    ### Returns why the given test entry cannot be used, if it is a regex entry that cannot be compiled.
+
+    Regular expressions with named groups are rejected, as their names could clash once combined with the others.
+
+    #### Params:
+    - entry (str): Test entry of the configuration.
+
+    #### Returns:
+    - (str | None): Description of the problem, or None if the entry can be used.
+    """
+    if not entry.startswith(REGEX_PREFIX):
+        return None
+    try:
+        if re.compile(entry[len(REGEX_PREFIX) :]).groupindex:
+            return f"regular expression '{entry}' cannot have named groups"
+    except re.error as e:
+        return f"invalid regular expression '{entry}': {e}"
+    return None
+
+
+def get_invalid_patterns(entries: list[str]) -> list[str]:
+    """
+    ### Returns the regex entries that cannot be used.
+
+    #### Params:
+    - entries (list[str]): Test entries of the configuration.
+
+    #### Returns:
+    - (list[str]): Entries that are not valid regular expressions.
+    """
+    return [entry for entry in entries if get_pattern_error(entry)]
+
+
+def get_test_matcher(rules: list[list[str]]) -> TestMatcher:
+    """
+    ### Returns a matcher finding the first of the given rules that matches each test.
+
+    Every pattern of every rule is compiled once into a single regular expression with one group per rule.
+    Regex entries with capturing groups or inline global flags are compiled on their own instead,
+    since their group references and flags would change their meaning inside the combined expression.
+
+    #### Params:
+    - rules (list[list[str]]): Test entries of each rule, in priority order. Invalid regex entries are ignored.
+
+    #### Returns:
+    - (TestMatcher): Matcher for the rules.
+    """
+    exact_rules = {}
+    alternatives = []
+    group_rules = {}
+    standalone_rules = []
+    n_groups = 0
+    for index, entries in enumerate(rules):
+        invalid_patterns = set(get_invalid_patterns(entries))
+        patterns = []
+        for entry in entries:
+            if not is_pattern(entry):
+                exact_rules.setdefault(entry, index)
+            elif entry in invalid_patterns:
+                continue
+            elif __must_compile_alone(entry):
+                standalone_rules.append((re.compile(entry[len(REGEX_PREFIX) :]), index))
+            else:
+                patterns.append(__get_regex(entry))
+        if patterns:
+            regex = f"({'|'.join(patterns)})"
+            n_groups += 1
+            group_rules[n_groups] = index
+            n_groups += re.compile(regex).groups - 1
+            alternatives.append(regex)
+    return TestMatcher(
+        exact_rules,
+        re.compile("|".join(alternatives)) if alternatives else None,
+        group_rules,
+        standalone_rules,
+    )
+
+
+class TestMatcher:
+    """
+    ### Finds the first rule matching each test among rules made of exact names and patterns.
+
+    Exact names are looked up in a dictionary and patterns are matched with a single regular expression,
+    so each test is checked against all the rules in one pass. The few patterns that cannot be combined
+    are only tried while they could belong to an earlier rule than the one already found.
+    """
+
+    __test__ = False
+
+    def __init__(
+        self,
+        exact_rules: dict[str, int],
+        regex: re.Pattern | None,
+        group_rules: dict[int, int],
+        standalone_rules: list[tuple[re.Pattern, int]] | None = None,
+    ):
+        """
+        ### Constructor.
+
+        #### Params:
+        - exact_rules (dict[str, int]): First rule listing each exact test name.
+        - regex (re.Pattern | None): Combined regular expression of the patterns, if there are any.
+        - group_rules (dict[int, int]): Rule each outer group of the regular expression belongs to.
+        - standalone_rules (list[tuple[re.Pattern, int]] | None): Optional. Patterns compiled on their own, along with their rule.
+        """
+        self.__exact_rules = exact_rules
+        self.__regex = regex
+        self.__group_rules = group_rules
+        self.__standalone_rules = sorted(
+            standalone_rules or [], key=lambda standalone_rule: standalone_rule[1]
+        )
+
+    def __contains__(self, test: str) -> bool:
+        """
+        ### Checks if any rule matches the given test.
+
+        #### Params:
+        - test (str): Name of the test.
+
+        #### Returns:
+        - (bool): True if the test matches a rule, False otherwise.
+        """
+        return self.match(test) is not None
+
+    def match(self, test: str) -> int | None:
+        """
+        ### Returns the first rule matching the given test.
+
+        #### Params:
+        - test (str): Name of the test.
+
+        #### Returns:
+        - (int | None): Index of the rule, or None if no rule matches the test.
+        """
+        index = self.__exact_rules.get(test)
+        match = self.__regex.fullmatch(test) if self.__regex else None
+        if match is not None:
+            pattern_index = self.__group_rules[match.lastindex]
+            index = pattern_index if index is None else min(index, pattern_index)
+        for regex, standalone_index in self.__standalone_rules:
+            if index is not None and standalone_index >= index:
+                break
+            if regex.fullmatch(test):
+                return standalone_index
+        return index
+
+    def get_matches(self, tests: list[str]) -> dict[str, int]:
+        """
+        ### Returns the first rule matching each of the given tests.
+
+        #### Params:
+        - tests (list[str]): Names of the tests.
+
+        #### Returns:
+        - (dict[str, int]): Index of the rule matching each test, in the order of the tests. Tests matching no rule are left out.
+        """
+        matches = {}
+        for test in tests:
+            index = self.match(test)
+            if index is not None:
+                matches[test] = index
+        return matches
+
+
+def __must_compile_alone(entry: str) -> bool:
+    """
+    ### Checks if a valid pattern entry has to be compiled on its own rather than inside the combined expression.
+
+    #### Params:
+    - entry (str): Glob or regex pattern.
+
+    #### Returns:
+    - (bool): True if the entry is a regex with capturing groups or inline global flags, False otherwise.
+    """
+    if not entry.startswith(REGEX_PREFIX):
+        return False
+    regex = re.compile(entry[len(REGEX_PREFIX) :])
+    return bool(regex.groups) or regex.flags != __DEFAULT_FLAGS
+
+
+def __get_regex(entry: str) -> str:
+    """
+    ### Returns the regular expression matching the same tests as the given pattern.
+
+    #### Params:
+    - entry (str): Glob or regex pattern.
+
+    #### Returns:
+    - (str): Regular expression to be matched against the whole test name.
+    """
+    if entry.startswith(REGEX_PREFIX):
+        return f"(?:{entry[len(REGEX_PREFIX) :]})"
+    return f"(?:{fnmatch.translate(entry)})"
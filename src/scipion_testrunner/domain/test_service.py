@@ -2,370 +2,1282 @@
 
 from __future__ import annotations
 
+import functools
+import math
+import os
 import sys
+import threading
+from typing import Callable
 
 from scipion_testrunner.application.logger import logger
 from scipion_testrunner.configuration import test_config, test_data_keys
-from scipion_testrunner.domain.handlers import python_handler, scipion_handler
+from scipion_testrunner.configuration.test_config import TestConfig
+from scipion_testrunner.domain import (
+    dependency_graph,
+    packing,
+    resources,
+    sharding,
+    splitting,
+    static_discovery,
+    test_matcher,
+    worker,
+)
+from scipion_testrunner.domain.catalog import (
+    FAILED_STATUS,
+    PASSED_STATUS,
+    SKIPPED_STATUS,
+    TestCatalog,
+)
+from scipion_testrunner.domain.coordinator import Coordinator
+from scipion_testrunner.domain.executor import Executor, PoolStats
+from scipion_testrunner.domain.handlers import (
+    discovery_handler,
+    history_handler,
+    module_handler,
+    python_handler,
+    scipion_handler,
+)
+from scipion_testrunner.domain.pipeline import DiscoveryPipeline
+from scipion_testrunner.domain.resources import Resources
+from scipion_testrunner.domain.run_options import POOL_ENGINE, RunOptions
+from scipion_testrunner.domain.scheduler import DependencyScheduler
+from scipion_testrunner.domain.test_matcher import TestMatcher
 
 SCIPION_PARAM_NAME = "scipion"
 PLUGIN_PARAM_NAME = "plugin"
 JOBS_PARAM_NAME = "jobs"
 NO_GPU_PARAM_NAME = "noGpu"
 TEST_DATA_PARAM_NAME = "testData"
-
-
-def test_scipion_plugin(args: dict):
+PROFILE_PARAM_NAME = "profile"
+CACHE_DIR_PARAM_NAME = "cacheDir"
+DEFAULT_DURATION_PARAM_NAME = "defaultDuration"
+SHARD_PARAM_NAME = "shard"
+SHARD_DURATIONS_PARAM_NAME = "shardDurations"
+COORDINATOR_PARAM_NAME = "coordinator"
+WORKER_PARAM_NAME = "worker"
+FORK_SERVER_PARAM_NAME = "forkServer"
+PACK_THRESHOLD_PARAM_NAME = "packThreshold"
+PACK_SIZE_PARAM_NAME = "packSize"
+SPLIT_THRESHOLD_PARAM_NAME = "splitThreshold"
+SPLIT_TESTS_PARAM_NAME = "splitTests"
+TIMEOUT_PARAM_NAME = "timeout"
+FAIL_FAST_PARAM_NAME = "failFast"
+LOG_DIR_PARAM_NAME = "logDir"
+OUTPUT_TAIL_PARAM_NAME = "outputTail"
+ENGINE_PARAM_NAME = "engine"
+REFRESH_DISCOVERY_PARAM_NAME = "refreshDiscovery"
+DISCOVERY_PARAM_NAME = "discovery"
+CPUS_PARAM_NAME = "cpus"
+MEMORY_PARAM_NAME = "memory"
+GPUS_PARAM_NAME = "gpus"
+__GPU_SKIP_REASON = "Needs GPU"
+
+
+def test_scipion_plugin(args: dict):  # noqa: PLR0912, PLR0914, PLR0915
     """
     ### Handles the full test execution of a Scipion plugin.
 
     #### Params:
     - args (dict): Dictionary containing all the command-line args.
     """
-    tests = scipion_handler.get_all_tests(
-        args[SCIPION_PARAM_NAME], args[PLUGIN_PARAM_NAME]
-    )
-    if not tests:
-        logger.log_warning(
-            f"Module {args[PLUGIN_PARAM_NAME]} has not tests. Nothing to run."
+    if args[WORKER_PARAM_NAME]:
+        worker.run_worker(
+            args[WORKER_PARAM_NAME],
+            args[SCIPION_PARAM_NAME],
+            args[PLUGIN_PARAM_NAME],
+            args[JOBS_PARAM_NAME],
         )
-        sys.exit(0)
-    data_sets, skippable_tests, tests_with_deps = test_config.get_test_config(
-        args[TEST_DATA_PARAM_NAME]
+        return
+    config = __get_test_config(args)
+    data_sets, skippable_tests, tests_with_deps = (
+        config.data_sets,
+        config.skippable_tests,
+        config.tests_with_deps,
     )
-    tests = __remove_skippable_tests(tests, skippable_tests, args[NO_GPU_PARAM_NAME])
-    tests, tests_with_deps = __remove_circular_dependencies(tests, tests_with_deps)
-    tests, tests_with_deps = __remove_unmet_internal_dependency_tests(
-        tests, tests_with_deps
+    history_file = history_handler.get_history_file_path(
+        args[CACHE_DIR_PARAM_NAME], args[PLUGIN_PARAM_NAME]
     )
-    if not tests:
-        logger.log_warning("There are no tests left. Nothing to run.")
-        sys.exit(0)
-    if data_sets:
-        scipion_handler.download_datasets(args[SCIPION_PARAM_NAME], data_sets)
-    tests, test_batches = __generate_sorted_test_batches(tests, tests_with_deps)
-    failed_tests = scipion_handler.run_tests(
-        args[SCIPION_PARAM_NAME],
-        tests.copy(),
-        test_batches,
-        args[JOBS_PARAM_NAME],
-        args[PLUGIN_PARAM_NAME],
+    durations = history_handler.get_test_durations(history_file)
+    options = RunOptions(
+        fork_server=args[FORK_SERVER_PARAM_NAME],
+        timeout=args[TIMEOUT_PARAM_NAME],
+        test_timeouts=config.test_timeouts,
+        fail_fast=args[FAIL_FAST_PARAM_NAME],
+        log_dir=args[LOG_DIR_PARAM_NAME]
+        or os.path.join(args[CACHE_DIR_PARAM_NAME], "logs", args[PLUGIN_PARAM_NAME]),
+        output_tail_size=args[OUTPUT_TAIL_PARAM_NAME] * 1024,
+        engine=args[ENGINE_PARAM_NAME],
+    )
+    executor = Executor(test_jobs=args[JOBS_PARAM_NAME])
+    wait_module_check = __start_module_check(args, skippable_tests)
+    finished = False
+    try:
+        pipeline = None
+        if __can_start_tests_during_discovery(args, config.test_resources):
+            if data_sets:
+                scipion_handler.download_datasets(
+                    args[SCIPION_PARAM_NAME], data_sets, executor
+                )
+                data_sets = []
+            pipeline = DiscoveryPipeline(
+                args[SCIPION_PARAM_NAME],
+                args[PLUGIN_PARAM_NAME],
+                executor,
+                options,
+                functools.partial(
+                    __can_start_test_during_discovery,
+                    args,
+                    __get_held_tests(
+                        skippable_tests, tests_with_deps, args[NO_GPU_PARAM_NAME]
+                    ),
+                    durations,
+                ),
+            )
+        tests = __get_all_tests(args, on_test=pipeline.add_test if pipeline else None)
+        if not tests:
+            logger.log_warning(
+                f"Module {args[PLUGIN_PARAM_NAME]} has not tests. Nothing to run."
+            )
+            sys.exit(0)
+        estimates = __get_test_estimates(
+            tests, durations, args[DEFAULT_DURATION_PARAM_NAME]
+        )
+        if args[SHARD_PARAM_NAME]:
+            tests = __get_shard_tests(
+                tests,
+                tests_with_deps,
+                __get_shard_estimates(args, tests),
+                *args[SHARD_PARAM_NAME],
+            )
+        catalog = __remove_skippable_tests(
+            TestCatalog(tests, tests_with_deps),
+            skippable_tests,
+            args[NO_GPU_PARAM_NAME],
+            wait_module_check(),
+        )
+        catalog, tests_with_deps = __remove_circular_dependencies(
+            catalog, tests_with_deps
+        )
+        catalog, tests_with_deps = __remove_unmet_internal_dependency_tests(
+            catalog, tests_with_deps
+        )
+        if not catalog:
+            logger.log_warning("There are no tests left. Nothing to run.")
+            sys.exit(0)
+        scheduled_tests = (
+            pipeline.get_pending_tests(catalog.get_tests())
+            if pipeline
+            else catalog.get_tests()
+        )
+        test_classes = {}
+        if args[SPLIT_THRESHOLD_PARAM_NAME] or args[SPLIT_TESTS_PARAM_NAME]:
+            scheduled_tests, tests_with_deps, estimates, test_classes = (
+                __split_long_tests(
+                    args, scheduled_tests, tests_with_deps, estimates, durations
+                )
+            )
+        if args[PACK_THRESHOLD_PARAM_NAME] and not args[COORDINATOR_PARAM_NAME]:
+            scheduled_tests, estimates = __pack_short_tests(
+                args, scheduled_tests, tests_with_deps, estimates
+            )
+        capacity = __get_resource_capacity(args, config.test_resources)
+        on_finished = functools.partial(
+            __record_test_duration,
+            history_file,
+            durations=durations,
+            split_durations=__get_split_durations(test_classes),
+        )
+        scheduler = DependencyScheduler(
+            scheduled_tests,
+            tests_with_deps,
+            estimates=estimates,
+            on_finished=on_finished,
+            demands=(
+                __get_test_demands(scheduled_tests, config.test_resources, capacity)
+                if capacity is not None
+                else None
+            ),
+            capacity=capacity,
+        )
+        failed_tests = (
+            __run_tests(args, scheduler, data_sets, options, executor)
+            if scheduled_tests
+            else []
+        )
+        if pipeline:
+            failed_tests = pipeline.wait(on_finished=on_finished) + failed_tests
+        finished = True
+    finally:
+        if finished:
+            executor.close()
+        else:
+            executor.terminate()
+    __log_pool_stats(executor.get_stats())
+    failed_tests = list(
+        dict.fromkeys(test_classes.get(test, test) for test in failed_tests)
+    )
+    catalog.set_results(
+        failed_tests,
+        __get_skipped_tests(scheduler.get_skipped_tests(), test_classes, failed_tests),
+        scheduler.get_durations(),
     )
-    __log_result_summary(__get_sorted_results(tests, failed_tests))
+    __log_result_summary(__get_sorted_results(catalog))
     if failed_tests:
         logger.log_error("Some tests ended with errors. Exiting.")
     logger(logger.green("\nAll test passed!"))
 
 
-def __find_circular_dependency(
-    test_name: str, tests_with_deps: dict[str, list[str]], path: list[str] | None = None
+def __get_test_config(args: dict) -> TestConfig:
+    """
+    ### Returns the test configuration, with every test named as the discovered ones.
+
+    Test names in the configuration can be any alias of a test class, so they are replaced
+    by the canonical name of the class before being matched against the discovered tests.
+    Glob and regex patterns of skippable tests are kept as they are.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+
+    #### Returns:
+    - (TestConfig): Test configuration with the canonical test names.
+    """
+    config = test_config.get_test_config(
+        args[TEST_DATA_PARAM_NAME],
+        args[CACHE_DIR_PARAM_NAME],
+        args[PROFILE_PARAM_NAME],
+    )
+    resolve = static_discovery.get_test_name_resolver(args[PLUGIN_PARAM_NAME])
+    resolve_entry = functools.partial(__resolve_test_entry, resolve)
+    skippable_tests = {**config.skippable_tests}
+    if test_data_keys.SKIPPABLE_GPU_KEY in skippable_tests:
+        skippable_tests[test_data_keys.SKIPPABLE_GPU_KEY] = [
+            resolve_entry(test)
+            for test in skippable_tests[test_data_keys.SKIPPABLE_GPU_KEY]
+        ]
+    if test_data_keys.SKIPPABLE_DEPENDENCIES_KEY in skippable_tests:
+        skippable_tests[test_data_keys.SKIPPABLE_DEPENDENCIES_KEY] = [
+            {
+                **dependency,
+                test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: [
+                    resolve_entry(test)
+                    for test in dependency.get(
+                        test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, []
+                    )
+                ],
+            }
+            for dependency in skippable_tests[test_data_keys.SKIPPABLE_DEPENDENCIES_KEY]
+        ]
+    if test_data_keys.SKIPPABLE_OTHERS_KEY in skippable_tests:
+        skippable_tests[test_data_keys.SKIPPABLE_OTHERS_KEY] = [
+            (
+                {
+                    **other_test,
+                    test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: resolve_entry(
+                        other_test[test_data_keys.SKIPPABLE_OTHERS_TEST_KEY]
+                    ),
+                }
+                if other_test.get(test_data_keys.SKIPPABLE_OTHERS_TEST_KEY)
+                else other_test
+            )
+            for other_test in skippable_tests[test_data_keys.SKIPPABLE_OTHERS_KEY]
+        ]
+    resolved_deps = {}
+    for test, deps in config.tests_with_deps.items():
+        resolved_deps.setdefault(resolve(test), []).extend(resolve(dep) for dep in deps)
+    return TestConfig(
+        config.data_sets,
+        skippable_tests,
+        resolved_deps,
+        {resolve(test): timeout for test, timeout in config.test_timeouts.items()},
+        {
+            resolve(test): test_resources
+            for test, test_resources in config.test_resources.items()
+        },
+    )
+
+
+def __resolve_test_entry(resolve: Callable[[str], str], entry: str) -> str:
+    """
+    ### Returns the canonical name of a test entry of the configuration, unless it is a pattern.
+
+    #### Params:
+    - resolve (callable): Function receiving a test name and returning its canonical name.
+    - entry (str): Test entry of the configuration.
+
+    #### Returns:
+    - (str): Canonical name of the test, or the same entry if it is a pattern.
+    """
+    return entry if test_matcher.is_pattern(entry) else resolve(entry)
+
+
+def __get_skippable_entries(skippable_tests: dict) -> list[list[str]]:
+    """
+    ### Returns the test entries of every skippable section, grouped as they are listed.
+
+    #### Params:
+    - skippable_tests (dict): Dictionary containing the different types of skippable tests.
+
+    #### Returns:
+    - (list[list[str]]): GPU-based test entries, followed by the entries of each dependency and each other test.
+    """
+    return [
+        skippable_tests.get(test_data_keys.SKIPPABLE_GPU_KEY, []),
+        *(
+            dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, [])
+            for dependency in skippable_tests.get(
+                test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, []
+            )
+        ),
+        *(
+            [other_test[test_data_keys.SKIPPABLE_OTHERS_TEST_KEY]]
+            for other_test in skippable_tests.get(
+                test_data_keys.SKIPPABLE_OTHERS_KEY, []
+            )
+            if other_test.get(test_data_keys.SKIPPABLE_OTHERS_TEST_KEY)
+        ),
+    ]
+
+
+def __start_module_check(
+    args: dict, skippable_tests: dict
+) -> Callable[[], dict[str, bool]]:
+    """
+    ### Starts checking the modules the skippable tests depend on, so the check overlaps with test discovery.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - skippable_tests (dict): Dictionary containing the different types of skippable tests.
+
+    #### Returns:
+    - (callable): Waits for the check to finish and returns whether each module exists.
+    """
+    module_names = list(
+        dict.fromkeys(
+            dependency[test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY]
+            for dependency in skippable_tests.get(
+                test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, []
+            )
+            if dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY)
+        )
+    )
+    existing_modules = {}
+    check = threading.Thread(
+        target=lambda: existing_modules.update(
+            __get_existing_modules(args[CACHE_DIR_PARAM_NAME], module_names)
+        ),
+        daemon=True,
+    )
+    check.start()
+    return functools.partial(__wait_module_check, check, existing_modules)
+
+
+def __get_existing_modules(cache_dir: str, module_names: list[str]) -> dict[str, bool]:
+    """
+    ### Returns whether each given module exists, checking in a single process only the ones missing from the cache.
+
+    The module search path of the Python executable that checks them is also cached, so that executable
+    only starts when the environment changed. The cache is not used if the search path cannot be obtained.
+
+    #### Params:
+    - cache_dir (str): Path to the cache directory.
+    - module_names (list[str]): Names of the Python modules.
+
+    #### Returns:
+    - (dict[str, bool]): True for each module that exists, False otherwise.
+    """
+    if not module_names:
+        return {}
+    module_file = module_handler.get_module_file_path(cache_dir)
+    cached_search_path = module_handler.get_cached_search_path(module_file)
+    search_path = (
+        cached_search_path
+        if cached_search_path is not None
+        else python_handler.get_python_search_path()
+    )
+    if search_path is None:
+        return python_handler.get_existing_python_modules(module_names)
+    fingerprint = module_handler.get_fingerprint(search_path)
+    existing_modules = module_handler.get_cached_modules(module_file, fingerprint)
+    unchecked_modules = [
+        module_name
+        for module_name in module_names
+        if module_name not in existing_modules
+    ]
+    if unchecked_modules:
+        existing_modules.update(
+            python_handler.get_existing_python_modules(unchecked_modules)
+        )
+    if unchecked_modules or cached_search_path is None:
+        module_handler.record_modules(
+            module_file, fingerprint, existing_modules, search_path
+        )
+    return {module_name: existing_modules[module_name] for module_name in module_names}
+
+
+def __wait_module_check(
+    check: threading.Thread, existing_modules: dict[str, bool]
+) -> dict[str, bool]:
+    """
+    ### Waits for the module check to finish.
+
+    #### Params:
+    - check (Thread): Thread checking the modules.
+    - existing_modules (dict[str, bool]): Results filled in by the thread.
+
+    #### Returns:
+    - (dict[str, bool]): True for each checked module that exists, False otherwise.
+    """
+    check.join()
+    return existing_modules
+
+
+def __get_all_tests(
+    args: dict, on_test: Callable[[str], None] | None = None
+) -> list[str]:
+    """
+    ### Returns the tests of the plugin, from the discovery cache if the plugin has not changed since they were cached.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - on_test (callable): Optional. Called with each test as soon as Scipion's test search finds it.
+
+    #### Returns:
+    - (list[str]): Tests of the plugin.
+    """
+    fingerprint = discovery_handler.get_fingerprint(
+        args[SCIPION_PARAM_NAME], args[PLUGIN_PARAM_NAME]
+    )
+    if not fingerprint:
+        return __discover_tests(args, on_test=on_test)
+    discovery_file = discovery_handler.get_discovery_file_path(
+        args[CACHE_DIR_PARAM_NAME], args[PLUGIN_PARAM_NAME]
+    )
+    if (
+        not args[REFRESH_DISCOVERY_PARAM_NAME]
+        and args[DISCOVERY_PARAM_NAME] != static_discovery.CHECK_DISCOVERY
+    ):
+        tests = discovery_handler.get_cached_tests(discovery_file, fingerprint)
+        if tests:
+            logger(
+                logger.blue(
+                    f"Using the {len(tests)} cached tests of {args[PLUGIN_PARAM_NAME]}. Use --{REFRESH_DISCOVERY_PARAM_NAME} to discover them again."
+                )
+            )
+            return tests
+    tests = __discover_tests(args, on_test=on_test)
+    if tests:
+        discovery_handler.record_tests(discovery_file, fingerprint, tests)
+    return tests
+
+
+def __discover_tests(
+    args: dict, on_test: Callable[[str], None] | None = None
 ) -> list[str]:
     """
-    ### Returns a list of all the tests involved in a circular dependency path.
+    ### Discovers the tests of the plugin with the selected discovery mode.
+
+    Static discovery falls back to Scipion when the sources of the plugin are ambiguous,
+    and the check mode compares both methods, keeping Scipion's result.
+    Every test is named after the module defining its class, so a class listed under several names runs once.
 
     #### Params:
-    - test (str): Name of the test being checked for a circular dependency.
-    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests that depend on other tests.
-    - path (list[str]): Optional. List of tests that might form a circular dependency.
+    - args (dict): Dictionary containing all the command-line args.
+    - on_test (callable): Optional. Called with the canonical name of each test as soon as Scipion's test search finds it.
 
     #### Returns:
-    - (list[str]): List with all the tests forming a circular path.
+    - (list[str]): Tests of the plugin.
+    """
+    mode = args[DISCOVERY_PARAM_NAME]
+    static_tests = None
+    if mode != static_discovery.SCIPION_DISCOVERY:
+        static_tests = static_discovery.find_tests(args[PLUGIN_PARAM_NAME])
+        if mode == static_discovery.STATIC_DISCOVERY and static_tests:
+            return static_tests
+        if not static_tests:
+            logger.log_warning(
+                f"Could not find the tests of {args[PLUGIN_PARAM_NAME]} statically. Discovering them with Scipion..."
+            )
+    resolve = static_discovery.get_test_name_resolver(args[PLUGIN_PARAM_NAME])
+    tests = __merge_test_aliases(
+        scipion_handler.get_all_tests(
+            args[SCIPION_PARAM_NAME],
+            args[PLUGIN_PARAM_NAME],
+            on_test=(
+                functools.partial(__handle_discovered_test, resolve, on_test)
+                if on_test
+                else None
+            ),
+        ),
+        resolve,
+    )
+    if mode == static_discovery.CHECK_DISCOVERY and static_tests:
+        __log_discovery_differences(static_tests, tests)
+    return tests
+
+
+def __handle_discovered_test(
+    resolve: Callable[[str], str], on_test: Callable[[str], None], test: str
+):
     """
-    path = [] if path is None else path
+    ### Hands over the canonical name of a test as soon as it is discovered.
+
+    #### Params:
+    - resolve (callable): Function returning the canonical name of a test.
+    - on_test (callable): Called with the canonical name of the test.
+    - test (str): Discovered test name.
+    """
+    on_test(resolve(test))
 
-    if test_name in path:
-        return path[path.index(test_name) :] + [test_name]
-    path.append(test_name)
 
-    for dep in tests_with_deps.get(test_name, []):
-        circular_path = __find_circular_dependency(
-            dep, tests_with_deps, path=path.copy()
+def __merge_test_aliases(tests: list[str], resolve: Callable[[str], str]) -> list[str]:
+    """
+    ### Replaces every test name by its canonical one, keeping a single entry for the names of the same class.
+
+    #### Params:
+    - tests (list[str]): Discovered test names.
+    - resolve (callable): Function returning the canonical name of a test.
+
+    #### Returns:
+    - (list[str]): Canonical test names, in the order they were first discovered.
+    """
+    merged_tests = list(dict.fromkeys(resolve(test) for test in tests))
+    if len(merged_tests) < len(tests):
+        logger(
+            logger.blue(
+                f"Merged {len(tests) - len(merged_tests)} tests discovered under several names with the module defining their class."
+            )
         )
-        if circular_path:
-            return circular_path
-    return []
+    return merged_tests
 
 
-def __generate_sorted_test_batches(
-    tests: list[str], tests_with_deps: dict[str, list[str]]
-) -> tuple[list[str], list[list[str]]]:
+def __log_discovery_differences(static_tests: list[str], scipion_tests: list[str]):
     """
-    ### Generates the list of test batches to be executed in order.
+    ### Prints the tests that only one of the discovery methods found.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
+    - static_tests (list[str]): Tests found by static discovery.
+    - scipion_tests (list[str]): Tests found by Scipion.
+    """
+    only_static = sorted(set(static_tests) - set(scipion_tests))
+    only_scipion = sorted(set(scipion_tests) - set(static_tests))
+    if not only_static and not only_scipion:
+        logger(
+            logger.green(
+                f"Static discovery found the same {len(set(scipion_tests))} tests as Scipion."
+            )
+        )
+        return
+    for title, tests in (
+        ("Only found by static discovery", only_static),
+        ("Only found by Scipion", only_scipion),
+    ):
+        if tests:
+            logger(logger.red(f"{title}:\n" + "\n".join(f"  {test}" for test in tests)))
+
+
+def __can_start_tests_during_discovery(
+    args: dict, test_resources: dict[str, dict[str, float]]
+) -> bool:
+    """
+    ### Checks if tests can start before the full test list is known.
+
+    Sharding, coordinating remote workers, stopping at the first failure and limiting the resources
+    of the running tests need the full list before running anything, and only the default engine runs tests this way.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
+
+    #### Returns:
+    - (bool): True if independent tests can start while they are discovered, False otherwise.
+    """
+    return (
+        not args[SHARD_PARAM_NAME]
+        and not args[COORDINATOR_PARAM_NAME]
+        and not args[FAIL_FAST_PARAM_NAME]
+        and not args[FORK_SERVER_PARAM_NAME]
+        and args[ENGINE_PARAM_NAME] == POOL_ENGINE
+        and not __limits_resources(args, test_resources)
+    )
+
+
+def __get_held_tests(
+    skippable_tests: dict, tests_with_deps: dict[str, list[str]], no_gpu: bool
+) -> TestMatcher:
+    """
+    ### Returns the tests that must wait for the full test list, because they could be skipped or have dependencies.
+
+    #### Params:
+    - skippable_tests (dict): Dictionary containing the different types of skippable tests.
     - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - no_gpu (bool): If True, GPU-based tests are skipped.
 
     #### Returns:
-    - (list[str]): All remaining independent tests.
-    - (list[list[str]]): List of test batches.
+    - (TestMatcher): Matcher for the tests that cannot start during discovery.
+    """
+    held_tests = []
+    for test, deps in tests_with_deps.items():
+        held_tests.extend([test, *deps])
+    skippable_entries = __get_skippable_entries(skippable_tests)
+    for entries in skippable_entries if no_gpu else skippable_entries[1:]:
+        held_tests.extend(entries)
+    return test_matcher.get_test_matcher([held_tests])
+
+
+def __can_start_test_during_discovery(
+    args: dict,
+    held_tests: TestMatcher,
+    durations: dict[str, float],
+    test: str,
+) -> bool:
     """
-    test_batches = []
-    while tests_with_deps:
-        batch = __get_test_batch(tests_with_deps)
-        if not batch:
-            break
-        test_batches.append(batch)
-        for test in batch:
-            del tests_with_deps[test]
-            if test in tests:
-                tests.remove(test)
-    return tests, test_batches
+    ### Checks if a discovered test can start before the full test list is known.
+
+    Tests that would be split into their methods or packed with others wait for the full list.
 
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - held_tests (TestMatcher): Matcher for the tests that cannot start during discovery.
+    - durations (dict[str, float]): Expected duration in seconds of the tests present in the history.
+    - test (str): Discovered test.
 
-def __get_test_batch(test_with_deps: dict[str, list[str]]) -> list[str]:
+    #### Returns:
+    - (bool): True if the test can start right away, False otherwise.
+    """
+    if test in held_tests:
+        return False
+    estimates = __get_test_estimates(
+        [test], durations, args[DEFAULT_DURATION_PARAM_NAME]
+    )
+    if splitting.get_split_candidates(
+        [test],
+        estimates,
+        args[SPLIT_THRESHOLD_PARAM_NAME],
+        args[SPLIT_TESTS_PARAM_NAME],
+    ):
+        return False
+    return not (
+        args[PACK_THRESHOLD_PARAM_NAME]
+        and estimates[test] <= args[PACK_THRESHOLD_PARAM_NAME]
+    )
+
+
+def __limits_resources(args: dict, test_resources: dict[str, dict[str, float]]) -> bool:
     """
-    ### Returns the next test batch to run given the dependencies between them.
+    ### Checks if the resources of the locally running tests are limited.
+
+    Resources are only limited when some test has resource hints or some capacity is given in the command line.
+    Remote workers have their own resources, so they are never limited when acting as a coordinator.
 
     #### Params:
-    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests that depend on other tests.
+    - args (dict): Dictionary containing all the command-line args.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
 
     #### Returns:
-    - (list[str]): Next test batch to run.
+    - (bool): True if the running tests must fit in the available resources, False otherwise.
     """
-    batch = []
-    for test, deps in test_with_deps.items():
-        if not any(key in deps for key in test_with_deps):
-            batch.append(test)
-    return batch
+    return not args[COORDINATOR_PARAM_NAME] and bool(
+        test_resources
+        or any(
+            args[param_name] is not None
+            for param_name in (CPUS_PARAM_NAME, MEMORY_PARAM_NAME, GPUS_PARAM_NAME)
+        )
+    )
 
 
-def __get_sorted_results(
-    tests: list[str], failed_tests: list[str]
-) -> dict[str, list[str]]:
+def __get_resource_capacity(
+    args: dict, test_resources: dict[str, dict[str, float]]
+) -> Resources | None:
     """
-    ### Groups the passed/failed test results by origin file.
+    ### Returns the resources the locally running tests can use at the same time.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
-    - failed_tests (list[str]): Names of the tests that failed.
+    - args (dict): Dictionary containing all the command-line args.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
 
     #### Returns:
-    - (dict[str, list[str]]): Tests grouped by origin file.
+    - (Resources | None): Available resources, or None if they are not limited.
     """
-    passed_name = "passed"
-    failed_name = "failed"
-    results = {}
-    for origin_file, test_group in __group_tests_by_file(tests).items():
-        results[origin_file] = {failed_name: [], passed_name: []}
-        for test in test_group:
-            destination_list = (
-                failed_name if f"{origin_file}.{test}" in failed_tests else passed_name
+    if not __limits_resources(args, test_resources):
+        return None
+    capacity = resources.get_system_capacity(
+        args[CPUS_PARAM_NAME], args[MEMORY_PARAM_NAME], args[GPUS_PARAM_NAME]
+    )
+    logger(
+        logger.blue(
+            f"Running tests within {__format_amount(capacity.cpus)} CPU cores, {__format_amount(capacity.memory)} GB of memory and {__format_amount(capacity.gpus)} GPUs."
+        )
+    )
+    return capacity
+
+
+def __format_amount(amount: float) -> str:
+    """
+    ### Formats the amount of a resource to be logged.
+
+    #### Params:
+    - amount (float): Amount of the resource.
+
+    #### Returns:
+    - (str): Amount with at most one decimal, or "unlimited" if it is infinite.
+    """
+    return "unlimited" if math.isinf(amount) else f"{round(amount, 1):g}"
+
+
+def __get_test_demands(
+    tests: list[str], test_resources: dict[str, dict[str, float]], capacity: Resources
+) -> dict[str, Resources]:
+    """
+    ### Returns the resources needed by each of the given tests, warning about the ones needing more than available.
+
+    #### Params:
+    - tests (list[str]): Scheduled tests.
+    - test_resources (dict[str, dict[str, float]]): Resources needed by specific tests, classes or files.
+    - capacity (Resources): Available resources.
+
+    #### Returns:
+    - (dict[str, Resources]): Resources needed by each test.
+    """
+    demands = {test: resources.get_test_demand(test, test_resources) for test in tests}
+    for test, demand in demands.items():
+        if not demand.fits_in(capacity):
+            logger.log_warning(
+                f"Test {test} needs more resources than available. It will run while no other test is running."
             )
-            results[origin_file][destination_list].append(test)
+    return demands
+
+
+def __record_test_duration(  # noqa: PLR0913
+    history_file: str,
+    test: str,
+    duration: float,
+    failed: bool,
+    *,
+    durations: dict[str, float] | None = None,
+    split_durations: dict[str, dict[str, float | None]] | None = None,
+):
+    """
+    ### Appends the duration of a finished test to the history, unless it failed or it is a pack.
 
-    return results
+    Once every method of a split class has passed, the duration of the whole class is derived from them
+    and recorded too, so the class estimate keeps up with its methods while the class is split.
+
+    #### Params:
+    - history_file (str): Path to the JSON-lines history file.
+    - test (str): Scheduled name of the test.
+    - duration (float): Measured duration in seconds of the test.
+    - failed (bool): If True, the test failed.
+    - durations (dict[str, float] | None): Optional. Expected duration in seconds of the tests present in the history.
+    - split_durations (dict[str, dict[str, float | None]] | None): Optional. Measured duration of the methods of each split class, None until they pass.
+    """
+    if failed or packing.is_pack(test):
+        return
+    recorded_durations = {test: duration}
+    test_class = test.rsplit(".", 1)[0]
+    method_durations = (split_durations or {}).get(test_class, {})
+    if test in method_durations:
+        method_durations[test] = duration
+        if None not in method_durations.values():
+            recorded_durations[test_class] = splitting.get_class_duration(
+                test_class, method_durations, durations or {}
+            )
+    history_handler.record_test_durations(history_file, recorded_durations)
+
+
+def __get_split_durations(
+    test_classes: dict[str, str],
+) -> dict[str, dict[str, float | None]]:
+    """
+    ### Returns an empty record of the durations of the methods of each split class.
+
+    #### Params:
+    - test_classes (dict[str, str]): Test class of each method.
+
+    #### Returns:
+    - (dict[str, dict[str, float | None]]): Duration of each method of each split class, all of them None.
+    """
+    split_durations = {}
+    for method, test_class in test_classes.items():
+        split_durations.setdefault(test_class, {})[method] = None
+    return split_durations
+
+
+def __run_tests(
+    args: dict,
+    scheduler: DependencyScheduler,
+    data_sets: list[str],
+    options: RunOptions,
+    executor: Executor,
+) -> list[str]:
+    """
+    ### Runs the scheduled tests locally, or serves them to remote workers if acting as a coordinator.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - scheduler (DependencyScheduler): Scheduler containing the tests to run.
+    - data_sets (list[str]): Datasets needed by the tests.
+    - options (RunOptions): Options that change how each test is run.
+    - executor (Executor): Executor running the downloads and the tests.
+
+    #### Returns:
+    - (list[str]): Names of the tests that failed.
+    """
+    if args[COORDINATOR_PARAM_NAME]:
+        return Coordinator(
+            scheduler, args[PLUGIN_PARAM_NAME], data_sets, options=options
+        ).serve(args[COORDINATOR_PARAM_NAME])
+    if data_sets:
+        scipion_handler.download_datasets(args[SCIPION_PARAM_NAME], data_sets, executor)
+    return scipion_handler.run_tests(
+        args[SCIPION_PARAM_NAME],
+        scheduler,
+        executor,
+        args[PLUGIN_PARAM_NAME],
+        options=options,
+    )
 
 
-def __group_tests_by_file(tests: list[str]) -> dict[str, list[str]]:
+def __log_pool_stats(stats: PoolStats):
     """
-    ### Groups tests by origin file.
+    ### Logs how the worker pools of the run were used.
 
     #### Params:
+    - stats (PoolStats): Counters of the worker pools.
+    """
+    if stats.pools_created:
+        logger(
+            logger.blue(
+                f"Worker pools: {stats.pools_created} started, {stats.queue_wait:.1f}s of queue wait, {stats.idle_time:.1f}s of idle worker time."
+            )
+        )
+
+
+def __split_long_tests(
+    args: dict,
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    estimates: dict[str, float],
+    durations: dict[str, float],
+) -> tuple[list[str], dict[str, list[str]], dict[str, float], dict[str, str]]:
+    """
+    ### Splits the selected and long test classes into their methods when it is expected to save time.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
     - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test.
+    - durations (dict[str, float]): Expected duration in seconds of the tests present in the history.
 
     #### Returns:
-    - (dict[str, list[str]]): Tests grouped by origin file.
+    - (list[str]): Tests to schedule, with split classes replaced by their methods.
+    - (dict[str, list[str]]): Dependencies between the tests to schedule.
+    - (dict[str, float]): Estimated duration in seconds of each test to schedule.
+    - (dict[str, str]): Test class of each method.
+    """
+    candidates = splitting.get_split_candidates(
+        tests,
+        estimates,
+        args[SPLIT_THRESHOLD_PARAM_NAME],
+        args[SPLIT_TESTS_PARAM_NAME],
+    )
+    methods_by_test = (
+        scipion_handler.get_test_methods(
+            args[SCIPION_PARAM_NAME], args[PLUGIN_PARAM_NAME], candidates
+        )
+        if candidates
+        else {}
+    )
+    methods_by_test = {
+        test: methods
+        for test, methods in methods_by_test.items()
+        if splitting.is_split_worth_it(
+            test, methods, durations, selected=test in args[SPLIT_TESTS_PARAM_NAME]
+        )
+    }
+    if not methods_by_test:
+        return tests, tests_with_deps, estimates, {}
+    units, units_with_deps, test_classes = splitting.split_tests(
+        tests, tests_with_deps, methods_by_test
+    )
+    logger(
+        logger.blue(
+            f"Split {len(methods_by_test)} long test classes into {len(test_classes)} test methods."
+        )
+    )
+    unit_estimates = {
+        unit: durations.get(unit, estimates.get(test, 0) / len(methods_by_test[test]))
+        for unit, test in test_classes.items()
+    }
+    return units, units_with_deps, {**estimates, **unit_estimates}, test_classes
+
+
+def __pack_short_tests(
+    args: dict,
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    estimates: dict[str, float],
+) -> tuple[list[str], dict[str, float]]:
     """
-    grouped_tests = {}
-    for test in tests:
-        full_path = test.split(".")
-        grouped_tests.setdefault(".".join(full_path[:-1]), []).append(full_path[-1])
-    return grouped_tests
+    ### Packs the short tests so that each pack runs in a single Scipion process.
 
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test.
 
-############################ REMOVAL FUNCTIONS ############################
-def __remove_skippable_tests(
-    tests: list[str], skippable_tests: dict, no_gpu: bool
+    #### Returns:
+    - (list[str]): Tests and packs to schedule.
+    - (dict[str, float]): Estimated duration in seconds of each test and pack.
+    """
+    short_tests = packing.get_short_tests(
+        tests, tests_with_deps, estimates, args[PACK_THRESHOLD_PARAM_NAME]
+    )
+    packs = [
+        pack
+        for pack in packing.get_test_packs(
+            short_tests, estimates, args[PACK_SIZE_PARAM_NAME], args[JOBS_PARAM_NAME]
+        )
+        if len(pack) > 1
+    ]
+    if not packs:
+        return tests, estimates
+    packed_tests = {test for pack in packs for test in pack}
+    logger(
+        logger.blue(
+            f"Packed {len(packed_tests)} short tests into {len(packs)} Scipion processes."
+        )
+    )
+    pack_estimates = {
+        packing.get_pack_name(pack): sum(estimates.get(test, 0) for test in pack)
+        for pack in packs
+    }
+    return [test for test in tests if test not in packed_tests] + list(
+        pack_estimates
+    ), {**estimates, **pack_estimates}
+
+
+def __get_test_estimates(
+    tests: list[str], durations: dict[str, float], default_duration: float
+) -> dict[str, float]:
+    """
+    ### Returns the estimated duration of every test.
+
+    #### Params:
+    - tests (list[str]): Full list of tests.
+    - durations (dict[str, float]): Expected duration in seconds of the tests present in the history.
+    - default_duration (float): Estimated duration in seconds of tests without history.
+
+    #### Returns:
+    - (dict[str, float]): Estimated duration in seconds of each test.
+    """
+    return {test: durations.get(test, default_duration) for test in tests}
+
+
+def __get_shard_estimates(args: dict, tests: list[str]) -> dict[str, float]:
+    """
+    ### Returns the estimated duration of each test used to balance the shards.
+
+    Estimates only come from the durations file given along with the shard, never from the local history,
+    so that every node computes the same shards.
+
+    #### Params:
+    - args (dict): Dictionary containing all the command-line args.
+    - tests (list[str]): Full list of tests.
+
+    #### Returns:
+    - (dict[str, float]): Estimated duration in seconds of each test, or an empty dictionary if there are no durations.
+    """
+    if not args[SHARD_DURATIONS_PARAM_NAME]:
+        return {}
+    durations = history_handler.get_test_durations(
+        args[SHARD_DURATIONS_PARAM_NAME], compact=False
+    )
+    if not durations:
+        logger.log_warning(
+            f"No durations found in {args[SHARD_DURATIONS_PARAM_NAME]}. Shards will be balanced by their number of tests."
+        )
+        return {}
+    return __get_test_estimates(tests, durations, args[DEFAULT_DURATION_PARAM_NAME])
+
+
+def __get_shard_tests(
+    tests: list[str],
+    tests_with_deps: dict[str, list[str]],
+    estimates: dict[str, float],
+    shard_index: int,
+    shard_count: int,
 ) -> list[str]:
     """
-    ### Removes all the tests that apply from the full test list.
+    ### Returns the tests of the given shard, exiting if there are none.
 
     #### Params:
     - tests (list[str]): Full list of tests.
+    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
+    - estimates (dict[str, float]): Estimated duration in seconds of each test, shared by every node. Can be empty.
+    - shard_index (int): Index of the shard, starting at 1.
+    - shard_count (int): Total number of shards.
+
+    #### Returns:
+    - (list[str]): Tests of the shard.
+    """
+    shard_tests = sharding.get_shard_tests(
+        tests, tests_with_deps, estimates, shard_index, shard_count
+    )
+    if not shard_tests:
+        logger.log_warning(
+            f"Shard {shard_index}/{shard_count} has no tests. Nothing to run."
+        )
+        sys.exit(0)
+    logger(
+        logger.blue(
+            f"Shard {shard_index}/{shard_count} contains {len(shard_tests)} of {len(tests)} tests."
+        )
+    )
+    return shard_tests
+
+
+def __get_skipped_tests(
+    skipped_names: dict[str, str],
+    test_classes: dict[str, str],
+    failed_tests: list[str],
+) -> list[str]:
+    """
+    ### Logs the tests the scheduler skipped and returns the ones that did not fail.
+
+    #### Params:
+    - skipped_names (dict[str, str]): Reason why each scheduled test or pack was skipped.
+    - test_classes (dict[str, str]): Test class of each method.
+    - failed_tests (list[str]): Names of the tests that failed.
+
+    #### Returns:
+    - (list[str]): Names of the skipped tests.
+    """
+    failed_tests = set(failed_tests)
+    skipped_tests = {}
+    for name, reason in skipped_names.items():
+        for test in packing.get_pack_tests(name):
+            __log_skip_test(test, reason)
+            test_class = test_classes.get(test, test)
+            if test_class not in failed_tests:
+                skipped_tests[test_class] = None
+    return list(skipped_tests)
+
+
+def __get_sorted_results(catalog: TestCatalog) -> dict[str, dict[str, list[str]]]:
+    """
+    ### Groups the passed/failed/skipped test results by origin file.
+
+    #### Params:
+    - catalog (TestCatalog): Catalog with the results of every test of the run.
+
+    #### Returns:
+    - (dict[str, dict[str, list[str]]]): Test classes grouped by origin file and result.
+    """
+    results = {}
+    for record in catalog.get_records():
+        results.setdefault(
+            record.module,
+            {
+                FAILED_STATUS: [],
+                PASSED_STATUS: [],
+                SKIPPED_STATUS: [],
+            },
+        ).setdefault(record.status, []).append(record.class_name)
+    return results
+
+
+############################ REMOVAL FUNCTIONS ############################
+def __remove_skippable_tests(
+    catalog: TestCatalog,
+    skippable_tests: dict,
+    no_gpu: bool,
+    existing_modules: dict[str, bool] | None = None,
+) -> TestCatalog:
+    """
+    ### Removes all the tests that apply from the catalog.
+
+    #### Params:
+    - catalog (TestCatalog): Catalog with every test of the run.
     - skippable_tests (dict): Dictionary containing the different types of skippable tests.
     - no_gpu (bool): If True, GPU-based tests must be removed.
+    - existing_modules (dict[str, bool] | None): Optional. Already known existence of dependency modules.
 
     #### Returns:
-    - (list[str]): List of tests where skippable ones are removed if applicable.
+    - (TestCatalog): Catalog where skippable tests are removed if applicable.
     """
-    tests = __remove_gpu_tests(
-        tests, skippable_tests.get(test_data_keys.SKIPPABLE_GPU_KEY, []), no_gpu
+    catalog = __remove_gpu_tests(
+        catalog, skippable_tests.get(test_data_keys.SKIPPABLE_GPU_KEY, []), no_gpu
     )
-    tests = __remove_dependency_tests(
-        tests, skippable_tests.get(test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, [])
+    catalog = __remove_dependency_tests(
+        catalog,
+        skippable_tests.get(test_data_keys.SKIPPABLE_DEPENDENCIES_KEY, []),
+        existing_modules,
     )
     return __remove_other_tests(
-        tests, skippable_tests.get(test_data_keys.SKIPPABLE_OTHERS_KEY, [])
+        catalog, skippable_tests.get(test_data_keys.SKIPPABLE_OTHERS_KEY, [])
     )
 
 
 def __remove_gpu_tests(
-    tests: list[str], gpu_tests: list[str], no_gpu: bool
-) -> list[str]:
+    catalog: TestCatalog, gpu_tests: list[str], no_gpu: bool
+) -> TestCatalog:
     """
-    ### Removes the GPU-based tests from the test list if applicable.
+    ### Removes the GPU-based tests from the catalog if applicable.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
-    - gpu_tests (list[str]): List of GPU-base tests.
+    - catalog (TestCatalog): Catalog with every test of the run.
+    - gpu_tests (list[str]): List of GPU-base tests or patterns matching them.
     - no_gpu (bool): If True, GPU-based tests must be removed.
 
     #### Returns:
-    - (list[str]): List of tests where GPU-based ones are removed if applicable.
+    - (TestCatalog): Catalog where GPU-based tests are removed if applicable.
     """
     if not no_gpu:
-        return tests
-    for gpu_test in gpu_tests:
-        if gpu_test in tests:
-            __log_skip_gpu_test(gpu_test)
-            tests.remove(gpu_test)
-    return tests
+        return catalog
+    for gpu_test in test_matcher.get_test_matcher([gpu_tests]).get_matches(
+        catalog.get_tests()
+    ):
+        catalog.remove(gpu_test, __GPU_SKIP_REASON)
+        __log_skip_gpu_test(gpu_test)
+    return catalog
 
 
 def __remove_dependency_tests(
-    tests: list[str], dependency_tests: list[dict]
-) -> list[str]:
+    catalog: TestCatalog,
+    dependency_tests: list[dict],
+    existing_modules: dict[str, bool] | None = None,
+) -> TestCatalog:
     """
-    ### Removes all dependency-based tests from the test list if the dependency is not met.
+    ### Removes all dependency-based tests from the catalog if the dependency is not met.
+
+    Modules missing from the already known ones are checked one by one.
+    Each test is removed because of the first unmet dependency matching it.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
+    - catalog (TestCatalog): Catalog with every test of the run.
     - dependency_tests (list[dict]): List of dependency-based tests.
+    - existing_modules (dict[str, bool] | None): Optional. Already known existence of dependency modules.
 
     #### Returns:
-    - (list[str]): List of tests where dependency-based ones are removed if applicable.
+    - (TestCatalog): Catalog where dependency-based tests are removed if applicable.
     """
+    unmet_dependencies = []
     for dependency in dependency_tests:
-        plugin_name = dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY)
         module_name = dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY)
-        is_plugin = dependency.get(
+        if not module_name or not (
+            existing_modules.get(module_name)
+            if module_name in (existing_modules or {})
+            else python_handler.exists_python_module(module_name)
+        ):
+            unmet_dependencies.append(dependency)
+    matches = test_matcher.get_test_matcher(
+        [
+            dependency.get(test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, [])
+            for dependency in unmet_dependencies
+        ]
+    ).get_matches(catalog.get_tests())
+    for dependency_test, index in matches.items():
+        plugin_name = unmet_dependencies[index].get(
+            test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY
+        )
+        is_plugin = unmet_dependencies[index].get(
             test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY, True
         )
-        if module_name and python_handler.exists_python_module(module_name):
-            continue
-        for dependency_test in dependency.get(
-            test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY, []
-        ):
-            if dependency_test in tests:
-                __log_skip_dependency_test(
-                    dependency_test, plugin_name, is_plugin=is_plugin
-                )
-                tests.remove(dependency_test)
-    return tests
+        catalog.remove(
+            dependency_test,
+            __get_dependency_skip_reason(plugin_name, is_plugin=is_plugin),
+        )
+        __log_skip_dependency_test(dependency_test, plugin_name, is_plugin=is_plugin)
+    return catalog
 
 
-def __remove_other_tests(tests: list[str], other_tests: list[dict]) -> list[str]:
+def __remove_other_tests(catalog: TestCatalog, other_tests: list[dict]) -> TestCatalog:
     """
-    ### Removes other tests from the test list.
+    ### Removes other tests from the catalog.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
-    - other_tests (list[dict]): List of other tests.
+    - catalog (TestCatalog): Catalog with every test of the run.
+    - other_tests (list[dict]): List of other tests. Each one is removed with the reason of the first entry matching it.
 
     #### Returns:
-    - (list[str]): List of tests where other tests have been removed.
+    - (TestCatalog): Catalog where other tests have been removed.
     """
-    for other_test in other_tests:
-        test_name = other_test.get(test_data_keys.SKIPPABLE_OTHERS_TEST_KEY)
-        reason = other_test.get(test_data_keys.SKIPPABLE_OTHERS_REASON_KEY)
-        if test_name and test_name in tests:
-            __log_skip_test(test_name, reason)
-            tests.remove(test_name)
-    return tests
+    matches = test_matcher.get_test_matcher(
+        [
+            (
+                [other_test[test_data_keys.SKIPPABLE_OTHERS_TEST_KEY]]
+                if other_test.get(test_data_keys.SKIPPABLE_OTHERS_TEST_KEY)
+                else []
+            )
+            for other_test in other_tests
+        ]
+    ).get_matches(catalog.get_tests())
+    for test_name, index in matches.items():
+        reason = other_tests[index].get(test_data_keys.SKIPPABLE_OTHERS_REASON_KEY)
+        catalog.remove(test_name, reason)
+        __log_skip_test(test_name, reason)
+    return catalog
 
 
 def __remove_unmet_internal_dependency_tests(
-    tests: list[str], tests_with_deps: dict[str, list[str]]
-) -> tuple[list[str], dict[str, list[str]]]:
+    catalog: TestCatalog, tests_with_deps: dict[str, list[str]]
+) -> tuple[TestCatalog, dict[str, list[str]]]:
     """
     ### Removes all the tests that have unmet dependencies.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
+    - catalog (TestCatalog): Catalog with every test of the run.
     - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
 
     #### Returns:
-    - (list[str]): All remaining tests.
+    - (TestCatalog): Catalog with the remaining tests.
     - (dict[str, list[str]]): Remaining tests with their met dependencies.
     """
-    has_been_modified = False
-    for test, deps in tests_with_deps.copy().items():
-        non_met_deps = [
-            element for element in deps if element in list(set(deps) - set(tests))
-        ]
-        if non_met_deps:
-            has_been_modified = True
-            del tests_with_deps[test]
-            if test in tests:
-                non_met_deps_text = (
-                    f"'{non_met_deps[0]}'"
-                    if len(non_met_deps) == 1
-                    else ", ".join([f"'{test}'" for test in non_met_deps])
-                )
-                __log_skip_test(
-                    test, f"Missing dependency with tests: {non_met_deps_text}"
-                )
-                tests.remove(test)
-    if has_been_modified:
-        return __remove_unmet_internal_dependency_tests(tests, tests_with_deps)
-    return tests, tests_with_deps
+    unmet_deps = dependency_graph.get_unmet_dependencies(catalog, tests_with_deps)
+    for test, non_met_deps in unmet_deps.items():
+        non_met_deps_text = (
+            f"'{non_met_deps[0]}'"
+            if len(non_met_deps) == 1
+            else ", ".join([f"'{test}'" for test in non_met_deps])
+        )
+        reason = f"Missing dependency with tests: {non_met_deps_text}"
+        if catalog.remove(test, reason):
+            __log_skip_test(test, reason)
+    return catalog, {
+        test: deps for test, deps in tests_with_deps.items() if test not in unmet_deps
+    }
 
 
 def __remove_circular_dependencies(
-    tests: list[str], tests_with_deps: dict[str, list[str]]
-) -> tuple[list[str], dict[str, list[str]]]:
+    catalog: TestCatalog, tests_with_deps: dict[str, list[str]]
+) -> tuple[TestCatalog, dict[str, list[str]]]:
     """
     ### Removes all the tests that are within a circular dependency.
 
     #### Params:
-    - tests (list[str]): Full list of tests.
+    - catalog (TestCatalog): Catalog with every test of the run.
     - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
 
     #### Returns:
-    - (list[str]): All remaining tests.
+    - (TestCatalog): Catalog with the remaining tests.
     - (dict[str, list[str]]): Remaining tests without circular dependencies.
     """
-    non_circular = {}
-    while tests_with_deps:
-        test_name = next(iter(tests_with_deps))
-        circular_path = __find_circular_dependency(test_name, tests_with_deps)
-        if not circular_path:
-            non_circular[test_name] = tests_with_deps[test_name]
-            del tests_with_deps[test_name]
-        else:
-            tests, tests_with_deps = __remove_circular_dependency(
-                tests, tests_with_deps, circular_path
-            )
-    return tests, non_circular
-
-
-def __remove_circular_dependency(
-    tests: list[str], tests_with_deps: dict[str, list[str]], circular_path: list[str]
-) -> tuple[list[str], dict[str, list[str]]]:
-    """
-    ### Removes all the tests that are within the given circular dependency.
-
-    #### Params:
-    - tests (list[str]): Full list of tests.
-    - tests_with_deps (dict[str, list[str]]): Dictionary containing tests with their dependencies.
-    - circular_path (list[str]): List of tests that form the circular dependency.
-
-    #### Returns:
-    - (list[str]): All remaining tests.
-    - (dict[str, list[str]]): Remaining tests without circular dependencies.
-    """
-    for _ in range(len(circular_path) - 1):
-        test_name = circular_path[0]
-        del tests_with_deps[test_name]
-        if test_name in tests:
-            __log_skip_test(
-                test_name,
-                f"It has a circular dependency: {' --> '.join(circular_path)}",
-            )
-            tests.remove(test_name)
-        circular_path = circular_path[1:] + [circular_path[1]]
-    return tests, tests_with_deps
+    circular_tests = set()
+    for circular_group, circular_path in dependency_graph.get_circular_dependencies(
+        tests_with_deps
+    ):
+        reason = f"It has a circular dependency: {' --> '.join(circular_path)}"
+        for test_name in circular_group:
+            if catalog.remove(test_name, reason):
+                __log_skip_test(test_name, reason)
+        circular_tests.update(circular_group)
+    return catalog, {
+        test: deps
+        for test, deps in tests_with_deps.items()
+        if test not in circular_tests
+    }
 
 
 ############################ LOG FUNCTIONS ############################
@@ -376,7 +1288,7 @@ def __log_skip_gpu_test(test_name: str):
     #### Params:
     - test_name (str): Name of the test to skip.
     """
-    __log_skip_test(test_name, "Needs GPU")
+    __log_skip_test(test_name, __GPU_SKIP_REASON)
 
 
 def __log_skip_dependency_test(test_name: str, dependency: str, is_plugin: bool = True):
@@ -388,9 +1300,25 @@ def __log_skip_dependency_test(test_name: str, dependency: str, is_plugin: bool
     - dependency (str): Name of the plugin or module the test deppends on.
     - is_plugin (bool): If True, the package is a plugin. Otherwise, is a regular python package.
     """
+    __log_skip_test(
+        test_name, __get_dependency_skip_reason(dependency, is_plugin=is_plugin)
+    )
+
+
+def __get_dependency_skip_reason(dependency: str, is_plugin: bool = True) -> str:
+    """
+    ### Returns the reason why a dependency-based test is removed.
+
+    #### Params:
+    - dependency (str): Name of the plugin or module the test deppends on.
+    - is_plugin (bool): If True, the package is a plugin. Otherwise, is a regular python package.
+
+    #### Returns:
+    - (str): Reason why the test is removed.
+    """
     package_type = "plugin" if is_plugin else "package"
     dependency_name_message = f" with {package_type} {dependency}" if dependency else ""
-    __log_skip_test(test_name, f"Unmet dependency{dependency_name_message}")
+    return f"Unmet dependency{dependency_name_message}"
 
 
 def __log_skip_test(test_name: str, custom_text: str):
@@ -416,7 +1344,10 @@ def __log_result_summary(results: dict[str, list[str]]):
     for origin_file in results:
         passed = results.get(origin_file, {}).get("passed", [])
         failed = results.get(origin_file, {}).get("failed", [])
-        total = len(passed) + len(failed)
+        skipped = results.get(origin_file, {}).get("skipped", [])
+        total = len(passed) + len(failed) + len(skipped)
         logger(f"{origin_file}: [{len(passed)} / {total}]")
         if failed:
             logger(logger.red(f"\tFailed tests: {' '.join(failed)}"))
+        if skipped:
+            logger(logger.yellow(f"\tSkipped tests: {' '.join(skipped)}"))
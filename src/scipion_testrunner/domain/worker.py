@@ -0,0 +1,228 @@
+"""### Runs the tests handed out by a coordinator with the local Scipion installation."""
+
+from __future__ import annotations
+
+import contextlib
+import queue
+import socket
+import threading
+from typing import BinaryIO
+
+from scipion_testrunner.application.logger import logger
+from scipion_testrunner.domain import coordinator
+from scipion_testrunner.domain.executor import Executor
+from scipion_testrunner.domain.handlers import (
+    scipion_handler,
+    shell_handler,
+    socket_handler,
+)
+from scipion_testrunner.domain.run_options import RunOptions
+
+
+def run_worker(address: str, scipion: str, plugin_module: str, jobs: int):
+    """
+    ### Pulls tests from the coordinator and runs them until there are no more left.
+
+    #### Params:
+    - address (str): Address of the coordinator, with format HOST:PORT, or unix:PATH for a Unix socket.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    - jobs (int): Number of tests to run at the same time.
+    """
+    worker_name = socket.gethostname()
+    first_connection, datasets = __connect(address, plugin_module, worker_name)
+    if datasets:
+        executor = Executor(test_jobs=jobs)
+        try:
+            scipion_handler.download_datasets(scipion, datasets, executor)
+        finally:
+            executor.close()
+        logger(
+            logger.blue(
+                f"Running tests from coordinator {address} in {jobs} slot{'s' if jobs > 1 else ''}..."
+            )
+        )
+    slots = [
+        threading.Thread(
+            target=__run_slot,
+            args=(connection, scipion, plugin_module),
+        )
+        for connection in [
+            first_connection,
+            *(
+                __connect(address, plugin_module, worker_name)[0]
+                for _ in range(jobs - 1)
+            ),
+        ]
+    ]
+    for slot in slots:
+        slot.start()
+    for slot in slots:
+        slot.join()
+    logger(logger.green("\nNo tests left in coordinator."))
+
+
+def __connect(
+    address: str, plugin_module: str, worker_name: str
+) -> tuple[socket.socket, list[str]]:
+    """
+    ### Opens a connection with the coordinator and introduces the worker.
+
+    #### Params:
+    - address (str): Address of the coordinator.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    - worker_name (str): Name identifying this worker in the coordinator logs.
+
+    #### Returns:
+    - (socket): Connection with the coordinator.
+    - (list[str]): Datasets needed by the tests.
+    """
+    try:
+        connection = socket_handler.create_connection(address)
+    except OSError as e:
+        logger.log_error(f"ERROR: Could not connect to coordinator {address}:\n{e}")
+    with connection.makefile("rwb") as stream:
+        socket_handler.send_message(
+            stream,
+            {
+                coordinator.TYPE_KEY: coordinator.HELLO_TYPE,
+                coordinator.PLUGIN_KEY: plugin_module,
+                coordinator.WORKER_KEY: worker_name,
+            },
+        )
+        message = socket_handler.receive_message(stream) or {}
+    if message.get(coordinator.TYPE_KEY) != coordinator.WELCOME_TYPE:
+        connection.close()
+        logger.log_error(
+            f"ERROR: Coordinator {address} rejected the worker. {message.get(coordinator.MESSAGE_KEY, '')}".rstrip()
+        )
+    return connection, message.get(coordinator.DATASETS_KEY, [])
+
+
+def __run_slot(connection: socket.socket, scipion: str, plugin_module: str):
+    """
+    ### Runs tests one after another, asking the coordinator for the next one every time.
+
+    Messages from the coordinator are received in a separate thread, so a cancellation
+    can stop the running test right away.
+
+    #### Params:
+    - connection (socket): Connection with the coordinator.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    """
+    with connection, connection.makefile("rwb") as stream:
+        messages = queue.Queue()
+        cancelled = threading.Event()
+        receiver = threading.Thread(
+            target=__receive_messages, args=(stream, messages, cancelled), daemon=True
+        )
+        receiver.start()
+        try:
+            __run_tests(stream, messages, cancelled, scipion, plugin_module)
+        finally:
+            with contextlib.suppress(OSError):
+                connection.shutdown(socket.SHUT_RDWR)
+            receiver.join()
+
+
+def __receive_messages(
+    stream: BinaryIO, messages: queue.Queue, cancelled: threading.Event
+):
+    """
+    ### Receives the messages of the coordinator until the connection is closed.
+
+    Cancellations stop the running commands as soon as they arrive. Any other message is queued.
+
+    #### Params:
+    - stream (BinaryIO): Stream of the coordinator connection.
+    - messages (Queue): Queue receiving the messages, followed by None when the connection is closed.
+    - cancelled (Event): Event set when the coordinator cancels the running test.
+    """
+    while True:
+        message = socket_handler.receive_message(stream)
+        if message and message.get(coordinator.TYPE_KEY) == coordinator.CANCEL_TYPE:
+            cancelled.set()
+            shell_handler.stop_running_commands()
+            continue
+        messages.put(message)
+        if message is None:
+            return
+
+
+def __run_tests(
+    stream: BinaryIO,
+    messages: queue.Queue,
+    cancelled: threading.Event,
+    scipion: str,
+    plugin_module: str,
+):
+    """
+    ### Asks the coordinator for tests and runs them until there are no more left or they are cancelled.
+
+    #### Params:
+    - stream (BinaryIO): Stream of the coordinator connection.
+    - messages (Queue): Queue with the messages received from the coordinator.
+    - cancelled (Event): Event set when the coordinator cancels the running test.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    """
+    while True:
+        socket_handler.send_message(
+            stream, {coordinator.TYPE_KEY: coordinator.NEXT_TYPE}
+        )
+        message = messages.get()
+        if (
+            cancelled.is_set()
+            or not message
+            or message.get(coordinator.TYPE_KEY) != coordinator.TEST_TYPE
+        ):
+            return
+        test = message[coordinator.TEST_KEY]
+        ret_code, output = __run_test(
+            test, scipion, plugin_module, message.get(coordinator.TIMEOUT_KEY)
+        )
+        if cancelled.is_set():
+            logger.log_warning(f"Test {test} was cancelled by the coordinator.")
+            return
+        logger(
+            logger.red(f"Test {test} failed.")
+            if ret_code
+            else logger.green(f"Test {test} OK")
+        )
+        socket_handler.send_message(
+            stream,
+            {
+                coordinator.TYPE_KEY: coordinator.RESULT_TYPE,
+                coordinator.TEST_KEY: test,
+                coordinator.FAILED_KEY: bool(ret_code),
+                coordinator.OUTPUT_KEY: output if ret_code else "",
+            },
+        )
+
+
+def __run_test(
+    test: str, scipion: str, plugin_module: str, timeout: float | None
+) -> tuple[int, str]:
+    """
+    ### Runs a test received from the coordinator, refusing names that are not valid test names.
+
+    #### Params:
+    - test (str): Name of the test.
+    - scipion (str): Path to Scipion's executable.
+    - plugin_module (str): Module name of the plugin to run tests for.
+    - timeout (float | None): Maximum time in seconds the test can run, or None for no limit.
+
+    #### Returns:
+    - (int): Return code of the test.
+    - (str): Tail of the output of the test.
+    """
+    if not scipion_handler.is_valid_test_name(test):
+        return 1, f"Invalid test name {test!r}. It was not run."
+    logger.log_warning(f"Running test {test}...")
+    ret_code, output = scipion_handler.run_test(
+        test, scipion, plugin_module, RunOptions(timeout=timeout)
+    )
+    if timeout is not None and ret_code == shell_handler.TIMEOUT_RET_CODE:
+        output += f"\nTest {test} timed out after {timeout:g} seconds."
+    return ret_code, output
@@ -0,0 +1,263 @@
+"""
+### Preloaded process that forks itself to run each test in isolation.
+
+This file is run as a script by Scipion's Python, not imported by the test runner,
+so it can only depend on the standard library.
+
+Usage: python zygote.py RUNNER_MODULE [PRELOADED_MODULE ...]
+
+Once the modules are imported, a ready message is written to stdout.
+After that, every JSON line read from stdin with a test name is answered with a JSON line
+containing the return code and output of a forked child running RUNNER_MODULE for that test.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import runpy
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from typing import TextIO
+
+READY_TYPE = "ready"
+RESULT_TYPE = "result"
+TYPE_KEY = "type"
+TEST_KEY = "test"
+RET_CODE_KEY = "retCode"
+OUTPUT_KEY = "output"
+TIMEOUT_KEY = "timeout"
+TIMED_OUT_KEY = "timedOut"
+LOG_FILE_KEY = "logFile"
+TAIL_SIZE_KEY = "tailSize"
+
+__STDIN_FD = 0
+__STDOUT_FD = 1
+__STDERR_FD = 2
+__KILL_GRACE_PERIOD = 10
+__POLL_INTERVAL = 0.1
+__running_child = None
+
+
+def main():
+    """### Preloads the given modules and runs the tests requested through stdin until it is closed."""
+    runner_module, *preloaded_modules = sys.argv[1:]
+    protocol = os.fdopen(os.dup(__STDOUT_FD), "w")
+    sys.stdout.flush()
+    os.dup2(__STDERR_FD, __STDOUT_FD)
+    signal.signal(signal.SIGTERM, __terminate)
+    for module in preloaded_modules:
+        preload_module(module)
+    send_message(protocol, {TYPE_KEY: READY_TYPE})
+    for line in sys.stdin:
+        request = json.loads(line)
+        ret_code, output, timed_out = run_forked_test(
+            runner_module,
+            request[TEST_KEY],
+            timeout=request.get(TIMEOUT_KEY),
+            log_file=request.get(LOG_FILE_KEY),
+            tail_size=request.get(TAIL_SIZE_KEY),
+        )
+        send_message(
+            protocol,
+            {
+                TYPE_KEY: RESULT_TYPE,
+                TEST_KEY: request[TEST_KEY],
+                RET_CODE_KEY: ret_code,
+                OUTPUT_KEY: output,
+                TIMED_OUT_KEY: timed_out,
+            },
+        )
+
+
+def preload_module(module: str):
+    """
+    ### Imports the given module so forked children do not need to import it again.
+
+    #### Params:
+    - module (str): Name of the module.
+    """
+    try:
+        importlib.import_module(module)
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+
+
+def run_forked_test(
+    runner_module: str,
+    test: str,
+    timeout: float | None = None,
+    log_file: str | None = None,
+    tail_size: int | None = None,
+) -> tuple[int, str, bool]:
+    """
+    ### Runs the given test in a forked child and waits for it.
+
+    The child leads its own process group, so every process it starts is stopped if it times out.
+    Its output goes straight to a file, and only its tail is read back.
+
+    #### Params:
+    - runner_module (str): Module that runs the test received as its only argument.
+    - test (str): Full name of the test.
+    - timeout (float | None): Optional. Maximum number of seconds the test can run for.
+    - log_file (str | None): Optional. File receiving the full output of the test. If not provided, a temporary file is used.
+    - tail_size (int | None): Optional. Maximum number of bytes of output to return. If not provided, all of it is returned.
+
+    #### Returns:
+    - (int): Return code of the test, negative if it was killed by a signal.
+    - (str): Combined stdout and stderr of the test, or its tail.
+    - (bool): True if the test timed out, False otherwise.
+    """
+    global __running_child  # noqa: PLW0603
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(log_file, "w+b") if log_file else tempfile.TemporaryFile() as output_file:
+        pid = os.fork()
+        if not pid:
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os._exit(__run_child(runner_module, test, output_file.fileno()))
+        __running_child = pid
+        status = __wait_child(pid, timeout)
+        timed_out = status is None
+        if timed_out:
+            status = __stop_child(pid)
+        __running_child = None
+        output_file.seek(0, os.SEEK_END)
+        output_file.seek(max(output_file.tell() - (tail_size or output_file.tell()), 0))
+        output = output_file.read().decode(errors="replace")
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status), output, timed_out
+    return os.WEXITSTATUS(status), output, timed_out
+
+
+def send_message(stream: TextIO, message: dict):
+    """
+    ### Sends the given message as a JSON line.
+
+    #### Params:
+    - stream (TextIO): Stream to write to.
+    - message (dict): Message to send.
+    """
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def __run_child(runner_module: str, test: str, output_fd: int) -> int:
+    """
+    ### Runs the test runner module as if it was started from the command line.
+
+    #### Params:
+    - runner_module (str): Module that runs the test received as its only argument.
+    - test (str): Full name of the test.
+    - output_fd (int): File descriptor receiving the output of the test.
+
+    #### Returns:
+    - (int): Exit code of the test runner.
+    """
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, __STDIN_FD)
+    os.close(devnull)
+    os.dup2(output_fd, __STDOUT_FD)
+    os.dup2(output_fd, __STDERR_FD)
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    sys.argv = [runner_module, *test.split()]
+    exit_code = 0
+    try:
+        runpy.run_module(runner_module, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        exit_code = __get_exit_code(e.code)
+    except BaseException:  # noqa: BLE001
+        traceback.print_exc()
+        exit_code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return exit_code
+
+
+def __wait_child(pid: int, timeout: float | None) -> int | None:
+    """
+    ### Waits for the given child to finish.
+
+    #### Params:
+    - pid (int): Process id of the child.
+    - timeout (float | None): Maximum number of seconds to wait, or None to wait indefinitely.
+
+    #### Returns:
+    - (int | None): Wait status of the child, or None if it was still running after the timeout.
+    """
+    if timeout is None:
+        return os.waitpid(pid, 0)[1]
+    deadline = time.monotonic() + timeout
+    while True:
+        finished_pid, status = os.waitpid(pid, os.WNOHANG)
+        if finished_pid:
+            return status
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(__POLL_INTERVAL)
+
+
+def __terminate(*_):
+    """### Stops the test being run, if any, and exits."""
+    if __running_child is not None:
+        __stop_child(__running_child)
+    os._exit(1)
+
+
+def __stop_child(pid: int) -> int:
+    """
+    ### Terminates the process group of the given child, killing it if it does not stop in time.
+
+    #### Params:
+    - pid (int): Process id of the child, which is also the id of its process group.
+
+    #### Returns:
+    - (int): Wait status of the child.
+    """
+    __signal_group(pid, signal.SIGTERM)
+    status = __wait_child(pid, __KILL_GRACE_PERIOD)
+    if status is None:
+        __signal_group(pid, signal.SIGKILL)
+        status = os.waitpid(pid, 0)[1]
+    return status
+
+
+def __signal_group(pgid: int, sig: int):
+    """
+    ### Sends the given signal to every process of a group, if it still exists.
+
+    #### Params:
+    - pgid (int): Id of the process group.
+    - sig (int): Signal to send.
+    """
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def __get_exit_code(code: int | str | None) -> int:
+    """
+    ### Converts the code of a SystemExit into a process exit code.
+
+    #### Params:
+    - code (int | str | None): Code given to sys.exit.
+
+    #### Returns:
+    - (int): Exit code.
+    """
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytest
 
 from scipion_testrunner.application import cli
+from scipion_testrunner.domain.handlers import cache_handler
 
 __SCIPION = "/path/to/scipion"
 __PLUGIN = "myplugin"
@@ -15,7 +16,29 @@ __ARGS_DICT = {
     "plugin": __PLUGIN,
     "jobs": multiprocessing.cpu_count(),
     "noGpu": False,
+    "forkServer": False,
     "testData": "",
+    "profile": [],
+    "cacheDir": os.path.abspath(cache_handler.DEFAULT_CACHE_DIR),
+    "defaultDuration": 60.0,
+    "packThreshold": 0.0,
+    "packSize": 10,
+    "splitThreshold": 0.0,
+    "splitTests": [],
+    "timeout": None,
+    "cpus": None,
+    "memory": None,
+    "gpus": None,
+    "failFast": False,
+    "logDir": None,
+    "outputTail": 20,
+    "engine": "pool",
+    "refreshDiscovery": False,
+    "discovery": "scipion",
+    "shard": None,
+    "shardDurations": "",
+    "coordinator": None,
+    "worker": None,
 }
 
 
@@ -34,6 +57,10 @@ def test_calls_required_test_service_function(__mock_parse_args, __mock_test_ser
     [
         pytest.param("jobs", 2),
         pytest.param("testData", os.path.abspath("/path/to/testData.json")),
+        pytest.param("cacheDir", os.path.abspath("/path/to/cache")),
+        pytest.param("defaultDuration", 12.5),
+        pytest.param("engine", "asyncio"),
+        pytest.param("discovery", "static"),
     ],
 )
 def test_generates_expected_args(param_name, value, __mock_test_service):
@@ -52,6 +79,153 @@ def test_generates_expected_no_gpu_arg(__mock_test_service):
         __mock_test_service.assert_called_once_with(args)
 
 
+def test_generates_expected_shard_arg(__mock_test_service):
+    args = __ARGS_DICT.copy()
+    args["shard"] = (2, 4)
+    with patch.object(sys, "argv", [*__ARGS, "--shard", "2/4"]):
+        cli.main()
+        __mock_test_service.assert_called_once_with(args)
+
+
+def test_generates_absolute_shard_durations_arg(
+    tmp_path, monkeypatch, __mock_test_service
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "durations.jsonl").write_text("")
+    args = __ARGS_DICT.copy()
+    args["shard"] = (2, 4)
+    args["shardDurations"] = str(tmp_path / "durations.jsonl")
+    with patch.object(
+        sys,
+        "argv",
+        [*__ARGS, "--shard", "2/4", "--shardDurations", "durations.jsonl"],
+    ):
+        cli.main()
+        __mock_test_service.assert_called_once_with(args)
+
+
+@pytest.mark.parametrize(
+    "extra_args",
+    [
+        pytest.param(["--shardDurations", "durations.jsonl"]),
+        pytest.param(["--shard", "1/2", "--shardDurations", "missing.jsonl"]),
+    ],
+)
+def test_returns_error_when_providing_invalid_shard_durations(
+    extra_args, tmp_path, monkeypatch, __mock_test_service
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "durations.jsonl").write_text("")
+    with patch.object(sys, "argv", [*__ARGS, *extra_args]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "shard",
+    [pytest.param("2"), pytest.param("a/4"), pytest.param("0/4"), pytest.param("5/4")],
+)
+def test_returns_error_when_providing_invalid_shard(shard, __mock_test_service):
+    with patch.object(sys, "argv", [*__ARGS, "--shard", shard]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "param_name,value",
+    [
+        pytest.param("cpus", 8.0),
+        pytest.param("memory", 12.5),
+        pytest.param("gpus", 0.0),
+    ],
+)
+def test_generates_expected_capacity_args(param_name, value, __mock_test_service):
+    args = __ARGS_DICT.copy()
+    args[param_name] = value
+    with patch.object(sys, "argv", [*__ARGS, f"--{param_name}", f"{value}"]):
+        cli.main()
+        __mock_test_service.assert_called_once_with(args)
+
+
+@pytest.mark.parametrize(
+    "capacity", [pytest.param("-1"), pytest.param("a"), pytest.param("nan")]
+)
+def test_returns_error_when_providing_invalid_capacity(capacity, __mock_test_service):
+    with patch.object(sys, "argv", [*__ARGS, "--cpus", capacity]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "param_name,value",
+    [
+        pytest.param("coordinator", "0.0.0.0:5000"),
+        pytest.param("worker", "unix:/tmp/coordinator.sock"),
+    ],
+)
+def test_generates_expected_distribution_args(param_name, value, __mock_test_service):
+    args = __ARGS_DICT.copy()
+    args[param_name] = value
+    with patch.object(sys, "argv", [*__ARGS, f"--{param_name}", value]):
+        cli.main()
+        __mock_test_service.assert_called_once_with(args)
+
+
+@pytest.mark.parametrize(
+    "extra_args",
+    [
+        pytest.param(["--coordinator", "localhost"]),
+        pytest.param(["--worker", "unix:"]),
+        pytest.param(["--coordinator", "localhost:1", "--worker", "localhost:1"]),
+    ],
+)
+def test_returns_error_when_providing_invalid_distribution_args(
+    extra_args, __mock_test_service
+):
+    with patch.object(sys, "argv", [*__ARGS, *extra_args]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
+def test_generates_expected_profile_args(__mock_test_service):
+    args = __ARGS_DICT.copy()
+    args["testData"] = os.path.abspath("testData.json")
+    args["profile"] = ["gpu", "nightly"]
+    with patch.object(
+        sys,
+        "argv",
+        [
+            *__ARGS,
+            "--testData",
+            "testData.json",
+            "--profile",
+            "gpu",
+            "--profile",
+            "nightly",
+        ],
+    ):
+        cli.main()
+        __mock_test_service.assert_called_once_with(args)
+
+
+def test_returns_error_when_using_profile_without_test_data(__mock_test_service):
+    with patch.object(sys, "argv", [*__ARGS, "--profile", "nightly"]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
+def test_returns_error_when_using_fork_server_with_asyncio_engine(__mock_test_service):
+    with patch.object(sys, "argv", [*__ARGS, "--forkServer", "--engine", "asyncio"]):
+        with pytest.raises(SystemExit):
+            cli.main()
+    __mock_test_service.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "input_args", [pytest.param([]), pytest.param([""]), pytest.param(["", "scipion"])]
 )
@@ -1,124 +1,390 @@
 import json
+import os
 from unittest.mock import patch
 
 import pytest
 
 from scipion_testrunner.application.logger import logger
 from scipion_testrunner.configuration import test_config, test_data_keys
+from scipion_testrunner.configuration.test_config import TestConfig
 
 __DUMMY_FILE_PATH = "path"
 __FILE_DATA = {
     test_data_keys.DATASETS_KEY: ["1", "2"],
-    test_data_keys.SKIPPABLE_TESTS_KEY: {"key": "value"},
-    test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY: {"key": "value"},
+    test_data_keys.SKIPPABLE_TESTS_KEY: {
+        test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu.TestA", "test_gpu_*.*"],
+        test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+            {
+                test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: "plugin",
+                test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: ["re:test_.*"],
+            }
+        ],
+        test_data_keys.SKIPPABLE_OTHERS_KEY: [
+            {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "test_other.TestA"}
+        ],
+    },
+    test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY: {"test_b.TestB": ["test_a.TestA"]},
+    test_data_keys.TIMEOUTS_KEY: {"test_a.TestA": 10},
+    test_data_keys.RESOURCES_KEY: {
+        "test_a": {
+            test_data_keys.RESOURCES_CPUS_KEY: 8,
+            test_data_keys.RESOURCES_MEMORY_KEY: 20,
+        }
+    },
 }
+__CONFIG = TestConfig(
+    ["1", "2"],
+    {
+        test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu.TestA", "test_gpu_*.*"],
+        test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+            {
+                test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: "plugin",
+                test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY: None,
+                test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY: True,
+                test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: ["re:test_.*"],
+            }
+        ],
+        test_data_keys.SKIPPABLE_OTHERS_KEY: [
+            {
+                test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "test_other.TestA",
+                test_data_keys.SKIPPABLE_OTHERS_REASON_KEY: None,
+            }
+        ],
+    },
+    {"test_b.TestB": ["test_a.TestA"]},
+    {"test_a.TestA": 10.0},
+    {
+        "test_a": {
+            test_data_keys.RESOURCES_CPUS_KEY: 8.0,
+            test_data_keys.RESOURCES_MEMORY_KEY: 20.0,
+            test_data_keys.RESOURCES_GPUS_KEY: 0.0,
+        }
+    },
+)
 __EXCEPTION_TEXT = "Test"
-__JSON_EXCEPTION = json.JSONDecodeError(__EXCEPTION_TEXT, __DUMMY_FILE_PATH, 1)
+__MTIME_NS = 1_000_000_000
 
 
 def test_returns_empty_fields(__mock_log):
-    assert test_config.get_test_config("") == (
-        [],
-        {},
-        {},
+    assert (
+        test_config.get_test_config("") == TestConfig()
     ), "Empty file path should have returned empty fields."
 
 
-def test_returns_expected_fields(__mock_open, __mock_json_load):
-    assert test_config.get_test_config(__DUMMY_FILE_PATH) == (
-        __FILE_DATA[test_data_keys.DATASETS_KEY],
-        __FILE_DATA[test_data_keys.SKIPPABLE_TESTS_KEY],
-        __FILE_DATA[test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY],
+def test_returns_normalized_fields(__test_data_file):
+    assert (
+        test_config.get_test_config(__test_data_file) == __CONFIG
     ), "Test data file did not return the expected data."
 
 
-def test_exits_on_file_not_found_error(
-    __mock_open_raise_file_not_found_error, __mock_log
-):
+def test_reads_unchanged_file_from_cache(__test_data_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    test_config.get_test_config(__test_data_file, cache_dir)
+    with patch(
+        "scipion_testrunner.configuration.test_config.__get_normalized_config"
+    ) as mock_get_normalized_config:
+        assert (
+            test_config.get_test_config(__test_data_file, cache_dir) == __CONFIG
+        ), "Cached test data did not return the expected data."
+    mock_get_normalized_config.assert_not_called()
+
+
+def test_only_hashes_touched_file_with_same_content(__test_data_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    test_config.get_test_config(__test_data_file, cache_dir)
+    os.utime(__test_data_file, ns=(__MTIME_NS, __MTIME_NS))
+    with patch(
+        "scipion_testrunner.configuration.test_config.__get_normalized_config"
+    ) as mock_get_normalized_config:
+        assert (
+            test_config.get_test_config(__test_data_file, cache_dir) == __CONFIG
+        ), "Cached test data did not return the expected data."
+    mock_get_normalized_config.assert_not_called()
+
+
+def test_parses_file_again_when_its_content_changes(__test_data_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    test_config.get_test_config(__test_data_file, cache_dir)
+    __write_json(__test_data_file, {test_data_keys.DATASETS_KEY: ["3"]})
+    os.utime(__test_data_file, ns=(__MTIME_NS, __MTIME_NS))
+    assert test_config.get_test_config(__test_data_file, cache_dir) == TestConfig(
+        ["3"],
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: [],
+            test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [],
+        },
+    ), "Test data file did not return the expected data."
+
+
+def test_ignores_corrupted_cache(__test_data_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "test-configs.json").write_text("{")
+    assert (
+        test_config.get_test_config(__test_data_file, str(cache_dir)) == __CONFIG
+    ), "Test data file did not return the expected data."
+
+
+def test_merges_included_files_and_selected_profiles_in_order(tmp_path):
+    __write_json(
+        str(tmp_path / "base.json"),
+        {
+            test_data_keys.DATASETS_KEY: ["1"],
+            test_data_keys.SKIPPABLE_TESTS_KEY: {
+                test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu.TestA"]
+            },
+            test_data_keys.TIMEOUTS_KEY: {"test_a.TestA": 10},
+            test_data_keys.PROFILES_KEY: {
+                "nightly": {test_data_keys.DATASETS_KEY: ["nightly"]}
+            },
+        },
+    )
+    file_path = str(tmp_path / "testData.json")
+    __write_json(
+        file_path,
+        {
+            test_data_keys.INCLUDE_KEY: ["base.json"],
+            test_data_keys.DATASETS_KEY: ["1", "2"],
+            test_data_keys.PROFILES_KEY: {
+                "gpu": {
+                    test_data_keys.SKIPPABLE_TESTS_KEY: {
+                        test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu_*.*"]
+                    },
+                    test_data_keys.TIMEOUTS_KEY: {"test_a.TestA": 20},
+                }
+            },
+        },
+    )
+    assert test_config.get_test_config(
+        file_path, profiles=["gpu", "nightly"]
+    ) == TestConfig(
+        ["1", "2", "nightly"],
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu.TestA", "test_gpu_*.*"],
+            test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [],
+        },
+        {},
+        {"test_a.TestA": 20.0},
+    ), "Test data files did not return the expected data."
+
+
+def test_parses_files_again_when_an_included_file_changes(tmp_path):
+    include_path = str(tmp_path / "base.json")
+    __write_json(include_path, {test_data_keys.DATASETS_KEY: ["1"]})
+    file_path = str(tmp_path / "testData.json")
+    __write_json(file_path, {test_data_keys.INCLUDE_KEY: ["base.json"]})
+    cache_dir = str(tmp_path / "cache")
+    test_config.get_test_config(file_path, cache_dir)
+    __write_json(include_path, {test_data_keys.DATASETS_KEY: ["2"]})
+    os.utime(include_path, ns=(__MTIME_NS, __MTIME_NS))
+    assert test_config.get_test_config(file_path, cache_dir).data_sets == [
+        "2"
+    ], "Test data files did not return the expected data."
+
+
+def test_exits_on_circular_include(tmp_path, __mock_log):
+    file_path = str(tmp_path / "testData.json")
+    __write_json(file_path, {test_data_keys.INCLUDE_KEY: ["testData.json"]})
     with pytest.raises(SystemExit):
-        test_config.get_test_config(__DUMMY_FILE_PATH)
+        test_config.get_test_config(file_path)
     __mock_log.assert_called_once_with(
-        logger.red(f"ERROR: File '{__DUMMY_FILE_PATH}' does not exist.")
+        logger.red(
+            f"ERROR: Circular include in file '{file_path}': {file_path} -> {file_path}"
+        )
     )
 
 
-def test_exits_on_is_a_directory_error(
-    __mock_open_raise_is_directory_error, __mock_log
-):
+def test_exits_on_missing_included_file(tmp_path, __mock_log):
+    file_path = str(tmp_path / "testData.json")
+    __write_json(file_path, {test_data_keys.INCLUDE_KEY: ["missing.json"]})
     with pytest.raises(SystemExit):
-        test_config.get_test_config(__DUMMY_FILE_PATH)
+        test_config.get_test_config(file_path)
     __mock_log.assert_called_once_with(
-        logger.red(f"ERROR: Path '{__DUMMY_FILE_PATH}' provided is a directory.")
+        logger.red(f"ERROR: File '{tmp_path / 'missing.json'}' does not exist.")
     )
 
 
-def test_exits_on_permission_error(__mock_open_raise_permission_error, __mock_log):
+def test_exits_on_undefined_profile(__test_data_file, __mock_log):
     with pytest.raises(SystemExit):
-        test_config.get_test_config(__DUMMY_FILE_PATH)
+        test_config.get_test_config(__test_data_file, profiles=["nightly"])
     __mock_log.assert_called_once_with(
-        logger.red(f"ERROR: Permission denied to open file '{__DUMMY_FILE_PATH}'.")
+        logger.red(
+            f"ERROR: Profile 'nightly' is not defined in file '{__test_data_file}' or the files it includes. Available profiles: none."
+        )
     )
 
 
-def test_exits_on_json_decode_error(
-    __mock_open, __mock_json_load_raise_json_decode_error, __mock_log
+@pytest.mark.parametrize(
+    "data,expected_errors",
+    [
+        pytest.param(
+            [],
+            ["configuration: expected an object, got a list."],
+        ),
+        pytest.param(
+            {"skipable": {}, test_data_keys.DATASETS_KEY: "mda"},
+            [
+                "configuration: unknown key 'skipable'. Did you mean 'skippable'?",
+                "datasets: expected a list, got a string.",
+            ],
+        ),
+        pytest.param(
+            {
+                test_data_keys.SKIPPABLE_TESTS_KEY: {
+                    test_data_keys.SKIPPABLE_GPU_KEY: ["re:(", 1],
+                    test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+                        {
+                            test_data_keys.SKIPPABLE_DEPENDENCIES_IS_PLUGIN_KEY: "yes",
+                            "test": [],
+                        }
+                    ],
+                    test_data_keys.SKIPPABLE_OTHERS_KEY: [
+                        {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "re:(?P<a>b)"}
+                    ],
+                }
+            },
+            [
+                "skippable.gpu[0]: invalid regular expression 're:(': missing ), unterminated subpattern at position 0.",
+                "skippable.gpu[1]: expected a string, got a number.",
+                "skippable.dependencies[0]: unknown key 'test'. Did you mean 'tests'?",
+                "skippable.dependencies[0]: missing required key 'name'.",
+                "skippable.dependencies[0].isPlugin: expected a boolean, got a string.",
+                "skippable.others[0].test: regular expression 're:(?P<a>b)' cannot have named groups.",
+            ],
+        ),
+        pytest.param(
+            {
+                test_data_keys.TEST_INTERNAL_DEPENDENCIES_KEY: {"test_a.TestA": None},
+                test_data_keys.TIMEOUTS_KEY: {"test_a.TestA": 0, "test_b.TestB": True},
+            },
+            [
+                "test-dependencies.test_a.TestA: expected a list, got null.",
+                "timeouts.test_a.TestA: expected a positive number of seconds, got 0.",
+                "timeouts.test_b.TestB: expected a positive number of seconds, got true.",
+            ],
+        ),
+        pytest.param(
+            {
+                test_data_keys.RESOURCES_KEY: {
+                    "test_a.TestA": {
+                        test_data_keys.RESOURCES_CPUS_KEY: 0,
+                        test_data_keys.RESOURCES_MEMORY_KEY: "20G",
+                        "gpu": 1,
+                    },
+                    "test_b.TestB": {test_data_keys.RESOURCES_GPUS_KEY: -1},
+                    "test_c.TestC": 4,
+                }
+            },
+            [
+                "resources.test_a.TestA: unknown key 'gpu'. Did you mean 'gpus'?",
+                "resources.test_a.TestA.cpus: expected a positive number, got 0.",
+                'resources.test_a.TestA.memory: expected a non-negative number, got "20G".',
+                "resources.test_b.TestB.gpus: expected a non-negative number, got -1.",
+                "resources.test_c.TestC: expected an object, got a number.",
+            ],
+        ),
+        pytest.param(
+            {
+                test_data_keys.INCLUDE_KEY: "base.json",
+                test_data_keys.PROFILES_KEY: {
+                    "nightly": {
+                        test_data_keys.INCLUDE_KEY: [],
+                        test_data_keys.SKIPPABLE_TESTS_KEY: {
+                            test_data_keys.SKIPPABLE_GPU_KEY: [None]
+                        },
+                    }
+                },
+            },
+            [
+                "include: expected a list, got a string.",
+                "profiles.nightly: unknown key 'include'.",
+                "profiles.nightly.skippable.gpu[0]: expected a string, got null.",
+            ],
+        ),
+    ],
+)
+def test_exits_listing_every_mistake_of_invalid_config(
+    data, expected_errors, tmp_path, __mock_log
 ):
+    file_path = str(tmp_path / "testData.json")
+    __write_json(file_path, data)
     with pytest.raises(SystemExit):
-        test_config.get_test_config(__DUMMY_FILE_PATH)
+        test_config.get_test_config(file_path)
     __mock_log.assert_called_once_with(
         logger.red(
-            f"ERROR: Invalid JSON format in file '{__DUMMY_FILE_PATH}':\n{__JSON_EXCEPTION}"
+            f"ERROR: Invalid test configuration in file '{file_path}':\n"
+            + "\n".join(f"  - {error}" for error in expected_errors)
         )
     )
 
 
-def test_exits_on_exception(__mock_open_raise_exception, __mock_log):
+def test_exits_on_file_not_found_error(__mock_log):
     with pytest.raises(SystemExit):
         test_config.get_test_config(__DUMMY_FILE_PATH)
     __mock_log.assert_called_once_with(
-        logger.red(f"An unexpected error occurred:\n{__EXCEPTION_TEXT}")
+        logger.red(f"ERROR: File '{__DUMMY_FILE_PATH}' does not exist.")
     )
 
 
-@pytest.fixture
-def __mock_log():
-    with patch("scipion_testrunner.application.logger.Logger.__call__") as mock_method:
-        yield mock_method
+def test_exits_on_is_a_directory_error(tmp_path, __mock_log):
+    with pytest.raises(SystemExit):
+        test_config.get_test_config(str(tmp_path))
+    __mock_log.assert_called_once_with(
+        logger.red(f"ERROR: Path '{tmp_path}' provided is a directory.")
+    )
 
 
-@pytest.fixture
-def __mock_open():
-    with patch("builtins.open") as mock_method:
-        yield mock_method
+def test_exits_on_permission_error(__test_data_file, __mock_open, __mock_log):
+    __mock_open.side_effect = PermissionError(__EXCEPTION_TEXT)
+    with pytest.raises(SystemExit):
+        test_config.get_test_config(__test_data_file)
+    __mock_log.assert_called_once_with(
+        logger.red(f"ERROR: Permission denied to open file '{__test_data_file}'.")
+    )
 
 
-@pytest.fixture
-def __mock_json_load():
-    with patch("json.load") as mock_method:
-        mock_method.return_value = __FILE_DATA
-        yield mock_method
+def test_exits_on_json_decode_error(tmp_path, __mock_log):
+    file_path = tmp_path / "testData.json"
+    file_path.write_text("{")
+    with pytest.raises(SystemExit):
+        test_config.get_test_config(str(file_path))
+    with pytest.raises(json.JSONDecodeError) as error:
+        json.loads("{")
+    __mock_log.assert_called_once_with(
+        logger.red(f"ERROR: Invalid JSON format in file '{file_path}':\n{error.value}")
+    )
 
 
-@pytest.fixture
-def __mock_open_raise_file_not_found_error(__mock_open):
-    __mock_open.side_effect = FileNotFoundError(__EXCEPTION_TEXT)
+def test_exits_on_exception(__test_data_file, __mock_open, __mock_log):
+    __mock_open.side_effect = Exception(__EXCEPTION_TEXT)
+    with pytest.raises(SystemExit):
+        test_config.get_test_config(__test_data_file)
+    __mock_log.assert_called_once_with(
+        logger.red(f"An unexpected error occurred:\n{__EXCEPTION_TEXT}")
+    )
 
 
 @pytest.fixture
-def __mock_open_raise_is_directory_error(__mock_open):
-    __mock_open.side_effect = IsADirectoryError(__EXCEPTION_TEXT)
+def __mock_log():
+    with patch("scipion_testrunner.application.logger.Logger.__call__") as mock_method:
+        yield mock_method
 
 
 @pytest.fixture
-def __mock_open_raise_permission_error(__mock_open):
-    __mock_open.side_effect = PermissionError(__EXCEPTION_TEXT)
+def __mock_open():
+    with patch("builtins.open") as mock_method:
+        yield mock_method
 
 
 @pytest.fixture
-def __mock_json_load_raise_json_decode_error(__mock_json_load):
-    __mock_json_load.side_effect = __JSON_EXCEPTION
+def __test_data_file(tmp_path):
+    file_path = str(tmp_path / "testData.json")
+    __write_json(file_path, __FILE_DATA)
+    return file_path
 
 
-@pytest.fixture
-def __mock_open_raise_exception(__mock_open):
-    __mock_open.side_effect = Exception(__EXCEPTION_TEXT)
+def __write_json(file_path, data):
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
@@ -0,0 +1,76 @@
+import pytest
+
+from scipion_testrunner.domain import catalog
+from scipion_testrunner.domain.catalog import TestCatalog
+
+__TESTS = [f"module.test_{i}.TestCase{i}" for i in range(5)]
+__REASON = "Test reason"
+
+
+def test_keeps_tests_in_order_without_repetitions():
+    assert (
+        TestCatalog([*__TESTS, __TESTS[0]]).get_tests() == __TESTS
+    ), "Received different tests than expected"
+
+
+@pytest.mark.parametrize(
+    "test,removed,expected",
+    [
+        pytest.param(__TESTS[0], False, True),
+        pytest.param(__TESTS[0], True, False),
+        pytest.param("missing.TestMissing", False, False),
+    ],
+)
+def test_checks_membership_of_tests(test, removed, expected):
+    test_catalog = TestCatalog(__TESTS)
+    if removed:
+        test_catalog.remove(test)
+    assert (test in test_catalog) == expected, "Received different membership"
+
+
+def test_removes_tests_keeping_their_reason():
+    test_catalog = TestCatalog(__TESTS)
+    assert test_catalog.remove(__TESTS[1], __REASON), "Test was not removed"
+    assert test_catalog.get_tests() == [
+        __TESTS[0],
+        *__TESTS[2:],
+    ], "Received different tests than expected"
+    assert len(test_catalog) == len(__TESTS) - 1, "Received different test count"
+    record = test_catalog.get_record(__TESTS[1])
+    assert (
+        record.status == catalog.REMOVED_STATUS and record.skip_reason == __REASON
+    ), "Removed test does not keep its removal reason"
+
+
+@pytest.mark.parametrize(
+    "test", [pytest.param(__TESTS[0]), pytest.param("missing.TestMissing")]
+)
+def test_does_not_remove_tests_outside_catalog(test):
+    test_catalog = TestCatalog(__TESTS)
+    test_catalog.remove(__TESTS[0])
+    assert not test_catalog.remove(test), "Removed a test outside the catalog"
+    assert len(test_catalog) == len(__TESTS) - 1, "Received different test count"
+
+
+def test_splits_test_names_into_module_and_class():
+    record = TestCatalog(__TESTS, {__TESTS[0]: [__TESTS[1]]}).get_record(__TESTS[0])
+    assert (record.module, record.class_name, record.deps) == (
+        "module.test_0",
+        "TestCase0",
+        (__TESTS[1],),
+    ), "Received different test record than expected"
+
+
+def test_records_results_of_tests_that_were_not_removed():
+    test_catalog = TestCatalog(__TESTS)
+    test_catalog.remove(__TESTS[3])
+    test_catalog.set_results(__TESTS[:1], __TESTS[1:2], {__TESTS[2]: 1.5})
+    assert [
+        (record.name, record.status, record.duration)
+        for record in test_catalog.get_records()
+    ] == [
+        (__TESTS[0], catalog.FAILED_STATUS, None),
+        (__TESTS[1], catalog.SKIPPED_STATUS, None),
+        (__TESTS[2], catalog.PASSED_STATUS, 1.5),
+        (__TESTS[4], catalog.PASSED_STATUS, None),
+    ], "Received different test results than expected"
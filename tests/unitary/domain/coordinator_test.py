@@ -0,0 +1,251 @@
+import os
+import stat
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain import coordinator, worker
+from scipion_testrunner.domain.handlers import socket_handler
+from scipion_testrunner.domain.run_options import RunOptions
+from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+__PLUGIN = "myplugin"
+__TESTS = ["test_a.TestA", "test_a.TestB", "test_a.TestFail", "test_b.TestC"]
+__TESTS_WITH_DEPS = {"test_a.TestB": ["test_a.TestA"]}
+__STUB_SCIPION = """#!/bin/bash
+echo "$2" >> "{log_file}"
+[[ "$2" == *Fail ]] && echo "Stub failure" && exit 1
+[[ "$2" == *FailLate ]] && sleep 1 && exit 1
+[[ "$2" == *Slow ]] && sleep 30 && echo "Slow test finished" >> "{log_file}"
+exit 0
+"""
+
+
+def test_returns_failed_tests_run_by_local_workers(tmp_path, __mock_print):
+    address = f"unix:{tmp_path / 'socket'}"
+    log_file = tmp_path / "runs.log"
+    scipion = __create_stub_scipion(tmp_path, log_file)
+    serving = __serve_in_background(
+        coordinator.Coordinator(
+            DependencyScheduler(__TESTS, __TESTS_WITH_DEPS), __PLUGIN, []
+        ),
+        address,
+    )
+    workers = [
+        threading.Thread(target=worker.run_worker, args=(address, scipion, __PLUGIN, 2))
+        for _ in range(2)
+    ]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join(timeout=20)
+    serving.join(timeout=20)
+    assert serving.failed_tests == ["test_a.TestFail"], "Unexpected failed tests"
+    runs = [line.rsplit(".", maxsplit=2)[-2:] for line in log_file.read_text().split()]
+    run_tests = [".".join(run) for run in runs]
+    assert sorted(run_tests) == sorted(__TESTS), "Every test must run exactly once"
+    assert run_tests.index("test_a.TestA") < run_tests.index(
+        "test_a.TestB"
+    ), "Dependent test ran before its dependency"
+
+
+def test_stops_serving_tests_after_first_failure_when_failing_fast(
+    tmp_path, __mock_print
+):
+    address = f"unix:{tmp_path / 'socket'}"
+    log_file = tmp_path / "runs.log"
+    scipion = __create_stub_scipion(tmp_path, log_file)
+    scheduler = DependencyScheduler(["test_a.TestFail", "test_b.TestC"], {})
+    serving = __serve_in_background(
+        coordinator.Coordinator(
+            scheduler, __PLUGIN, [], options=RunOptions(fail_fast=True)
+        ),
+        address,
+    )
+    worker.run_worker(address, scipion, __PLUGIN, 1)
+    serving.join(timeout=20)
+    assert serving.failed_tests == ["test_a.TestFail"], "Unexpected failed tests"
+    assert log_file.read_text().split() == [
+        f"{__PLUGIN}.tests.test_a.TestFail"
+    ], "Tests kept running after the first failure"
+    assert list(scheduler.get_skipped_tests()) == [
+        "test_b.TestC"
+    ], "Remaining test was not cancelled"
+
+
+def test_refuses_to_run_invalid_test_names(tmp_path, __mock_print):
+    address = f"unix:{tmp_path / 'socket'}"
+    log_file = tmp_path / "runs.log"
+    scipion = __create_stub_scipion(tmp_path, log_file)
+    injected_test = f"test_a.TestA; touch {tmp_path / 'injected'}"
+    serving = __serve_in_background(
+        coordinator.Coordinator(DependencyScheduler([injected_test], {}), __PLUGIN, []),
+        address,
+    )
+    worker.run_worker(address, scipion, __PLUGIN, 1)
+    serving.join(timeout=20)
+    assert serving.failed_tests == [injected_test], "Invalid test was not failed"
+    assert not log_file.exists(), "Invalid test was run"
+    assert not (tmp_path / "injected").exists(), "Injected command was run"
+
+
+def test_stops_tests_running_on_workers_after_first_failure_when_failing_fast(
+    tmp_path, __mock_print
+):
+    address = f"unix:{tmp_path / 'socket'}"
+    log_file = tmp_path / "runs.log"
+    scipion = __create_stub_scipion(tmp_path, log_file)
+    serving = __serve_in_background(
+        coordinator.Coordinator(
+            DependencyScheduler(["test_a.TestSlow", "test_a.TestFailLate"], {}),
+            __PLUGIN,
+            [],
+            options=RunOptions(fail_fast=True),
+        ),
+        address,
+    )
+    worker_thread = threading.Thread(
+        target=worker.run_worker, args=(address, scipion, __PLUGIN, 2)
+    )
+    worker_thread.start()
+    worker_thread.join(timeout=20)
+    serving.join(timeout=20)
+    assert not worker_thread.is_alive(), "Worker kept running the slow test"
+    assert serving.failed_tests == ["test_a.TestFailLate"], "Unexpected failed tests"
+    assert "Slow test finished" not in log_file.read_text(), "Slow test was not stopped"
+
+
+def test_requeues_test_when_worker_disconnects(tmp_path, __mock_print):
+    address = f"unix:{tmp_path / 'socket'}"
+    serving = __serve_in_background(
+        coordinator.Coordinator(DependencyScheduler(__TESTS[:1], {}), __PLUGIN, []),
+        address,
+    )
+    first_test = __ask_for_test(address)
+    second_test = __ask_for_test(address, send_result=True)
+    serving.join(timeout=20)
+    assert first_test == second_test == __TESTS[0], "Test was not handed out again"
+    assert serving.failed_tests == [], "Unexpected failed tests"
+
+
+def test_rejects_worker_of_different_plugin(tmp_path, __mock_print):
+    address = f"unix:{tmp_path / 'socket'}"
+    __serve_in_background(
+        coordinator.Coordinator(DependencyScheduler(__TESTS[:1], {}), __PLUGIN, []),
+        address,
+    )
+    with pytest.raises(SystemExit):
+        worker.run_worker(address, "scipion", "otherplugin", 1)
+
+
+class __ServingThread(threading.Thread):
+    """
+    ### Thread serving the tests of a coordinator.
+    """
+
+    def __init__(self, test_coordinator: coordinator.Coordinator, address: str):
+        """
+        ### Constructor
+
+        #### Params:
+        - test_coordinator (Coordinator): Coordinator to serve tests from.
+        - address (str): Address to serve the tests on.
+        """
+        super().__init__(daemon=True)
+        self.test_coordinator = test_coordinator
+        self.address = address
+        self.failed_tests = None
+
+    def run(self):
+        """
+        ### Serves the tests and stores the failed ones.
+        """
+        self.failed_tests = self.test_coordinator.serve(self.address)
+
+
+def __serve_in_background(
+    test_coordinator: coordinator.Coordinator, address: str
+) -> __ServingThread:
+    """
+    ### Starts serving the tests of the given coordinator and waits until it listens.
+
+    #### Params:
+    - test_coordinator (Coordinator): Coordinator to serve tests from.
+    - address (str): Address to serve the tests on.
+
+    #### Returns:
+    - (__ServingThread): Thread serving the tests.
+    """
+    serving = __ServingThread(test_coordinator, address)
+    serving.start()
+    path = address[len(socket_handler.UNIX_ADDRESS_PREFIX) :]
+    for _ in range(500):
+        if os.path.exists(path):
+            break
+        serving.join(timeout=0.01)
+    return serving
+
+
+def __ask_for_test(address: str, send_result: bool = False) -> str:
+    """
+    ### Connects to the coordinator, asks for a test and optionally sends back its result.
+
+    #### Params:
+    - address (str): Address of the coordinator.
+    - send_result (bool): Optional. If True, the test is reported as passed.
+
+    #### Returns:
+    - (str): Received test.
+    """
+    with socket_handler.create_connection(address) as connection:
+        with connection.makefile("rwb") as stream:
+            socket_handler.send_message(
+                stream,
+                {
+                    coordinator.TYPE_KEY: coordinator.HELLO_TYPE,
+                    coordinator.PLUGIN_KEY: __PLUGIN,
+                },
+            )
+            socket_handler.receive_message(stream)
+            socket_handler.send_message(
+                stream, {coordinator.TYPE_KEY: coordinator.NEXT_TYPE}
+            )
+            test = socket_handler.receive_message(stream)[coordinator.TEST_KEY]
+            if send_result:
+                socket_handler.send_message(
+                    stream,
+                    {
+                        coordinator.TYPE_KEY: coordinator.RESULT_TYPE,
+                        coordinator.TEST_KEY: test,
+                        coordinator.FAILED_KEY: False,
+                    },
+                )
+                socket_handler.send_message(
+                    stream, {coordinator.TYPE_KEY: coordinator.NEXT_TYPE}
+                )
+                socket_handler.receive_message(stream)
+    return test
+
+
+def __create_stub_scipion(directory, log_file) -> str:
+    """
+    ### Creates an executable that logs the tests it is asked to run.
+
+    #### Params:
+    - directory (Path): Directory where the executable is created.
+    - log_file (Path): File where each run test is appended.
+
+    #### Returns:
+    - (str): Path to the executable.
+    """
+    scipion = directory / "scipion"
+    scipion.write_text(__STUB_SCIPION.format(log_file=log_file))
+    scipion.chmod(scipion.stat().st_mode | stat.S_IEXEC)
+    return str(scipion)
+
+
+@pytest.fixture
+def __mock_print():
+    with patch("builtins.print") as mock_method:
+        yield mock_method
@@ -0,0 +1,175 @@
+import pytest
+
+from scipion_testrunner.domain import dependency_graph
+
+__TESTS = [f"test_{i}" for i in range(5)]
+__N_SYNTHETIC_TESTS = 10000
+__SYNTHETIC_LAYER_SIZE = 100
+__MAX_VISITS_PER_DEPENDENCY = 10
+
+
+@pytest.mark.parametrize(
+    "dependencies,expected_circular_dependencies",
+    [
+        pytest.param({}, []),
+        pytest.param({__TESTS[0]: ["random_test"]}, []),
+        pytest.param(
+            {__TESTS[0]: [__TESTS[-1]], __TESTS[-1]: [__TESTS[0]]},
+            [([__TESTS[0], __TESTS[-1]], [__TESTS[0], __TESTS[-1], __TESTS[0]])],
+        ),
+        pytest.param(
+            {
+                __TESTS[0]: [__TESTS[1]],
+                __TESTS[1]: [__TESTS[-1]],
+                __TESTS[-1]: [__TESTS[1]],
+            },
+            [([__TESTS[1], __TESTS[-1]], [__TESTS[1], __TESTS[-1], __TESTS[1]])],
+        ),
+        pytest.param(
+            {__TESTS[0]: [__TESTS[0]]}, [([__TESTS[0]], [__TESTS[0], __TESTS[0]])]
+        ),
+        pytest.param(
+            {
+                __TESTS[0]: [__TESTS[1]],
+                __TESTS[1]: [__TESTS[0], __TESTS[2]],
+                __TESTS[2]: [__TESTS[1]],
+                __TESTS[3]: [__TESTS[3]],
+            },
+            [
+                (__TESTS[:3], [__TESTS[0], __TESTS[1], __TESTS[0]]),
+                ([__TESTS[3]], [__TESTS[3], __TESTS[3]]),
+            ],
+        ),
+    ],
+)
+def test_returns_expected_circular_dependencies(
+    dependencies, expected_circular_dependencies
+):
+    assert (
+        dependency_graph.get_circular_dependencies(dependencies)
+        == expected_circular_dependencies
+    ), "Received different circular dependencies than expected"
+
+
+@pytest.mark.parametrize(
+    "dependencies,expected_unmet_dependencies",
+    [
+        pytest.param({}, {}),
+        pytest.param({__TESTS[0]: [__TESTS[1]]}, {}),
+        pytest.param({__TESTS[0]: ["missing"]}, {__TESTS[0]: ["missing"]}),
+        pytest.param(
+            {__TESTS[0]: [__TESTS[1], "missing_a", "missing_b"]},
+            {__TESTS[0]: ["missing_a", "missing_b"]},
+        ),
+        pytest.param(
+            {
+                __TESTS[2]: [__TESTS[1]],
+                __TESTS[1]: [__TESTS[0]],
+                __TESTS[0]: ["missing"],
+            },
+            {
+                __TESTS[0]: ["missing"],
+                __TESTS[1]: [__TESTS[0]],
+                __TESTS[2]: [__TESTS[1]],
+            },
+        ),
+        pytest.param(
+            {"not_a_test": ["missing"], __TESTS[0]: ["not_a_test"]},
+            {"not_a_test": ["missing"], __TESTS[0]: ["not_a_test"]},
+        ),
+    ],
+)
+def test_returns_expected_unmet_dependencies(dependencies, expected_unmet_dependencies):
+    assert (
+        dependency_graph.get_unmet_dependencies(__TESTS, dependencies)
+        == expected_unmet_dependencies
+    ), "Received different unmet dependencies than expected"
+
+
+@pytest.mark.parametrize(
+    "dependencies,n_circular_tests,n_unmet_tests",
+    [
+        pytest.param(
+            {f"test_{i}": [f"test_{i + 1}"] for i in range(__N_SYNTHETIC_TESTS - 1)},
+            0,
+            0,
+            id="chain",
+        ),
+        pytest.param(
+            {
+                f"test_{i}": [f"test_{(i + 1) % __N_SYNTHETIC_TESTS}"]
+                for i in range(__N_SYNTHETIC_TESTS)
+            },
+            __N_SYNTHETIC_TESTS,
+            __N_SYNTHETIC_TESTS,
+            id="circle",
+        ),
+        pytest.param(
+            {
+                f"test_{i}": [
+                    f"test_{i - __SYNTHETIC_LAYER_SIZE + j}"
+                    for j in range(__SYNTHETIC_LAYER_SIZE)
+                ]
+                for i in range(__SYNTHETIC_LAYER_SIZE, __N_SYNTHETIC_TESTS)
+            },
+            0,
+            __N_SYNTHETIC_TESTS - __SYNTHETIC_LAYER_SIZE,
+            id="dense-layers",
+        ),
+    ],
+)
+def test_walks_synthetic_graphs_of_many_tests_in_linear_time(
+    dependencies, n_circular_tests, n_unmet_tests
+):
+    tests = [f"test_{i}" for i in range(1, __N_SYNTHETIC_TESTS)]
+    visits = [0]
+    counted_dependencies = {
+        test: __VisitCountingList(deps, visits) for test, deps in dependencies.items()
+    }
+    circular_dependencies = dependency_graph.get_circular_dependencies(
+        counted_dependencies
+    )
+    unmet_dependencies = dependency_graph.get_unmet_dependencies(
+        tests, counted_dependencies
+    )
+    assert visits[0] <= __MAX_VISITS_PER_DEPENDENCY * sum(
+        len(deps) for deps in dependencies.values()
+    ), "Walking the dependency graph visited more dependencies than expected"
+    assert (
+        sum(len(tests) for tests, _ in circular_dependencies) == n_circular_tests
+    ), "Received different number of circular tests than expected"
+    assert (
+        len(unmet_dependencies) == n_unmet_tests
+    ), "Received different number of tests with unmet dependencies than expected"
+
+
+class __VisitCountingList(list):
+    """
+    ### List of dependencies that counts how many of its elements are visited.
+    """
+
+    def __init__(self, items: list[str], visits: list[int]):
+        """
+        ### Constructor.
+
+        #### Params:
+        - items (list[str]): Dependencies of a test.
+        - visits (list[int]): Counter shared by every list of the graph, as its only element.
+        """
+        super().__init__(items)
+        self.visits = visits
+
+    def __iter__(self):
+        """
+        ### Iterates over the dependencies, counting each one as visited.
+        """
+        for item in super().__iter__():
+            self.visits[0] += 1
+            yield item
+
+    def __contains__(self, item: object) -> bool:
+        """
+        ### Checks if the given test is a dependency, counting every dependency as visited.
+        """
+        self.visits[0] += len(self)
+        return super().__contains__(item)
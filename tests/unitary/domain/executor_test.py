@@ -0,0 +1,84 @@
+import threading
+import time
+
+from scipion_testrunner.domain.executor import Executor, WorkerPool
+from scipion_testrunner.domain.handlers import python_handler, shell_handler
+
+__TASK_TIME = 0.2
+__MIN_MEASURED_TIME = 0.15
+
+
+def test_reuses_the_same_pool_across_batches_of_work():
+    pool = WorkerPool(2, use_threads=True)
+    for _ in range(3):
+        python_handler.run_function_in_parallel(
+            lambda param: None, parallelizable_params=["a", "b"], pool=pool
+        )
+    pool.close()
+    assert pool.get_stats().pools_created == 1, "Pool was started more than once"
+
+
+def test_does_not_start_pool_until_it_is_used():
+    executor = Executor(test_jobs=2)
+    executor.get_test_pool()
+    executor.close()
+    assert executor.get_stats().pools_created == 0, "Unused pool was started"
+
+
+def test_runs_functions_in_worker_processes():
+    results = []
+    finished = threading.Event()
+    pool = WorkerPool(1)
+    pool.apply_async(
+        abs,
+        (-1,),
+        callback=lambda result: (results.append(result), finished.set()),
+        error_callback=lambda _: finished.set(),
+    )
+    finished.wait(10)
+    pool.close()
+    assert results == [1], "Received different result than expected"
+
+
+def test_measures_queue_wait_and_idle_time():
+    pool = WorkerPool(2, use_threads=True)
+    python_handler.run_function_in_parallel(
+        lambda _: time.sleep(__TASK_TIME),
+        parallelizable_params=["a", "b", "c"],
+        pool=pool,
+    )
+    pool.close()
+    stats = pool.get_stats()
+    assert (
+        stats.queue_wait >= __MIN_MEASURED_TIME
+    ), "Task waiting for a free worker was not measured"
+    assert (
+        stats.idle_time >= __MIN_MEASURED_TIME
+    ), "Worker without a task was not measured as idle"
+
+
+def test_keeps_separate_pools_for_downloads_and_tests():
+    executor = Executor(test_jobs=2, download_jobs=8)
+    assert (
+        executor.get_download_pool().processes,
+        executor.get_test_pool().processes,
+        executor.get_test_pool(use_threads=True).processes,
+    ) == (8, 2, 2), "Pools have different sizes than expected"
+    assert (
+        executor.get_test_pool() is executor.get_test_pool()
+    ), "Test pool was not reused"
+
+
+def test_stops_running_commands_when_terminated():
+    results = []
+    executor = Executor(test_jobs=1)
+    executor.get_test_pool(use_threads=True).apply_async(
+        shell_handler.run_logged_shell_command,
+        ("sleep 10",),
+        callback=results.append,
+        error_callback=results.append,
+    )
+    time.sleep(__TASK_TIME)
+    executor.terminate()
+    assert len(results) == 1, "Running command was not stopped."
+    assert results[0][0] != 0, "Stopped command reported success."
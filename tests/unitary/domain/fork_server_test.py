@@ -0,0 +1,115 @@
+import os
+import stat
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain import fork_server
+from scipion_testrunner.domain.handlers import shell_handler
+
+__PLUGIN = "myplugin"
+__RUNNER_MODULE = "fake_runner"
+__MAX_STOP_TIME = 30
+__FAKE_RUNNER = """import sys
+import time
+
+print(f"Running {sys.argv[1]}", flush=True)
+if sys.argv[1].endswith("Hang"):
+    time.sleep(60)
+sys.exit(1 if sys.argv[1].endswith("Fail") else 0)
+"""
+__STUB_SCIPION = f"""#!/bin/bash
+echo "Scipion banner"
+shift
+exec "{sys.executable}" "$@"
+"""
+
+
+@pytest.mark.parametrize(
+    "test,expected_ret_code",
+    [pytest.param("test_a.TestOk", 0), pytest.param("test_a.TestFail", 1)],
+)
+def test_returns_expected_result_when_running_test_in_fork_server(
+    test, expected_ret_code, __stub_scipion
+):
+    server = fork_server.ForkServer(__stub_scipion, __PLUGIN)
+    try:
+        ret_code, output = server.run_test(test)
+    finally:
+        server.close()
+    assert ret_code == expected_ret_code, "Received different return code than expected"
+    assert (
+        output.strip() == f"Running {test}"
+    ), "Received different output than expected"
+
+
+def test_returns_timeout_code_when_test_in_fork_server_times_out(__stub_scipion):
+    server = fork_server.ForkServer(__stub_scipion, __PLUGIN)
+    try:
+        ret_code, output = server.run_test("test_a.TestHang", timeout=0.5)
+        assert server.is_alive(), "Fork server should survive a timed out test"
+    finally:
+        server.close()
+    assert (
+        ret_code == shell_handler.TIMEOUT_RET_CODE
+    ), "Received different return code than expected"
+    assert "Running test_a.TestHang" in output, "Output of the test was lost"
+
+
+def test_stops_running_test_when_fork_server_is_terminated(__stub_scipion):
+    servers = fork_server.ForkServerPool(__stub_scipion, __PLUGIN)
+    results = []
+    running_test = threading.Thread(
+        target=lambda: results.append(servers.run_test("test_a.TestHang"))
+    )
+    running_test.start()
+    time.sleep(1)
+    start = time.monotonic()
+    servers.terminate()
+    running_test.join(timeout=__MAX_STOP_TIME)
+    servers.close()
+    assert time.monotonic() - start < __MAX_STOP_TIME, "Test was not stopped in time"
+    assert results[0][0], "Terminated test should have failed"
+
+
+def test_reports_failure_when_fork_server_cannot_start(tmp_path):
+    scipion = tmp_path / "scipion"
+    scipion.write_text("#!/bin/bash\necho 'Broken Scipion' >&2\nexit 1\n")
+    os.chmod(scipion, os.stat(scipion).st_mode | stat.S_IEXEC)
+    server = fork_server.ForkServer(str(scipion), __PLUGIN)
+    try:
+        ret_code, output = server.run_test("test_a.TestOk")
+    finally:
+        server.close()
+    assert not server.is_alive(), "Fork server should not be alive"
+    assert ret_code, "Test should have failed"
+    assert "Broken Scipion" in output, "Output does not contain the startup error"
+
+
+def test_reports_saved_time_of_every_test_after_the_first_one(__stub_scipion):
+    servers = fork_server.ForkServerPool(__stub_scipion, __PLUGIN)
+    try:
+        servers.run_test("test_a.TestOk")
+        first_saved_time = servers.get_saved_time()
+        servers.run_test("test_a.TestOk")
+        second_saved_time = servers.get_saved_time()
+    finally:
+        servers.close()
+    assert first_saved_time == 0, "First test cannot save startup time"
+    assert second_saved_time > 0, "Second test did not save startup time"
+
+
+@pytest.fixture
+def __stub_scipion(tmp_path, monkeypatch):
+    (tmp_path / f"{__RUNNER_MODULE}.py").write_text(__FAKE_RUNNER)
+    scipion = tmp_path / "scipion"
+    scipion.write_text(__STUB_SCIPION)
+    os.chmod(scipion, os.stat(scipion).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    with patch.object(fork_server, "TEST_RUNNER_MODULE", __RUNNER_MODULE), patch.object(
+        fork_server, "PRELOADED_MODULES", []
+    ):
+        yield str(scipion)
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from scipion_testrunner.domain.handlers import async_handler
+from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+
+@pytest.mark.parametrize(
+    "failing,expected_failed",
+    [
+        pytest.param([], []),
+        pytest.param(["test_1"], ["test_1"]),
+        pytest.param(["test_0", "test_2"], ["test_0", "test_2"]),
+    ],
+)
+def test_returns_expected_failed_params_when_running_in_dependency_order(
+    failing, expected_failed
+):
+    async def __run(param):
+        return param if param in failing else None
+
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"], {"test_2": ["test_1"]}
+    )
+    assert sorted(
+        async_handler.run_coroutine_in_dependency_order(
+            __run, scheduler=scheduler, jobs=2
+        )
+    ) == sorted(expected_failed), "Received different failed params than expected."
+
+
+def test_returns_every_failure_reported_as_list_when_running_in_dependency_order():
+    async def __run(param):
+        return param.split() if " " in param else None
+
+    scheduler = DependencyScheduler(["test_0 test_1", "test_2"], {})
+    assert async_handler.run_coroutine_in_dependency_order(
+        __run, scheduler=scheduler
+    ) == ["test_0", "test_1"], "Received different failed params than expected."
+
+
+def test_runs_params_after_their_dependencies_when_running_in_dependency_order():
+    run_order = []
+
+    async def __run(param):
+        run_order.append(param)
+
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"],
+        {"test_0": ["test_1"], "test_1": ["test_2"]},
+    )
+    async_handler.run_coroutine_in_dependency_order(__run, scheduler=scheduler, jobs=3)
+    assert run_order == [
+        "test_2",
+        "test_1",
+        "test_0",
+    ], "Params did not run in dependency order."
+
+
+def test_runs_up_to_given_number_of_params_at_the_same_time():
+    running = []
+    max_running = []
+
+    async def __run(_):
+        running.append(None)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    scheduler = DependencyScheduler([f"test_{index}" for index in range(6)], {})
+    async_handler.run_coroutine_in_dependency_order(__run, scheduler=scheduler, jobs=2)
+    assert max(max_running) == len(["test_0", "test_1"]), "Ran more params than jobs"
+
+
+def test_returns_param_as_failed_and_skips_dependents_when_coroutine_raises():
+    async def __raise(param):
+        if param == "test_0":
+            raise RuntimeError
+
+    scheduler = DependencyScheduler(["test_0", "test_1"], {"test_1": ["test_0"]})
+    assert async_handler.run_coroutine_in_dependency_order(
+        __raise, scheduler=scheduler
+    ) == ["test_0"], "Coroutine that raised was not returned as failed."
+    assert scheduler.get_skipped_tests() == {
+        "test_1": "Dependency failed: 'test_0'"
+    }, "Dependent of a failed param was not skipped"
+
+
+def test_cancels_running_and_remaining_params_after_first_failure_when_failing_fast():
+    cancelled = []
+
+    async def __run(param):
+        if param == "test_0":
+            return param
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(param)
+            raise
+
+    scheduler = DependencyScheduler(["test_0", "test_1", "test_2"], {})
+    assert async_handler.run_coroutine_in_dependency_order(
+        __run, scheduler=scheduler, jobs=2, fail_fast=True
+    ) == ["test_0"], "Received different failed params than expected."
+    assert cancelled == ["test_1"], "Running param was not cancelled"
+    assert set(scheduler.get_skipped_tests()) == {
+        "test_1",
+        "test_2",
+    }, "Remaining params were not cancelled"
@@ -0,0 +1,16 @@
+import os
+
+from scipion_testrunner.domain.handlers import cache_handler
+
+
+def test_returns_file_path_inside_cache_dir(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    assert cache_handler.get_cache_file_path(cache_dir, "file.json") == os.path.join(
+        cache_dir, "file.json"
+    ), "Received different cache file path than expected"
+
+
+def test_creates_cache_dir_when_getting_file_path(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_handler.get_cache_file_path(str(cache_dir), "file.json")
+    assert cache_dir.is_dir(), "Cache directory was not created"
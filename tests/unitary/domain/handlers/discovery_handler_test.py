@@ -0,0 +1,110 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain.handlers import discovery_handler
+
+__PLUGIN = "myplugin"
+__TESTS = ["test_a.TestA", "test_b.TestB"]
+
+
+def test_returns_expected_discovery_file_path(__mock_get_cache_file_path):
+    assert (
+        discovery_handler.get_discovery_file_path("cache", __PLUGIN)
+        == __mock_get_cache_file_path.return_value
+    ), "Received different discovery file path than expected"
+    __mock_get_cache_file_path.assert_called_once_with(
+        "cache", f"{__PLUGIN}-discovery.json"
+    )
+
+
+def test_returns_no_fingerprint_when_plugin_cannot_be_located():
+    assert (
+        discovery_handler.get_fingerprint("scipion", "missing_plugin_module") is None
+    ), "Received fingerprint of a plugin that does not exist"
+
+
+def test_returns_same_fingerprint_when_plugin_does_not_change(__plugin_dir):
+    assert discovery_handler.get_fingerprint(
+        "scipion", __PLUGIN
+    ) == discovery_handler.get_fingerprint(
+        "scipion", __PLUGIN
+    ), "Fingerprint changed without changes in the plugin"
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    [pytest.param("__init__.py"), pytest.param(os.path.join("tests", "test_c.py"))],
+)
+def test_returns_different_fingerprint_when_plugin_file_changes(
+    file_name, __plugin_dir
+):
+    fingerprint = discovery_handler.get_fingerprint("scipion", __PLUGIN)
+    (__plugin_dir / file_name).write_text("class TestC: pass\n")
+    assert (
+        discovery_handler.get_fingerprint("scipion", __PLUGIN) != fingerprint
+    ), "Fingerprint did not change along with the plugin"
+
+
+def test_ignores_compiled_files_in_fingerprint(__plugin_dir):
+    fingerprint = discovery_handler.get_fingerprint("scipion", __PLUGIN)
+    (__plugin_dir / "__pycache__").mkdir()
+    (__plugin_dir / "__pycache__" / "module.pyc").write_bytes(b"\0")
+    assert (
+        discovery_handler.get_fingerprint("scipion", __PLUGIN) == fingerprint
+    ), "Fingerprint changed because of compiled files"
+
+
+def test_returns_different_fingerprint_for_different_scipion(__plugin_dir, tmp_path):
+    scipion = tmp_path / "scipion"
+    scipion.write_text("#!/bin/sh\n")
+    assert discovery_handler.get_fingerprint(
+        str(scipion), __PLUGIN
+    ) != discovery_handler.get_fingerprint(
+        "scipion", __PLUGIN
+    ), "Fingerprint did not depend on the Scipion executable"
+
+
+def test_returns_recorded_tests_when_fingerprint_matches(tmp_path):
+    discovery_file = str(tmp_path / "discovery.json")
+    discovery_handler.record_tests(discovery_file, "abc", __TESTS)
+    assert (
+        discovery_handler.get_cached_tests(discovery_file, "abc") == __TESTS
+    ), "Received different cached tests than expected"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(None),
+        pytest.param('{"fingerprint": "other", "tests": ["test_a.TestA"]}'),
+        pytest.param('{"fingerprint": "abc", "tests": "test_a.TestA"}'),
+        pytest.param("not json"),
+    ],
+)
+def test_returns_no_cached_tests_when_cache_is_not_valid(content, tmp_path):
+    discovery_file = tmp_path / "discovery.json"
+    if content is not None:
+        discovery_file.write_text(content)
+    assert (
+        discovery_handler.get_cached_tests(str(discovery_file), "abc") is None
+    ), "Received cached tests from a cache that is not valid"
+
+
+@pytest.fixture
+def __plugin_dir(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "site-packages" / __PLUGIN
+    (plugin_dir / "tests").mkdir(parents=True)
+    (plugin_dir / "__init__.py").write_text("")
+    (plugin_dir / "tests" / "test_a.py").write_text("class TestA: pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path / "site-packages"))
+    return plugin_dir
+
+
+@pytest.fixture
+def __mock_get_cache_file_path():
+    with patch(
+        "scipion_testrunner.domain.handlers.cache_handler.get_cache_file_path"
+    ) as mock_method:
+        yield mock_method
@@ -0,0 +1,92 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain.handlers import history_handler
+
+__PLUGIN = "myplugin"
+__HISTORY_SIZE = 5
+__N_RECORDED_RUNS = 20
+
+
+def test_returns_expected_history_file_path(__mock_get_cache_file_path):
+    assert (
+        history_handler.get_history_file_path("cache", __PLUGIN)
+        == __mock_get_cache_file_path.return_value
+    ), "Received different history file path than expected"
+    __mock_get_cache_file_path.assert_called_once_with(
+        "cache", f"{__PLUGIN}-durations.jsonl"
+    )
+
+
+def test_returns_empty_durations_when_history_does_not_exist(tmp_path):
+    assert (
+        history_handler.get_test_durations(str(tmp_path / "missing.jsonl")) == {}
+    ), "Received durations from a non-existing history"
+
+
+def test_returns_recorded_durations(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    history_handler.record_test_durations(history_file, {"test_0": 1.0, "test_1": 2.0})
+    history_handler.record_test_durations(history_file, {"test_0": 3.0})
+    assert history_handler.get_test_durations(history_file) == {
+        "test_0": 2.0,
+        "test_1": 2.0,
+    }, "Received different durations than expected"
+
+
+def test_only_uses_most_recent_durations(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    for duration in [100.0, 1.0, 1.0, 1.0, 1.0, 1.0]:
+        history_handler.record_test_durations(history_file, {"test_0": duration})
+    assert history_handler.get_test_durations(history_file) == {
+        "test_0": 1.0
+    }, "Old durations were taken into account"
+
+
+def test_ignores_invalid_history_lines(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    history_file.write_text(
+        "not json\n"
+        + json.dumps({"test": "test_0"})
+        + "\n"
+        + json.dumps({"test": "test_1", "duration": 4})
+        + "\n"
+    )
+    assert history_handler.get_test_durations(str(history_file)) == {
+        "test_1": 4.0
+    }, "Received different durations than expected"
+
+
+def test_compacts_history_when_it_grows_too_big(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    for _ in range(__N_RECORDED_RUNS):
+        history_handler.record_test_durations(history_file, {"test_0": 1.0})
+    history_handler.get_test_durations(history_file)
+    with open(history_file, encoding="utf-8") as file:
+        assert len(file.readlines()) == __HISTORY_SIZE, "History file was not compacted"
+
+
+def test_does_not_compact_history_when_not_requested(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    for _ in range(__N_RECORDED_RUNS):
+        history_handler.record_test_durations(history_file, {"test_0": 1.0})
+    history_handler.get_test_durations(history_file, compact=False)
+    with open(history_file, encoding="utf-8") as file:
+        assert len(file.readlines()) == __N_RECORDED_RUNS, "History file was compacted"
+
+
+def test_does_not_create_history_when_there_are_no_durations(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    history_handler.record_test_durations(str(history_file), {})
+    assert not history_file.exists(), "History file was created"
+
+
+@pytest.fixture
+def __mock_get_cache_file_path():
+    with patch(
+        "scipion_testrunner.domain.handlers.cache_handler.get_cache_file_path"
+    ) as mock_method:
+        mock_method.return_value = "cache/history.jsonl"
+        yield mock_method
@@ -0,0 +1,140 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain.handlers import module_handler
+
+__MODULES = {"module_a": True, "module_b": False}
+
+
+def test_returns_expected_module_file_path(__mock_get_cache_file_path):
+    assert (
+        module_handler.get_module_file_path("cache")
+        == __mock_get_cache_file_path.return_value
+    ), "Received different module file path than expected"
+    __mock_get_cache_file_path.assert_called_once_with("cache", "python-modules.json")
+
+
+def test_returns_same_fingerprint_when_environment_does_not_change(tmp_path):
+    assert module_handler.get_fingerprint(
+        [str(tmp_path)]
+    ) == module_handler.get_fingerprint(
+        [str(tmp_path)]
+    ), "Fingerprint changed without changes in the environment"
+
+
+def test_returns_different_fingerprint_when_package_is_installed(tmp_path):
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    fingerprint = module_handler.get_fingerprint([str(site_packages)])
+    (site_packages / "module_a").mkdir()
+    assert (
+        module_handler.get_fingerprint([str(site_packages)]) != fingerprint
+    ), "Fingerprint did not change along with the installed packages"
+
+
+def test_returns_different_fingerprint_when_search_path_changes(tmp_path):
+    assert module_handler.get_fingerprint(
+        [str(tmp_path)]
+    ) != module_handler.get_fingerprint(
+        []
+    ), "Fingerprint did not depend on the given search path"
+
+
+def test_returns_different_fingerprint_when_python_path_changes(monkeypatch):
+    fingerprint = module_handler.get_fingerprint([])
+    monkeypatch.setenv("PYTHONPATH", "/other/path")
+    assert (
+        module_handler.get_fingerprint([]) != fingerprint
+    ), "Fingerprint did not depend on the PYTHONPATH variable"
+
+
+def test_returns_different_fingerprint_when_pth_file_changes(tmp_path):
+    pth_file = tmp_path / "package.pth"
+    pth_file.write_text("/some/path")
+    fingerprint = module_handler.get_fingerprint([str(tmp_path)])
+    os.utime(pth_file, ns=(0, 0))
+    assert (
+        module_handler.get_fingerprint([str(tmp_path)]) != fingerprint
+    ), "Fingerprint did not depend on the .pth files"
+
+
+def test_returns_recorded_search_path_when_environment_does_not_change(tmp_path):
+    module_file = str(tmp_path / "modules.json")
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    search_path = [str(site_packages)]
+    module_handler.record_modules(
+        module_file, module_handler.get_fingerprint(search_path), __MODULES, search_path
+    )
+    assert (
+        module_handler.get_cached_search_path(module_file) == search_path
+    ), "Received different cached search path than expected"
+
+
+def test_returns_no_search_path_when_environment_changes(tmp_path):
+    module_file = str(tmp_path / "modules.json")
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    search_path = [str(site_packages)]
+    module_handler.record_modules(
+        module_file, module_handler.get_fingerprint(search_path), __MODULES, search_path
+    )
+    (site_packages / "package.pth").write_text("/some/path")
+    assert (
+        module_handler.get_cached_search_path(module_file) is None
+    ), "Received a cached search path from a changed environment"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(None),
+        pytest.param('{"fingerprint": "abc", "modules": {}}'),
+        pytest.param('{"fingerprint": "abc", "modules": {}, "searchPath": "path"}'),
+        pytest.param('["not", "a", "cache"]'),
+    ],
+)
+def test_returns_no_search_path_when_cache_is_not_valid(content, tmp_path):
+    module_file = tmp_path / "modules.json"
+    if content is not None:
+        module_file.write_text(content)
+    assert (
+        module_handler.get_cached_search_path(str(module_file)) is None
+    ), "Received a cached search path from a cache that is not valid"
+
+
+def test_returns_recorded_modules_when_fingerprint_matches(tmp_path):
+    module_file = str(tmp_path / "modules.json")
+    module_handler.record_modules(module_file, "abc", __MODULES)
+    assert (
+        module_handler.get_cached_modules(module_file, "abc") == __MODULES
+    ), "Received different cached modules than expected"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(None),
+        pytest.param('{"fingerprint": "other", "modules": {"module_a": true}}'),
+        pytest.param('{"fingerprint": "abc", "modules": ["module_a"]}'),
+        pytest.param('{"fingerprint": "abc", "modules": {"module_a": "yes"}}'),
+        pytest.param("not json"),
+    ],
+)
+def test_returns_no_cached_modules_when_cache_is_not_valid(content, tmp_path):
+    module_file = tmp_path / "modules.json"
+    if content is not None:
+        module_file.write_text(content)
+    assert (
+        module_handler.get_cached_modules(str(module_file), "abc") == {}
+    ), "Received cached modules from a cache that is not valid"
+
+
+@pytest.fixture
+def __mock_get_cache_file_path():
+    with patch(
+        "scipion_testrunner.domain.handlers.cache_handler.get_cache_file_path"
+    ) as mock_method:
+        yield mock_method
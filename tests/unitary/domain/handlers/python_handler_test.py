@@ -1,11 +1,17 @@
+import multiprocessing.pool
+import threading
 from typing import Callable, Optional, Tuple
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 import pytest
 
+from scipion_testrunner.domain.executor import WorkerPool
 from scipion_testrunner.domain.handlers import python_handler
+from scipion_testrunner.domain.scheduler import DependencyScheduler
 
 __MODULE_NAME = "test"
+__WORKER_START_TIME = 10.0
+__WORKER_END_TIME = 13.0
 
 
 @pytest.mark.parametrize(
@@ -34,6 +40,85 @@ def test_returns_expected_status_when_testing_python_command(
     ), f"Command {message_fragment}."
 
 
+def test_checks_every_module_in_a_single_python_process():
+    assert python_handler.get_existing_python_modules(
+        ["json", "missing_module_name", "os.path"]
+    ) == {
+        "json": True,
+        "missing_module_name": False,
+        "os.path": True,
+    }, "Received different module checks than expected"
+
+
+def test_ignores_lines_printed_by_modules_when_checking_modules(
+    __mock_run_shell_command, __mock_exists_python_module
+):
+    __mock_run_shell_command.return_value = (
+        0,
+        'Imported\nMODULE_CHECK:{"test": true}\n',
+    )
+    assert python_handler.get_existing_python_modules([__MODULE_NAME]) == {
+        __MODULE_NAME: True
+    }, "Received different module checks than expected"
+    __mock_run_shell_command.assert_called_once()
+    __mock_exists_python_module.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "return_code,output",
+    [
+        pytest.param(139, ""),
+        pytest.param(0, "Imported\n"),
+        pytest.param(0, "MODULE_CHECK:not json"),
+        pytest.param(0, 'MODULE_CHECK:{"other": true}'),
+    ],
+)
+def test_checks_each_module_separately_when_single_check_has_no_result(
+    return_code, output, __mock_run_shell_command, __mock_exists_python_module
+):
+    __mock_run_shell_command.return_value = return_code, output
+    __mock_exists_python_module.return_value = True
+    assert python_handler.get_existing_python_modules([__MODULE_NAME, "other"]) == {
+        __MODULE_NAME: True,
+        "other": True,
+    }, "Received different module checks than expected"
+    __mock_exists_python_module.assert_has_calls([call(__MODULE_NAME), call("other")])
+
+
+def test_returns_search_path_of_python_in_path():
+    search_path = python_handler.get_python_search_path()
+    assert isinstance(search_path, list) and all(
+        isinstance(path, str) for path in search_path
+    ), "Received a search path that is not a list of paths"
+
+
+@pytest.mark.parametrize(
+    "return_code,output",
+    [
+        pytest.param(1, "Error"),
+        pytest.param(0, ""),
+        pytest.param(0, "not json"),
+        pytest.param(0, '{"path": "/usr/lib"}'),
+    ],
+)
+def test_returns_no_search_path_when_python_cannot_report_it(
+    return_code, output, __mock_run_shell_command
+):
+    __mock_run_shell_command.return_value = return_code, output
+    assert (
+        python_handler.get_python_search_path() is None
+    ), "Received a search path from an invalid output"
+
+
+def test_does_not_run_python_when_there_are_no_modules_to_check(
+    __mock_run_shell_command,
+):
+    assert (
+        python_handler.get_existing_python_modules([]) == {}
+    ), "Received module checks without modules"
+    __mock_run_shell_command.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "params,n_errors",
     [
@@ -50,36 +135,151 @@ def test_returns_expected_statuses_when_running_parallel_function(
     assert (
         len(
             python_handler.run_function_in_parallel(
-                ExitState, parallelizable_params=params
+                lambda param: None if param else "Failed",
+                parallelizable_params=params,
+                pool=WorkerPool(2),
             )
         )
         == n_errors
     ), "Parallel function call returned different number of errors than expected."
 
 
-class ExitState:
-    """
-    ### Mock substitute for multiprocessing.pool.AsyncResult.
-    """
+def test_reports_results_in_completion_order_when_running_parallel_function():
+    slow_param_finished = threading.Event()
+    results = []
 
-    def __init__(self, input_str: str):
-        """
-        ### Constructor
+    def __run(param):
+        if param == "slow":
+            slow_param_finished.wait(5)
+        return param
 
-        #### Params:
-        - input_str (str): Input (possibly empty) string.
-        """
-        self.success = bool(input_str)
+    def __on_result(param, result):
+        results.append((param, result, slow_param_finished.is_set()))
+        slow_param_finished.set()
 
-    def get(self) -> Optional[str]:
-        """
-        ### Returns a message if the state of the fake operation is failure.
+    with patch("multiprocessing.Pool", multiprocessing.pool.ThreadPool):
+        assert python_handler.run_function_in_parallel(
+            __run,
+            parallelizable_params=["slow", "fast"],
+            pool=WorkerPool(2),
+            on_result=__on_result,
+        ) == ["fast", "slow"], "Failures were not collected in completion order"
+    assert results == [
+        ("fast", "fast", False),
+        ("slow", "slow", True),
+    ], "Results were not reported as soon as they finished"
+
+
+@pytest.mark.parametrize(
+    "failing,expected_failed",
+    [
+        pytest.param([], []),
+        pytest.param(["test_1"], ["test_1"]),
+        pytest.param(["test_0", "test_2"], ["test_0", "test_2"]),
+    ],
+)
+def test_returns_expected_failed_params_when_running_in_dependency_order(
+    failing, expected_failed, __mock_pool
+):
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"], {"test_2": ["test_1"]}
+    )
+    assert (
+        python_handler.run_function_in_dependency_order(
+            lambda param: param if param in failing else None,
+            scheduler=scheduler,
+            pool=WorkerPool(2),
+        )
+        == expected_failed
+    ), "Received different failed params than expected."
+
+
+def test_returns_every_failure_reported_as_list_when_running_in_dependency_order(
+    __mock_pool,
+):
+    scheduler = DependencyScheduler(["test_0 test_1", "test_2"], {})
+    assert python_handler.run_function_in_dependency_order(
+        lambda param: param.split() if " " in param else None,
+        scheduler=scheduler,
+        pool=WorkerPool(2),
+    ) == ["test_0", "test_1"], "Received different failed params than expected."
+
+
+def test_runs_params_after_their_dependencies_when_running_in_dependency_order(
+    __mock_pool,
+):
+    run_order = []
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"],
+        {"test_0": ["test_1"], "test_1": ["test_2"]},
+    )
+    python_handler.run_function_in_dependency_order(
+        run_order.append, scheduler=scheduler, pool=WorkerPool(3)
+    )
+    assert run_order == [
+        "test_2",
+        "test_1",
+        "test_0",
+    ], "Params did not run in dependency order."
+
+
+def test_returns_param_as_failed_when_function_raises_in_dependency_order(
+    __mock_pool,
+):
+    def __raise(_):
+        raise RuntimeError
+
+    scheduler = DependencyScheduler(["test_0"], {})
+    assert python_handler.run_function_in_dependency_order(
+        __raise, scheduler=scheduler, pool=WorkerPool(1)
+    ) == ["test_0"], "Function that raised was not returned as failed."
 
-        #### Returns:
-        - (str | None): Message if the sate is a failure.
-        """
-        if not self.success:
-            return "Failed"
+
+def test_runs_params_in_threads_when_running_in_dependency_order():
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"], {"test_2": ["test_1"]}
+    )
+    assert python_handler.run_function_in_dependency_order(
+        lambda param: param if param != "test_0" else None,
+        scheduler=scheduler,
+        pool=WorkerPool(2, use_threads=True),
+    ) == ["test_1"], "Received different failed params than expected."
+    assert scheduler.get_skipped_tests() == {
+        "test_2": "Dependency failed: 'test_1'"
+    }, "Dependent of a failed param was not skipped"
+
+
+def test_records_duration_measured_by_the_worker_when_running_in_dependency_order():
+    scheduler = DependencyScheduler(["test_0"], {})
+    with patch.object(
+        python_handler,
+        "run_timed",
+        lambda func, *args: (__WORKER_START_TIME, __WORKER_END_TIME, func(*args)),
+    ):
+        python_handler.run_function_in_dependency_order(
+            lambda _: None, scheduler=scheduler, pool=WorkerPool(1, use_threads=True)
+        )
+    assert scheduler.get_durations() == {
+        "test_0": __WORKER_END_TIME - __WORKER_START_TIME
+    }, "Duration was not measured from the moment the worker started the param"
+
+
+def test_cancels_remaining_params_after_first_failure_when_failing_fast(__mock_pool):
+    run_params = []
+    scheduler = DependencyScheduler(["test_0", "test_1", "test_2"], {})
+
+    def __run(param):
+        run_params.append(param)
+        return param if param == "test_0" else None
+
+    assert python_handler.run_function_in_dependency_order(
+        __run, scheduler=scheduler, pool=WorkerPool(1), fail_fast=True
+    ) == ["test_0"], "Received different failed params than expected."
+    assert run_params == ["test_0"], "Params kept running after the first failure"
+    assert set(scheduler.get_skipped_tests()) == {
+        "test_1",
+        "test_2",
+    }, "Remaining params were not cancelled"
 
 
 class PoolMock:
@@ -87,27 +287,45 @@ class PoolMock:
     ### Mock substitute for multiprocessing.Pool.
     """
 
-    def __init__(self, processes: int):
+    def __init__(self, processes: int, initializer: Optional[Callable] = None):
         """
         ### Constructor
 
         #### Params:
         - processes (int): Number of processes for the pool.
+        - initializer (callable): Optional. Callable each worker would run when starting.
         """
         self.processes = processes
+        self.initializer = initializer
 
-    def apply_async(self, func: Callable, args: Tuple):
+    def apply_async(
+        self,
+        func: Callable,
+        args: Tuple,
+        callback: Optional[Callable] = None,
+        error_callback: Optional[Callable] = None,
+    ):
         """
         ### Calls the received callable with given args.
 
         #### Params:
         - func (callable): Callable to run.
         - args (Tuple): Args to be passed on to the callable.
+        - callback (callable): Optional. Callable receiving the output.
+        - error_callback (callable): Optional. Callable receiving the raised exception.
 
         #### Returns:
         - (Any): Output of the callable.
         """
-        return func(args[0], *args[1:])
+        try:
+            result = func(args[0], *args[1:])
+        except Exception as e:
+            if error_callback:
+                error_callback(e)
+            return None
+        if callback:
+            callback(result)
+        return result
 
     def close(self):
         """
@@ -121,6 +339,12 @@ class PoolMock:
         """
         pass
 
+    def terminate(self):
+        """
+        ### Overrides the pool terminate function.
+        """
+        pass
+
 
 @pytest.fixture
 def __mock_python_command_succeeded():
@@ -130,6 +354,14 @@ def __mock_python_command_succeeded():
         yield mock_method
 
 
+@pytest.fixture
+def __mock_exists_python_module():
+    with patch(
+        "scipion_testrunner.domain.handlers.python_handler.exists_python_module"
+    ) as mock_method:
+        yield mock_method
+
+
 @pytest.fixture
 def __mock_run_shell_command():
     with patch(
@@ -1,9 +1,14 @@
-from unittest.mock import patch, call, Mock
+import asyncio
+from unittest.mock import call, patch
 
 import pytest
 
 from scipion_testrunner.application.logger import logger
-from scipion_testrunner.domain.handlers import scipion_handler
+from scipion_testrunner.domain import packing
+from scipion_testrunner.domain.executor import Executor
+from scipion_testrunner.domain.handlers import scipion_handler, shell_handler
+from scipion_testrunner.domain.run_options import ASYNCIO_ENGINE, RunOptions
+from scipion_testrunner.domain.scheduler import DependencyScheduler
 
 __SCIPION = "scipion"
 __MODULE = "mymodule"
@@ -30,16 +35,30 @@ Scanning tests...
    scipion3 tests {__MODULE}.tests.test_convert_atom_struct.TestAtomicStructHandler
 """
 __DATASETS = ["dataset_1", "dataset_2"]
-__ALL_TESTS = [f"test_{i}" for i in range(10)]
-__TESTS = __ALL_TESTS[:5]
-__TEST_BATCHES = [__ALL_TESTS[5:7], __ALL_TESTS[7:]]
+__TESTS = [f"test_{i}" for i in range(5)]
+__PACKED_TESTS = ["test_a.TestA", "test_b.TestB"]
+__INJECTED_TEST = "test_a.TestA;touch_injected"
+__TESTS_WITH_DEPS = {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[1]]}
+__SEARCHED_TESTS = [
+    "workflows.test_workflow_xmipp_rct.TestXmippRCTWorkflow",
+    "workflows.test_workflow_xmipp_ctf_consensus.TestCtfConsensus",
+    "workflows.test_workflow_xmipp_assignment_tiltpairs.TestXmippAssignmentTiltPairsWorkflow",
+    "workflows.test_workflow_xmipp.TestXmippWorkflow",
+    "test_convert_atom_struct.TestAtomicStructHandler",
+]
+__DEFAULT_COMMAND_OPTIONS = {
+    "timeout": None,
+    "log_file": None,
+    "tail_size": shell_handler.DEFAULT_TAIL_SIZE,
+}
 
 
 def test_exists_with_error_when_test_search_fails(
-    __mock_run_shell_command, __mock_print
+    __mock_run_streamed_shell_command, __mock_print
 ):
     error_text = "Test fail"
-    __mock_run_shell_command.return_value = (1, error_text)
+    __mock_run_streamed_shell_command.side_effect = None
+    __mock_run_streamed_shell_command.return_value = (1, error_text)
     with pytest.raises(SystemExit):
         scipion_handler.get_all_tests(__SCIPION, __MODULE)
     __mock_print.assert_called_once_with(
@@ -51,7 +70,7 @@ def test_exists_with_error_when_test_search_fails(
 
 
 def test_exits_with_error_when_plugin_is_not_installed(
-    __mock_run_shell_command, __mock_print, __mock_exists_module
+    __mock_run_streamed_shell_command, __mock_print, __mock_exists_module
 ):
     __mock_exists_module.return_value = False
     with pytest.raises(SystemExit):
@@ -64,23 +83,93 @@ def test_exits_with_error_when_plugin_is_not_installed(
     )
 
 
-def test_returns_expected_test_list(__mock_run_shell_command, __mock_exists_module):
-    __mock_run_shell_command.return_value = (0, __TEST_LIST_STRING)
+def test_returns_expected_test_list(
+    __mock_run_streamed_shell_command, __mock_exists_module
+):
+    __mock_run_streamed_shell_command.side_effect = __stream_lines(__TEST_LIST_STRING)
     __mock_exists_module.return_value = True
-    assert scipion_handler.get_all_tests(__SCIPION, __MODULE) == [
-        "workflows.test_workflow_xmipp_rct.TestXmippRCTWorkflow",
-        "workflows.test_workflow_xmipp_ctf_consensus.TestCtfConsensus",
-        "workflows.test_workflow_xmipp_assignment_tiltpairs.TestXmippAssignmentTiltPairsWorkflow",
-        "workflows.test_workflow_xmipp.TestXmippWorkflow",
-        "test_convert_atom_struct.TestAtomicStructHandler",
-    ], "Received different tests than expected"
+    assert (
+        scipion_handler.get_all_tests(__SCIPION, __MODULE) == __SEARCHED_TESTS
+    ), "Received different tests than expected"
+
+
+def test_hands_over_each_test_as_it_is_found(
+    __mock_run_streamed_shell_command, __mock_exists_module
+):
+    __mock_run_streamed_shell_command.side_effect = __stream_lines(__TEST_LIST_STRING)
+    found_tests = []
+    scipion_handler.get_all_tests(__SCIPION, __MODULE, on_test=found_tests.append)
+    assert (
+        found_tests == __SEARCHED_TESTS
+    ), "Received different streamed tests than expected"
+
+
+def test_returns_expected_test_methods(__mock_run_shell_command):
+    __mock_run_shell_command.return_value = (
+        0,
+        f'Scipion banner\n{{"{__MODULE}.tests.{__PACKED_TESTS[0]}": ["test_x", "test_y"]}}',
+    )
+    assert scipion_handler.get_test_methods(
+        __SCIPION, __MODULE, __PACKED_TESTS[:1]
+    ) == {__PACKED_TESTS[0]: ["test_x", "test_y"]}, "Received different methods"
+    assert __mock_run_shell_command.call_args[0][0].startswith(
+        f"{__SCIPION} python -c "
+    ), "Methods were not listed with Scipion's Python"
+    assert __mock_run_shell_command.call_args[0][0].endswith(
+        f" {__MODULE}.tests.{__PACKED_TESTS[0]}"
+    ), "Methods were not listed for the given test"
+
+
+def test_quotes_test_names_when_listing_test_methods(__mock_run_shell_command):
+    __mock_run_shell_command.return_value = (1, "")
+    scipion_handler.get_test_methods(__SCIPION, __MODULE, [__INJECTED_TEST])
+    assert __mock_run_shell_command.call_args[0][0].endswith(
+        f" '{__MODULE}.tests.{__INJECTED_TEST}'"
+    ), "Test name was not quoted"
+
+
+@pytest.mark.parametrize(
+    "test,expected",
+    [
+        pytest.param(__PACKED_TESTS[0], True),
+        pytest.param(f"{__PACKED_TESTS[0]}.test_x", True),
+        pytest.param(packing.get_pack_name(__PACKED_TESTS), True),
+        pytest.param("", False),
+        pytest.param("test_a..TestA", False),
+        pytest.param("test_a.1TestA", False),
+        pytest.param(__INJECTED_TEST, False),
+        pytest.param(packing.get_pack_name([__PACKED_TESTS[0], "$(reboot)"]), False),
+    ],
+)
+def test_checks_if_test_name_is_valid(test, expected):
+    assert (
+        scipion_handler.is_valid_test_name(test) == expected
+    ), "Received different validity than expected"
+
+
+@pytest.mark.parametrize(
+    "return_code,output",
+    [
+        pytest.param(1, "ModuleNotFoundError"),
+        pytest.param(0, ""),
+        pytest.param(0, "Not JSON"),
+    ],
+)
+def test_returns_no_test_methods_when_they_cannot_be_listed(
+    return_code, output, __mock_run_shell_command, __mock_log_warning
+):
+    __mock_run_shell_command.return_value = (return_code, output)
+    assert (
+        scipion_handler.get_test_methods(__SCIPION, __MODULE, __PACKED_TESTS) == {}
+    ), "Received methods when they could not be listed"
+    __mock_log_warning.assert_called_once()
 
 
 def test_prints_starting_message_when_downloading_datasets(
     __mock_print, __mock_run_function_in_parallel
 ):
     __mock_run_function_in_parallel.return_value = []
-    scipion_handler.download_datasets(__SCIPION, __DATASETS)
+    scipion_handler.download_datasets(__SCIPION, __DATASETS, Executor())
     __mock_print.assert_called_once_with(
         logger.blue(f"Downloading {len(__DATASETS)} datasets..."), flush=True
     )
@@ -91,7 +180,7 @@ def test_exits_with_error_when_downloading_datasets(
 ):
     __mock_run_function_in_parallel.return_value = [True]
     with pytest.raises(SystemExit):
-        scipion_handler.download_datasets(__SCIPION, __DATASETS)
+        scipion_handler.download_datasets(__SCIPION, __DATASETS, Executor())
     __mock_print.assert_called_with(
         logger.red("The download of at least one dataset ended with errors. Exiting."),
         flush=True,
@@ -132,112 +221,144 @@ def test_shows_expected_individual_download_success_message_when_downloading_ind
     )
 
 
-def test_logs_expected_messages_when_running_tests(__mock_print, __mock_run_test_batch):
-    scipion_handler.run_tests(__SCIPION, __TESTS, __TEST_BATCHES, 2, __MODULE)
-    calls = [
-        call(logger.blue("Initial run of non-dependent tests."), flush=True),
-        call(logger.blue("Batch of dependent tests 1/2."), flush=True),
-        call(logger.blue("Batch of dependent tests 2/2."), flush=True),
-    ]
-    __mock_print.assert_has_calls(calls)
-
-
-def test_does_not_log_run_messages_when_running_tests(
-    __mock_print, __mock_run_test_batch
-):
-    scipion_handler.run_tests(__SCIPION, __TESTS, [], 2, __MODULE)
-    __mock_print.assert_not_called()
-
-
 @pytest.mark.parametrize(
-    "failed_tests,expected_failed_total",
+    "tests,max_jobs,test_number_text,parallel_text",
     [
-        pytest.param([[], [], []], []),
-        pytest.param([[__TESTS[0]], [], []], [__TESTS[0]]),
-        pytest.param([[], [__TEST_BATCHES[0][0]], []], [__TEST_BATCHES[0][0]]),
-        pytest.param([[], [], [__TEST_BATCHES[1][0]]], [__TEST_BATCHES[1][0]]),
-        pytest.param(
-            [[], [__TEST_BATCHES[0][0]], [__TEST_BATCHES[1][0]]],
-            [__TEST_BATCHES[0][0], __TEST_BATCHES[1][0]],
-        ),
-        pytest.param(
-            [[__TESTS[0]], [__TEST_BATCHES[0][0]], [__TEST_BATCHES[1][0]]],
-            [__TESTS[0], __TEST_BATCHES[0][0], __TEST_BATCHES[1][0]],
-        ),
-        pytest.param(
-            [__TESTS.copy(), __TEST_BATCHES[0], []], __TESTS + __TEST_BATCHES[0]
-        ),
-        pytest.param(
-            [__TESTS.copy(), [], __TEST_BATCHES[1]], __TESTS + __TEST_BATCHES[1]
-        ),
-        pytest.param(
-            [[], __TEST_BATCHES[0], __TEST_BATCHES[1]],
-            __TEST_BATCHES[0] + __TEST_BATCHES[1],
-        ),
+        pytest.param(__TESTS, 2, "tests", " in up to 2 parallel processes"),
         pytest.param(
-            [__TESTS.copy(), __TEST_BATCHES[0], __TEST_BATCHES[1]], __ALL_TESTS
+            __TESTS, 20, "tests", f" in up to {len(__TESTS)} parallel processes"
         ),
-    ],
-)
-def test_returns_expected_failed_tests_when_running_tests(
-    failed_tests, expected_failed_total, __mock_print
-):
-    mock_run_test_batch = Mock()
-    mock_run_test_batch.side_effect = failed_tests
-    with patch(
-        "scipion_testrunner.domain.handlers.scipion_handler.__run_test_batch",
-        new=mock_run_test_batch,
-    ):
-        assert (
-            scipion_handler.run_tests(
-                __SCIPION, __TESTS.copy(), __TEST_BATCHES.copy(), 1, __MODULE
-            )
-            == expected_failed_total
-        ), "Received different failed tests than expected"
-
-
-@pytest.mark.parametrize(
-    "batch,max_jobs,test_number_text,batch_text",
-    [
-        pytest.param(__TESTS, 2, "tests", " in batches of 2 processes"),
-        pytest.param(__TESTS, 20, "tests", f" in batches of {len(__TESTS)} processes"),
         pytest.param([__TESTS[0]], 20, "test", ""),
         pytest.param([__TESTS[0]], 1, "test", ""),
-        pytest.param(__TESTS, 1, "tests", " in batches of 1 process"),
+        pytest.param(__TESTS, 1, "tests", " in up to 1 parallel process"),
     ],
 )
-def test_logs_expected_message_when_running_test_batch(
-    batch,
+def test_logs_expected_message_when_running_tests(
+    tests,
     max_jobs,
     test_number_text,
-    batch_text,
+    parallel_text,
     __mock_print,
-    __mock_run_function_in_parallel,
+    __mock_run_function_in_dependency_order,
 ):
-    scipion_handler.__run_test_batch(batch, max_jobs, __SCIPION, __MODULE)
+    scipion_handler.run_tests(
+        __SCIPION,
+        DependencyScheduler(tests, __TESTS_WITH_DEPS),
+        Executor(test_jobs=max_jobs),
+        __MODULE,
+    )
     __mock_print.assert_called_once_with(
         logger.blue(
-            f"Running a total of {len(batch)} {test_number_text} for {__MODULE}{batch_text}..."
+            f"Running a total of {len(tests)} {test_number_text} for {__MODULE}{parallel_text}..."
         ),
         flush=True,
     )
 
 
-def test_runs_function_in_parallel(__mock_print, __mock_run_function_in_parallel):
-    scipion_handler.__run_test_batch(__TESTS, 5, __SCIPION, __MODULE)
-    __mock_run_function_in_parallel.assert_called_once_with(
+def test_runs_function_in_dependency_order_when_running_tests(
+    __mock_print, __mock_run_function_in_dependency_order
+):
+    scheduler = DependencyScheduler(__TESTS, __TESTS_WITH_DEPS)
+    options = RunOptions()
+    executor = Executor(test_jobs=5)
+    scipion_handler.run_tests(__SCIPION, scheduler, executor, __MODULE, options=options)
+    __mock_run_function_in_dependency_order.assert_called_once_with(
+        scipion_handler.__run_test,
+        __SCIPION,
+        __MODULE,
+        options,
+        scheduler=scheduler,
+        pool=executor.get_test_pool(),
+        jobs=5,
+        fail_fast=False,
+    )
+
+
+def test_returns_expected_failed_tests_when_running_tests(
+    __mock_print, __mock_run_function_in_dependency_order
+):
+    __mock_run_function_in_dependency_order.return_value = __TESTS[:2]
+    assert (
+        scipion_handler.run_tests(
+            __SCIPION,
+            DependencyScheduler(__TESTS, __TESTS_WITH_DEPS),
+            Executor(test_jobs=5),
+            __MODULE,
+        )
+        == __TESTS[:2]
+    ), "Received different failed tests than expected"
+
+
+def test_runs_tests_in_fork_servers_when_running_tests_with_fork_server(
+    __mock_print, __mock_run_function_in_dependency_order, __mock_fork_server_pool
+):
+    scheduler = DependencyScheduler(__TESTS, __TESTS_WITH_DEPS)
+    __mock_fork_server_pool.return_value.get_saved_time.return_value = 12.34
+    options = RunOptions(fork_server=True, fail_fast=True)
+    executor = Executor(test_jobs=5)
+    scipion_handler.run_tests(__SCIPION, scheduler, executor, __MODULE, options=options)
+    __mock_run_function_in_dependency_order.assert_called_once_with(
         scipion_handler.__run_test,
         __SCIPION,
         __MODULE,
-        parallelizable_params=__TESTS,
+        options,
+        __mock_fork_server_pool.return_value,
+        scheduler=scheduler,
+        pool=executor.get_test_pool(use_threads=True),
         jobs=5,
+        fail_fast=True,
+    )
+    __mock_fork_server_pool.return_value.terminate.assert_called_once_with()
+    __mock_fork_server_pool.return_value.close.assert_called_once_with()
+    __mock_print.assert_called_with(
+        logger.blue("Fork servers saved about 12.3s of Scipion startup time."),
+        flush=True,
+    )
+
+
+def test_runs_tests_in_event_loop_when_running_tests_with_asyncio_engine(
+    __mock_run_function_in_dependency_order,
+    __mock_run_coroutine_in_dependency_order,
+    __mock_print,
+):
+    scheduler = DependencyScheduler(__TESTS, {})
+    options = RunOptions(engine=ASYNCIO_ENGINE)
+    scipion_handler.run_tests(
+        __SCIPION, scheduler, Executor(test_jobs=5), __MODULE, options=options
+    )
+    __mock_run_coroutine_in_dependency_order.assert_called_once_with(
+        scipion_handler.__run_test_async,
+        __SCIPION,
+        __MODULE,
+        options,
+        scheduler=scheduler,
+        jobs=5,
+        fail_fast=False,
+    )
+    __mock_run_function_in_dependency_order.assert_not_called()
+
+
+def test_runs_test_in_fork_server_when_running_test(
+    __mock_log_warning,
+    __mock_run_logged_shell_command,
+    __mock_print,
+    __mock_fork_server_pool,
+):
+    fork_servers = __mock_fork_server_pool.return_value
+    fork_servers.run_test.return_value = (0, "")
+    scipion_handler.__run_test(
+        __TESTS[0], __SCIPION, __MODULE, RunOptions(fork_server=True), fork_servers
+    )
+    fork_servers.run_test.assert_called_once_with(
+        f"{__MODULE}.tests.{__TESTS[0]}", **__DEFAULT_COMMAND_OPTIONS
     )
+    __mock_run_logged_shell_command.assert_not_called()
 
 
 def test_logs_expected_initial_warning_when_running_test(
-    __mock_log_warning, __mock_run_shell_command, __mock_print
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
 ):
-    scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE)
+    scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE, RunOptions())
     __mock_log_warning.assert_called_once_with(f"Running test {__TESTS[0]}...")
 
 
@@ -255,11 +376,11 @@ def test_logs_expected_message_when_running_test(
     output,
     expected_message,
     __mock_log_warning,
-    __mock_run_shell_command,
+    __mock_run_logged_shell_command,
     __mock_print,
 ):
-    __mock_run_shell_command.return_value = (return_code, output)
-    scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE)
+    __mock_run_logged_shell_command.return_value = (return_code, output)
+    scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE, RunOptions())
     __mock_print.assert_called_once_with(expected_message, flush=True)
 
 
@@ -270,13 +391,154 @@ def test_returns_expected_output_when_running_test(
     return_code,
     expected_return,
     __mock_log_warning,
-    __mock_run_shell_command,
+    __mock_run_logged_shell_command,
     __mock_print,
 ):
-    __mock_run_shell_command.return_value = (return_code, "")
+    __mock_run_logged_shell_command.return_value = (return_code, "")
+    assert (
+        scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE, RunOptions())
+        == expected_return
+    )
+
+
+def test_runs_pack_in_a_single_scipion_process_when_running_test(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
+):
+    assert (
+        scipion_handler.__run_test(
+            packing.get_pack_name(__PACKED_TESTS), __SCIPION, __MODULE, RunOptions()
+        )
+        == []
+    ), "Received failed tests from a successful pack"
+    __mock_run_logged_shell_command.assert_called_once_with(
+        f"{__SCIPION} tests {__MODULE}.tests.{__PACKED_TESTS[0]} {__MODULE}.tests.{__PACKED_TESTS[1]}",
+        **__DEFAULT_COMMAND_OPTIONS,
+    )
+
+
+def test_returns_attributed_failures_when_running_failed_pack(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
+):
+    __mock_run_logged_shell_command.return_value = (
+        1,
+        f"FAIL: test_x ({__MODULE}.tests.{__PACKED_TESTS[1]})\nRan 2 tests in 1.0s",
+    )
+    assert scipion_handler.__run_test(
+        packing.get_pack_name(__PACKED_TESTS), __SCIPION, __MODULE, RunOptions()
+    ) == [__PACKED_TESTS[1]], "Received different failed tests than expected"
+    __mock_run_logged_shell_command.assert_called_once()
+    __mock_print.assert_called_with(
+        logger.green(f"Test {__PACKED_TESTS[0]} OK"), flush=True
+    )
+
+
+def test_runs_tests_one_by_one_when_pack_failure_cannot_be_attributed(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
+):
+    __mock_run_logged_shell_command.side_effect = [
+        (1, "Segmentation fault"),
+        (0, ""),
+        (1, ""),
+    ]
+    assert scipion_handler.__run_test(
+        packing.get_pack_name(__PACKED_TESTS), __SCIPION, __MODULE, RunOptions()
+    ) == [__PACKED_TESTS[1]], "Received different failed tests than expected"
+    assert __mock_run_logged_shell_command.call_args_list[1:] == [
+        call(f"{__SCIPION} tests {__MODULE}.tests.{test}", **__DEFAULT_COMMAND_OPTIONS)
+        for test in __PACKED_TESTS
+    ], "Packed tests were not run one by one"
+
+
+def test_runs_tests_one_by_one_when_async_pack_failure_cannot_be_attributed(
+    __mock_log_warning, __mock_run_logged_shell_command_async, __mock_print
+):
+    __mock_run_logged_shell_command_async.side_effect = [
+        (1, "Segmentation fault"),
+        (0, ""),
+        (1, ""),
+    ]
+    assert asyncio.run(
+        scipion_handler.__run_test_async(
+            packing.get_pack_name(__PACKED_TESTS), __SCIPION, __MODULE, RunOptions()
+        )
+    ) == [__PACKED_TESTS[1]], "Received different failed tests than expected"
+    assert __mock_run_logged_shell_command_async.call_args_list[1:] == [
+        call(f"{__SCIPION} tests {__MODULE}.tests.{test}", **__DEFAULT_COMMAND_OPTIONS)
+        for test in __PACKED_TESTS
+    ], "Packed tests were not run one by one"
+
+
+def test_logs_timeout_message_when_running_test_that_times_out(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
+):
+    __mock_run_logged_shell_command.return_value = (
+        shell_handler.TIMEOUT_RET_CODE,
+        "AAA",
+    )
     assert (
-        scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE) == expected_return
+        scipion_handler.__run_test(
+            __TESTS[0], __SCIPION, __MODULE, RunOptions(timeout=1.5)
+        )
+        == __TESTS[0]
+    ), "Timed out test was not reported as failed"
+    __mock_run_logged_shell_command.assert_called_once_with(
+        f"{__SCIPION} tests {__MODULE}.tests.{__TESTS[0]}",
+        **{**__DEFAULT_COMMAND_OPTIONS, "timeout": 1.5},
     )
+    __mock_print.assert_called_once_with(
+        logger.red(f"AAA\nTest {__TESTS[0]} timed out after 1.5 seconds."),
+        flush=True,
+    )
+
+
+def test_runs_tests_one_by_one_when_pack_times_out(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print
+):
+    __mock_run_logged_shell_command.side_effect = [
+        (shell_handler.TIMEOUT_RET_CODE, f"FAIL: test_x ({__PACKED_TESTS[0]})"),
+        (0, ""),
+        (0, ""),
+    ]
+    assert (
+        scipion_handler.__run_test(
+            packing.get_pack_name(__PACKED_TESTS),
+            __SCIPION,
+            __MODULE,
+            RunOptions(timeout=1.0),
+        )
+        == []
+    ), "Received different failed tests than expected"
+    assert __mock_run_logged_shell_command.call_args_list[0][1]["timeout"] == len(
+        __PACKED_TESTS
+    ), "Pack did not get the sum of the timeouts of its tests"
+
+
+def test_writes_test_output_to_its_log_file_when_running_test(
+    __mock_log_warning, __mock_run_logged_shell_command, __mock_print, tmp_path
+):
+    __mock_run_logged_shell_command.return_value = (1, "AAA")
+    options = RunOptions(log_dir=str(tmp_path), output_tail_size=100)
+    scipion_handler.__run_test(__TESTS[0], __SCIPION, __MODULE, options)
+    log_file = str(tmp_path / f"{__TESTS[0]}.log")
+    __mock_run_logged_shell_command.assert_called_once_with(
+        f"{__SCIPION} tests {__MODULE}.tests.{__TESTS[0]}",
+        timeout=None,
+        log_file=log_file,
+        tail_size=100,
+    )
+    __mock_print.assert_called_once_with(
+        logger.red(
+            f"AAA\nTest {__TESTS[0]} failed with above message. Full output in {log_file}."
+        ),
+        flush=True,
+    )
+
+
+def test_quotes_test_names_when_getting_test_command():
+    assert (
+        scipion_handler.__get_test_command(__INJECTED_TEST, __SCIPION, __MODULE)
+        == f"{__SCIPION} tests {__MODULE}.tests.'{__INJECTED_TEST}'"
+    ), "Test name was not quoted"
 
 
 @pytest.mark.parametrize("plugin", [pytest.param(""), pytest.param("test_name")])
@@ -284,6 +546,51 @@ def test_returns_expected_test_prefix(plugin):
     assert scipion_handler.__get_test_prefix(plugin) == f"tests {plugin}.tests."
 
 
+@pytest.fixture
+def __mock_run_logged_shell_command():
+    with patch(
+        "scipion_testrunner.domain.handlers.shell_handler.run_logged_shell_command"
+    ) as mock_method:
+        mock_method.return_value = (0, "")
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_run_logged_shell_command_async():
+    with patch(
+        "scipion_testrunner.domain.handlers.shell_handler.run_logged_shell_command_async"
+    ) as mock_method:
+        mock_method.return_value = (0, "")
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_run_coroutine_in_dependency_order():
+    with patch(
+        "scipion_testrunner.domain.handlers.async_handler.run_coroutine_in_dependency_order"
+    ) as mock_method:
+        mock_method.return_value = []
+        yield mock_method
+
+
+def __stream_lines(output):
+    def run_streamed_shell_command(_, on_line):
+        for line in output.split("\n"):
+            on_line(line)
+        return 0, output
+
+    return run_streamed_shell_command
+
+
+@pytest.fixture
+def __mock_run_streamed_shell_command():
+    with patch(
+        "scipion_testrunner.domain.handlers.shell_handler.run_streamed_shell_command"
+    ) as mock_method:
+        mock_method.side_effect = __stream_lines("")
+        yield mock_method
+
+
 @pytest.fixture
 def __mock_run_shell_command():
     with patch(
@@ -316,17 +623,25 @@ def __mock_run_function_in_parallel():
 
 
 @pytest.fixture
-def __mock_log_warning():
+def __mock_fork_server_pool():
     with patch(
-        "scipion_testrunner.application.logger.Logger.log_warning"
+        "scipion_testrunner.domain.handlers.scipion_handler.ForkServerPool"
+    ) as mock_class:
+        yield mock_class
+
+
+@pytest.fixture
+def __mock_run_function_in_dependency_order():
+    with patch(
+        "scipion_testrunner.domain.handlers.python_handler.run_function_in_dependency_order"
     ) as mock_method:
+        mock_method.return_value = []
         yield mock_method
 
 
 @pytest.fixture
-def __mock_run_test_batch():
+def __mock_log_warning():
     with patch(
-        "scipion_testrunner.domain.handlers.scipion_handler.__run_test_batch"
+        "scipion_testrunner.application.logger.Logger.log_warning"
     ) as mock_method:
-        mock_method.return_value = []
         yield mock_method
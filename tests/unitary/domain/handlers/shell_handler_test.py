@@ -1,5 +1,9 @@
+import asyncio
+import multiprocessing
 import os
 import subprocess
+import threading
+import time
 from unittest.mock import patch, Mock
 
 import pytest
@@ -7,6 +11,7 @@ import pytest
 from scipion_testrunner.domain.handlers import shell_handler
 
 __COMMAND = "echo Hi"
+__STREAM_DELAY = 0.4
 
 
 def test_calls_popen_when_running_shell_command(__mock_popen):
@@ -17,17 +22,155 @@ def test_calls_popen_when_running_shell_command(__mock_popen):
         stderr=subprocess.PIPE,
         shell=True,
         env=os.environ,
+        start_new_session=True,
     )
 
 
-def test_calls_popen_wait_when_running_shell_command(__mock_popen):
-    shell_handler.run_shell_command(__COMMAND)
-    __mock_popen().wait.assert_called_once_with()
+@pytest.mark.parametrize("timeout", [pytest.param(None), pytest.param(5.0)])
+def test_calls_popen_communicate_when_running_shell_command(timeout, __mock_popen):
+    shell_handler.run_shell_command(__COMMAND, timeout=timeout)
+    __mock_popen().communicate.assert_called_once_with(timeout=timeout)
 
 
-def test_calls_popen_communicate_when_running_shell_command(__mock_popen):
-    shell_handler.run_shell_command(__COMMAND)
-    __mock_popen().communicate.assert_called_once_with()
+def test_returns_timeout_return_code_with_output_when_command_times_out():
+    ret_code, output = shell_handler.run_shell_command(
+        "echo Started; sleep 10", timeout=0.5
+    )
+    assert ret_code == shell_handler.TIMEOUT_RET_CODE, "Command did not time out."
+    assert (
+        __remove_carriage_characters(output) == "Started"
+    ), "Received different output than expected."
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+def test_kills_whole_process_group_when_command_times_out(tmp_path):
+    marker = tmp_path / "marker"
+    shell_handler.run_shell_command(
+        f"(sleep 1; touch {marker}) & sleep 10", timeout=0.2
+    )
+    time.sleep(1.5)
+    assert not marker.exists(), "Child process survived the timeout."
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+def test_kills_command_ignoring_termination_when_it_times_out():
+    with patch.object(shell_handler, "__KILL_GRACE_PERIOD", 0.2):
+        ret_code, _ = shell_handler.run_shell_command(
+            "trap '' TERM; sleep 10", timeout=0.2
+        )
+    assert ret_code == shell_handler.TIMEOUT_RET_CODE, "Command did not time out."
+
+
+def test_stops_running_commands_when_process_running_them_is_terminated(tmp_path):
+    marker = tmp_path / "marker"
+    pool = multiprocessing.Pool(
+        processes=1, initializer=shell_handler.stop_commands_on_termination
+    )
+    pool.apply_async(shell_handler.run_shell_command, (f"sleep 1; touch {marker}",))
+    time.sleep(0.5)
+    pool.terminate()
+    time.sleep(1.5)
+    assert not marker.exists(), "Command survived the termination of its process."
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+def test_stops_commands_running_in_other_threads():
+    results = []
+    command = threading.Thread(
+        target=lambda: results.append(
+            shell_handler.run_logged_shell_command("sleep 10")
+        )
+    )
+    command.start()
+    time.sleep(0.5)
+    shell_handler.stop_running_commands()
+    command.join(timeout=5)
+    assert not command.is_alive(), "Command was not stopped."
+    assert results[0][0] != 0, "Stopped command reported success."
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+def test_stops_async_commands_running_in_other_threads():
+    results = []
+    command = threading.Thread(
+        target=lambda: results.append(
+            asyncio.run(shell_handler.run_logged_shell_command_async("sleep 10"))
+        )
+    )
+    command.start()
+    time.sleep(0.5)
+    shell_handler.stop_running_commands()
+    command.join(timeout=5)
+    assert not command.is_alive(), "Command was not stopped."
+    assert results[0][0] != 0, "Stopped command reported success."
+
+
+def test_writes_full_output_to_log_file_when_running_logged_shell_command(tmp_path):
+    log_file = tmp_path / "test.log"
+    assert shell_handler.run_logged_shell_command(
+        "echo Out; echo Err >&2; exit 3", log_file=str(log_file)
+    ) == (3, "Out\nErr"), "Received different result than expected."
+    assert log_file.read_text() == "Out\nErr\n", "Log file does not contain the output."
+
+
+def test_returns_only_output_tail_when_running_logged_shell_command(tmp_path):
+    log_file = tmp_path / "test.log"
+    output_size = 8 * 1024 * 1024
+    ret_code, output = shell_handler.run_logged_shell_command(
+        f"head -c {output_size} /dev/zero | tr '\\0' x; echo End",
+        log_file=str(log_file),
+        tail_size=10,
+    )
+    assert (ret_code, output) == (0, "xxxxxxEnd"), "Received different tail"
+    assert log_file.stat().st_size == output_size + len(
+        "End\n"
+    ), "Log file does not contain the full output."
+
+
+def test_returns_timeout_return_code_when_logged_command_times_out():
+    assert shell_handler.run_logged_shell_command(
+        "echo Started; sleep 10", timeout=0.2
+    ) == (shell_handler.TIMEOUT_RET_CODE, "Started"), "Command did not time out."
+
+
+def test_writes_full_output_to_log_file_when_running_async_logged_shell_command(
+    tmp_path,
+):
+    log_file = tmp_path / "test.log"
+    assert asyncio.run(
+        shell_handler.run_logged_shell_command_async(
+            "echo Out; echo Err >&2; exit 3", log_file=str(log_file)
+        )
+    ) == (3, "Out\nErr"), "Received different result than expected."
+    assert log_file.read_text() == "Out\nErr\n", "Log file does not contain the output."
+
+
+def test_returns_timeout_return_code_when_async_logged_command_times_out():
+    assert asyncio.run(
+        shell_handler.run_logged_shell_command_async(
+            "echo Started; sleep 10", timeout=0.2
+        )
+    ) == (shell_handler.TIMEOUT_RET_CODE, "Started"), "Command did not time out."
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+def test_kills_whole_process_group_when_async_logged_command_is_cancelled(tmp_path):
+    marker = tmp_path / "marker"
+
+    async def __run_and_cancel():
+        task = asyncio.ensure_future(
+            shell_handler.run_logged_shell_command_async(
+                f"(sleep 1; touch {marker}) & sleep 10"
+            )
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(__run_and_cancel())
+    time.sleep(1.5)
+    assert not marker.exists(), "Child process survived the cancellation."
 
 
 def test_returns_expected_ok_return_code_when_running_shell_command():
@@ -49,6 +192,38 @@ def test_returns_expected_error_return_code_when_running_shell_command():
     ), "Command returned exit status zero."
 
 
+def test_hands_over_each_line_when_running_streamed_shell_command():
+    lines = []
+    ret_code, output = shell_handler.run_streamed_shell_command(
+        "echo first; echo second", lines.append
+    )
+    assert (ret_code, output, lines) == (
+        0,
+        "first\nsecond",
+        ["first", "second"],
+    ), "Received different output than expected"
+
+
+def test_hands_over_lines_before_streamed_command_finishes():
+    line_times = []
+    start_time = time.monotonic()
+    shell_handler.run_streamed_shell_command(
+        f"echo first; sleep {__STREAM_DELAY}; echo second",
+        lambda _: line_times.append(time.monotonic() - start_time),
+    )
+    assert (
+        line_times[1] - line_times[0] >= __STREAM_DELAY / 2
+    ), "Lines were not handed over as they were printed"
+
+
+def test_returns_error_output_when_streamed_shell_command_fails():
+    lines = []
+    assert shell_handler.run_streamed_shell_command(
+        "echo first; echo failure >&2; exit 3", lines.append
+    ) == (3, "failure"), "Received different result than expected"
+    assert lines == ["first"], "Received different lines than expected"
+
+
 def __remove_carriage_characters(text: str) -> str:
     """
     ### Returns the given text without carriage characters used in Windows.
@@ -0,0 +1,79 @@
+import io
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from scipion_testrunner.domain.handlers import socket_handler
+
+__MESSAGE = {"type": "test", "test": "test_0"}
+
+
+@pytest.mark.parametrize(
+    "address,expected",
+    [
+        pytest.param("localhost:5000", True),
+        pytest.param("0.0.0.0:0", True),
+        pytest.param("unix:/tmp/socket", True),
+        pytest.param("unix:", False),
+        pytest.param("localhost", False),
+        pytest.param("localhost:port", False),
+    ],
+)
+def test_returns_expected_address_validity(address, expected):
+    assert (
+        socket_handler.is_valid_address(address) == expected
+    ), "Received different address validity than expected"
+
+
+def test_sends_message_as_json_line():
+    stream = io.BytesIO()
+    assert socket_handler.send_message(stream, __MESSAGE), "Message was not sent"
+    assert (
+        stream.getvalue() == b'{"type": "test", "test": "test_0"}\n'
+    ), "Sent different content than expected"
+
+
+def test_returns_false_when_sending_message_through_broken_connection():
+    stream = Mock()
+    stream.write.side_effect = BrokenPipeError
+    assert not socket_handler.send_message(
+        stream, __MESSAGE
+    ), "Message was reported as sent"
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        pytest.param(b'{"type": "test", "test": "test_0"}\n', __MESSAGE),
+        pytest.param(b"", None),
+        pytest.param(b"not json\n", None),
+    ],
+)
+def test_returns_expected_received_message(content, expected):
+    assert (
+        socket_handler.receive_message(io.BytesIO(content)) == expected
+    ), "Received different message than expected"
+
+
+@pytest.mark.parametrize("use_unix_socket", [pytest.param(True), pytest.param(False)])
+def test_exchanges_messages_between_server_and_connection(use_unix_socket, tmp_path):
+    address = f"unix:{tmp_path / 'socket'}" if use_unix_socket else "127.0.0.1:0"
+    server = socket_handler.create_server(address)
+    if not use_unix_socket:
+        address = f"127.0.0.1:{server.getsockname()[1]}"
+    received = []
+
+    def __receive():
+        connection, _ = server.accept()
+        with connection, connection.makefile("rwb") as stream:
+            received.append(socket_handler.receive_message(stream))
+
+    receiver = threading.Thread(target=__receive)
+    receiver.start()
+    with socket_handler.create_connection(address) as connection:
+        with connection.makefile("rwb") as stream:
+            socket_handler.send_message(stream, __MESSAGE)
+    receiver.join(timeout=5)
+    server.close()
+    assert received == [__MESSAGE], "Message was not received"
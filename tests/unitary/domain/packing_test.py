@@ -0,0 +1,111 @@
+import pytest
+
+from scipion_testrunner.domain import packing
+
+__TESTS = [f"test_{i}.Test{i}" for i in range(6)]
+__SUMMARY = "Ran 3 tests in 1.234s"
+
+
+@pytest.mark.parametrize(
+    "tests_with_deps,estimates,expected_short",
+    [
+        pytest.param({}, {}, __TESTS),
+        pytest.param({}, {__TESTS[0]: 20.0, __TESTS[1]: 10.0}, __TESTS[1:]),
+        pytest.param({__TESTS[1]: [__TESTS[0]]}, {}, __TESTS[2:]),
+        pytest.param({__TESTS[1]: []}, {}, __TESTS),
+    ],
+)
+def test_returns_expected_short_tests(tests_with_deps, estimates, expected_short):
+    assert (
+        packing.get_short_tests(__TESTS, tests_with_deps, estimates, 10.0)
+        == expected_short
+    ), "Received different short tests than expected"
+
+
+@pytest.mark.parametrize(
+    "max_pack_size,jobs,expected_n_packs",
+    [
+        pytest.param(10, 1, 1),
+        pytest.param(2, 1, 3),
+        pytest.param(10, 4, 4),
+        pytest.param(10, 20, 6),
+    ],
+)
+def test_returns_expected_number_of_packs(max_pack_size, jobs, expected_n_packs):
+    packs = packing.get_test_packs(__TESTS, {}, max_pack_size, jobs)
+    assert len(packs) == expected_n_packs, "Received different number of packs"
+    assert sorted(test for pack in packs for test in pack) == sorted(
+        __TESTS
+    ), "Tests were lost or duplicated across packs"
+    assert all(
+        len(pack) <= max_pack_size for pack in packs
+    ), "A pack is bigger than allowed"
+
+
+def test_balances_packs_by_estimated_duration():
+    estimates = {__TESTS[0]: 9.0, __TESTS[1]: 5.0, __TESTS[2]: 4.0}
+    assert packing.get_test_packs(__TESTS[:3], estimates, 10, 2) == [
+        [__TESTS[0]],
+        [__TESTS[1], __TESTS[2]],
+    ], "Packs are not balanced"
+
+
+def test_returns_no_packs_when_there_are_no_tests():
+    assert packing.get_test_packs([], {}, 10, 2) == [], "Received unexpected packs"
+
+
+def test_recovers_pack_tests_from_pack_name():
+    name = packing.get_pack_name(__TESTS[:2])
+    assert packing.is_pack(name), "Pack name is not recognised as a pack"
+    assert packing.get_pack_tests(name) == __TESTS[:2], "Received different tests"
+    assert not packing.is_pack(__TESTS[0]), "Single test recognised as a pack"
+
+
+@pytest.mark.parametrize(
+    "output,expected_failed",
+    [
+        pytest.param(
+            f"FAIL: test_x (myplugin.tests.test_1.Test1)\n{__SUMMARY}",
+            [__TESTS[1]],
+        ),
+        pytest.param(
+            f"ERROR: test_x (myplugin.tests.test_2.Test2.test_x)\nFAIL: test_y (myplugin.tests.test_0.Test0.test_y)\n{__SUMMARY}",
+            [__TESTS[0], __TESTS[2]],
+        ),
+        pytest.param(
+            f"ERROR: setUpClass (myplugin.tests.test_1.Test1)\n{__SUMMARY}",
+            [__TESTS[1]],
+        ),
+        pytest.param(
+            "[  FAILED  ] Test2.test_x\n[==========] run 3 tests", [__TESTS[2]]
+        ),
+        pytest.param(
+            f"FAIL: test_y (myplugin.tests.test_0.Test0)\nERROR: test_x (myplugin.tests.test_2.Test2)\n{__SUMMARY}\nFAILED (failures=1, errors=1)",
+            [__TESTS[0], __TESTS[2]],
+        ),
+        pytest.param(
+            f"ERROR: test_x (myplugin.tests.test_2.Test2)\n{__SUMMARY}\nFAILED (failures=1, errors=1)",
+            None,
+        ),
+        pytest.param("FAIL: test_x (myplugin.tests.test_1.Test1)", None),
+        pytest.param(f"Segmentation fault\n{__SUMMARY}", None),
+        pytest.param(
+            f"ERROR: test_1 (unittest.loader._FailedTest)\n{__SUMMARY}",
+            None,
+        ),
+    ],
+)
+def test_returns_expected_failed_pack_tests(output, expected_failed):
+    assert (
+        packing.get_failed_pack_tests(__TESTS[:3], output) == expected_failed
+    ), "Received different failed tests than expected"
+
+
+def test_does_not_attribute_failure_shared_by_several_tests():
+    tests = ["test_a.TestSame", "test_b.TestSame"]
+    assert (
+        packing.get_failed_pack_tests(
+            tests, "[  FAILED  ] TestSame.test_x\n[==] run 2 tests"
+        )
+        is None
+    ), "Failure was attributed to a test with an ambiguous name"
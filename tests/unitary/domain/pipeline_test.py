@@ -0,0 +1,118 @@
+import threading
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from scipion_testrunner.domain.executor import WorkerPool
+from scipion_testrunner.domain.pipeline import DiscoveryPipeline
+from scipion_testrunner.domain.run_options import RunOptions
+
+__SCIPION = "scipion"
+__PLUGIN = "myplugin"
+__TESTS = [f"test_{i}" for i in range(5)]
+__HELD_TESTS = {"test_1"}
+
+
+def test_starts_each_accepted_test_once(__mock_run_logged_test, __mock_print):
+    pipeline = __get_pipeline()
+    for test in [*__TESTS, __TESTS[0]]:
+        pipeline.add_test(test)
+    pipeline.wait()
+    started_tests = [test for test in __TESTS if test not in __HELD_TESTS]
+    assert sorted(
+        __mock_run_logged_test.call_args_list, key=lambda test_call: test_call.args[0]
+    ) == [
+        call(test, __SCIPION, __PLUGIN, RunOptions()) for test in started_tests
+    ], "Received different started tests than expected"
+
+
+def test_returns_pending_tests_in_their_order(__mock_run_logged_test, __mock_print):
+    pipeline = __get_pipeline()
+    pipeline.add_test(__TESTS[2])
+    pipeline.add_test(__TESTS[1])
+    pipeline.wait()
+    assert pipeline.get_pending_tests(__TESTS) == [
+        test for test in __TESTS if test != __TESTS[2]
+    ], "Received different pending tests than expected"
+
+
+def test_returns_failed_tests_and_reports_each_finished_one(
+    __mock_run_logged_test, __mock_print
+):
+    __mock_run_logged_test.side_effect = lambda test, *_: (
+        test if test == __TESTS[0] else None
+    )
+    pipeline = __get_pipeline()
+    pipeline.add_test(__TESTS[0])
+    pipeline.add_test(__TESTS[2])
+    on_finished = Mock()
+    assert pipeline.wait(on_finished=on_finished) == [
+        __TESTS[0]
+    ], "Received different failed tests than expected"
+    assert sorted(
+        (test, failed) for (test, _, failed), _ in on_finished.call_args_list
+    ) == [
+        (__TESTS[0], True),
+        (__TESTS[2], False),
+    ], "Finished tests were not reported as expected"
+
+
+def test_counts_test_raising_an_error_as_failed(__mock_run_logged_test, __mock_print):
+    __mock_run_logged_test.side_effect = RuntimeError
+    pipeline = __get_pipeline()
+    pipeline.add_test(__TESTS[0])
+    assert pipeline.wait() == [
+        __TESTS[0]
+    ], "Received different failed tests than expected"
+
+
+def test_creates_log_dir_before_starting_first_test(
+    tmp_path, __mock_run_logged_test, __mock_print
+):
+    log_dir = tmp_path / "logs"
+    pipeline = __get_pipeline(RunOptions(log_dir=str(log_dir)))
+    pipeline.add_test(__TESTS[0])
+    pipeline.wait()
+    assert log_dir.is_dir(), "Log directory was not created"
+
+
+def test_leaves_tests_found_while_every_worker_is_busy_to_the_scheduler(
+    __mock_run_logged_test, __mock_print
+):
+    release = threading.Event()
+    __mock_run_logged_test.side_effect = lambda *_: release.wait()
+    pipeline = __get_pipeline(processes=1)
+    pipeline.add_test(__TESTS[0])
+    pipeline.add_test(__TESTS[2])
+    release.set()
+    pipeline.wait()
+    assert pipeline.get_pending_tests(__TESTS) == [
+        test for test in __TESTS if test != __TESTS[0]
+    ], "Test was queued behind a busy worker"
+
+
+def __get_pipeline(options=None, processes=len(__TESTS)):
+    executor = Mock()
+    executor.get_test_pool.return_value = WorkerPool(processes, use_threads=True)
+    return DiscoveryPipeline(
+        __SCIPION,
+        __PLUGIN,
+        executor,
+        options or RunOptions(),
+        lambda test: test not in __HELD_TESTS,
+    )
+
+
+@pytest.fixture
+def __mock_run_logged_test():
+    with patch(
+        "scipion_testrunner.domain.handlers.scipion_handler.run_logged_test"
+    ) as mock_method:
+        mock_method.return_value = None
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_print():
+    with patch("builtins.print") as mock_method:
+        yield mock_method
@@ -0,0 +1,85 @@
+import math
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.configuration import test_data_keys
+from scipion_testrunner.domain import packing, resources
+from scipion_testrunner.domain.resources import Resources
+
+__TEST_RESOURCES = {
+    "test_mpi": {test_data_keys.RESOURCES_CPUS_KEY: 8.0},
+    "test_big.TestBig": {
+        test_data_keys.RESOURCES_CPUS_KEY: 1.0,
+        test_data_keys.RESOURCES_MEMORY_KEY: 20.0,
+    },
+    "test_big.TestBig.test_gpu": {test_data_keys.RESOURCES_GPUS_KEY: 1.0},
+}
+__MEMINFO = "MemTotal:       16777216 kB\nMemFree:         1048576 kB\nMemAvailable:    8388608 kB\n"
+__AVAILABLE_MEMORY = 8.0
+
+
+@pytest.mark.parametrize(
+    "test,expected",
+    [
+        pytest.param("test_small.TestSmall", Resources()),
+        pytest.param("test_mpi.TestMpi", Resources(cpus=8.0)),
+        pytest.param("test_big.TestBig.test_cpu", Resources(memory=20.0)),
+        pytest.param("test_big.TestBig.test_gpu", Resources(cpus=1.0, gpus=1.0)),
+        pytest.param(
+            packing.get_pack_name(["test_mpi.TestMpi", "test_big.TestBig"]),
+            Resources(cpus=8.0, memory=20.0),
+        ),
+    ],
+)
+def test_returns_resources_of_test_falling_back_to_its_class_or_file(test, expected):
+    assert (
+        resources.get_test_demand(test, __TEST_RESOURCES) == expected
+    ), "Received different demand than expected"
+
+
+@pytest.mark.parametrize(
+    "demand,expected",
+    [
+        pytest.param(Resources(cpus=4.0, memory=16.0, gpus=1.0), True),
+        pytest.param(Resources(cpus=5.0), False),
+        pytest.param(Resources(memory=16.5), False),
+        pytest.param(Resources(gpus=2.0), False),
+    ],
+)
+def test_checks_if_resources_fit_in_capacity(demand, expected):
+    assert (
+        demand.fits_in(Resources(cpus=4.0, memory=16.0, gpus=1.0)) == expected
+    ), "Received different fit than expected"
+
+
+def test_returns_given_capacity_instead_of_detected_one():
+    assert resources.get_system_capacity(2.0, 4.0, 0.0) == Resources(
+        cpus=2.0, memory=4.0, gpus=0.0
+    ), "Received different capacity than expected"
+
+
+def test_reads_available_memory_and_visible_gpus(tmp_path, monkeypatch):
+    meminfo_file = tmp_path / "meminfo"
+    meminfo_file.write_text(__MEMINFO)
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "0,2")
+    with patch.object(resources, "__MEMINFO_FILE", str(meminfo_file)):
+        capacity = resources.get_system_capacity()
+    assert (capacity.memory, capacity.gpus) == (
+        __AVAILABLE_MEMORY,
+        2.0,
+    ), "Received different capacity than expected"
+
+
+def test_does_not_limit_resources_that_cannot_be_detected(tmp_path, monkeypatch):
+    monkeypatch.delenv("CUDA_VISIBLE_DEVICES", raising=False)
+    with patch.multiple(
+        resources,
+        __MEMINFO_FILE=str(tmp_path / "meminfo"),
+        __NVIDIA_GPUS_DIR=str(tmp_path / "gpus"),
+    ):
+        capacity = resources.get_system_capacity()
+    assert (capacity.memory, capacity.gpus) == (
+        math.inf,
+        math.inf,
+    ), "Undetected resources were limited"
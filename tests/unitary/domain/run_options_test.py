@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from scipion_testrunner.domain import packing
+from scipion_testrunner.domain.run_options import RunOptions
+
+__TIMEOUTS = {
+    "test_a": 100.0,
+    "test_a.TestA": 50.0,
+    "test_a.TestA.test_slow": 200.0,
+}
+
+
+@pytest.mark.parametrize(
+    "test,expected_timeout",
+    [
+        pytest.param("test_a.TestA.test_slow", 200.0),
+        pytest.param("test_a.TestA.test_fast", 50.0),
+        pytest.param("test_a.TestA", 50.0),
+        pytest.param("test_a.TestB", 100.0),
+        pytest.param("test_b.TestA", 10.0),
+    ],
+)
+def test_returns_most_specific_timeout(test, expected_timeout):
+    options = RunOptions(timeout=10.0, test_timeouts=__TIMEOUTS)
+    assert (
+        options.get_timeout(test) == expected_timeout
+    ), "Received different timeout than expected"
+
+
+def test_returns_no_timeout_when_none_is_configured():
+    assert RunOptions().get_timeout("test_a.TestA") is None, "Test should not time out"
+
+
+@pytest.mark.parametrize(
+    "pack,expected_timeout",
+    [
+        pytest.param(["test_a.TestA", "test_a.TestB"], 150.0),
+        pytest.param(["test_a.TestA", "test_b.TestA"], None),
+    ],
+)
+def test_returns_sum_of_timeouts_of_packed_tests(pack, expected_timeout):
+    options = RunOptions(test_timeouts=__TIMEOUTS)
+    assert (
+        options.get_timeout(packing.get_pack_name(pack)) == expected_timeout
+    ), "Received different timeout than expected"
+
+
+@pytest.mark.parametrize(
+    "test,expected_file_name",
+    [
+        pytest.param("test_a.TestA", "test_a.TestA.log"),
+        pytest.param(
+            packing.get_pack_name(["test_a.TestA", "test_a.TestB", "test_b.TestA"]),
+            "test_a.TestA+2.log",
+        ),
+    ],
+)
+def test_returns_expected_log_file(test, expected_file_name):
+    assert RunOptions(log_dir="logs").get_log_file(test) == os.path.join(
+        "logs", expected_file_name
+    ), "Received different log file than expected"
+
+
+def test_returns_no_log_file_without_log_dir():
+    assert (
+        RunOptions().get_log_file("test_a.TestA") is None
+    ), "Output should not be kept"
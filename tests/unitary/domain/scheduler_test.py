@@ -0,0 +1,281 @@
+from unittest.mock import patch
+
+import pytest
+
+from scipion_testrunner.domain.resources import Resources
+from scipion_testrunner.domain.scheduler import DependencyScheduler
+
+__TESTS = [f"test_{i}" for i in range(5)]
+__CAPACITY = Resources(cpus=4.0, memory=16.0, gpus=1.0)
+__DEMANDS = {
+    __TESTS[0]: Resources(cpus=3.0),
+    __TESTS[1]: Resources(cpus=2.0),
+    __TESTS[2]: Resources(memory=8.0),
+    __TESTS[3]: Resources(cpus=8.0, memory=32.0),
+}
+
+
+@pytest.mark.parametrize(
+    "tests_with_deps,expected_ready",
+    [
+        pytest.param({}, __TESTS),
+        pytest.param({__TESTS[0]: [__TESTS[1]]}, __TESTS[1:]),
+        pytest.param(
+            {__TESTS[0]: [__TESTS[1]], __TESTS[2]: [__TESTS[1], __TESTS[3]]},
+            [__TESTS[1], __TESTS[3], __TESTS[4]],
+        ),
+        pytest.param({__TESTS[0]: ["non_existent"]}, __TESTS),
+        pytest.param({"non_existent": [__TESTS[0]]}, __TESTS),
+    ],
+)
+def test_returns_expected_initially_ready_tests(tests_with_deps, expected_ready):
+    assert (
+        __pop_all_ready(DependencyScheduler(__TESTS, tests_with_deps)) == expected_ready
+    ), "Received different ready tests than expected"
+
+
+def test_releases_dependent_test_when_its_only_dependency_finishes():
+    scheduler = DependencyScheduler(__TESTS[:2], {__TESTS[1]: [__TESTS[0]]})
+    scheduler.pop_ready_test()
+    assert scheduler.mark_finished(__TESTS[0]) == [
+        __TESTS[1]
+    ], "Dependent test was not released"
+
+
+def test_does_not_release_dependent_test_until_all_dependencies_finish():
+    scheduler = DependencyScheduler(__TESTS[:3], {__TESTS[2]: [__TESTS[0], __TESTS[1]]})
+    __pop_all_ready(scheduler)
+    assert scheduler.mark_finished(__TESTS[0]) == [], "Test released too early"
+    assert scheduler.mark_finished(__TESTS[1]) == [
+        __TESTS[2]
+    ], "Test not released after all dependencies finished"
+
+
+def test_ignores_duplicated_dependencies():
+    scheduler = DependencyScheduler(__TESTS[:2], {__TESTS[1]: [__TESTS[0], __TESTS[0]]})
+    scheduler.pop_ready_test()
+    assert scheduler.mark_finished(__TESTS[0]) == [
+        __TESTS[1]
+    ], "Dependent test was not released"
+
+
+@pytest.mark.parametrize(
+    "estimates,expected_ready",
+    [
+        pytest.param({}, __TESTS[:3]),
+        pytest.param(
+            {__TESTS[2]: 30.0, __TESTS[1]: 20.0, __TESTS[0]: 10.0},
+            [__TESTS[2], __TESTS[1], __TESTS[0]],
+        ),
+        pytest.param({__TESTS[1]: 5.0}, [__TESTS[1], __TESTS[0], __TESTS[2]]),
+    ],
+)
+def test_releases_longest_ready_tests_first(estimates, expected_ready):
+    assert (
+        __pop_all_ready(DependencyScheduler(__TESTS[:3], {}, estimates=estimates))
+        == expected_ready
+    ), "Ready tests were not sorted by estimated duration"
+
+
+@pytest.mark.parametrize(
+    "tests_with_deps,estimates,expected_ready",
+    [
+        pytest.param(
+            {__TESTS[1]: [__TESTS[0]]},
+            {__TESTS[0]: 1.0, __TESTS[1]: 50.0, __TESTS[2]: 20.0},
+            [__TESTS[0], __TESTS[2], __TESTS[3]],
+        ),
+        pytest.param(
+            {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[1]]},
+            {__TESTS[0]: 1.0, __TESTS[1]: 1.0, __TESTS[2]: 1.0, __TESTS[3]: 2.5},
+            [__TESTS[0], __TESTS[3]],
+        ),
+        pytest.param(
+            {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[3]]},
+            {__TESTS[0]: 5.0, __TESTS[1]: 5.0, __TESTS[2]: 20.0, __TESTS[3]: 1.0},
+            [__TESTS[3], __TESTS[0]],
+        ),
+        pytest.param(
+            {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[3]]},
+            {__TESTS[0]: 10.0, __TESTS[3]: 10.0, __TESTS[1]: 5.0, __TESTS[2]: 5.0},
+            [__TESTS[0], __TESTS[3]],
+        ),
+    ],
+)
+def test_releases_tests_with_longest_critical_path_first(
+    tests_with_deps, estimates, expected_ready
+):
+    assert (
+        __pop_all_ready(
+            DependencyScheduler(__TESTS[:4], tests_with_deps, estimates=estimates)
+        )
+        == expected_ready
+    ), "Ready tests were not sorted by critical path length"
+
+
+def test_returns_durations_of_finished_tests():
+    scheduler = DependencyScheduler(__TESTS[:2], {})
+    with patch("time.monotonic") as mock_monotonic:
+        mock_monotonic.side_effect = [0.0, 1.0, 5.0]
+        first = scheduler.pop_ready_test()
+        scheduler.pop_ready_test()
+        scheduler.mark_finished(first)
+    assert scheduler.get_durations() == {
+        first: 5.0
+    }, "Received different durations than expected"
+
+
+def test_records_given_duration_instead_of_measured_one():
+    scheduler = DependencyScheduler(__TESTS[:1], {})
+    scheduler.mark_finished(scheduler.pop_ready_test(), duration=3.0)
+    assert scheduler.get_durations() == {
+        __TESTS[0]: 3.0
+    }, "Received different durations than expected"
+
+
+def test_requeues_running_test_without_recording_its_duration():
+    scheduler = DependencyScheduler(__TESTS[:1], {})
+    test = scheduler.pop_ready_test()
+    scheduler.requeue_test(test)
+    assert not scheduler.is_finished(), "Scheduler finished with a requeued test"
+    assert scheduler.pop_ready_test() == test, "Requeued test was not ready again"
+    assert scheduler.get_durations() == {}, "Duration of requeued test was recorded"
+
+
+@pytest.mark.parametrize(
+    "n_popped,n_finished,expected",
+    [
+        pytest.param(0, 0, False),
+        pytest.param(1, 0, False),
+        pytest.param(2, 1, False),
+        pytest.param(2, 2, True),
+    ],
+)
+def test_returns_expected_finished_status(n_popped, n_finished, expected):
+    scheduler = DependencyScheduler(__TESTS[:2], {})
+    popped = [scheduler.pop_ready_test() for _ in range(n_popped)]
+    for test in popped[:n_finished]:
+        scheduler.mark_finished(test)
+    assert scheduler.is_finished() == expected, "Unexpected finished status"
+
+
+def test_releases_ready_tests_only_while_their_resources_fit():
+    scheduler = DependencyScheduler(
+        __TESTS[:3], {}, demands=__DEMANDS, capacity=__CAPACITY
+    )
+    assert __pop_all_ready(scheduler) == [
+        __TESTS[0],
+        __TESTS[2],
+    ], "Received different admitted tests than expected"
+    scheduler.mark_finished(__TESTS[0])
+    assert __pop_all_ready(scheduler) == [
+        __TESTS[1]
+    ], "Postponed test was not admitted after resources were freed"
+
+
+def test_releases_test_needing_more_than_capacity_only_when_nothing_runs():
+    scheduler = DependencyScheduler(
+        __TESTS[2:4],
+        {},
+        estimates={__TESTS[2]: 10.0},
+        demands=__DEMANDS,
+        capacity=__CAPACITY,
+    )
+    assert __pop_all_ready(scheduler) == [
+        __TESTS[2]
+    ], "Oversized test was admitted along with another test"
+    scheduler.mark_finished(__TESTS[2])
+    assert __pop_all_ready(scheduler) == [
+        __TESTS[3]
+    ], "Oversized test was not admitted once nothing was running"
+
+
+def test_ignores_demands_without_capacity():
+    assert (
+        __pop_all_ready(DependencyScheduler(__TESTS[:4], {}, demands=__DEMANDS))
+        == __TESTS[:4]
+    ), "Tests were not released without a capacity"
+
+
+def __pop_all_ready(scheduler: DependencyScheduler) -> list:
+    """
+    ### Pops all the tests that are ready to run.
+
+    #### Params:
+    - scheduler (DependencyScheduler): Scheduler to pop the tests from.
+
+    #### Returns:
+    - (list): Popped tests.
+    """
+    ready = []
+    while scheduler.has_ready_tests():
+        ready.append(scheduler.pop_ready_test())
+    return ready
+
+
+def test_skips_every_dependent_of_a_failed_test():
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2", "test_3"],
+        {"test_1": ["test_0"], "test_2": ["test_1"], "test_3": []},
+    )
+    scheduler.pop_ready_test()
+    scheduler.pop_ready_test()
+    assert (
+        scheduler.mark_finished("test_0", failed=True) == []
+    ), "Dependent of a failed test was released"
+    assert scheduler.get_skipped_tests() == {
+        "test_1": "Dependency failed: 'test_0'",
+        "test_2": "Dependency failed: 'test_0'",
+    }, "Received different skipped tests than expected"
+    scheduler.mark_finished("test_3")
+    assert scheduler.is_finished(), "Skipped tests are still pending"
+
+
+def test_does_not_release_skipped_test_when_its_other_dependency_finishes():
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"], {"test_2": ["test_0", "test_1"]}
+    )
+    scheduler.pop_ready_test()
+    scheduler.pop_ready_test()
+    scheduler.mark_finished("test_0", failed=True)
+    assert (
+        scheduler.mark_finished("test_1") == []
+    ), "Skipped test was released after its other dependency finished"
+
+
+def test_cancels_every_unfinished_test():
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1", "test_2"], {"test_2": ["test_1"]}
+    )
+    first_test = scheduler.pop_ready_test()
+    scheduler.mark_finished(first_test)
+    running_test = scheduler.pop_ready_test()
+    assert sorted(scheduler.cancel()) == sorted(
+        {"test_0", "test_1", "test_2"} - {first_test}
+    ), "Received different cancelled tests than expected"
+    assert scheduler.is_finished(), "Cancelled tests are still pending"
+    assert (
+        scheduler.mark_finished(running_test) == []
+    ), "Cancelled test released its dependents"
+    assert list(scheduler.get_durations()) == [
+        first_test
+    ], "Cancelled test has a recorded duration"
+
+
+def test_notifies_each_test_as_soon_as_it_finishes():
+    finished = []
+    scheduler = DependencyScheduler(
+        ["test_0", "test_1"],
+        {},
+        on_finished=lambda test, duration, failed: finished.append(
+            (test, duration >= 0, failed)
+        ),
+    )
+    scheduler.mark_finished(scheduler.pop_ready_test(), failed=True)
+    assert finished == [
+        ("test_0", True, True)
+    ], "Finished test was not notified immediately"
+    scheduler.mark_finished(scheduler.pop_ready_test())
+    assert finished[1:] == [
+        ("test_1", True, False)
+    ], "Finished test was not notified immediately"
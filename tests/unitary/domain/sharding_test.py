@@ -0,0 +1,74 @@
+import pytest
+
+from scipion_testrunner.domain import sharding
+
+__TESTS = [f"test_{i}" for i in range(6)]
+__ESTIMATES = {
+    __TESTS[0]: 100.0,
+    __TESTS[1]: 40.0,
+    __TESTS[2]: 30.0,
+    __TESTS[3]: 20.0,
+    __TESTS[4]: 10.0,
+    __TESTS[5]: 1.0,
+}
+
+
+@pytest.mark.parametrize("shard_count", [pytest.param(1), pytest.param(3)])
+def test_assigns_every_test_to_exactly_one_shard(shard_count):
+    shards = [
+        sharding.get_shard_tests(__TESTS, {}, {}, shard_index, shard_count)
+        for shard_index in range(1, shard_count + 1)
+    ]
+    assert sorted(test for shard in shards for test in shard) == sorted(
+        __TESTS
+    ), "Tests were lost or duplicated across shards"
+
+
+def test_balances_shards_by_estimated_duration():
+    assert sharding.get_shard_tests(__TESTS, {}, __ESTIMATES, 1, 2) == [
+        __TESTS[0],
+        __TESTS[5],
+    ], "First shard is not balanced"
+    assert (
+        sharding.get_shard_tests(__TESTS, {}, __ESTIMATES, 2, 2) == __TESTS[1:5]
+    ), "Second shard is not balanced"
+
+
+def test_balances_shards_by_number_of_tests_without_estimates():
+    tests_with_deps = {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[1]]}
+    assert (
+        sharding.get_shard_tests(__TESTS, tests_with_deps, {}, 1, 2) == __TESTS[:3]
+    ), "First shard is not balanced"
+    assert (
+        sharding.get_shard_tests(__TESTS, tests_with_deps, {}, 2, 2) == __TESTS[3:]
+    ), "Second shard is not balanced"
+
+
+def test_keeps_dependent_tests_in_the_same_shard():
+    tests_with_deps = {__TESTS[5]: [__TESTS[0]], __TESTS[3]: [__TESTS[5]]}
+    for shard_index in range(1, 4):
+        shard = sharding.get_shard_tests(__TESTS, tests_with_deps, {}, shard_index, 3)
+        connected = {__TESTS[0], __TESTS[3], __TESTS[5]}
+        assert not connected & set(shard) or connected <= set(
+            shard
+        ), "Dependent tests were split across shards"
+
+
+def test_ignores_dependencies_with_unknown_tests():
+    assert (
+        sharding.get_shard_tests(
+            __TESTS[:2], {"non_existent": [__TESTS[0]], __TESTS[1]: ["other"]}, {}, 1, 1
+        )
+        == __TESTS[:2]
+    ), "Unknown tests affected the shard"
+
+
+def test_returns_same_shard_regardless_of_test_order():
+    tests_with_deps = {__TESTS[4]: [__TESTS[1]]}
+    assert set(
+        sharding.get_shard_tests(__TESTS, tests_with_deps, __ESTIMATES, 1, 3)
+    ) == set(
+        sharding.get_shard_tests(
+            list(reversed(__TESTS)), tests_with_deps, __ESTIMATES, 1, 3
+        )
+    ), "Shard assignment depends on the order of the tests"
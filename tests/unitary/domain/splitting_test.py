@@ -0,0 +1,138 @@
+import pytest
+
+from scipion_testrunner.domain import splitting
+
+__TESTS = [f"test_{i}.Test{i}" for i in range(4)]
+__METHODS = ["test_x", "test_y", "test_z"]
+
+
+@pytest.mark.parametrize(
+    "threshold,selected_tests,expected_candidates",
+    [
+        pytest.param(0.0, [], []),
+        pytest.param(0.0, [__TESTS[2]], [__TESTS[2]]),
+        pytest.param(100.0, [], [__TESTS[0], __TESTS[3]]),
+        pytest.param(
+            100.0, [__TESTS[2], __TESTS[0]], [__TESTS[0], __TESTS[2], __TESTS[3]]
+        ),
+    ],
+)
+def test_returns_expected_split_candidates(
+    threshold, selected_tests, expected_candidates
+):
+    estimates = {__TESTS[0]: 200.0, __TESTS[1]: 50.0, __TESTS[3]: 100.0}
+    assert (
+        splitting.get_split_candidates(__TESTS, estimates, threshold, selected_tests)
+        == expected_candidates
+    ), "Received different split candidates than expected"
+
+
+@pytest.mark.parametrize(
+    "methods,durations,expected",
+    [
+        pytest.param(__METHODS[:1], {}, False),
+        pytest.param(__METHODS, {}, False),
+        pytest.param(
+            __METHODS,
+            {
+                f"{__TESTS[0]}.test_x": 31.0,
+                f"{__TESTS[0]}.test_y": 31.0,
+                f"{__TESTS[0]}.test_z": 31.0,
+            },
+            False,
+        ),
+        pytest.param(__METHODS, {__TESTS[0]: 90.0}, True),
+        pytest.param(
+            __METHODS,
+            {
+                __TESTS[0]: 90.0,
+                f"{__TESTS[0]}.test_x": 31.0,
+                f"{__TESTS[0]}.test_y": 31.0,
+                f"{__TESTS[0]}.test_z": 31.0,
+            },
+            True,
+        ),
+        pytest.param(
+            __METHODS,
+            {
+                __TESTS[0]: 90.0,
+                f"{__TESTS[0]}.test_x": 70.0,
+                f"{__TESTS[0]}.test_y": 70.0,
+                f"{__TESTS[0]}.test_z": 70.0,
+            },
+            False,
+        ),
+    ],
+)
+def test_returns_expected_split_decision(methods, durations, expected):
+    assert (
+        splitting.is_split_worth_it(__TESTS[0], methods, durations) == expected
+    ), "Received different split decision than expected"
+
+
+@pytest.mark.parametrize(
+    "methods,expected",
+    [
+        pytest.param(__METHODS[:1], False),
+        pytest.param(__METHODS, True),
+    ],
+)
+def test_splits_selected_classes_without_history(methods, expected):
+    assert (
+        splitting.is_split_worth_it(__TESTS[0], methods, {}, selected=True) == expected
+    ), "Received different split decision than expected"
+
+
+@pytest.mark.parametrize(
+    "durations,expected_duration",
+    [
+        pytest.param({}, 120.0),
+        pytest.param({__TESTS[0]: 90.0}, 90.0),
+        pytest.param(
+            {
+                __TESTS[0]: 90.0,
+                f"{__TESTS[0]}.test_x": 20.0,
+                f"{__TESTS[0]}.test_y": 20.0,
+                f"{__TESTS[0]}.test_z": 80.0,
+            },
+            90.0,
+        ),
+        pytest.param(
+            {
+                __TESTS[0]: 90.0,
+                f"{__TESTS[0]}.test_x": 50.0,
+                f"{__TESTS[0]}.test_y": 50.0,
+                f"{__TESTS[0]}.test_z": 50.0,
+            },
+            60.0,
+        ),
+    ],
+)
+def test_derives_class_duration_from_its_methods(durations, expected_duration):
+    method_durations = {
+        f"{__TESTS[0]}.test_x": 40.0,
+        f"{__TESTS[0]}.test_y": 40.0,
+        f"{__TESTS[0]}.test_z": 40.0,
+    }
+    assert (
+        splitting.get_class_duration(__TESTS[0], method_durations, durations)
+        == expected_duration
+    ), "Received different class duration than expected"
+
+
+def test_replaces_split_classes_with_their_methods():
+    methods = [f"{__TESTS[1]}.{method}" for method in __METHODS[:2]]
+    units, units_with_deps, test_classes = splitting.split_tests(
+        __TESTS[:3],
+        {__TESTS[1]: [__TESTS[0]], __TESTS[2]: [__TESTS[1]]},
+        {__TESTS[1]: __METHODS[:2]},
+    )
+    assert units == [__TESTS[0], *methods, __TESTS[2]], "Received different units"
+    assert units_with_deps == {
+        methods[0]: [__TESTS[0]],
+        methods[1]: [__TESTS[0]],
+        __TESTS[2]: methods,
+    }, "Received different dependencies than expected"
+    assert test_classes == {
+        method: __TESTS[1] for method in methods
+    }, "Received different test classes than expected"
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+from scipion_testrunner.domain import static_discovery
+
+__PLUGIN = "myplugin"
+__TEST_CASE = "from unittest import TestCase\n\n\n"
+__DUMMY_PLUGIN_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "e2e", "scipion-em-dummy"
+)
+__TEST_CLASS = "class {name}({base}):\n    def test_a(self):\n        pass\n"
+
+
+def test_returns_no_tests_when_plugin_cannot_be_located():
+    assert (
+        static_discovery.find_tests("missing_plugin_module") is None
+    ), "Received tests of a plugin that does not exist"
+
+
+def test_finds_tests_defined_in_test_modules(__plugin_dir):
+    __write(__plugin_dir, "test_a.py", __TEST_CASE + __test_class("TestA"))
+    __write(
+        __plugin_dir,
+        "test_b.py",
+        "import unittest\n\n\n" + __test_class("TestB", "unittest.TestCase"),
+    )
+    assert static_discovery.find_tests(__PLUGIN) == [
+        "test_a.TestA",
+        "test_b.TestB",
+    ], "Received different tests than expected"
+
+
+def test_names_reexported_tests_after_defining_module(__plugin_dir):
+    __write(__plugin_dir, "__init__.py", "from .nested.test_c import TestC\n")
+    __write(__plugin_dir, "nested/test_c.py", __TEST_CASE + __test_class("TestC"))
+    __write(__plugin_dir, "test_a.py", "from .nested.test_c import TestC\n")
+    assert static_discovery.find_tests(__PLUGIN) == [
+        "nested.test_c.TestC"
+    ], "Received different tests than expected"
+
+
+def test_ignores_modules_unittest_would_not_load(__plugin_dir):
+    __write(__plugin_dir, "helper.py", __TEST_CASE + __test_class("TestHelper"))
+    __write(__plugin_dir, "nested/test_c.py", __TEST_CASE + __test_class("TestC"))
+    __write(__plugin_dir, "package/__init__.py", "")
+    __write(__plugin_dir, "package/test_d.py", __TEST_CASE + __test_class("TestD"))
+    assert static_discovery.find_tests(__PLUGIN) == [
+        "package.test_d.TestD"
+    ], "Received different tests than expected"
+
+
+def test_finds_tests_inheriting_test_methods_and_test_case(__plugin_dir):
+    __write(
+        __plugin_dir,
+        "test_base.py",
+        __TEST_CASE
+        + "class TestBase(TestCase):\n    def helper(self):\n        pass\n\n\n"
+        + __test_class("TestWithMethods", "TestBase"),
+    )
+    __write(
+        __plugin_dir,
+        "test_child.py",
+        "from .test_base import TestBase, TestWithMethods\n\n\n"
+        + "class TestChild(TestWithMethods):\n    pass\n\n\n"
+        + __test_class("TestOther", "TestBase"),
+    )
+    assert static_discovery.find_tests(__PLUGIN) == [
+        "test_base.TestWithMethods",
+        "test_child.TestChild",
+        "test_child.TestOther",
+    ], "Received different tests than expected"
+
+
+def test_finds_same_tests_as_scipion_in_dummy_plugin(monkeypatch):
+    monkeypatch.syspath_prepend(__DUMMY_PLUGIN_DIR)
+    assert static_discovery.find_tests("dummy") == [
+        "nested.test_nested.TestNested",
+        "test_root.TestRoot",
+    ], "Received different tests than expected"
+
+
+@pytest.mark.parametrize(
+    "test,expected_test",
+    [
+        pytest.param("TestNested", "nested.test_nested.TestNested"),
+        pytest.param("nested.test_nested.TestNested", "nested.test_nested.TestNested"),
+        pytest.param("TestRoot", "test_root.TestRoot"),
+        pytest.param("missing.TestMissing", "missing.TestMissing"),
+    ],
+)
+def test_resolves_test_aliases_to_defining_module(test, expected_test, monkeypatch):
+    monkeypatch.syspath_prepend(__DUMMY_PLUGIN_DIR)
+    assert (
+        static_discovery.get_test_name_resolver("dummy")(test) == expected_test
+    ), "Received different canonical test name than expected"
+
+
+def test_keeps_test_names_when_plugin_cannot_be_located():
+    assert (
+        static_discovery.get_test_name_resolver("missing_plugin_module")("TestA")
+        == "TestA"
+    ), "Received different test name than expected"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("from .test_b import *\n"),
+        pytest.param("def load_tests(loader, tests, pattern):\n    return tests\n"),
+        pytest.param(
+            __TEST_CASE + "if True:\n\n    class TestA(TestCase):\n        pass\n"
+        ),
+        pytest.param("from other import Base\n\n\nclass TestA(Base):\n    pass\n"),
+        pytest.param("TestA = type('TestA', (), {})\n"),
+        pytest.param("class TestA(\n"),
+    ],
+)
+def test_returns_no_tests_when_sources_are_ambiguous(content, __plugin_dir):
+    __write(__plugin_dir, "test_a.py", content)
+    assert (
+        static_discovery.find_tests(__PLUGIN) is None
+    ), "Received tests from ambiguous sources"
+
+
+@pytest.fixture
+def __plugin_dir(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "site-packages" / __PLUGIN
+    (plugin_dir / "tests").mkdir(parents=True)
+    (plugin_dir / "__init__.py").write_text("")
+    (plugin_dir / "tests" / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path / "site-packages"))
+    return plugin_dir / "tests"
+
+
+def __write(tests_dir, file_name, content):
+    path = tests_dir / file_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def __test_class(name, base="TestCase"):
+    return __TEST_CLASS.format(name=name, base=base)
@@ -0,0 +1,126 @@
+from re import compile as re_compile
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scipion_testrunner.domain import test_matcher
+
+__N_SYNTHETIC_TESTS = 2000
+__N_SYNTHETIC_RULES = 500
+
+
+@pytest.mark.parametrize(
+    "entry,expected",
+    [
+        pytest.param("test_a.TestA", False),
+        pytest.param("test_gpu_*.*", True),
+        pytest.param("test_?.TestA", True),
+        pytest.param("test_[ab].TestA", True),
+        pytest.param("re:test_a\\.Test.+", True),
+    ],
+)
+def test_detects_pattern_entries(entry, expected):
+    assert (
+        test_matcher.is_pattern(entry) == expected
+    ), "Received different pattern detection than expected"
+
+
+def test_returns_invalid_regex_entries():
+    assert test_matcher.get_invalid_patterns(
+        ["re:(", "re:(?P<name>a)", "re:(a)", "test_[", "test_a"]
+    ) == ["re:(", "re:(?P<name>a)"], "Received different invalid patterns than expected"
+
+
+@pytest.mark.parametrize(
+    "test,expected_rule",
+    [
+        pytest.param("test_a.TestA", 0),
+        pytest.param("test_gpu_1.TestA", 0),
+        pytest.param("test_b.TestB", 1),
+        pytest.param("test_gpu_1.TestB", 0),
+        pytest.param("nested.test_c.TestC", 2),
+        pytest.param("test_c.TestC", None),
+        pytest.param("test_gpu_1", None),
+    ],
+)
+def test_returns_first_matching_rule(test, expected_rule):
+    matcher = test_matcher.get_test_matcher(
+        [
+            ["test_a.TestA", "test_gpu_*.*"],
+            ["re:test_(b)\\.(Test)B", "test_gpu_1.TestB"],
+            ["re:(", "re:nested\\..+"],
+        ]
+    )
+    assert (
+        matcher.match(test) == expected_rule
+    ), "Received different matching rule than expected"
+
+
+@pytest.mark.parametrize(
+    "test,expected_rule",
+    [
+        pytest.param("FOO.TestA", 1),
+        pytest.param("foo.TestB", 0),
+        pytest.param("aa", 1),
+        pytest.param("ab", 2),
+        pytest.param("ba", None),
+        pytest.param("bb", 2),
+    ],
+)
+def test_matches_regexes_that_cannot_be_combined(test, expected_rule):
+    matcher = test_matcher.get_test_matcher(
+        [
+            ["foo.TestB"],
+            ["re:(?i)foo\\..+", "re:(a)\\1"],
+            ["re:(b)\\1", "re:a."],
+        ]
+    )
+    assert (
+        matcher.match(test) == expected_rule
+    ), "Received different matching rule than expected"
+
+
+def test_prefers_first_rule_among_exact_names_and_patterns():
+    matcher = test_matcher.get_test_matcher([[], ["test_*"], ["test_a"], ["test_a"]])
+    assert matcher.get_matches(["test_a", "other"]) == {
+        "test_a": 1
+    }, "Received different matches than expected"
+
+
+def test_matches_no_tests_without_rules():
+    assert "test_a" not in test_matcher.get_test_matcher(
+        []
+    ), "Matched a test without any rule"
+
+
+def test_matches_many_tests_against_many_patterns_in_one_pass():
+    compiled_regexes = []
+
+    def __compile(pattern, *args):
+        regex = re_compile(pattern, *args)
+        compiled_regexes.append(
+            Mock(
+                fullmatch=Mock(side_effect=regex.fullmatch),
+                groups=regex.groups,
+                groupindex=regex.groupindex,
+                flags=regex.flags,
+            )
+        )
+        return compiled_regexes[-1]
+
+    with patch("re.compile", side_effect=__compile):
+        matcher = test_matcher.get_test_matcher(
+            [
+                [f"test_{rule}_*.*", f"re:module_{rule}\\.Test[0-9]+"]
+                for rule in range(__N_SYNTHETIC_RULES)
+            ]
+        )
+    tests = [
+        f"test_{index % __N_SYNTHETIC_RULES}_x.Test{index}"
+        for index in range(__N_SYNTHETIC_TESTS)
+    ]
+    matches = matcher.get_matches(tests)
+    assert (
+        compiled_regexes[-1].fullmatch.call_count == __N_SYNTHETIC_TESTS
+    ), "Tests were not matched against all the patterns in a single pass"
+    assert len(matches) == __N_SYNTHETIC_TESTS, "Not every test was matched"
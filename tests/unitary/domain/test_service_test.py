@@ -1,10 +1,18 @@
-from unittest.mock import patch, Mock, call
+import copy
+from unittest.mock import ANY, DEFAULT, patch, Mock, call
 
 import pytest
 
 from scipion_testrunner.application.logger import logger
 from scipion_testrunner.configuration import test_data_keys
-from scipion_testrunner.domain import test_service
+from scipion_testrunner.configuration.test_config import TestConfig
+from scipion_testrunner.domain import catalog, packing, static_discovery, test_service
+from scipion_testrunner.domain.catalog import TestCatalog
+from scipion_testrunner.domain.executor import Executor
+from scipion_testrunner.domain.handlers import history_handler
+from scipion_testrunner.domain.resources import Resources
+from scipion_testrunner.domain.run_options import RunOptions
+from scipion_testrunner.domain.scheduler import DependencyScheduler
 
 __SCIPION = test_service.SCIPION_PARAM_NAME
 __PLUGIN = "myplugin"
@@ -14,6 +22,28 @@ __ARGS = {
     test_service.JOBS_PARAM_NAME: 5,
     test_service.NO_GPU_PARAM_NAME: False,
     test_service.TEST_DATA_PARAM_NAME: "test.json",
+    test_service.PROFILE_PARAM_NAME: [],
+    test_service.CACHE_DIR_PARAM_NAME: "cache",
+    test_service.DEFAULT_DURATION_PARAM_NAME: 60.0,
+    test_service.SHARD_PARAM_NAME: None,
+    test_service.SHARD_DURATIONS_PARAM_NAME: "",
+    test_service.COORDINATOR_PARAM_NAME: None,
+    test_service.WORKER_PARAM_NAME: None,
+    test_service.FORK_SERVER_PARAM_NAME: False,
+    test_service.PACK_THRESHOLD_PARAM_NAME: 0.0,
+    test_service.PACK_SIZE_PARAM_NAME: 10,
+    test_service.SPLIT_THRESHOLD_PARAM_NAME: 0.0,
+    test_service.SPLIT_TESTS_PARAM_NAME: [],
+    test_service.TIMEOUT_PARAM_NAME: None,
+    test_service.CPUS_PARAM_NAME: None,
+    test_service.MEMORY_PARAM_NAME: None,
+    test_service.GPUS_PARAM_NAME: None,
+    test_service.FAIL_FAST_PARAM_NAME: False,
+    test_service.LOG_DIR_PARAM_NAME: None,
+    test_service.OUTPUT_TAIL_PARAM_NAME: 20,
+    test_service.ENGINE_PARAM_NAME: "pool",
+    test_service.REFRESH_DISCOVERY_PARAM_NAME: False,
+    test_service.DISCOVERY_PARAM_NAME: "scipion",
 }
 __DATASETS = ["dataset_1", "dataset_2"]
 __TESTS = [f"test_{i}" for i in range(10)]
@@ -43,10 +73,257 @@ __INTERNAL_DEPENDENCIES = {
     "test_8": ["test_7"],
     "test_9": ["test_10"],
 }
+__TIMEOUTS = {"test_2": 30.0}
+
+
+def test_runs_worker_instead_of_discovering_tests_when_testing_scipion_plugin(
+    __mock_get_all_tests, __mock_run_worker
+):
+    address = "localhost:5000"
+    test_service.test_scipion_plugin(
+        {**__ARGS, test_service.WORKER_PARAM_NAME: address}
+    )
+    __mock_run_worker.assert_called_once_with(
+        address, __SCIPION, __PLUGIN, __ARGS[test_service.JOBS_PARAM_NAME]
+    )
+    __mock_get_all_tests.assert_not_called()
+
+
+def test_serves_tests_instead_of_running_them_when_acting_as_coordinator(
+    __mock_download_datasets, __mock_run_tests
+):
+    address = "localhost:5000"
+    scheduler = DependencyScheduler(__TESTS, {})
+    with patch("scipion_testrunner.domain.coordinator.Coordinator.serve") as mock_serve:
+        assert (
+            test_service.__run_tests(
+                {**__ARGS, test_service.COORDINATOR_PARAM_NAME: address},
+                scheduler,
+                __DATASETS,
+                RunOptions(),
+                Executor(),
+            )
+            == mock_serve.return_value
+        ), "Received different failed tests than expected"
+    mock_serve.assert_called_once_with(address)
+    __mock_download_datasets.assert_not_called()
+    __mock_run_tests.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "fingerprint,cached_tests,refresh,discovered",
+    [
+        pytest.param(None, None, False, True),
+        pytest.param("abc", None, False, True),
+        pytest.param("abc", __TESTS[:2], False, False),
+        pytest.param("abc", __TESTS[:2], True, True),
+    ],
+)
+def test_discovers_tests_only_when_discovery_cache_cannot_be_used(
+    fingerprint,
+    cached_tests,
+    refresh,
+    discovered,
+    __mock_get_all_tests,
+    __mock_get_fingerprint,
+    __mock_get_cached_tests,
+    __mock_record_tests,
+    __mock_print,
+):
+    __mock_get_fingerprint.return_value = fingerprint
+    __mock_get_cached_tests.return_value = cached_tests
+    with patch(
+        "scipion_testrunner.domain.handlers.discovery_handler.get_discovery_file_path"
+    ) as mock_get_discovery_file_path:
+        tests = test_service.__get_all_tests(
+            {**__ARGS, test_service.REFRESH_DISCOVERY_PARAM_NAME: refresh}
+        )
+    assert tests == (
+        __TESTS if discovered else cached_tests
+    ), "Received different tests than expected"
+    assert (
+        __mock_get_all_tests.called == discovered
+    ), "Test discovery did not run as expected"
+    assert __mock_record_tests.call_args_list == (
+        [call(mock_get_discovery_file_path.return_value, fingerprint, __TESTS)]
+        if discovered and fingerprint
+        else []
+    ), "Discovery cache was not updated as expected"
+
+
+@pytest.mark.parametrize(
+    "mode,static_tests,expected_tests,discovered",
+    [
+        pytest.param(static_discovery.SCIPION_DISCOVERY, __TESTS[:2], __TESTS, True),
+        pytest.param(
+            static_discovery.STATIC_DISCOVERY, __TESTS[:2], __TESTS[:2], False
+        ),
+        pytest.param(static_discovery.STATIC_DISCOVERY, None, __TESTS, True),
+        pytest.param(static_discovery.CHECK_DISCOVERY, __TESTS[:2], __TESTS, True),
+    ],
+)
+def test_discovers_tests_with_selected_discovery_mode(
+    mode,
+    static_tests,
+    expected_tests,
+    discovered,
+    __mock_get_all_tests,
+    __mock_find_tests,
+    __mock_log_warning,
+    __mock_print,
+):
+    __mock_find_tests.return_value = static_tests
+    tests = test_service.__discover_tests(
+        {**__ARGS, test_service.DISCOVERY_PARAM_NAME: mode}
+    )
+    assert tests == expected_tests, "Received different tests than expected"
+    assert (
+        __mock_get_all_tests.called == discovered
+    ), "Scipion discovery did not run as expected"
+    assert __mock_find_tests.called == (
+        mode != static_discovery.SCIPION_DISCOVERY
+    ), "Static discovery did not run as expected"
+    assert __mock_log_warning.called == (
+        static_tests is None
+    ), "Fallback warning was not shown as expected"
+
+
+def test_check_discovery_skips_discovery_cache(
+    __mock_get_all_tests,
+    __mock_find_tests,
+    __mock_get_fingerprint,
+    __mock_get_cached_tests,
+    __mock_record_tests,
+    __mock_print,
+):
+    __mock_find_tests.return_value = __TESTS.copy()
+    __mock_get_fingerprint.return_value = "abc"
+    with patch(
+        "scipion_testrunner.domain.handlers.discovery_handler.get_discovery_file_path"
+    ):
+        tests = test_service.__get_all_tests(
+            {
+                **__ARGS,
+                test_service.DISCOVERY_PARAM_NAME: static_discovery.CHECK_DISCOVERY,
+            }
+        )
+    assert tests == __TESTS, "Received different tests than expected"
+    __mock_get_cached_tests.assert_not_called()
+    __mock_get_all_tests.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "static_tests,expected_calls",
+    [
+        pytest.param(
+            __TESTS,
+            [
+                call(
+                    logger.green(
+                        f"Static discovery found the same {len(__TESTS)} tests as Scipion."
+                    ),
+                    flush=True,
+                )
+            ],
+        ),
+        pytest.param(
+            [*__TESTS[1:], "extra"],
+            [
+                call(
+                    logger.red("Only found by static discovery:\n  extra"), flush=True
+                ),
+                call(logger.red(f"Only found by Scipion:\n  {__TESTS[0]}"), flush=True),
+            ],
+        ),
+    ],
+)
+def test_logs_discovery_differences(static_tests, expected_calls, __mock_print):
+    test_service.__log_discovery_differences(static_tests, __TESTS)
+    assert (
+        __mock_print.call_args_list == expected_calls
+    ), "Received different messages than expected"
+
+
+def test_merges_tests_discovered_under_several_names(
+    __mock_get_all_tests, __mock_get_test_name_resolver, __mock_print
+):
+    __mock_get_all_tests.return_value = ["TestA", "module.TestA", "module.TestB"]
+    found_tests = []
+    tests = test_service.__discover_tests(__ARGS, on_test=found_tests.append)
+    assert tests == [
+        "module.TestA",
+        "module.TestB",
+    ], "Received different tests than expected"
+    __mock_get_all_tests.call_args[1]["on_test"]("TestA")
+    assert found_tests == [
+        "module.TestA"
+    ], "Streamed tests were not handed over with their canonical name"
+    __mock_print.assert_called_once_with(
+        logger.blue(
+            "Merged 1 tests discovered under several names with the module defining their class."
+        ),
+        flush=True,
+    )
+
+
+def test_names_configured_tests_as_discovered_ones(
+    __mock_get_test_config, __mock_get_test_name_resolver
+):
+    __mock_get_test_config.return_value = TestConfig(
+        __DATASETS,
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: ["TestA"],
+            test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+                {test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: ["TestA"]}
+            ],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [
+                {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "TestA"}
+            ],
+        },
+        {"TestA": ["module.TestB"], "module.TestA": ["TestC"]},
+        {"TestA": 30.0},
+        {"TestA": {test_data_keys.RESOURCES_CPUS_KEY: 4.0}},
+    )
+    assert test_service.__get_test_config(__ARGS) == TestConfig(
+        __DATASETS,
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: ["module.TestA"],
+            test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+                {test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: ["module.TestA"]}
+            ],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [
+                {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "module.TestA"}
+            ],
+        },
+        {"module.TestA": ["module.TestB", "TestC"]},
+        {"module.TestA": 30.0},
+        {"module.TestA": {test_data_keys.RESOURCES_CPUS_KEY: 4.0}},
+    ), "Received different test configuration than expected"
+
+
+def test_keeps_configured_test_patterns_as_they_are(
+    __mock_get_test_config, __mock_get_test_name_resolver
+):
+    skippable_tests = {
+        test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu_*.*", "re:.*\\.TestA"],
+        test_data_keys.SKIPPABLE_OTHERS_KEY: [
+            {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "Test[AB]"}
+        ],
+    }
+    __mock_get_test_config.return_value = TestConfig(__DATASETS, skippable_tests)
+    assert (
+        test_service.__get_test_config(__ARGS).skippable_tests == skippable_tests
+    ), "Received different skippable tests than expected"
 
 
 def test_exits_success_when_there_are_not_tests_while_testing_scipion_plugin(
-    __mock_get_all_tests, __mock_log_warning
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_download_datasets,
+    __mock_log_warning,
 ):
     __mock_get_all_tests.return_value = []
     with pytest.raises(SystemExit) as exit_status:
@@ -55,7 +332,13 @@ def test_exits_success_when_there_are_not_tests_while_testing_scipion_plugin(
 
 
 def test_logs_warning_when_there_are_not_tests_while_testing_scipion_plugin(
-    __mock_get_all_tests, __mock_log_warning
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_download_datasets,
+    __mock_log_warning,
 ):
     __mock_get_all_tests.return_value = []
     with pytest.raises(SystemExit):
@@ -68,10 +351,14 @@ def test_logs_warning_when_there_are_not_tests_while_testing_scipion_plugin(
 def test_exits_success_when_all_tests_get_removed_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_remove_skippable_tests,
+    __mock_download_datasets,
     __mock_log_warning,
 ):
-    __mock_remove_skippable_tests.return_value = []
+    __mock_remove_skippable_tests.return_value = TestCatalog([])
     with pytest.raises(SystemExit) as exit_status:
         test_service.test_scipion_plugin(__ARGS)
     assert exit_status.value.code == 0
@@ -80,10 +367,14 @@ def test_exits_success_when_all_tests_get_removed_when_testing_scipion_plugin(
 def test_logs_warning_when_all_tests_get_removed_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_remove_skippable_tests,
+    __mock_download_datasets,
     __mock_log_warning,
 ):
-    __mock_remove_skippable_tests.return_value = []
+    __mock_remove_skippable_tests.return_value = TestCatalog([])
     with pytest.raises(SystemExit):
         test_service.test_scipion_plugin(__ARGS)
     __mock_log_warning.assert_called_once_with(
@@ -94,32 +385,45 @@ def test_logs_warning_when_all_tests_get_removed_when_testing_scipion_plugin(
 def test_calls_download_datasets_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_remove_circular_dependencies,
     __mock_remove_unmet_internal_dependency_tests,
     __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_print,
 ):
-    __mock_remove_skippable_tests.return_value = __TESTS
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     test_service.test_scipion_plugin(__ARGS)
-    __mock_download_datasets.assert_called_once_with(__SCIPION, __DATASETS)
+    __mock_download_datasets.assert_called_once_with(__SCIPION, __DATASETS, ANY)
 
 
 def test_not_calls_download_datasets_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_print,
 ):
-    __mock_get_test_config.return_value = ([], __SKIPPABLE, __INTERNAL_DEPENDENCIES)
-    __mock_remove_skippable_tests.return_value = __TESTS
+    __mock_get_test_config.return_value = TestConfig(
+        [],
+        __SKIPPABLE,
+        __INTERNAL_DEPENDENCIES,
+        __TIMEOUTS,
+    )
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     test_service.test_scipion_plugin(__ARGS)
     __mock_download_datasets.assert_not_called()
 
@@ -127,43 +431,489 @@ def test_not_calls_download_datasets_when_testing_scipion_plugin(
 def test_calls_run_tests_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_remove_circular_dependencies,
     __mock_remove_unmet_internal_dependency_tests,
     __mock_download_datasets,
-    __mock_generate_sorted_test_batches,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_log_warning,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_print,
 ):
-    __mock_remove_skippable_tests.return_value = __TESTS.copy()
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     test_service.test_scipion_plugin(__ARGS)
     __mock_run_tests.assert_called_once_with(
         __SCIPION,
-        __TESTS,
-        [],
-        __ARGS[test_service.JOBS_PARAM_NAME],
+        ANY,
+        ANY,
         __ARGS[test_service.PLUGIN_PARAM_NAME],
+        options=ANY,
     )
+    assert __mock_run_tests.call_args[0][1].get_test_count() == len(
+        __TESTS
+    ), "Scheduler received different tests than expected"
+    assert (
+        __mock_run_tests.call_args[0][2].test_jobs
+        == __ARGS[test_service.JOBS_PARAM_NAME]
+    ), "Executor received different number of test jobs than expected"
+
+
+def test_passes_timeouts_to_run_tests_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_remove_skippable_tests,
+    __mock_remove_circular_dependencies,
+    __mock_remove_unmet_internal_dependency_tests,
+    __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_run_tests,
+    __mock_record_test_durations,
+    __mock_log_warning,
+    __mock_get_sorted_results,
+    __mock_log_result_summary,
+    __mock_print,
+):
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
+    test_service.test_scipion_plugin({**__ARGS, test_service.TIMEOUT_PARAM_NAME: 10.0})
+    options = __mock_run_tests.call_args[1]["options"]
+    assert (
+        options.get_timeout("test_2"),
+        options.get_timeout("test_3"),
+    ) == (30.0, 10.0), "Received different timeouts than expected"
+
+
+def test_records_duration_as_soon_as_each_test_finishes_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_remove_skippable_tests,
+    __mock_remove_circular_dependencies,
+    __mock_remove_unmet_internal_dependency_tests,
+    __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_run_tests,
+    __mock_record_test_durations,
+    __mock_log_warning,
+    __mock_get_sorted_results,
+    __mock_log_result_summary,
+    __mock_print,
+):
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
+    finished_tests = []
+    n_recorded_while_running = []
+
+    def __run_first_test(_, scheduler, *__, **___):
+        finished_tests.append(scheduler.pop_ready_test())
+        scheduler.mark_finished(finished_tests[0])
+        n_recorded_while_running.append(__mock_record_test_durations.call_count)
+        scheduler.cancel()
+        return []
+
+    __mock_run_tests.side_effect = __run_first_test
+    test_service.test_scipion_plugin(__ARGS)
+    assert n_recorded_while_running == [
+        1
+    ], "Duration was not recorded as soon as the test finished"
+    __mock_record_test_durations.assert_called_once_with(
+        __mock_get_history_file_path.return_value, {finished_tests[0]: ANY}
+    )
+
+
+def test_runs_tests_started_during_discovery_only_once_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_remove_skippable_tests,
+    __mock_remove_circular_dependencies,
+    __mock_remove_unmet_internal_dependency_tests,
+    __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_run_tests,
+    __mock_log_error,
+    __mock_get_sorted_results,
+    __mock_log_result_summary,
+    __mock_print,
+):
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
+
+    def __stream_tests(*_, on_test):
+        for test in __TESTS:
+            on_test(test)
+        return __TESTS.copy()
+
+    __mock_get_all_tests.side_effect = __stream_tests
+    with patch(
+        "scipion_testrunner.domain.test_service.DiscoveryPipeline"
+    ) as mock_pipeline:
+        mock_pipeline.return_value.get_pending_tests.return_value = __TESTS[1:]
+        mock_pipeline.return_value.wait.return_value = __TESTS[:1]
+        test_service.test_scipion_plugin(__ARGS)
+    assert mock_pipeline.return_value.add_test.call_args_list == [
+        call(test) for test in __TESTS
+    ], "Discovered tests were not handed over to the pipeline"
+    assert __mock_run_tests.call_args[0][1].get_test_count() == len(
+        __TESTS[1:]
+    ), "Scheduler received different tests than expected"
+    assert [
+        record.status
+        for record in __mock_get_sorted_results.call_args[0][0].get_records()
+    ] == [catalog.FAILED_STATUS] + [catalog.PASSED_STATUS] * (
+        len(__TESTS) - 1
+    ), "Received different test results than expected"
+    __mock_download_datasets.assert_called_once_with(__SCIPION, __DATASETS, ANY)
+
+
+def test_terminates_running_tests_when_discovery_fails_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_print,
+):
+    __mock_get_all_tests.side_effect = SystemExit(1)
+    with patch("scipion_testrunner.domain.test_service.DiscoveryPipeline"), patch(
+        "scipion_testrunner.domain.test_service.Executor"
+    ) as mock_executor:
+        with pytest.raises(SystemExit):
+            test_service.test_scipion_plugin(__ARGS)
+    mock_executor.return_value.terminate.assert_called_once_with()
+    mock_executor.return_value.close.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "param_name,value,expected",
+    [
+        pytest.param(test_service.JOBS_PARAM_NAME, 2, True),
+        pytest.param(test_service.SHARD_PARAM_NAME, (1, 2), False),
+        pytest.param(test_service.COORDINATOR_PARAM_NAME, "localhost:5000", False),
+        pytest.param(test_service.FAIL_FAST_PARAM_NAME, True, False),
+        pytest.param(test_service.FORK_SERVER_PARAM_NAME, True, False),
+        pytest.param(test_service.ENGINE_PARAM_NAME, "asyncio", False),
+        pytest.param(test_service.CPUS_PARAM_NAME, 4.0, False),
+    ],
+)
+def test_starts_tests_during_discovery_only_when_run_allows_it(
+    param_name, value, expected
+):
+    assert (
+        test_service.__can_start_tests_during_discovery(
+            {**__ARGS, param_name: value}, {}
+        )
+        == expected
+    ), "Received different pipelining decision than expected"
+
+
+def test_does_not_start_tests_during_discovery_with_resource_hints():
+    assert not test_service.__can_start_tests_during_discovery(
+        __ARGS, {__TESTS[3]: {test_data_keys.RESOURCES_CPUS_KEY: 4.0}}
+    ), "Tests were started during discovery while their resources are limited"
+
+
+def test_holds_tests_that_can_be_skipped_or_have_dependencies():
+    held_tests = test_service.__get_held_tests(
+        __SKIPPABLE, {"test_1": ["test_6"], "test_7": []}, True
+    )
+    assert [f"test_{index}" for index in range(9) if f"test_{index}" in held_tests] == [
+        "test_0",
+        "test_1",
+        "test_3",
+        "test_4",
+        "test_5",
+        "test_6",
+        "test_7",
+    ], "Received different held tests than expected"
+
+
+def test_holds_tests_matching_skippable_patterns():
+    held_tests = test_service.__get_held_tests(
+        {
+            test_data_keys.SKIPPABLE_GPU_KEY: ["test_gpu_*"],
+            test_data_keys.SKIPPABLE_OTHERS_KEY: [
+                {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "re:test_other_[0-9]+"}
+            ],
+        },
+        {},
+        False,
+    )
+    assert [
+        test
+        for test in ["test_gpu_1", "test_other_1", "test_other_a"]
+        if test in held_tests
+    ] == ["test_other_1"], "Received different held tests than expected"
+
+
+@pytest.mark.parametrize(
+    "test,args,expected",
+    [
+        pytest.param(__TESTS[2], {}, True),
+        pytest.param(__TESTS[1], {}, False),
+        pytest.param(__TESTS[2], {test_service.SPLIT_TESTS_PARAM_NAME: __TESTS}, False),
+        pytest.param(
+            __TESTS[2], {test_service.SPLIT_THRESHOLD_PARAM_NAME: 30.0}, False
+        ),
+        pytest.param(__TESTS[2], {test_service.SPLIT_THRESHOLD_PARAM_NAME: 90.0}, True),
+        pytest.param(__TESTS[2], {test_service.PACK_THRESHOLD_PARAM_NAME: 60.0}, False),
+        pytest.param(__TESTS[2], {test_service.PACK_THRESHOLD_PARAM_NAME: 30.0}, True),
+    ],
+)
+def test_starts_discovered_test_only_when_it_does_not_need_full_test_list(
+    test, args, expected
+):
+    assert (
+        test_service.__can_start_test_during_discovery(
+            {**__ARGS, **args},
+            {__TESTS[1]},
+            {},
+            test,
+        )
+        == expected
+    ), "Received different decision than expected"
+
+
+@pytest.mark.parametrize(
+    "args,test_resources",
+    [
+        pytest.param({}, {}),
+        pytest.param(
+            {test_service.COORDINATOR_PARAM_NAME: "localhost:5000"},
+            {__TESTS[0]: {test_data_keys.RESOURCES_CPUS_KEY: 4.0}},
+        ),
+    ],
+)
+def test_does_not_limit_resources_without_hints_or_when_coordinating(
+    args, test_resources
+):
+    assert (
+        test_service.__get_resource_capacity({**__ARGS, **args}, test_resources) is None
+    ), "Resources were limited"
+
+
+@pytest.mark.parametrize(
+    "args,test_resources",
+    [
+        pytest.param(
+            {test_service.MEMORY_PARAM_NAME: 16.0},
+            {},
+        ),
+        pytest.param(
+            {test_service.MEMORY_PARAM_NAME: 16.0},
+            {__TESTS[0]: {test_data_keys.RESOURCES_CPUS_KEY: 4.0}},
+        ),
+    ],
+)
+def test_limits_resources_with_hints_or_given_capacity(
+    args, test_resources, __mock_print
+):
+    capacity = test_service.__get_resource_capacity({**__ARGS, **args}, test_resources)
+    assert capacity.memory == args[test_service.MEMORY_PARAM_NAME] and (
+        capacity.cpus > 0
+    ), "Received different capacity than expected"
+
+
+def test_warns_about_tests_needing_more_resources_than_available(__mock_log_warning):
+    demands = test_service.__get_test_demands(
+        __TESTS[:2],
+        {__TESTS[0]: {test_data_keys.RESOURCES_CPUS_KEY: 8.0}},
+        Resources(cpus=4.0, memory=16.0, gpus=1.0),
+    )
+    assert demands == {
+        __TESTS[0]: Resources(cpus=8.0),
+        __TESTS[1]: Resources(),
+    }, "Received different demands than expected"
+    __mock_log_warning.assert_called_once_with(
+        f"Test {__TESTS[0]} needs more resources than available. It will run while no other test is running."
+    )
+
+
+@pytest.mark.parametrize(
+    "test,failed,recorded",
+    [
+        pytest.param(__TESTS[0], False, True),
+        pytest.param(__TESTS[0], True, False),
+        pytest.param(packing.get_pack_name(__TESTS[1:3]), False, False),
+    ],
+)
+def test_records_durations_of_passed_tests_that_are_not_packs(
+    test, failed, recorded, __mock_record_test_durations
+):
+    test_service.__record_test_duration("history.jsonl", test, 1.0, failed)
+    assert __mock_record_test_durations.call_args_list == (
+        [call("history.jsonl", {test: 1.0})] if recorded else []
+    ), "Received different recorded durations than expected"
+
+
+@pytest.mark.parametrize(
+    "failed,expected_calls",
+    [
+        pytest.param(
+            False,
+            [
+                call("history.jsonl", {f"{__TESTS[0]}.test_x": 30.0}),
+                call("history.jsonl", {f"{__TESTS[0]}.test_y": 40.0, __TESTS[0]: 50.0}),
+            ],
+        ),
+        pytest.param(True, [call("history.jsonl", {f"{__TESTS[0]}.test_y": 40.0})]),
+    ],
+)
+def test_records_class_duration_once_its_split_methods_pass(
+    failed, expected_calls, __mock_record_test_durations
+):
+    split_durations = {
+        __TESTS[0]: {f"{__TESTS[0]}.test_x": None, f"{__TESTS[0]}.test_y": None}
+    }
+    durations = {
+        __TESTS[0]: 60.0,
+        f"{__TESTS[0]}.test_x": 40.0,
+        f"{__TESTS[0]}.test_y": 40.0,
+    }
+    test_service.__record_test_duration(
+        "history.jsonl",
+        f"{__TESTS[0]}.test_x",
+        30.0,
+        failed,
+        durations=durations,
+        split_durations=split_durations,
+    )
+    test_service.__record_test_duration(
+        "history.jsonl",
+        f"{__TESTS[0]}.test_y",
+        40.0,
+        False,
+        durations=durations,
+        split_durations=split_durations,
+    )
+    assert (
+        __mock_record_test_durations.call_args_list == expected_calls
+    ), "Received different recorded durations than expected"
+
+
+def test_reports_failed_methods_as_their_class_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_remove_skippable_tests,
+    __mock_remove_circular_dependencies,
+    __mock_remove_unmet_internal_dependency_tests,
+    __mock_download_datasets,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_get_test_methods,
+    __mock_run_tests,
+    __mock_record_test_durations,
+    __mock_get_sorted_results,
+    __mock_log_result_summary,
+    __mock_log_error,
+    __mock_print,
+):
+    __mock_remove_unmet_internal_dependency_tests.return_value = (
+        TestCatalog(__TESTS[:2]),
+        {},
+    )
+    __mock_get_test_methods.return_value = {__TESTS[0]: ["test_x", "test_y"]}
+    __mock_run_tests.return_value = [f"{__TESTS[0]}.test_x", f"{__TESTS[0]}.test_y"]
+    test_service.test_scipion_plugin(
+        {**__ARGS, test_service.SPLIT_TESTS_PARAM_NAME: [__TESTS[0]]}
+    )
+    assert (
+        __mock_run_tests.call_args[0][1].get_test_count()
+        == len(__mock_get_test_methods.return_value[__TESTS[0]]) + 1
+    ), "Scheduler did not receive the split methods"
+    assert [
+        record.status
+        for record in __mock_get_sorted_results.call_args[0][0].get_records()
+    ] == [
+        catalog.FAILED_STATUS,
+        catalog.PASSED_STATUS,
+    ], "Received different test results than expected"
+
+
+def test_splits_long_tests_into_their_methods(__mock_get_test_methods, __mock_print):
+    __mock_get_test_methods.return_value = {
+        __TESTS[0]: ["test_x", "test_y"],
+        __TESTS[1]: ["test_x", "test_y"],
+    }
+    estimates = {__TESTS[0]: 100.0, __TESTS[1]: 100.0, __TESTS[2]: 1.0}
+    durations = {
+        __TESTS[1]: 100.0,
+        f"{__TESTS[1]}.test_x": 100.0,
+        f"{__TESTS[1]}.test_y": 100.0,
+        __TESTS[0]: 100.0,
+        f"{__TESTS[0]}.test_y": 20.0,
+    }
+    methods = [f"{__TESTS[0]}.test_x", f"{__TESTS[0]}.test_y"]
+    assert test_service.__split_long_tests(
+        {**__ARGS, test_service.SPLIT_THRESHOLD_PARAM_NAME: 50.0},
+        __TESTS[:3],
+        {__TESTS[2]: [__TESTS[0]]},
+        estimates,
+        durations,
+    ) == (
+        [*methods, __TESTS[1], __TESTS[2]],
+        {__TESTS[2]: methods},
+        {**estimates, methods[0]: 50.0, methods[1]: 20.0},
+        {method: __TESTS[0] for method in methods},
+    ), "Received different split tests than expected"
+    __mock_get_test_methods.assert_called_once_with(__SCIPION, __PLUGIN, __TESTS[:2])
+
+
+def test_packs_short_tests_without_dependencies(__mock_print):
+    estimates = {__TESTS[0]: 5.0, __TESTS[1]: 5.0, __TESTS[2]: 50.0, __TESTS[3]: 5.0}
+    pack = packing.get_pack_name([__TESTS[0], __TESTS[3]])
+    assert test_service.__pack_short_tests(
+        {
+            **__ARGS,
+            test_service.PACK_THRESHOLD_PARAM_NAME: 10.0,
+            test_service.JOBS_PARAM_NAME: 1,
+        },
+        __TESTS[:4],
+        {__TESTS[1]: [__TESTS[2]]},
+        estimates,
+    ) == (
+        [__TESTS[1], __TESTS[2], pack],
+        {**estimates, pack: 10.0},
+    ), "Received different packed tests than expected"
+
+
+def test_does_not_pack_tests_when_every_pack_has_a_single_test(__mock_print):
+    estimates = {__TESTS[0]: 5.0, __TESTS[1]: 5.0}
+    assert test_service.__pack_short_tests(
+        {**__ARGS, test_service.PACK_THRESHOLD_PARAM_NAME: 10.0},
+        __TESTS[:2],
+        {},
+        estimates,
+    ) == (__TESTS[:2], estimates), "Tests were packed when they should not"
+    __mock_print.assert_not_called()
 
 
 def test_calls_log_result_summary_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_remove_circular_dependencies,
     __mock_remove_unmet_internal_dependency_tests,
     __mock_download_datasets,
-    __mock_generate_sorted_test_batches,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_log_warning,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_print,
 ):
-    __mock_remove_skippable_tests.return_value = __TESTS.copy()
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     test_service.test_scipion_plugin(__ARGS)
     __mock_log_result_summary.assert_called_once_with(
         __mock_get_sorted_results.return_value
@@ -173,19 +923,22 @@ def test_calls_log_result_summary_when_testing_scipion_plugin(
 def test_logs_error_with_failed_tests_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_remove_circular_dependencies,
     __mock_remove_unmet_internal_dependency_tests,
     __mock_download_datasets,
-    __mock_generate_sorted_test_batches,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_log_warning,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_log_error,
     __mock_print,
 ):
-    __mock_remove_skippable_tests.return_value = __TESTS.copy()
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     __mock_run_tests.return_value = __TESTS.copy()
     test_service.test_scipion_plugin(__ARGS)
     __mock_log_error.assert_called_once_with("Some tests ended with errors. Exiting.")
@@ -194,30 +947,155 @@ def test_logs_error_with_failed_tests_when_testing_scipion_plugin(
 def test_logs_success_message_without_failed_tests_when_testing_scipion_plugin(
     __mock_get_all_tests,
     __mock_get_test_config,
+    __mock_start_module_check,
     __mock_remove_skippable_tests,
     __mock_remove_circular_dependencies,
     __mock_remove_unmet_internal_dependency_tests,
     __mock_download_datasets,
-    __mock_generate_sorted_test_batches,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
     __mock_run_tests,
+    __mock_record_test_durations,
     __mock_log_warning,
     __mock_get_sorted_results,
     __mock_log_result_summary,
     __mock_print,
 ):
-    __mock_remove_skippable_tests.return_value = __TESTS.copy()
+    __mock_remove_skippable_tests.return_value = TestCatalog(__TESTS)
     test_service.test_scipion_plugin(__ARGS)
     __mock_print.assert_called_with(logger.green("\nAll test passed!"), flush=True)
 
 
+def test_returns_expected_test_estimates():
+    assert test_service.__get_test_estimates(
+        __TESTS[:3], {__TESTS[0]: 10.0, "non_existent": 5.0}, 60.0
+    ) == {
+        __TESTS[0]: 10.0,
+        __TESTS[1]: 60.0,
+        __TESTS[2]: 60.0,
+    }, "Received different estimates than expected"
+
+
+def test_only_keeps_shard_tests_when_testing_scipion_plugin(
+    __mock_get_all_tests,
+    __mock_get_test_config,
+    __mock_start_module_check,
+    __mock_get_history_file_path,
+    __mock_get_test_durations,
+    __mock_get_shard_tests,
+    __mock_remove_skippable_tests,
+    __mock_log_warning,
+):
+    __mock_remove_skippable_tests.return_value = TestCatalog([])
+    received_args = []
+
+    def __get_shard_tests(*args):
+        received_args.append(copy.deepcopy(args))
+        return DEFAULT
+
+    __mock_get_shard_tests.side_effect = __get_shard_tests
+    with pytest.raises(SystemExit):
+        test_service.test_scipion_plugin(
+            {**__ARGS, test_service.SHARD_PARAM_NAME: (1, 2)}
+        )
+    assert received_args == [
+        (__TESTS, __INTERNAL_DEPENDENCIES, {}, 1, 2)
+    ], "Shard received different args than expected"
+    __mock_remove_skippable_tests.assert_called_once_with(ANY, __SKIPPABLE, False, {})
+    assert (
+        __mock_remove_skippable_tests.call_args[0][0].get_tests()
+        == __mock_get_shard_tests.return_value
+    ), "Skippable tests were not removed from the shard tests"
+
+
+def test_exits_success_when_shard_has_no_tests(__mock_log_warning, __mock_print):
+    with patch(
+        "scipion_testrunner.domain.sharding.get_shard_tests"
+    ) as mock_get_shard_tests:
+        mock_get_shard_tests.return_value = []
+        with pytest.raises(SystemExit) as exit_status:
+            test_service.__get_shard_tests(__TESTS, {}, {}, 3, 4)
+    assert exit_status.value.code == 0
+    __mock_log_warning.assert_called_once_with(
+        "Shard 3/4 has no tests. Nothing to run."
+    )
+
+
+def test_nodes_sharing_durations_file_pick_disjoint_shards_covering_every_test(
+    tmp_path, __mock_print
+):
+    shard_durations = str(tmp_path / "durations.jsonl")
+    history_handler.record_test_durations(
+        shard_durations, {test: float(index) for index, test in enumerate(__TESTS)}
+    )
+    args = {**__ARGS, test_service.SHARD_DURATIONS_PARAM_NAME: shard_durations}
+    shards = [
+        test_service.__get_shard_tests(
+            __TESTS, {}, test_service.__get_shard_estimates(args, __TESTS), index, 2
+        )
+        for index in (1, 2)
+    ]
+    assert not set(shards[0]) & set(shards[1]), "Shards share tests"
+    assert sorted(shards[0] + shards[1]) == sorted(
+        __TESTS
+    ), "Shards do not cover every test"
+    durations = history_handler.get_test_durations(shard_durations)
+    assert abs(
+        sum(durations[test] for test in shards[0])
+        - sum(durations[test] for test in shards[1])
+    ) <= max(durations.values()), "Shards are not balanced by duration"
+
+
+@pytest.mark.parametrize(
+    "recorded_durations,expected_estimates",
+    [
+        pytest.param({}, {}),
+        pytest.param(
+            {__TESTS[0]: 5.0},
+            {test: 5.0 if test == __TESTS[0] else 60.0 for test in __TESTS},
+        ),
+    ],
+)
+def test_returns_shard_estimates_from_durations_file(
+    recorded_durations, expected_estimates, tmp_path, __mock_log_warning
+):
+    shard_durations = tmp_path / "durations.jsonl"
+    shard_durations.write_text("")
+    history_handler.record_test_durations(str(shard_durations), recorded_durations)
+    assert (
+        test_service.__get_shard_estimates(
+            {
+                **__ARGS,
+                test_service.SHARD_DURATIONS_PARAM_NAME: str(shard_durations),
+            },
+            __TESTS,
+        )
+        == expected_estimates
+    ), "Received different shard estimates than expected"
+    assert __mock_log_warning.called == (
+        not recorded_durations
+    ), "Missing durations were not warned as expected"
+
+
+def test_logs_shard_size_when_getting_shard_tests(__mock_print):
+    with patch(
+        "scipion_testrunner.domain.sharding.get_shard_tests"
+    ) as mock_get_shard_tests:
+        mock_get_shard_tests.return_value = __TESTS[:2]
+        assert test_service.__get_shard_tests(__TESTS, {}, {}, 1, 4) == __TESTS[:2]
+    __mock_print.assert_called_once_with(
+        logger.blue(f"Shard 1/4 contains 2 of {len(__TESTS)} tests."), flush=True
+    )
+
+
 @pytest.mark.parametrize(
     "called_function,params",
     [
-        pytest.param("__mock_remove_gpu_tests", (__TESTS, __SKIPPABLE_GPU, False)),
+        pytest.param("__mock_remove_gpu_tests", (__SKIPPABLE_GPU, False)),
         pytest.param(
-            "__mock_remove_dependency_tests", (__TESTS, __SKIPPABLE_DEPENDENCIES)
+            "__mock_remove_dependency_tests", (__SKIPPABLE_DEPENDENCIES, None)
         ),
-        pytest.param("__mock_remove_other_tests", (__TESTS, __SKIPPABLE_OTHER)),
+        pytest.param("__mock_remove_other_tests", (__SKIPPABLE_OTHER,)),
     ],
 )
 def test_calls_expected_test_removal_function_when_removing_skippable_tests(
@@ -227,8 +1105,9 @@ def test_calls_expected_test_removal_function_when_removing_skippable_tests(
     __mock_remove_dependency_tests,
     __mock_remove_other_tests,
 ):
-    test_service.__remove_skippable_tests(__TESTS.copy(), __SKIPPABLE, False)
-    locals()[called_function].assert_called_once_with(*params)
+    test_catalog = TestCatalog(__TESTS)
+    test_service.__remove_skippable_tests(test_catalog, __SKIPPABLE, False)
+    locals()[called_function].assert_called_once_with(test_catalog, *params)
 
 
 @pytest.mark.parametrize(
@@ -248,13 +1127,13 @@ def test_returns_expected_remaining_tests_when_removing_skippable_tests(
     locals()[removal_function].return_value = __TESTS[:1]
     locals()[removal_function].side_effect = None
     assert (
-        test_service.__remove_skippable_tests(__TESTS.copy(), __SKIPPABLE, True)
+        test_service.__remove_skippable_tests(TestCatalog(__TESTS), __SKIPPABLE, True)
         == __TESTS[:1]
     ), "Received different remaining tests than expected."
 
 
 def test_logs_skipping_gpu_test(__mock_log_skip_gpu_test):
-    test_service.__remove_gpu_tests(__TESTS.copy(), __TESTS[:1], True)
+    test_service.__remove_gpu_tests(TestCatalog(__TESTS), __TESTS[:1], True)
     __mock_log_skip_gpu_test.assert_called_once_with(__TESTS[0])
 
 
@@ -269,10 +1148,11 @@ def test_logs_skipping_gpu_test(__mock_log_skip_gpu_test):
 )
 def test_removes_expected_gpu_tests(to_remove, no_gpu, __mock_log_skip_gpu_test):
     remaining = list(set(__TESTS.copy()) - set(to_remove)) if no_gpu else __TESTS
-    assert (
-        test_service.__remove_gpu_tests(__TESTS.copy(), to_remove, no_gpu).sort()
-        == remaining.sort()
-    ), "Different remaining tests than expected."
+    assert sorted(
+        test_service.__remove_gpu_tests(
+            TestCatalog(__TESTS), to_remove, no_gpu
+        ).get_tests()
+    ) == sorted(remaining), "Different remaining tests than expected."
 
 
 @pytest.mark.parametrize(
@@ -287,7 +1167,7 @@ def test_logs_skipping_dependency_test_with_expected_args(
 ):
     test_to_remove = "test_1"
     test_service.__remove_dependency_tests(
-        __TESTS.copy(),
+        TestCatalog(__TESTS),
         [
             {
                 test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: name,
@@ -331,15 +1211,122 @@ def test_removes_expected_dependency_tests(
         new=mock_exists_python_module,
     ):
         assert (
-            test_service.__remove_dependency_tests(__TESTS.copy(), dependency_tests)
+            test_service.__remove_dependency_tests(
+                TestCatalog(__TESTS), dependency_tests
+            ).get_tests()
             == remaining_tests
         ), "Received different remaining tests than expected."
 
 
+def test_removes_dependency_tests_with_already_checked_modules(
+    __mock_exists_python_module, __mock_log_skip_dependency_test
+):
+    dependency_tests = [
+        {
+            test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: "test_name",
+            test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY: module_name,
+            test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: [test],
+        }
+        for module_name, test in [("module_a", __TESTS[0]), ("module_b", __TESTS[1])]
+    ]
+    assert test_service.__remove_dependency_tests(
+        TestCatalog(__TESTS), dependency_tests, {"module_a": True, "module_b": False}
+    ).get_tests() == [
+        __TESTS[0],
+        *__TESTS[2:],
+    ], "Received different remaining tests than expected."
+    __mock_exists_python_module.assert_not_called()
+
+
+def test_checks_each_dependency_module_once_when_starting_module_check():
+    skippable_tests = {
+        test_data_keys.SKIPPABLE_DEPENDENCIES_KEY: [
+            *__SKIPPABLE_DEPENDENCIES,
+            *__SKIPPABLE_DEPENDENCIES,
+            {test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: "nomodule"},
+        ]
+    }
+    with patch(
+        "scipion_testrunner.domain.test_service.__get_existing_modules"
+    ) as mock_get_existing_modules:
+        mock_get_existing_modules.return_value = {"pluginmodule": True}
+        assert test_service.__start_module_check(__ARGS, skippable_tests)() == {
+            "pluginmodule": True
+        }, "Received different module checks than expected"
+    mock_get_existing_modules.assert_called_once_with("cache", ["pluginmodule"])
+
+
+def test_only_checks_modules_missing_from_cache(
+    __mock_get_cached_modules, __mock_record_modules, __mock_get_existing_python_modules
+):
+    assert test_service.__get_existing_modules("cache", ["module_a", "module_b"]) == {
+        "module_a": True,
+        "module_b": False,
+    }, "Received different module checks than expected"
+    __mock_get_existing_python_modules.assert_called_once_with(["module_b"])
+    __mock_record_modules.assert_called_once_with(
+        ANY, ANY, {"module_a": True, "module_c": True, "module_b": False}, ANY
+    )
+
+
+def test_does_not_check_modules_when_all_are_cached(
+    __mock_get_cached_modules, __mock_record_modules, __mock_get_existing_python_modules
+):
+    assert test_service.__get_existing_modules("cache", ["module_c"]) == {
+        "module_c": True
+    }, "Received different module checks than expected"
+    __mock_get_existing_python_modules.assert_not_called()
+    __mock_record_modules.assert_not_called()
+
+
+def test_records_search_path_when_it_is_not_cached(
+    __mock_get_cached_modules, __mock_record_modules, __mock_get_existing_python_modules
+):
+    with patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_cached_search_path"
+    ) as mock_get_cached_search_path, patch(
+        "scipion_testrunner.domain.handlers.python_handler.get_python_search_path"
+    ) as mock_get_python_search_path:
+        mock_get_cached_search_path.return_value = None
+        mock_get_python_search_path.return_value = ["site-packages"]
+        test_service.__get_existing_modules("cache", ["module_c"])
+    __mock_get_existing_python_modules.assert_not_called()
+    __mock_record_modules.assert_called_once_with(
+        ANY, ANY, {"module_a": True, "module_c": True}, ["site-packages"]
+    )
+
+
+def test_does_not_start_python_when_search_path_is_cached(
+    __mock_get_cached_modules, __mock_record_modules, __mock_get_existing_python_modules
+):
+    with patch(
+        "scipion_testrunner.domain.handlers.python_handler.get_python_search_path"
+    ) as mock_get_python_search_path:
+        test_service.__get_existing_modules("cache", ["module_a"])
+    mock_get_python_search_path.assert_not_called()
+
+
+def test_checks_every_module_without_cache_when_search_path_is_unknown(
+    __mock_get_cached_modules, __mock_record_modules, __mock_get_existing_python_modules
+):
+    with patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_cached_search_path"
+    ) as mock_get_cached_search_path, patch(
+        "scipion_testrunner.domain.handlers.python_handler.get_python_search_path"
+    ) as mock_get_python_search_path:
+        mock_get_cached_search_path.return_value = None
+        mock_get_python_search_path.return_value = None
+        assert test_service.__get_existing_modules("cache", ["module_b"]) == {
+            "module_b": False
+        }, "Received different module checks than expected"
+    __mock_get_cached_modules.assert_not_called()
+    __mock_record_modules.assert_not_called()
+
+
 def test_logs_skipping_other_test(__mock_log_skip_test):
     reason = "test_reason"
     test_service.__remove_other_tests(
-        __TESTS.copy(),
+        TestCatalog(__TESTS),
         [
             {
                 test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: __TESTS[0],
@@ -367,10 +1354,58 @@ def test_removes_expected_other_tests(to_remove, __mock_log_skip_test):
         }
         for test_name in to_remove
     ]
+    assert sorted(
+        test_service.__remove_other_tests(TestCatalog(__TESTS), other_tests).get_tests()
+    ) == sorted(remaining), "Different remaining tests than expected."
+
+
+def test_removes_tests_matching_patterns_with_reason_of_first_matching_rule(
+    __mock_log_skip_test,
+):
+    catalog = test_service.__remove_other_tests(
+        TestCatalog(["test_gpu.TestA", "test_gpu.TestB", "test_cpu.TestA"]),
+        [
+            {test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "re:.*\\.TestB"},
+            {
+                test_data_keys.SKIPPABLE_OTHERS_TEST_KEY: "test_gpu.*",
+                test_data_keys.SKIPPABLE_OTHERS_REASON_KEY: "Glob reason",
+            },
+        ],
+    )
+    assert catalog.get_tests() == [
+        "test_cpu.TestA"
+    ], "Received different remaining tests than expected."
+    __mock_log_skip_test.assert_has_calls(
+        [call("test_gpu.TestA", "Glob reason"), call("test_gpu.TestB", None)]
+    )
+
+
+def test_removes_gpu_tests_matching_patterns(__mock_log_skip_gpu_test):
+    assert test_service.__remove_gpu_tests(
+        TestCatalog(__TESTS), ["test_[12]", "re:test_[3-9]"], True
+    ).get_tests() == [__TESTS[0]], "Received different remaining tests than expected."
+
+
+def test_removes_pattern_dependency_tests_due_to_first_unmet_dependency(
+    __mock_log_skip_dependency_test,
+):
+    dependency_tests = [
+        {
+            test_data_keys.SKIPPABLE_DEPENDENCIES_NAME_KEY: name,
+            test_data_keys.SKIPPABLE_DEPENDENCIES_MODULE_KEY: name,
+            test_data_keys.SKIPPABLE_DEPENDENCIES_TESTS_KEY: ["test_*"],
+        }
+        for name in ["met", "unmet"]
+    ]
     assert (
-        test_service.__remove_other_tests(__TESTS.copy(), other_tests).sort()
-        == remaining.sort()
-    ), "Different remaining tests than expected."
+        test_service.__remove_dependency_tests(
+            TestCatalog(__TESTS[:1]), dependency_tests, {"met": True, "unmet": False}
+        ).get_tests()
+        == []
+    ), "Received different remaining tests than expected."
+    __mock_log_skip_dependency_test.assert_called_once_with(
+        __TESTS[0], "unmet", is_plugin=True
+    )
 
 
 def test_logs_expected_message_when_skipping_gpu_test(__mock_log_skip_test):
@@ -444,8 +1479,8 @@ def test_removes_expected_internal_dependency_tests(
 ):
     assert (
         test_service.__remove_unmet_internal_dependency_tests(
-            __TESTS.copy(), tests_with_dependencies
-        )[0]
+            TestCatalog(__TESTS), tests_with_dependencies
+        )[0].get_tests()
         == expected_tests
     ), "Removed different number of tests than expected."
 
@@ -461,45 +1496,13 @@ def test_logs_expected_internal_dependency_test_removal(
     tests, tests_text, __mock_log_skip_test
 ):
     test_service.__remove_unmet_internal_dependency_tests(
-        __TESTS.copy(), {__TESTS[0]: tests}
+        TestCatalog(__TESTS), {__TESTS[0]: tests}
     )
     __mock_log_skip_test.assert_called_once_with(
         __TESTS[0], f"Missing dependency with tests: {tests_text}"
     )
 
 
-@pytest.mark.parametrize(
-    "test_name,dependencies,expected_path",
-    [
-        pytest.param(__TESTS[0], {}, []),
-        pytest.param(__TESTS[0], {__TESTS[0]: ["random_test"]}, []),
-        pytest.param(
-            __TESTS[0],
-            {__TESTS[0]: [__TESTS[-1]], __TESTS[-1]: [__TESTS[0]]},
-            [__TESTS[0], __TESTS[-1], __TESTS[0]],
-        ),
-        pytest.param(
-            __TESTS[0], {__TESTS[1]: [__TESTS[-1]], __TESTS[-1]: [__TESTS[1]]}, []
-        ),
-        pytest.param(
-            __TESTS[0],
-            {
-                __TESTS[0]: [__TESTS[1]],
-                __TESTS[1]: [__TESTS[-1]],
-                __TESTS[-1]: [__TESTS[1]],
-            },
-            [__TESTS[1], __TESTS[-1], __TESTS[1]],
-        ),
-        pytest.param(__TESTS[0], {__TESTS[0]: [__TESTS[0]]}, [__TESTS[0], __TESTS[0]]),
-    ],
-)
-def test_returns_expected_circular_dependencies(test_name, dependencies, expected_path):
-    assert (
-        test_service.__find_circular_dependency(test_name, dependencies)
-        == expected_path
-    ), "Received circular dependency path was not expected"
-
-
 @pytest.mark.parametrize(
     "dependencies,expected_tests",
     [
@@ -520,14 +1523,31 @@ def test_returns_expected_non_circular_dependency_tests(
     dependencies, expected_tests, __mock_log_skip_test
 ):
     assert (
-        test_service.__remove_circular_dependencies(__TESTS.copy(), dependencies)[0]
+        test_service.__remove_circular_dependencies(TestCatalog(__TESTS), dependencies)[
+            0
+        ].get_tests()
         == expected_tests
     ), "Received different tests than expected"
 
 
+def test_keeps_dependencies_of_tests_outside_circular_dependencies(
+    __mock_log_skip_test,
+):
+    assert test_service.__remove_circular_dependencies(
+        TestCatalog(__TESTS),
+        {
+            __TESTS[0]: [__TESTS[1]],
+            __TESTS[1]: [__TESTS[2]],
+            __TESTS[2]: [__TESTS[1]],
+        },
+    )[1] == {
+        __TESTS[0]: [__TESTS[1]]
+    }, "Received different remaining dependencies than expected"
+
+
 def test_logs_expected_circular_dependency_message(__mock_log_skip_test):
-    test_service.__remove_circular_dependency(
-        __TESTS.copy(), {__TESTS[0]: [__TESTS[0]]}, [__TESTS[0], __TESTS[0]]
+    test_service.__remove_circular_dependencies(
+        TestCatalog(__TESTS), {__TESTS[0]: [__TESTS[0]]}
     )
     __mock_log_skip_test.assert_called_once_with(
         __TESTS[0], f"It has a circular dependency: {__TESTS[0]} --> {__TESTS[0]}"
@@ -536,98 +1556,60 @@ def test_logs_expected_circular_dependency_message(__mock_log_skip_test):
 
 def test_does_not_log_non_existing_tests_in_circular_path(__mock_log_skip_test):
     test_name = "non_existent"
-    test_service.__remove_circular_dependency(
-        __TESTS.copy(), {test_name: [test_name]}, [test_name, test_name]
+    test_service.__remove_circular_dependencies(
+        TestCatalog(__TESTS), {test_name: [test_name]}
     )
     __mock_log_skip_test.assert_not_called()
 
 
-@pytest.mark.parametrize(
-    "test_with_deps,expected_batch",
-    [
-        pytest.param(
-            {__TESTS[0]: [__TESTS[-1]], __TESTS[1]: [__TESTS[0]]}, [__TESTS[0]]
-        ),
-        pytest.param(
-            {__TESTS[0]: [__TESTS[-1]], __TESTS[1]: [__TESTS[2]]},
-            [__TESTS[0], __TESTS[1]],
-        ),
-        pytest.param({__TESTS[0]: [__TESTS[1]], __TESTS[1]: [__TESTS[0]]}, []),
-        pytest.param({__TESTS[0]: [__TESTS[0]]}, []),
-    ],
-)
-def test_returns_expected_batch(test_with_deps, expected_batch):
-    assert (
-        test_service.__get_test_batch(test_with_deps) == expected_batch
-    ), "Received different batch than expected"
-
-
-@pytest.mark.parametrize(
-    "test_with_deps,expected_tests,expected_batches",
-    [
-        pytest.param(
-            {__TESTS[0]: [__TESTS[-1]], __TESTS[1]: [__TESTS[0]]},
-            __TESTS[2:],
-            [[__TESTS[0]], [__TESTS[1]]],
-        ),
-        pytest.param(
-            {__TESTS[0]: [__TESTS[-1]], __TESTS[1]: [__TESTS[2]]},
-            __TESTS[2:],
-            [[__TESTS[0], __TESTS[1]]],
-        ),
-        pytest.param({__TESTS[0]: [__TESTS[1]], __TESTS[1]: [__TESTS[0]]}, __TESTS, []),
-        pytest.param({__TESTS[0]: [__TESTS[0]]}, __TESTS, []),
-        pytest.param({__TESTS[0]: ["non_existing"]}, __TESTS[1:], [[__TESTS[0]]]),
-        pytest.param({"non_existing": [__TESTS[0]]}, __TESTS, [["non_existing"]]),
-    ],
-)
-def test_returns_expected_sorted_batches(
-    test_with_deps, expected_tests, expected_batches
-):
-    assert test_service.__generate_sorted_test_batches(
-        __TESTS.copy(), test_with_deps
-    ) == (
-        expected_tests,
-        expected_batches,
-    ), "Received different sorted batches than expected"
-
-
-def test_returns_expected_grouped_tests():
-    file1_name = "file1"
-    file2_name = "file2"
-    assert test_service.__group_tests_by_file(
-        [
-            f"{file1_name}.{__TESTS[0]}",
-            f"{file1_name}.{__TESTS[1]}",
-            f"{file2_name}.{__TESTS[0]}",
-            f"folder.{file1_name}.{__TESTS[0]}",
-        ]
-    ) == {
-        file1_name: [__TESTS[0], __TESTS[1]],
-        file2_name: [__TESTS[0]],
-        f"folder.{file1_name}": [__TESTS[0]],
-    }, "Received different test grouping than expected"
-
-
 def test_returns_expected_sorted_results():
     file1_name = "file1"
     file2_name = "file2"
     file3_name = "file3"
-    assert test_service.__get_sorted_results(
+    test_catalog = TestCatalog(
         [
             f"{file1_name}.{__TESTS[0]}",
             f"{file1_name}.{__TESTS[1]}",
             f"{file2_name}.{__TESTS[0]}",
             f"{file3_name}.{__TESTS[0]}",
-        ],
+            f"folder.{file1_name}.{__TESTS[0]}",
+            f"folder.{file1_name}.{__TESTS[1]}",
+        ]
+    )
+    test_catalog.remove(f"folder.{file1_name}.{__TESTS[1]}")
+    test_catalog.set_results(
         [f"{file1_name}.{__TESTS[1]}", f"{file3_name}.{__TESTS[0]}"],
-    ) == {
-        file1_name: {"passed": [__TESTS[0]], "failed": [__TESTS[1]]},
-        file2_name: {"passed": [__TESTS[0]], "failed": []},
-        file3_name: {"passed": [], "failed": [__TESTS[0]]},
+        [f"{file2_name}.{__TESTS[0]}"],
+    )
+    assert test_service.__get_sorted_results(test_catalog) == {
+        file1_name: {"passed": [__TESTS[0]], "failed": [__TESTS[1]], "skipped": []},
+        file2_name: {"passed": [], "failed": [], "skipped": [__TESTS[0]]},
+        file3_name: {"passed": [], "failed": [__TESTS[0]], "skipped": []},
+        f"folder.{file1_name}": {"passed": [__TESTS[0]], "failed": [], "skipped": []},
     }, "Received different result order than expected"
 
 
+def test_logs_and_returns_skipped_tests_that_did_not_fail():
+    with patch(
+        "scipion_testrunner.domain.test_service.__log_skip_test"
+    ) as mock_log_skip_test:
+        assert test_service.__get_skipped_tests(
+            {
+                "file1.TestA.test_a": "Dependency failed: 'file1.TestB'",
+                "file1.TestC file1.TestD": "Cancelled after a test failed",
+            },
+            {"file1.TestA.test_a": "file1.TestA"},
+            ["file1.TestC"],
+        ) == ["file1.TestA", "file1.TestD"], "Received different skipped tests"
+    mock_log_skip_test.assert_has_calls(
+        [
+            call("file1.TestA.test_a", "Dependency failed: 'file1.TestB'"),
+            call("file1.TestC", "Cancelled after a test failed"),
+            call("file1.TestD", "Cancelled after a test failed"),
+        ]
+    )
+
+
 def test_logs_expected_messages_in_summary_report(__mock_print):
     file1_name = "file1"
     file2_name = "file2"
@@ -637,25 +1619,90 @@ def test_logs_expected_messages_in_summary_report(__mock_print):
         call(f"{file1_name}: [1 / 3]", flush=True),
         call(logger.red(f"\tFailed tests: {__TESTS[1]} {__TESTS[2]}"), flush=True),
         call(f"{file2_name}: [1 / 1]", flush=True),
-        call(f"{file3_name}: [0 / 1]", flush=True),
+        call(f"{file3_name}: [0 / 2]", flush=True),
         call(logger.red(f"\tFailed tests: {__TESTS[0]}"), flush=True),
+        call(logger.yellow(f"\tSkipped tests: {__TESTS[1]}"), flush=True),
     ]
     test_service.__log_result_summary(
         {
             file1_name: {"passed": [__TESTS[0]], "failed": [__TESTS[1], __TESTS[2]]},
             file2_name: {"passed": [__TESTS[0]], "failed": []},
-            file3_name: {"passed": [], "failed": [__TESTS[0]]},
+            file3_name: {"passed": [], "failed": [__TESTS[0]], "skipped": [__TESTS[1]]},
         }
     )
     __mock_print.assert_has_calls(calls)
 
 
+@pytest.fixture
+def __mock_start_module_check():
+    with patch(
+        "scipion_testrunner.domain.test_service.__start_module_check"
+    ) as mock_method:
+        mock_method.return_value = Mock(return_value={})
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_test_name_resolver():
+    with patch(
+        "scipion_testrunner.domain.static_discovery.get_test_name_resolver"
+    ) as mock_method:
+        mock_method.return_value = lambda test: {"TestA": "module.TestA"}.get(
+            test, test
+        )
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_find_tests():
+    with patch("scipion_testrunner.domain.static_discovery.find_tests") as mock_method:
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_fingerprint():
+    with patch(
+        "scipion_testrunner.domain.handlers.discovery_handler.get_fingerprint"
+    ) as mock_method:
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_cached_tests():
+    with patch(
+        "scipion_testrunner.domain.handlers.discovery_handler.get_cached_tests"
+    ) as mock_method:
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_record_tests():
+    with patch(
+        "scipion_testrunner.domain.handlers.discovery_handler.record_tests"
+    ) as mock_method:
+        yield mock_method
+
+
 @pytest.fixture
 def __mock_get_all_tests():
     with patch(
         "scipion_testrunner.domain.handlers.scipion_handler.get_all_tests"
     ) as mock_method:
-        mock_method.return_value = __TESTS
+        mock_method.return_value = __TESTS.copy()
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_test_methods():
+    with patch(
+        "scipion_testrunner.domain.handlers.scipion_handler.get_test_methods"
+    ) as mock_method:
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_run_worker():
+    with patch("scipion_testrunner.domain.worker.run_worker") as mock_method:
         yield mock_method
 
 
@@ -672,7 +1719,12 @@ def __mock_get_test_config():
     with patch(
         "scipion_testrunner.configuration.test_config.get_test_config"
     ) as mock_method:
-        mock_method.return_value = (__DATASETS, __SKIPPABLE, __INTERNAL_DEPENDENCIES)
+        mock_method.return_value = TestConfig(
+            __DATASETS,
+            __SKIPPABLE,
+            __INTERNAL_DEPENDENCIES,
+            __TIMEOUTS,
+        )
         yield mock_method
 
 
@@ -692,6 +1744,39 @@ def __mock_download_datasets():
         yield mock_method
 
 
+@pytest.fixture
+def __mock_get_history_file_path():
+    with patch(
+        "scipion_testrunner.domain.handlers.history_handler.get_history_file_path"
+    ) as mock_method:
+        mock_method.return_value = "history.jsonl"
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_test_durations():
+    with patch(
+        "scipion_testrunner.domain.handlers.history_handler.get_test_durations"
+    ) as mock_method:
+        mock_method.return_value = {}
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_shard_tests():
+    with patch("scipion_testrunner.domain.sharding.get_shard_tests") as mock_method:
+        mock_method.return_value = __TESTS[:5]
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_record_test_durations():
+    with patch(
+        "scipion_testrunner.domain.handlers.history_handler.record_test_durations"
+    ) as mock_method:
+        yield mock_method
+
+
 @pytest.fixture
 def __mock_run_tests():
     with patch(
@@ -715,7 +1800,9 @@ def __mock_remove_dependency_tests():
     with patch(
         "scipion_testrunner.domain.test_service.__remove_dependency_tests"
     ) as mock_method:
-        mock_method.side_effect = lambda tests, skippable_dependency: tests
+        mock_method.side_effect = (
+            lambda tests, skippable_dependency, existing_modules: tests
+        )
         yield mock_method
 
 
@@ -745,6 +1832,39 @@ def __mock_exists_python_module(request):
         yield mock_method
 
 
+@pytest.fixture
+def __mock_get_cached_modules():
+    with patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_cached_modules"
+    ) as mock_method, patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_module_file_path"
+    ), patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_fingerprint"
+    ), patch(
+        "scipion_testrunner.domain.handlers.module_handler.get_cached_search_path",
+        return_value=["site-packages"],
+    ):
+        mock_method.return_value = {"module_a": True, "module_c": True}
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_record_modules():
+    with patch(
+        "scipion_testrunner.domain.handlers.module_handler.record_modules"
+    ) as mock_method:
+        yield mock_method
+
+
+@pytest.fixture
+def __mock_get_existing_python_modules():
+    with patch(
+        "scipion_testrunner.domain.handlers.python_handler.get_existing_python_modules"
+    ) as mock_method:
+        mock_method.return_value = {"module_b": False}
+        yield mock_method
+
+
 @pytest.fixture
 def __mock_log_skip_dependency_test():
     with patch(
@@ -764,7 +1884,7 @@ def __mock_remove_circular_dependencies():
     with patch(
         "scipion_testrunner.domain.test_service.__remove_circular_dependencies"
     ) as mock_method:
-        mock_method.return_value = (__TESTS, __INTERNAL_DEPENDENCIES)
+        mock_method.return_value = (TestCatalog(__TESTS), __INTERNAL_DEPENDENCIES)
         yield mock_method
 
 
@@ -773,16 +1893,7 @@ def __mock_remove_unmet_internal_dependency_tests():
     with patch(
         "scipion_testrunner.domain.test_service.__remove_unmet_internal_dependency_tests"
     ) as mock_method:
-        mock_method.return_value = (__TESTS, __INTERNAL_DEPENDENCIES)
-        yield mock_method
-
-
-@pytest.fixture
-def __mock_generate_sorted_test_batches():
-    with patch(
-        "scipion_testrunner.domain.test_service.__generate_sorted_test_batches"
-    ) as mock_method:
-        mock_method.return_value = (__TESTS, [])
+        mock_method.return_value = (TestCatalog(__TESTS), __INTERNAL_DEPENDENCIES)
         yield mock_method
 
 
@@ -0,0 +1,83 @@
+import signal
+import time
+
+import pytest
+
+from scipion_testrunner.domain import zygote
+
+__RUNNER_MODULE = "fake_runner"
+__MAX_STOP_TIME = 30
+__FAKE_RUNNER = f"""import os
+import signal
+import sys
+import time
+
+test = sys.argv[1]
+print(f"Running {{test}}")
+if test.endswith("Crash"):
+    os.kill(os.getpid(), signal.{signal.SIGKILL.name})
+if test.endswith("Raise"):
+    raise RuntimeError("Unexpected error")
+if test.endswith("Hang"):
+    sys.stdout.flush()
+    time.sleep(60)
+sys.exit(1 if test.endswith("Fail") else 0)
+"""
+
+
+@pytest.mark.parametrize(
+    "test,expected_ret_code,expected_output",
+    [
+        pytest.param("test_a.TestOk", 0, "Running test_a.TestOk"),
+        pytest.param("test_a.TestFail", 1, "Running test_a.TestFail"),
+        pytest.param("test_a.TestRaise", 1, "RuntimeError: Unexpected error"),
+        pytest.param("test_a.TestCrash", -signal.SIGKILL, "Running test_a.TestCrash"),
+    ],
+)
+def test_returns_expected_result_when_running_forked_test(
+    test, expected_ret_code, expected_output, __fake_runner
+):
+    ret_code, output, timed_out = zygote.run_forked_test(__RUNNER_MODULE, test)
+    assert ret_code == expected_ret_code, "Received different return code than expected"
+    assert expected_output in output, "Output does not contain the expected message"
+    assert not timed_out, "Test was reported as timed out"
+
+
+def test_stops_test_when_running_forked_test_that_times_out(__fake_runner):
+    start = time.monotonic()
+    ret_code, output, timed_out = zygote.run_forked_test(
+        __RUNNER_MODULE, "test_a.TestHang", timeout=0.5
+    )
+    assert timed_out, "Test was not reported as timed out"
+    assert ret_code == -signal.SIGTERM, "Test was not terminated"
+    assert "Running test_a.TestHang" in output, "Output of the test was lost"
+    assert time.monotonic() - start < __MAX_STOP_TIME, "Test was not stopped in time"
+
+
+def test_writes_full_output_to_log_file_when_running_forked_test(
+    __fake_runner, tmp_path
+):
+    log_file = tmp_path / "test.log"
+    _, output, _ = zygote.run_forked_test(
+        __RUNNER_MODULE, "test_a.TestOk", log_file=str(log_file), tail_size=7
+    )
+    assert output == "TestOk\n", "Received different output tail than expected"
+    assert (
+        log_file.read_text().strip() == "Running test_a.TestOk"
+    ), "Log file does not contain the full output"
+
+
+def test_does_not_share_state_between_forked_tests(__fake_runner):
+    zygote.run_forked_test(__RUNNER_MODULE, "test_a.TestOk")
+    ret_code, output, _ = zygote.run_forked_test(__RUNNER_MODULE, "test_a.TestOk")
+    assert (ret_code, output.strip()) == (
+        0,
+        "Running test_a.TestOk",
+    ), "Second test saw the state left by the first one"
+
+
+@pytest.fixture
+def __fake_runner(tmp_path, monkeypatch):
+    (tmp_path / f"{__RUNNER_MODULE}.py").write_text(__FAKE_RUNNER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield